@@ -8,24 +8,67 @@
 import gc
 import json
 import asyncio
-from contextlib import asynccontextmanager
+import hashlib
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 from typing import Optional, List, AsyncGenerator
+from collections import OrderedDict
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, WebSocket, WebSocketDisconnect
+from starlette.requests import HTTPConnection
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+from translategemma_cli.cancellation import CancellationToken, TranslationCancelled
+from translategemma_cli.scheduler import GenerationScheduler, PRIORITIES
+from translategemma_cli.jobs import JobStore, JobRunner
+from translategemma_cli.metrics import get_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from translategemma_cli.stats import GenerationStats
+from translategemma_cli import tracing
+from translategemma_cli.profiling import RequestProfiler
+from translategemma_cli.memory import available_memory_mb, format_size, get_profile, snapshot as memory_snapshot
+from translategemma_cli.idle import AdaptiveIdlePolicy
+from translategemma_cli.config import RequestContext
+
 # ==================== Configuration ====================
 DEFAULT_MODEL = os.getenv("MODEL_NAME", "27b")
 DEFAULT_QUANTIZATION = int(os.getenv("QUANTIZATION", "8"))
 DEFAULT_BACKEND = os.getenv("BACKEND", "gguf")
 GPU_IDLE_TIMEOUT = int(os.getenv("GPU_IDLE_TIMEOUT", "0"))  # 0 = unload immediately after use
+GPU_IDLE_POLICY = os.getenv("GPU_IDLE_POLICY", "fixed")  # fixed = GPU_IDLE_TIMEOUT, adaptive = learned from request gaps
+GPU_IDLE_MIN = float(os.getenv("GPU_IDLE_MIN", "30"))  # adaptive policy bounds, seconds
+GPU_IDLE_MAX = float(os.getenv("GPU_IDLE_MAX", "1800"))
+PRELOAD = os.getenv("PRELOAD", "0") == "1"  # 1 = load the default model at startup and keep it resident
 MAX_CHUNK_LENGTH = int(os.getenv("MAX_CHUNK_LENGTH", "100"))  # 100 is safe, 150+ may cause truncation
 DEFAULT_OVERLAP = int(os.getenv("DEFAULT_OVERLAP", "0"))  # 0 = no sliding window, >0 = overlap chars
 REPETITION_PENALTY = float(os.getenv("REPETITION_PENALTY", "1.0"))  # 1.0 = no penalty, 1.1+ = reduce repetition
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.5"))  # seconds between client liveness checks
+# Relative share of generation slots per priority class, e.g. "interactive=8,batch=2,background=1"
+SCHEDULER_WEIGHTS = {
+    name.strip(): float(weight)
+    for name, weight in (item.split("=") for item in os.getenv("SCHEDULER_WEIGHTS", "").split(",") if item.strip())
+}
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))  # threads draining the /api/jobs queue
+JOBS_DB = os.getenv("JOBS_DB")  # defaults to ~/.cache/translate/jobs.db
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "8"))  # chunks generated together by /api/translate/batch
+WS_SEGMENT_CACHE_SIZE = int(os.getenv("WS_SEGMENT_CACHE_SIZE", "512"))  # translated segments kept per WebSocket
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")  # none, json or otel
+TRACE_FILE = os.getenv("TRACE_FILE")  # JSON lines file for TRACE_EXPORTER=json (default: in memory only)
+PROFILE = os.getenv("PROFILE", "0")  # 1 = cProfile each request, sample = sampling profiler
+PROFILE_DIR = os.getenv("PROFILE_DIR")  # defaults to ~/.cache/translate/profiles
+# Simulated model for BACKEND=fake (CPU-only load tests); unset keys keep the config defaults
+FAKE_BACKEND = {
+    key: value
+    for key, value in {
+        "token_latency": os.getenv("FAKE_TOKEN_LATENCY"),  # seconds per decoded token
+        "prefill_latency": os.getenv("FAKE_PREFILL_LATENCY"),  # fixed seconds per generation
+        "prefill_token_latency": os.getenv("FAKE_PREFILL_TOKEN_LATENCY"),  # seconds per prompt token
+        "batch_curve": os.getenv("FAKE_BATCH_CURVE"),  # e.g. "1:1.0,8:1.5"
+    }.items()
+    if value
+}
 
 # Supported languages (55 from TranslateGemma)
 LANGUAGES = {
@@ -47,15 +90,76 @@
 
 # Model configurations
 AVAILABLE_MODELS = {
-    "4B-Q4": {"name": "TranslateGemma 4B Q4", "size": "4B", "quantization": "Q4", "quant": 4, "vram": "~3GB", "quality": "Good", "description": "最快速度，适合日常翻译"},
-    "4B-Q8": {"name": "TranslateGemma 4B Q8", "size": "4B", "quantization": "Q8", "quant": 8, "vram": "~5GB", "quality": "Better", "description": "平衡速度与质量"},
-    "12B-Q4": {"name": "TranslateGemma 12B Q4", "size": "12B", "quantization": "Q4", "quant": 4, "vram": "~7GB", "quality": "High", "description": "中等模型，高质量翻译"},
-    "12B-Q8": {"name": "TranslateGemma 12B Q8", "size": "12B", "quantization": "Q8", "quant": 8, "vram": "~12GB", "quality": "Higher", "description": "更高精度，推荐使用"},
-    "27B-Q4": {"name": "TranslateGemma 27B Q4", "size": "27B", "quantization": "Q4", "quant": 4, "vram": "~15GB", "quality": "Best", "description": "大模型，最佳翻译质量"},
-    "27B-Q8": {"name": "TranslateGemma 27B Q8", "size": "27B", "quantization": "Q8", "quant": 8, "vram": "~28GB", "quality": "Best+", "description": "最高质量，专业翻译首选"},
+    "4B-Q4": {"name": "TranslateGemma 4B Q4", "size": "4B", "quantization": "Q4", "quant": 4, "quality": "Good", "description": "最快速度，适合日常翻译"},
+    "4B-Q8": {"name": "TranslateGemma 4B Q8", "size": "4B", "quantization": "Q8", "quant": 8, "quality": "Better", "description": "平衡速度与质量"},
+    "12B-Q4": {"name": "TranslateGemma 12B Q4", "size": "12B", "quantization": "Q4", "quant": 4, "quality": "High", "description": "中等模型，高质量翻译"},
+    "12B-Q8": {"name": "TranslateGemma 12B Q8", "size": "12B", "quantization": "Q8", "quant": 8, "quality": "Higher", "description": "更高精度，推荐使用"},
+    "27B-Q4": {"name": "TranslateGemma 27B Q4", "size": "27B", "quantization": "Q4", "quant": 4, "quality": "Best", "description": "大模型，最佳翻译质量"},
+    "27B-Q8": {"name": "TranslateGemma 27B Q8", "size": "27B", "quantization": "Q8", "quant": 8, "quality": "Best+", "description": "最高质量，专业翻译首选"},
 }
 
 
+
+def model_listing() -> dict:
+    """
+    AVAILABLE_MODELS with the memory each model needs at the configured context.
+
+    Sizes come from the memory budget planner: measured profiles
+    (`translate bench memory`) when present, else estimates.
+    """
+    from translategemma_cli.config import get_config
+    
+    backend = DEFAULT_BACKEND if DEFAULT_BACKEND != "auto" else "gguf"
+    context = get_config().gguf_n_ctx
+    available = available_memory_mb()
+    listing = {}
+    for key, info in AVAILABLE_MODELS.items():
+        profile = get_profile(info["size"].lower(), info["quant"], backend)
+        required = profile.required_mb(context)
+        listing[key] = {
+            **info,
+            "vram": format_size(required),
+            "memory_mb": round(required),
+            "memory_measured": profile.measured,
+            "fits": required <= available if available is not None else None,
+        }
+    return listing
+
+
+# ==================== Metrics ====================
+metrics = get_metrics()
+tracing.configure(TRACE_EXPORTER, TRACE_FILE)
+request_profiler = RequestProfiler(PROFILE, PROFILE_DIR)
+queue_wait_seconds = metrics.registry.histogram(
+    "translategemma_queue_wait_seconds",
+    "Time chunks waited for a generation slot, by priority class.",
+    ("priority",),
+)
+scheduler_queued = metrics.registry.gauge(
+    "translategemma_scheduler_queued",
+    "Chunks waiting for a generation slot, by priority class.",
+    ("priority",),
+)
+scheduler_active = metrics.registry.gauge(
+    "translategemma_scheduler_active",
+    "Chunks currently generating.",
+)
+model_loaded = metrics.registry.gauge(
+    "translategemma_model_loaded",
+    "Whether a model is resident (1) or unloaded (0).",
+)
+
+
+def cache_labels(model_size: str, quantization: int, target_lang: str) -> dict:
+    """Metric labels for a cache lookup made before the source language is known."""
+    return {
+        "model": model_size or DEFAULT_MODEL,
+        "quant": str(quantization or DEFAULT_QUANTIZATION),
+        "backend": DEFAULT_BACKEND,
+        "lang_pair": f"auto-{target_lang}",
+    }
+
+
 # ==================== GPU Manager ====================
 class GPUManager:
     """Manages GPU resources with auto-unload on idle."""
@@ -65,84 +169,222 @@ def __init__(self):
         self.current_model = None
         self.current_quant = None
         self.lock = threading.Lock()
+        # Signalled when the last request using the model releases it
+        self.released = threading.Condition(self.lock)
+        # Requests between acquire() and release(); the model is never
+        # unloaded or switched while any are in flight
+        self.users = 0
+        # Set by force_unload() while requests are in flight: the last one unloads
+        self.unload_requested = False
         self.last_used = 0
         self.unload_timer = None
+        self.unload_after = GPU_IDLE_TIMEOUT
         self.loading = False
-
-    def load(self, model_size: str = None, quantization: int = None):
-        """Load model, reusing if same config."""
+        self.load_error = None
+        # Preloaded models stay resident, so readiness does not flap
+        self.keep_resident = PRELOAD
+        self.idle_policy = None
+        if GPU_IDLE_POLICY == "adaptive":
+            self.idle_policy = AdaptiveIdlePolicy(GPU_IDLE_MIN, GPU_IDLE_MAX, initial=GPU_IDLE_TIMEOUT or None)
+        # Serializes chunk generation with per-client fair sharing; cancelled
+        # requests release their slot immediately
+        self.scheduler = GenerationScheduler(weights=SCHEDULER_WEIGHTS)
+
+    def _is_current(self, model_size: str, quantization: int) -> bool:
+        return self.translator is not None and self.current_model == model_size and self.current_quant == quantization
+
+    def acquire(self, model_size: str = None, quantization: int = None, preload: bool = False):
+        """
+        Load the model (reusing it if it is already loaded) and hold it for one request.
+        
+        Every acquire() must be paired with a release(). A different model is
+        only loaded once every request using the current one has released it.
+        Calls other than preloads count as requests for the idle policy.
+        """
         model_size = model_size or DEFAULT_MODEL
         quantization = quantization or DEFAULT_QUANTIZATION
+        if self.idle_policy and not preload:
+            self.idle_policy.record_arrival()
         
-        with self.lock:
-            # Return existing if same config
-            if (self.translator is not None and 
-                self.current_model == model_size and 
-                self.current_quant == quantization):
-                self.last_used = time.time()
-                self._schedule_unload()
-                return self.translator
-            
-            # Unload existing if different
-            if self.translator is not None:
-                self._do_unload()
-            
-            self.loading = True
-            try:
-                # Import here to avoid startup delay
-                from translategemma_cli.translator import Translator
-                from translategemma_cli.config import get_config
+        with tracing.span("load", model=model_size, quant=quantization, backend=DEFAULT_BACKEND) as span:
+            with self.lock:
+                # Requests still translating with another model finish first
+                while self.users and not self._is_current(model_size, quantization):
+                    self.released.wait()
                 
-                # Update config
-                config = get_config()
-                config.model_size = model_size
-                config.quantization_bits = quantization
-                config.backend_type = DEFAULT_BACKEND
+                if self.unload_timer:
+                    self.unload_timer.cancel()
+                    self.unload_timer = None
                 
-                # Create and load translator
-                self.translator = Translator()
-                self.translator.ensure_model_loaded(
-                    model_size=model_size,
-                    backend_type=DEFAULT_BACKEND
-                )
+                # Return existing if same config
+                if self._is_current(model_size, quantization):
+                    self.users += 1
+                    self.last_used = time.time()
+                    span.set_attribute("reused", True)
+                    return self.translator
                 
-                self.current_model = model_size
-                self.current_quant = quantization
-                self.last_used = time.time()
-                self._schedule_unload()
+                # Unload existing if different
+                if self.translator is not None:
+                    self._do_unload()
                 
-            finally:
-                self.loading = False
-            
-            return self.translator
+                self.loading = True
+                self.load_error = None
+                try:
+                    # Import here to avoid startup delay
+                    from translategemma_cli.translator import Translator
+                    from translategemma_cli.config import get_config
+                    
+                    # The model is passed to the translator rather than written
+                    # into the shared config, which requests snapshot concurrently;
+                    # the fake backend options come from the environment and never change
+                    if FAKE_BACKEND:
+                        get_config().fake_backend = FAKE_BACKEND
+                    
+                    # Create and load translator
+                    translator = Translator()
+                    translator.add_observer(metrics)
+                    start = time.perf_counter()
+                    translator.ensure_model_loaded(
+                        model_size=model_size,
+                        backend_type=DEFAULT_BACKEND,
+                        quantization_bits=quantization,
+                    )
+                    if self.idle_policy:
+                        self.idle_policy.record_load(time.perf_counter() - start)
+                    
+                    self.translator = translator
+                    self.current_model = model_size
+                    self.current_quant = quantization
+                    self.users += 1
+                    self.last_used = time.time()
+                    
+                finally:
+                    self.loading = False
+                
+                return self.translator
+
+    def release(self):
+        """
+        Finish a request started with acquire().
+        
+        When the last request releases the model it is unloaded right away
+        if the idle timeout is 0 (or force_unload() was called meanwhile),
+        else the idle timer starts.
+        """
+        with self.lock:
+            self.users -= 1
+            self.last_used = time.time()
+            if self.users:
+                return
+            self.released.notify_all()
+            if self.unload_requested:
+                self._do_unload()
+                return
+            self._schedule_unload()
+            if not self.keep_resident and self.unload_after <= 0:
+                self._do_unload()
+
+    async def acquire_async(self, model_size: str = None, quantization: int = None):
+        """
+        acquire() off the event loop, for requests that wait behind a load or a model switch.
+        
+        The awaiting task can be cancelled (client gone, input superseded)
+        while the executor thread is still loading; the thread cannot be
+        stopped, so whichever side finishes last gives the model back.
+        """
+        handoff = threading.Lock()
+        state = {"abandoned": False, "acquired": False}
+        
+        def work():
+            translator = self.acquire(model_size, quantization)
+            with handoff:
+                if not state["abandoned"]:
+                    state["acquired"] = True
+                    return translator
+            self.release()
+            return None
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, tracing.bind_context(work))
+        except asyncio.CancelledError:
+            with handoff:
+                state["abandoned"] = True
+                acquired = state["acquired"]
+            if acquired:
+                self.release()
+            raise
+    
+    @contextmanager
+    def use(self, model_size: str = None, quantization: int = None):
+        """acquire() the model for the duration of a with block."""
+        translator = self.acquire(model_size, quantization)
+        try:
+            yield translator
+        finally:
+            self.release()
+
+    def load(self, model_size: str = None, quantization: int = None, preload: bool = False):
+        """Load a model without holding it (preloads, model switches); the idle timer applies from now."""
+        translator = self.acquire(model_size, quantization, preload=preload)
+        with self.lock:
+            self.users -= 1
+            self.last_used = time.time()
+            if not self.users:
+                self.released.notify_all()
+                self._schedule_unload()
+        return translator
+
+    def preload(self):
+        """Load the default model in the background so the first request finds it warm."""
+        def run():
+            try:
+                self.load(preload=True)
+            except (Exception, SystemExit) as e:
+                # load_model exits when a backend is missing; keep serving and report it
+                self.load_error = str(e) or type(e).__name__
+                print(f"Preloading {DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION} failed: {self.load_error}")
+        
+        thread = threading.Thread(target=run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self) -> bool:
+        """Whether a model is loaded and warmed up, so requests skip the load."""
+        return self.translator is not None and not self.loading
+
+    def idle_timeout(self) -> float:
+        """Seconds the model stays loaded after its last use; 0 unloads right after each request."""
+        if self.idle_policy:
+            return self.idle_policy.timeout()
+        return GPU_IDLE_TIMEOUT
 
     def _schedule_unload(self):
-        """Schedule unload after idle timeout. If timeout is 0, unload immediately after use."""
+        """Schedule unload after idle timeout. If timeout is 0, release() unloads instead."""
         if self.unload_timer:
             self.unload_timer.cancel()
             self.unload_timer = None
         
-        if GPU_IDLE_TIMEOUT <= 0:
-            # Immediate unload mode - will be called after translation completes
+        if self.keep_resident:
+            return
+        
+        self.unload_after = self.idle_timeout()
+        if self.unload_after <= 0:
             return
         
-        self.unload_timer = threading.Timer(GPU_IDLE_TIMEOUT, self._auto_unload)
+        self.unload_timer = threading.Timer(self.unload_after, self._auto_unload)
         self.unload_timer.daemon = True
         self.unload_timer.start()
 
-    def unload_if_immediate(self):
-        """Unload immediately if GPU_IDLE_TIMEOUT is 0."""
-        if GPU_IDLE_TIMEOUT <= 0:
-            with self.lock:
-                self._do_unload()
-
     def _auto_unload(self):
         with self.lock:
-            if self.translator and time.time() - self.last_used >= GPU_IDLE_TIMEOUT:
+            if self.translator and not self.users and time.time() - self.last_used >= self.unload_after:
                 self._do_unload()
 
     def _do_unload(self):
+        self.unload_requested = False
         if self.translator:
+            self.translator.unload()
             del self.translator
             self.translator = None
             self.current_model = None
@@ -155,9 +397,19 @@ def _do_unload(self):
             except ImportError:
                 pass
 
-    def force_unload(self):
+    def force_unload(self) -> bool:
+        """
+        Unload the model now, or when the requests using it finish.
+        
+        Returns:
+            Whether the model was unloaded right away
+        """
         with self.lock:
+            if self.users:
+                self.unload_requested = True
+                return False
             self._do_unload()
+            return True
 
     def status(self):
         gpu_info = {"available": False}
@@ -183,13 +435,25 @@ def status(self):
         except:
             pass
         
+        available = available_memory_mb()
+        idle = self.idle_policy.stats() if self.idle_policy else {"policy": "fixed", "timeout_s": GPU_IDLE_TIMEOUT}
         return {
             "loaded": self.translator is not None,
             "loading": self.loading,
+            "ready": self.ready,
+            "preload": PRELOAD,
+            "load_error": self.load_error,
+            "idle": {**idle, "keep_resident": self.keep_resident},
             "current_model": f"{self.current_model}-Q{self.current_quant}" if self.current_model else None,
             "idle_seconds": int(time.time() - self.last_used) if self.last_used else 0,
             "gpu": gpu_info,
+            # Process memory works without torch (CPU-only hosts, GGUF)
+            "memory": {
+                **memory_snapshot().to_dict(),
+                "available_mb": round(available, 1) if available is not None else None,
+            },
             "default_model": f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}",
+            "scheduler": self.scheduler.stats(),
         }
 
 
@@ -321,21 +585,8 @@ def _get_overlap_text(text: str, overlap: int) -> str:
 
 
 # ==================== Translation Functions ====================
-def translate(
-    text: str,
-    target_lang: str,
-    source_lang: str = None,
-    model_size: str = None,
-    quantization: int = None,
-    chunk_size: int = MAX_CHUNK_LENGTH,
-    overlap: int = DEFAULT_OVERLAP,
-    repetition_penalty: float = REPETITION_PENALTY,
-    auto_split: bool = True,
-) -> dict:
-    """Translate text with chunking and optional sliding window support."""
-    start_time = time.time()
-    
-    # Parse model key if provided (e.g., "27B-Q8" -> "27b", 8)
+def parse_model_key(model_size: str = None, quantization: int = None) -> tuple:
+    """Parse a model key such as "27B-Q8" into ("27b", 8); plain sizes keep the given quantization."""
     actual_model = model_size
     actual_quant = quantization
     if model_size and "-Q" in model_size.upper():
@@ -344,61 +595,319 @@ def translate(
         actual_quant = int(parts[1]) if len(parts) > 1 else quantization
     elif model_size:
         actual_model = model_size.lower()
+    return actual_model, actual_quant
+
+
+# Generation settings a request may set for itself
+GENERATION_FIELDS = ("max_tokens", "temperature", "top_p", "top_k", "min_p", "repetition_penalty")
+
+
+def request_context(generation: dict = None) -> RequestContext:
+    """
+    Snapshot the settings of one request.
     
-    translator = gpu.load(actual_model, actual_quant)
-    
-    # Set target language
-    if target_lang:
-        translator.set_force_target(target_lang)
-    
-    # Split text with optional overlap
-    if auto_split:
-        chunk_data = split_text(text, chunk_size, overlap)
-    else:
-        chunk_data = [{"text": text, "overlap_chars": 0}]
+    generation holds the request's own generation settings (keys from
+    GENERATION_FIELDS); unset or None ones fall back to REPETITION_PENALTY
+    and the config. Nothing global is changed, so concurrent requests with
+    different settings do not affect each other.
     
-    results = []
+    Raises:
+        ValueError: If a setting is unknown or out of range
+    """
+    overrides = {"repetition_penalty": REPETITION_PENALTY}
+    overrides.update({key: value for key, value in (generation or {}).items() if value is not None})
+    unknown = set(overrides) - set(GENERATION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown generation settings: {', '.join(sorted(unknown))}")
+    return RequestContext.from_config(**overrides)
+
+
+def translate(
+    text: str,
+    target_lang: str,
+    source_lang: str = None,
+    model_size: str = None,
+    quantization: int = None,
+    chunk_size: int = MAX_CHUNK_LENGTH,
+    overlap: int = DEFAULT_OVERLAP,
+    auto_split: bool = True,
+    cancel_token: CancellationToken = None,
+    priority: str = "interactive",
+    flow: str = None,
+    generation: dict = None,
+) -> dict:
+    """
+    Translate text with chunking and optional sliding window support.
     
-    for chunk_info in chunk_data:
-        chunk_text = chunk_info["text"]
-        overlap_chars = chunk_info["overlap_chars"]
+    generation overrides generation settings for this request only (see request_context).
+    """
+    with tracing.span(
+        "request", endpoint="translate", target_lang=target_lang, model=model_size, priority=priority, chars=len(text)
+    ) as span:
+        start_time = time.time()
         
-        result, src, tgt = translator.translate(chunk_text, force_target=target_lang)
+        actual_model, actual_quant = parse_model_key(model_size, quantization)
+        context = request_context(generation)
         
-        # If overlap was used, we need to handle potential duplicate content
-        # The overlap is in source text for context, but translation may have duplicates
-        results.append({
-            "text": result,
-            "overlap_chars": overlap_chars,
-            "source_overlap": overlap_chars > 0,
-        })
+        # Released (and unloaded in immediate mode) once the last chunk is merged
+        with gpu.use(actual_model, actual_quant) as translator:
+            # Set target language
+            if target_lang:
+                translator.set_force_target(target_lang)
+            
+            # Split text with optional overlap
+            with translator.stage("chunking", target_lang=target_lang):
+                if auto_split:
+                    chunk_data = split_text(text, chunk_size, overlap)
+                else:
+                    chunk_data = [{"text": text, "overlap_chars": 0}]
+            span.set_attribute("chunks", len(chunk_data))
+            
+            results = []
+            chunk_stats = []
+            
+            for i, chunk_info in enumerate(chunk_data):
+                chunk_text = chunk_info["text"]
+                overlap_chars = chunk_info["overlap_chars"]
+                
+                with tracing.span("chunk", index=i, chars=len(chunk_text)):
+                    result, src, tgt, stats = translate_chunk(
+                        translator, chunk_text, target_lang, cancel_token, priority, flow, context
+                    )
+                
+                # If overlap was used, we need to handle potential duplicate content
+                # The overlap is in source text for context, but translation may have duplicates
+                results.append({
+                    "text": result,
+                    "overlap_chars": overlap_chars,
+                    "source_overlap": overlap_chars > 0,
+                })
+                chunk_stats.append(stats)
+                
+                if not source_lang:
+                    source_lang = src
+            
+            # Merge results
+            with translator.stage("merge", source_lang, target_lang):
+                final_result = _merge_translations(results, text, overlap > 0)
         
-        if not source_lang:
-            source_lang = src
-    
-    # Unload immediately if configured
-    gpu.unload_if_immediate()
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        
+        # Store model info before potential unload
+        model_info = f"{actual_model}-Q{actual_quant}" if actual_model else f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}"
+        generation = GenerationStats.combine(chunk_stats)
+        
+        return {
+            "result": final_result,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "elapsed_ms": elapsed_ms,
+            "chunks": len(chunk_data),
+            "input_length": len(text),
+            "output_length": len(final_result),
+            "model": model_info,
+            "overlap_used": overlap,
+            "chars_per_sec": round(len(text) / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
+            "generation": generation.to_dict() if generation else None,
+        }
+
+
+def translate_batch(
+    texts: List[str],
+    target_lang: str,
+    source_lang: str = None,
+    model_size: str = None,
+    quantization: int = None,
+    chunk_size: int = MAX_CHUNK_LENGTH,
+    batch_size: int = BATCH_SIZE,
+    cancel_token: CancellationToken = None,
+    priority: str = "batch",
+    flow: str = None,
+    generation: dict = None,
+) -> dict:
+    """
+    Translate many texts with a single model load.
     
-    elapsed_ms = int((time.time() - start_time) * 1000)
+    All texts are chunked up front and identical chunks are translated once.
+    The unique chunks go to the backend batch_size at a time, and the model is
+    unloaded (in immediate mode) once at the end instead of after every text.
+    Items whose chunks were all translated earlier in the batch report cache_hit.
+    All texts share the request's generation settings, so every batch does.
+    """
+    with tracing.span(
+        "request", endpoint="translate/batch", target_lang=target_lang, model=model_size, priority=priority, texts=len(texts)
+    ) as span:
+        start_time = time.time()
+        
+        actual_model, actual_quant = parse_model_key(model_size, quantization)
+        model_info = f"{actual_model}-Q{actual_quant}" if actual_model else f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}"
+        context = request_context(generation)
+        
+        item_chunks = [[c["text"] for c in split_text(text, chunk_size)] for text in texts]
+        unique = list(dict.fromkeys(chunk for chunks in item_chunks for chunk in chunks))
+        span.set_attribute("chunks", len(unique))
+        
+        translations = {}  # chunk -> (result, source_lang)
+        errors = {}  # chunk -> error message
+        finished_at = {}  # chunk -> ms since start when its batch completed
+        batch_stats = []
+        
+        translator = gpu.acquire(actual_model, actual_quant)
+        try:
+            for start in range(0, len(unique), batch_size):
+                group = unique[start:start + batch_size]
+                try:
+                    with tracing.span("chunk", index=start // batch_size, chunks=len(group)):
+                        with generation_slot(translator, cancel_token, priority, flow):
+                            outputs = translator.translate_batch(
+                                group,
+                                force_target=target_lang,
+                                batch_size=batch_size,
+                                cancel_token=cancel_token,
+                                context=context,
+                            )
+                            batch_stats.append(translator.last_stats)
+                    for chunk, (result, src, _) in zip(group, outputs):
+                        translations[chunk] = (result, src)
+                except TranslationCancelled:
+                    raise
+                except Exception as e:
+                    for chunk in group:
+                        errors[chunk] = str(e)
+                done_ms = int((time.time() - start_time) * 1000)
+                for chunk in group:
+                    finished_at[chunk] = done_ms
+        finally:
+            gpu.release()
+        
+        labels = cache_labels(actual_model, actual_quant, target_lang)
+        results = []
+        seen = set()
+        for text, chunks in zip(texts, item_chunks):
+            reused = sum(1 for chunk in chunks if chunk in seen)
+            for chunk in chunks:
+                metrics.on_cache(chunk in seen, labels)
+                seen.add(chunk)
+            failed = [errors[chunk] for chunk in chunks if chunk in errors]
+            if failed:
+                results.append({"status": "error", "error": failed[0]})
+                continue
+            parts = [{"text": translations[chunk][0]} for chunk in chunks]
+            results.append({
+                "status": "success",
+                "result": _merge_translations(parts, text, False),
+                "source_lang": source_lang or (translations[chunks[0]][1] if chunks else None),
+                "elapsed_ms": max((finished_at[chunk] for chunk in chunks), default=0),
+                "chunks": len(chunks),
+                "cache_hit": bool(chunks) and reused == len(chunks),
+            })
+        
+        generation = GenerationStats.combine(batch_stats)
+        return {
+            "results": results,
+            "total_elapsed_ms": int((time.time() - start_time) * 1000),
+            "count": len(results),
+            "chunks": sum(len(chunks) for chunks in item_chunks),
+            "unique_chunks": len(unique),
+            "model": model_info,
+            "generation": generation.to_dict() if generation else None,
+        }
+
+
+def translate_chunk(
+    translator,
+    text: str,
+    target_lang: str,
+    cancel_token: CancellationToken = None,
+    priority: str = "interactive",
+    flow: str = None,
+    context: RequestContext = None,
+):
+    """
+    Translate one chunk once the scheduler grants a fair-share generation slot.
     
-    # Merge results
-    final_result = _merge_translations(results, text, overlap > 0)
+    context is the request's settings snapshot, shared by all its chunks.
+    Returns (result, source_lang, target_lang, GenerationStats).
+    """
+    with generation_slot(translator, cancel_token, priority, flow):
+        result, src, tgt = translator.translate(
+            text, force_target=target_lang, cancel_token=cancel_token, context=context
+        )
+        return result, src, tgt, translator.last_stats
+
+
+@contextmanager
+def generation_slot(translator, cancel_token: CancellationToken, priority: str, flow: str):
+    """Hold a scheduler slot, recording how long it took to get one."""
+    wait_start = time.perf_counter()
+    wait_span = tracing.start_span("queue_wait", priority=priority)
+    try:
+        with gpu.scheduler.slot(cancel_token, priority, flow):
+            wait_span.end()
+            waited = time.perf_counter() - wait_start
+            queue_wait_seconds.observe(waited, priority=priority)
+            translator.record_stage("queue_wait", waited)
+            yield
+    finally:
+        # Cancelled while still queued
+        wait_span.end()
+
+
+def client_flow(connection: HTTPConnection) -> str:
+    """
+    Fairness key for a caller: its API key if it sent one, else its address.
     
-    # Store model info before potential unload
-    model_info = f"{actual_model}-Q{actual_quant}" if actual_model else f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}"
+    API keys are hashed so they never end up in logs or the job database.
+    """
+    api_key = connection.headers.get("x-api-key")
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return "ip:" + (connection.client.host if connection.client else "unknown")
+
+
+def check_priority(priority: str):
+    """Reject unknown priority classes with a 400."""
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of: {', '.join(PRIORITIES)}")
+
+
+async def run_cancellable(request: Optional[Request], func, cancel_token: CancellationToken):
+    """
+    Run blocking translation work off the event loop, cancelling it on disconnect.
     
-    return {
-        "result": final_result,
-        "source_lang": source_lang,
-        "target_lang": target_lang,
-        "elapsed_ms": elapsed_ms,
-        "chunks": len(chunk_data),
-        "input_length": len(text),
-        "output_length": len(final_result),
-        "model": model_info,
-        "overlap_used": overlap,
-        "chars_per_sec": round(len(text) / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
-    }
+    The client is polled every DISCONNECT_POLL_INTERVAL seconds; once it is gone
+    the token is cancelled so the backend stops generating for nobody. The
+    current tracing span is carried into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, tracing.bind_context(func))
+    try:
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return future.result()
+            if request is not None and await request.is_disconnected():
+                cancel_token.cancel("Client disconnected")
+                return await future
+    except asyncio.CancelledError:
+        cancel_token.cancel("Request cancelled")
+        # Nobody awaits the worker any more; retrieve its outcome so it is not logged
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        raise
+
+
+def profiled(name: str, func):
+    """
+    Wrap a request function returning a dict so it runs under the request
+    profiler (PROFILE=1); the profile summary is added to its result.
+    """
+    def run():
+        with request_profiler.profile(name) as profiler:
+            result = func()
+        if profiler is not None:
+            result["profile"] = profiler.summary.to_dict()
+        return result
+    return run
 
 
 def _merge_translations(results: List[dict], original_text: str, has_overlap: bool) -> str:
@@ -436,63 +945,204 @@ async def translate_stream(
     quantization: int = None,
     chunk_size: int = MAX_CHUNK_LENGTH,
     overlap: int = DEFAULT_OVERLAP,
+    request: Optional[Request] = None,
+    priority: str = "interactive",
+    generation: dict = None,
 ) -> AsyncGenerator[str, None]:
-    """Stream translation results chunk by chunk."""
-    start_time = time.time()
-    chunk_data = split_text(text, chunk_size, overlap)
-    total_chunks = len(chunk_data)
-    
-    yield f"data: {json.dumps({'event': 'start', 'total_chunks': total_chunks, 'input_length': len(text), 'overlap': overlap})}\n\n"
-    
-    # Parse model key if provided (e.g., "27B-Q8" -> "27b", 8)
-    actual_model = model_size
-    actual_quant = quantization
-    if model_size and "-Q" in model_size.upper():
-        parts = model_size.upper().split("-Q")
-        actual_model = parts[0].lower()
-        actual_quant = int(parts[1]) if len(parts) > 1 else quantization
-    elif model_size:
-        actual_model = model_size.lower()
-    
-    translator = gpu.load(actual_model, actual_quant)
-    if target_lang:
-        translator.set_force_target(target_lang)
+    """
+    Stream translation results chunk by chunk.
     
-    results = []
+    generation overrides generation settings for this request only (see request_context).
     
-    for i, chunk_info in enumerate(chunk_data):
-        chunk_text = chunk_info["text"]
-        chunk_start = time.time()
+    If the client disconnects (checked between chunks, or signalled by Starlette
+    cancelling the response task), the in-flight chunk is aborted and the
+    remaining chunks are never sent to the model.
+    """
+    cancel_token = CancellationToken()
+    try:
+        async for event in _translate_stream_events(
+            text, target_lang, model_size, quantization, chunk_size, overlap, request, cancel_token, priority, generation
+        ):
+            yield event
+    except TranslationCancelled:
+        # Client is gone - nothing left to send
+        pass
+    except (asyncio.CancelledError, GeneratorExit):
+        cancel_token.cancel("Client disconnected")
+        raise
+
+
+async def _translate_stream_events(
+    text: str,
+    target_lang: str,
+    model_size: str,
+    quantization: int,
+    chunk_size: int,
+    overlap: int,
+    request: Optional[Request],
+    cancel_token: CancellationToken,
+    priority: str,
+    generation: dict = None,
+) -> AsyncGenerator[str, None]:
+    """Produce the SSE events for translate_stream."""
+    # The request span stays open across yields, so it is only made current
+    # around the blocking work between them
+    request_span = tracing.start_span(
+        "request", endpoint="translate/stream", target_lang=target_lang, model=model_size, priority=priority, chars=len(text)
+    )
+    try:
+        start_time = time.time()
+        flow = client_flow(request) if request is not None else None
+        context = request_context(generation)
+        chunking_start = time.perf_counter()
+        with tracing.use_span(request_span), tracing.span("chunking"):
+            chunk_data = split_text(text, chunk_size, overlap)
+        chunking_seconds = time.perf_counter() - chunking_start
+        total_chunks = len(chunk_data)
+        request_span.set_attribute("chunks", total_chunks)
         
-        yield f"data: {json.dumps({'event': 'progress', 'chunk': i + 1, 'total': total_chunks})}\n\n"
+        yield f"data: {json.dumps({'event': 'start', 'total_chunks': total_chunks, 'input_length': len(text), 'overlap': overlap})}\n\n"
         
-        loop = asyncio.get_event_loop()
-        result, src, tgt = await loop.run_in_executor(
-            None, lambda c=chunk_text: translator.translate(c, force_target=target_lang)
-        )
-        results.append({"text": result, "overlap_chars": chunk_info["overlap_chars"]})
+        actual_model, actual_quant = parse_model_key(model_size, quantization)
         
-        chunk_elapsed = int((time.time() - chunk_start) * 1000)
-        yield f"data: {json.dumps({'event': 'chunk', 'chunk': i + 1, 'total': total_chunks, 'result': result, 'elapsed_ms': chunk_elapsed})}\n\n"
-    
-    # Store model info before potential unload
-    model_info = f"{actual_model}-Q{actual_quant}" if actual_model else f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}"
-    
-    # Unload immediately if configured
-    gpu.unload_if_immediate()
-    
-    total_elapsed = int((time.time() - start_time) * 1000)
-    
-    # Merge results
-    final_result = _merge_translations(results, text, overlap > 0)
-    
-    yield f"data: {json.dumps({'event': 'done', 'result': final_result, 'elapsed_ms': total_elapsed, 'output_length': len(final_result), 'model': model_info, 'overlap_used': overlap})}\n\n"
+        # Off the event loop: a model switch waits for the other requests, streams included
+        with tracing.use_span(request_span):
+            translator = await gpu.acquire_async(actual_model, actual_quant)
+        try:
+            if target_lang:
+                translator.set_force_target(target_lang)
+            translator.record_stage("chunking", chunking_seconds, target_lang=target_lang)
+            
+            results = []
+            chunk_stats = []
+            
+            for i, chunk_info in enumerate(chunk_data):
+                chunk_text = chunk_info["text"]
+                chunk_start = time.time()
+                
+                if request is not None and await request.is_disconnected():
+                    cancel_token.cancel("Client disconnected")
+                cancel_token.raise_if_cancelled()
+                
+                yield f"data: {json.dumps({'event': 'progress', 'chunk': i + 1, 'total': total_chunks})}\n\n"
+                
+                with tracing.use_span(request_span), tracing.span("chunk", index=i, chars=len(chunk_text)):
+                    result, src, tgt, stats = await run_cancellable(
+                        request,
+                        lambda c=chunk_text: translate_chunk(translator, c, target_lang, cancel_token, priority, flow, context),
+                        cancel_token,
+                    )
+                results.append({"text": result, "overlap_chars": chunk_info["overlap_chars"]})
+                chunk_stats.append(stats)
+                
+                chunk_elapsed = int((time.time() - chunk_start) * 1000)
+                generation = stats.to_dict() if stats else None
+                yield f"data: {json.dumps({'event': 'chunk', 'chunk': i + 1, 'total': total_chunks, 'result': result, 'elapsed_ms': chunk_elapsed, 'generation': generation})}\n\n"
+            
+            # Store model info before potential unload
+            model_info = f"{actual_model}-Q{actual_quant}" if actual_model else f"{DEFAULT_MODEL}-Q{DEFAULT_QUANTIZATION}"
+            
+            # Merge results
+            with tracing.use_span(request_span), translator.stage("merge", target_lang=target_lang):
+                final_result = _merge_translations(results, text, overlap > 0)
+        finally:
+            # Unloads in immediate mode, also when the client goes away
+            gpu.release()
+        
+        total_elapsed = int((time.time() - start_time) * 1000)
+        combined = GenerationStats.combine(chunk_stats)
+        generation = combined.to_dict() if combined else None
+        
+        yield f"data: {json.dumps({'event': 'done', 'result': final_result, 'elapsed_ms': total_elapsed, 'output_length': len(final_result), 'model': model_info, 'overlap_used': overlap, 'generation': generation})}\n\n"
+    except Exception as e:
+        request_span.record_exception(e)
+        raise
+    finally:
+        request_span.end()
+
+
+# ==================== Background Jobs ====================
+def run_job(job: dict, pending: List[tuple], cancel_token: CancellationToken):
+    """Translate the pending chunks of a queued job at the job's priority."""
+    params = job["params"]
+    actual_model, actual_quant = parse_model_key(params.get("model"), params.get("quantization"))
+    context = request_context(params.get("generation"))
+    request_span = tracing.start_span(
+        "request", endpoint="jobs", job_id=job["id"], target_lang=params["target_lang"],
+        model=actual_model, priority=job["priority"], chunks=len(pending),
+    )
+    try:
+        try:
+            with tracing.use_span(request_span):
+                translator = gpu.acquire(actual_model, actual_quant)
+        except SystemExit as e:
+            # load_model exits when a backend is missing: that fails this job, not the worker
+            raise RuntimeError(f"Loading {actual_model}-Q{actual_quant} failed (exit code {e.code})") from e
+        try:
+            for index, chunk_text in pending:
+                if cancel_token.is_cancelled:
+                    break
+                with tracing.use_span(request_span), tracing.span("chunk", index=index, chars=len(chunk_text)):
+                    result, _, _, _ = translate_chunk(
+                        translator, chunk_text, params["target_lang"], cancel_token, job["priority"], params.get("flow"), context
+                    )
+                yield index, result
+        finally:
+            gpu.release()
+    except Exception as e:
+        request_span.record_exception(e)
+        raise
+    finally:
+        request_span.end()
+
+
+def merge_job(job: dict, results: List[str]) -> str:
+    """Merge the translated chunks of a finished job."""
+    return _merge_translations([{"text": r} for r in results], job["params"].get("text", ""), False)
+
+
+jobs = JobRunner(
+    JobStore(JOBS_DB),
+    run_job,
+    merge_job,
+    workers=JOB_WORKERS,
+)
+
+
+def submit_job(text: str, target_lang: str, priority: str = "batch", chunk_size: int = MAX_CHUNK_LENGTH, **params) -> dict:
+    """Chunk text and queue it as a background job."""
+    chunks = [c["text"] for c in split_text(text, chunk_size)]
+    params = {"text": text, "target_lang": target_lang, "chunk_size": chunk_size, **params}
+    job_id = jobs.submit(params, chunks, priority)
+    return job_status(jobs.store.get(job_id))
+
+
+def job_status(job: dict) -> dict:
+    """Public view of a job (the source text is not echoed back)."""
+    params = {k: v for k, v in job["params"].items() if k not in ("text", "flow")}
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "priority": job["priority"],
+        "params": params,
+        "total_chunks": job["total_chunks"],
+        "done_chunks": job["done_chunks"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
 
 
 # ==================== FastAPI App ====================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    jobs.start()
+    if PRELOAD:
+        gpu.preload()
     yield
+    jobs.stop(timeout=5)
     if gpu.unload_timer:
         gpu.unload_timer.cancel()
 
@@ -515,7 +1165,20 @@ async def lifespan(app: FastAPI):
 
 
 # ==================== Pydantic Models ====================
-class TranslateRequest(BaseModel):
+class GenerationOptions(BaseModel):
+    max_tokens: Optional[int] = Field(None, gt=0, description="Maximum tokens to generate per chunk (default: config)")
+    temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Sampling temperature, 0 = deterministic (default: config)")
+    top_p: Optional[float] = Field(None, ge=0.0, le=1.0, description="Nucleus sampling threshold, 1 = disabled (default: config)")
+    top_k: Optional[int] = Field(None, ge=0, description="Top-k sampling, 0 = disabled (default: config)")
+    min_p: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum probability threshold, 0 = disabled (default: config)")
+    repetition_penalty: Optional[float] = Field(None, ge=0.0, description="Repetition penalty, 1 = disabled (default: REPETITION_PENALTY)")
+    
+    def generation(self) -> dict:
+        """The generation settings this request sets."""
+        return self.model_dump(include=set(GENERATION_FIELDS), exclude_none=True)
+
+
+class TranslateRequest(GenerationOptions):
     text: str = Field(..., description="Text to translate")
     target_lang: str = Field(..., description="Target language code (e.g., en, zh, ja)")
     source_lang: Optional[str] = Field(None, description="Source language (auto-detect if not provided)")
@@ -525,6 +1188,7 @@ class TranslateRequest(BaseModel):
     overlap: int = Field(DEFAULT_OVERLAP, description="Overlap size for sliding window (0=disabled)")
     auto_split: bool = Field(True, description="Auto-split long text")
     stream: bool = Field(False, description="Stream results")
+    priority: str = Field("interactive", description="Priority class: interactive, batch, background")
 
 
 class TranslateResponse(BaseModel):
@@ -538,15 +1202,28 @@ class TranslateResponse(BaseModel):
     output_length: Optional[int] = None
     model: Optional[str] = None
     chars_per_sec: Optional[float] = None
+    generation: Optional[dict] = None
+    profile: Optional[dict] = None
     error: Optional[str] = None
 
 
-class BatchRequest(BaseModel):
+class BatchRequest(GenerationOptions):
     texts: List[str]
     target_lang: str
     source_lang: Optional[str] = None
     model: Optional[str] = None
     quantization: Optional[int] = None
+    priority: str = Field("batch", description="Priority class: interactive, batch, background")
+
+
+class JobRequest(GenerationOptions):
+    text: str = Field(..., description="Text to translate")
+    target_lang: str = Field(..., description="Target language code (e.g., en, zh, ja)")
+    source_lang: Optional[str] = Field(None, description="Source language (auto-detect if not provided)")
+    model: Optional[str] = Field(None, description="Model size: 4b, 12b, 27b")
+    quantization: Optional[int] = Field(None, description="Quantization: 4 or 8")
+    chunk_size: int = Field(MAX_CHUNK_LENGTH, description="Max chars per chunk")
+    priority: str = Field("batch", description="Priority class: interactive, batch, background")
 
 
 class SwitchModelRequest(BaseModel):
@@ -559,6 +1236,32 @@ async def health():
     return {"status": "ok", "gpu": gpu.status()}
 
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """
+    Readiness: whether requests are served without a model load.
+    
+    With PRELOAD=1 the replica is ready (200) only once the model is warm,
+    and 503 while it loads, switches models or after a failed preload.
+    Without PRELOAD models load on demand, so the replica is always ready
+    and "warm" tells whether the next request pays the load.
+    """
+    body = {
+        "status": "ready" if gpu.ready or not PRELOAD else "warming",
+        "warm": gpu.ready,
+        "loading": gpu.loading,
+        "model": f"{gpu.current_model}-Q{gpu.current_quant}" if gpu.current_model else None,
+        "load_error": gpu.load_error,
+    }
+    return JSONResponse(body, status_code=200 if body["status"] == "ready" else 503)
+
+
 @app.get("/api/config")
 async def api_config():
     return {
@@ -566,6 +1269,8 @@ async def api_config():
         "default_quantization": DEFAULT_QUANTIZATION,
         "default_backend": DEFAULT_BACKEND,
         "gpu_idle_timeout": GPU_IDLE_TIMEOUT,
+        "gpu_idle_policy": GPU_IDLE_POLICY,
+        "preload": PRELOAD,
         "max_chunk_length": MAX_CHUNK_LENGTH,
         "default_overlap": DEFAULT_OVERLAP,
         "repetition_penalty": REPETITION_PENALTY,
@@ -581,7 +1286,7 @@ async def api_languages():
 @app.get("/api/models")
 async def api_models():
     return {
-        "models": AVAILABLE_MODELS,
+        "models": model_listing(),
         "current": f"{gpu.current_model.upper()}-Q{gpu.current_quant}" if gpu.current_model else None,
         "default": f"{DEFAULT_MODEL.upper()}-Q{DEFAULT_QUANTIZATION}",
     }
@@ -605,7 +1310,8 @@ async def api_switch_model(req: SwitchModelRequest):
     
     try:
         start = time.time()
-        gpu.load(model_size, quant)
+        # Waits for in-flight requests on the current model, so off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, gpu.load, model_size, quant)
         elapsed = int((time.time() - start) * 1000)
         return {
             "status": "success",
@@ -617,8 +1323,9 @@ async def api_switch_model(req: SwitchModelRequest):
 
 
 @app.post("/api/translate", response_model=TranslateResponse)
-async def api_translate(req: TranslateRequest):
+async def api_translate(req: TranslateRequest, request: Request):
     """Translate text."""
+    check_priority(req.priority)
     try:
         if req.stream:
             return StreamingResponse(
@@ -630,29 +1337,44 @@ async def api_translate(req: TranslateRequest):
                     quantization=req.quantization,
                     chunk_size=req.chunk_size,
                     overlap=req.overlap,
+                    request=request,
+                    priority=req.priority,
+                    generation=req.generation(),
                 ),
                 media_type="text/event-stream",
                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
             )
         
-        result = translate(
-            text=req.text,
-            target_lang=req.target_lang,
-            source_lang=req.source_lang,
-            model_size=req.model,
-            quantization=req.quantization,
-            chunk_size=req.chunk_size,
-            overlap=req.overlap,
-            auto_split=req.auto_split,
+        cancel_token = CancellationToken()
+        result = await run_cancellable(
+            request,
+            profiled("translate", lambda: translate(
+                text=req.text,
+                target_lang=req.target_lang,
+                source_lang=req.source_lang,
+                model_size=req.model,
+                quantization=req.quantization,
+                chunk_size=req.chunk_size,
+                overlap=req.overlap,
+                auto_split=req.auto_split,
+                cancel_token=cancel_token,
+                priority=req.priority,
+                flow=client_flow(request),
+                generation=req.generation(),
+            )),
+            cancel_token,
         )
         return TranslateResponse(status="success", **result)
+    except TranslationCancelled as e:
+        return TranslateResponse(status="cancelled", error=str(e))
     except Exception as e:
         return TranslateResponse(status="error", error=str(e))
 
 
 @app.post("/api/translate/stream")
-async def api_translate_stream(req: TranslateRequest):
+async def api_translate_stream(req: TranslateRequest, request: Request):
     """Stream translation endpoint."""
+    check_priority(req.priority)
     return StreamingResponse(
         translate_stream(
             text=req.text,
@@ -662,6 +1384,9 @@ async def api_translate_stream(req: TranslateRequest):
             quantization=req.quantization,
             chunk_size=req.chunk_size,
             overlap=req.overlap,
+            request=request,
+            priority=req.priority,
+            generation=req.generation(),
         ),
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
@@ -669,59 +1394,168 @@ async def api_translate_stream(req: TranslateRequest):
 
 
 @app.post("/api/translate/batch")
-async def api_translate_batch(req: BatchRequest):
-    """Batch translate multiple texts."""
-    start_time = time.time()
-    results = []
+async def api_translate_batch(req: BatchRequest, request: Request):
+    """Batch translate multiple texts with one model load and batched generation."""
+    check_priority(req.priority)
+    cancel_token = CancellationToken()
     
-    for text in req.texts:
-        try:
-            r = translate(
-                text=text,
+    try:
+        data = await run_cancellable(
+            request,
+            profiled("translate-batch", lambda: translate_batch(
+                texts=req.texts,
                 target_lang=req.target_lang,
                 source_lang=req.source_lang,
                 model_size=req.model,
                 quantization=req.quantization,
-            )
-            results.append({"status": "success", "result": r["result"], "elapsed_ms": r["elapsed_ms"]})
-        except Exception as e:
-            results.append({"status": "error", "error": str(e)})
+                cancel_token=cancel_token,
+                priority=req.priority,
+                flow=client_flow(request),
+                generation=req.generation(),
+            )),
+            cancel_token,
+        )
+    except TranslationCancelled as e:
+        return {"status": "cancelled", "error": str(e)}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
     
-    return {
-        "status": "success",
-        "results": results,
-        "total_elapsed_ms": int((time.time() - start_time) * 1000),
-        "count": len(results),
-    }
+    return {"status": "success", **data}
 
 
 @app.post("/api/translate/file")
 async def api_translate_file(
+    request: Request,
     file: UploadFile = File(...),
     target_lang: str = Form(...),
     source_lang: Optional[str] = Form(None),
     model: Optional[str] = Form(None),
     stream: bool = Form(False),
+    priority: str = Form("batch"),
 ):
     """Translate uploaded text file."""
+    check_priority(priority)
     try:
         content = await file.read()
         text = content.decode("utf-8")
         
         if stream:
             return StreamingResponse(
-                translate_stream(text=text, target_lang=target_lang, source_lang=source_lang, model_size=model),
+                translate_stream(
+                    text=text, target_lang=target_lang, source_lang=source_lang, model_size=model,
+                    request=request, priority=priority,
+                ),
                 media_type="text/event-stream",
             )
         
-        result = translate(text=text, target_lang=target_lang, source_lang=source_lang, model_size=model)
+        cancel_token = CancellationToken()
+        result = await run_cancellable(
+            request,
+            profiled("translate-file", lambda: translate(
+                text=text, target_lang=target_lang, source_lang=source_lang, model_size=model,
+                cancel_token=cancel_token, priority=priority, flow=client_flow(request),
+            )),
+            cancel_token,
+        )
         return TranslateResponse(status="success", **result)
+    except TranslationCancelled as e:
+        return TranslateResponse(status="cancelled", error=str(e))
     except UnicodeDecodeError:
         return TranslateResponse(status="error", error="File encoding error. Please use UTF-8.")
     except Exception as e:
         return TranslateResponse(status="error", error=str(e))
 
 
+@app.post("/api/jobs")
+async def api_create_job(req: JobRequest, request: Request):
+    """Queue a translation job and return its id immediately."""
+    check_priority(req.priority)
+    return submit_job(
+        text=req.text,
+        target_lang=req.target_lang,
+        priority=req.priority,
+        chunk_size=req.chunk_size,
+        source_lang=req.source_lang,
+        model=req.model,
+        quantization=req.quantization,
+        flow=client_flow(request),
+        generation=req.generation(),
+    )
+
+
+@app.post("/api/jobs/file")
+async def api_create_file_job(
+    request: Request,
+    file: UploadFile = File(...),
+    target_lang: str = Form(...),
+    source_lang: Optional[str] = Form(None),
+    model: Optional[str] = Form(None),
+    priority: str = Form("batch"),
+):
+    """Queue an uploaded text file as a translation job."""
+    check_priority(priority)
+    try:
+        text = (await file.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File encoding error. Please use UTF-8.")
+    return submit_job(
+        text=text,
+        target_lang=target_lang,
+        priority=priority,
+        source_lang=source_lang,
+        model=model,
+        filename=file.filename,
+        flow=client_flow(request),
+    )
+
+
+@app.get("/api/jobs")
+async def api_list_jobs(status: Optional[str] = None, limit: int = 50):
+    """List recent jobs, newest first."""
+    return {"jobs": [job_status(job) for job in jobs.store.list_jobs(status, limit)]}
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_get_job(job_id: str):
+    """Get job progress, and the result once it has completed."""
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@app.delete("/api/jobs/{job_id}")
+async def api_cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job['status']}")
+    return job_status(jobs.store.get(job_id))
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics: per-stage latency, tokens, chunks, cache and model lifecycle."""
+    stats = gpu.scheduler.stats()
+    for name, queued in stats["queued_by_priority"].items():
+        scheduler_queued.set(queued, priority=name)
+    scheduler_active.set(stats["active"])
+    model_loaded.set(1 if gpu.translator is not None else 0)
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/traces")
+async def api_traces(limit: int = 200):
+    """Most recent finished spans kept in process (TRACE_EXPORTER=json)."""
+    exporter = tracing.get_exporter()
+    if not isinstance(exporter, tracing.JSONExporter):
+        raise HTTPException(status_code=404, detail="In-process traces require TRACE_EXPORTER=json")
+    spans = exporter.spans[-limit:] if limit > 0 else []
+    return {"count": len(spans), "spans": [span.to_dict() for span in spans]}
+
+
 @app.get("/api/gpu/status")
 async def api_gpu_status():
     return gpu.status()
@@ -729,8 +1563,187 @@ async def api_gpu_status():
 
 @app.post("/api/gpu/offload")
 async def api_gpu_offload():
-    gpu.force_unload()
-    return {"status": "ok", "message": "GPU memory released"}
+    if gpu.force_unload():
+        return {"status": "ok", "message": "GPU memory released"}
+    return {"status": "ok", "message": "GPU memory will be released when the running requests finish"}
+
+
+# ==================== Live Translation (WebSocket) ====================
+class LiveSession:
+    """
+    Per-connection state for /ws/translate.
+    
+    Keeps the translation of every source segment seen on this connection, so
+    an edit only re-translates the segments whose text changed. A newer input
+    supersedes the one in flight: its token is cancelled and the model moves on.
+    """
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.segments: OrderedDict = OrderedDict()  # (model, target_lang, segment) -> translation
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_token: Optional[CancellationToken] = None
+        self.request_id = None
+        self.flow = client_flow(websocket)
+    
+    async def send(self, event: dict):
+        await self.websocket.send_text(json.dumps(event, ensure_ascii=False))
+    
+    async def submit(self, msg: dict):
+        """Start translating a new input, superseding the current one."""
+        await self.supersede("Superseded by newer input")
+        self.request_id = msg.get("id")
+        self.cancel_token = CancellationToken()
+        self.task = asyncio.create_task(self._run(msg, self.request_id, self.cancel_token))
+    
+    async def supersede(self, reason: str):
+        """Cancel the in-flight input, if any."""
+        if self.task is None or self.task.done():
+            return
+        self.cancel_token.cancel(reason)
+        self.task.cancel()
+        try:
+            await self.task
+        except (asyncio.CancelledError, TranslationCancelled):
+            pass
+        await self.send({"event": "cancelled", "id": self.request_id, "reason": reason})
+    
+    async def close(self):
+        """Stop any in-flight work when the socket goes away."""
+        if self.task is not None and not self.task.done():
+            self.cancel_token.cancel("Client disconnected")
+            self.task.cancel()
+    
+    def _lookup(self, key):
+        result = self.segments.get(key)
+        if result is not None:
+            self.segments.move_to_end(key)
+        return result
+    
+    def _store(self, key, result: str):
+        self.segments[key] = result
+        self.segments.move_to_end(key)
+        while len(self.segments) > WS_SEGMENT_CACHE_SIZE:
+            self.segments.popitem(last=False)
+    
+    async def _run(self, msg: dict, request_id, cancel_token: CancellationToken):
+        try:
+            with tracing.span(
+                "request", endpoint="ws/translate", target_lang=msg.get("target_lang"),
+                model=msg.get("model"), chars=len(msg.get("text") or ""),
+            ):
+                await self._translate(msg, request_id, cancel_token)
+        except TranslationCancelled:
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self.send({"event": "error", "id": request_id, "error": str(e)})
+    
+    async def _translate(self, msg: dict, request_id, cancel_token: CancellationToken):
+        start_time = time.time()
+        text = msg.get("text") or ""
+        target_lang = msg["target_lang"]
+        chunk_size = int(msg.get("chunk_size") or MAX_CHUNK_LENGTH)
+        actual_model, actual_quant = parse_model_key(msg.get("model"), msg.get("quantization"))
+        model_info = f"{actual_model or DEFAULT_MODEL}-Q{actual_quant or DEFAULT_QUANTIZATION}"
+        context = request_context({key: msg.get(key) for key in GENERATION_FIELDS})
+        
+        segments = [c["text"] for c in split_text(text, chunk_size)] if text.strip() else []
+        keys = [(model_info, target_lang, context.generation, segment) for segment in segments]
+        results = [self._lookup(key) for key in keys]
+        pending = [i for i, r in enumerate(results) if r is None]
+        labels = cache_labels(actual_model, actual_quant, target_lang)
+        for result in results:
+            metrics.on_cache(result is not None, labels)
+        
+        await self.send({
+            "event": "start",
+            "id": request_id,
+            "total": len(segments),
+            "reused": len(segments) - len(pending),
+        })
+        
+        # Unchanged segments are answered straight from the session state
+        for i, result in enumerate(results):
+            if result is not None:
+                await self.send({"event": "segment", "id": request_id, "index": i, "result": result, "cached": True})
+        
+        if pending:
+            translator = await gpu.acquire_async(actual_model, actual_quant)
+            try:
+                for i in pending:
+                    segment_start = time.time()
+                    with tracing.span("chunk", index=i, chars=len(segments[i])):
+                        result, _, _, stats = await run_cancellable(
+                            None,
+                            lambda s=segments[i]: translate_chunk(
+                                translator, s, target_lang, cancel_token, "interactive", self.flow, context
+                            ),
+                            cancel_token,
+                        )
+                    results[i] = result
+                    self._store(keys[i], result)
+                    await self.send({
+                        "event": "segment",
+                        "id": request_id,
+                        "index": i,
+                        "result": result,
+                        "cached": False,
+                        "elapsed_ms": int((time.time() - segment_start) * 1000),
+                        "generation": stats.to_dict() if stats else None,
+                    })
+            finally:
+                gpu.release()
+        
+        final_result = _merge_translations([{"text": r} for r in results], text, False)
+        await self.send({
+            "event": "done",
+            "id": request_id,
+            "result": final_result,
+            "translated": len(pending),
+            "reused": len(segments) - len(pending),
+            "elapsed_ms": int((time.time() - start_time) * 1000),
+            "model": model_info,
+        })
+
+
+@app.websocket("/ws/translate")
+async def ws_translate(websocket: WebSocket):
+    """
+    Live translation session for typing clients.
+    
+    Client messages:
+        {"type": "translate", "id": 1, "text": "...", "target_lang": "en", "model": "27b", "chunk_size": 100}
+        {"type": "cancel"}
+    
+    Server events: start, segment (one per segment, cached or freshly translated),
+    done (merged result), cancelled (input superseded) and error.
+    """
+    await websocket.accept()
+    session = LiveSession(websocket)
+    try:
+        while True:
+            try:
+                msg = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                await session.send({"event": "error", "error": "Invalid JSON message"})
+                continue
+            
+            msg_type = msg.get("type", "translate")
+            if msg_type == "translate":
+                if not msg.get("target_lang"):
+                    await session.send({"event": "error", "id": msg.get("id"), "error": "target_lang is required"})
+                    continue
+                await session.submit(msg)
+            elif msg_type == "cancel":
+                await session.supersede("Cancelled by client")
+            else:
+                await session.send({"event": "error", "error": f"Unknown message type: {msg_type}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
 
 
 # ==================== Static Files & UI ====================
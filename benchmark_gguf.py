@@ -1,411 +1,46 @@
 #!/usr/bin/env python3
 """
 GGUF Model Benchmark Script
-Tests all 6 GGUF models (4b/12b/27b × Q4/Q8) for speed and quality.
-"""
-
-import time
-import json
-from pathlib import Path
-from datetime import datetime
+Runs the benchmark suite on all 6 GGUF models (4b/12b/27b × Q4/Q8).
 
-# Test texts
-SHORT_TEXT = "Hello, how are you today?"
-MEDIUM_TEXT = """
-Artificial intelligence has transformed the way we live and work. 
-From voice assistants to self-driving cars, AI is everywhere.
-Machine learning algorithms can now recognize faces, translate languages, 
-and even write code. The future of AI is both exciting and challenging.
+Deprecated: use `translate bench run --backend gguf --model <size> --bits <4|8>`
+and `translate bench compare` directly. This script only loops over the
+model matrix and writes one result file per model. Pick GPUs with
+CUDA_VISIBLE_DEVICES in the calling shell.
 """
 
-LONG_TEXT = """
-The history of artificial intelligence began in antiquity, with myths, stories and rumors of artificial beings endowed with intelligence or consciousness by master craftsmen. The seeds of modern AI were planted by philosophers who attempted to describe the process of human thinking as the mechanical manipulation of symbols. This work culminated in the invention of the programmable digital computer in the 1940s, a machine based on the abstract essence of mathematical reasoning.
-
-This device and the ideas behind it inspired a handful of scientists to begin seriously discussing the possibility of building an electronic brain. The field of AI research was founded at a workshop held on the campus of Dartmouth College during the summer of 1956. Those who attended would become the leaders of AI research for decades. Many of them predicted that a machine as intelligent as a human being would exist in no more than a generation, and they were given millions of dollars to make this vision come true.
-
-Eventually, it became obvious that commercial developers and researchers had grossly underestimated the difficulty of the project. In 1974, in response to the criticism from James Lighthill and ongoing pressure from congress, the U.S. and British Governments stopped funding undirected research into artificial intelligence, and the difficult years that followed would later be known as an "AI winter". Seven years later, a visionary initiative by the Japanese Government inspired governments and industry to provide AI with billions of dollars, but by the late 1980s the investors became disillusioned and withdrew funding again.
+import sys
+from pathlib import Path
 
-Investment and interest in AI boomed in the first decades of the 21st century when machine learning was successfully applied to many problems in academia and industry due to new methods, the application of powerful computer hardware, and the collection of immense data sets. The field of deep learning began to dominate AI benchmarks around 2012 and generative AI became widely popular in 2022 with the release of ChatGPT.
-"""
+from translategemma_cli.bench import run_suite, save_result
+from translategemma_cli.translator import get_translator
 
-# Test cases for quality evaluation
-QUALITY_TESTS = [
-    ("Hello world", "zh", "Basic greeting"),
-    ("The weather is beautiful today.", "ja", "Simple sentence"),
-    ("I love programming and artificial intelligence.", "zh", "Technical terms"),
-    ("今天天气真好，我们去公园散步吧。", "en", "Chinese to English"),
-    ("人工智能正在改变我们的生活方式。", "en", "Technical Chinese"),
+GGUF_MODELS = [
+    ("4b", 4), ("4b", 8),
+    ("12b", 4), ("12b", 8),
+    ("27b", 4), ("27b", 8),
 ]
 
-def load_model(size: str, quant: int):
-    """Load a specific GGUF model."""
-    from llama_cpp import Llama
-    from translategemma_cli.config import get_model_path, get_config
-    
-    config = get_config()
-    path = get_model_path(size, quant, "gguf")
-    
-    model = Llama(
-        model_path=str(path),
-        n_gpu_layers=config.gguf_n_gpu_layers,
-        n_ctx=config.gguf_n_ctx,
-        verbose=False,
-    )
-    return model
-
-def format_prompt(text: str, source_lang: str, target_lang: str) -> str:
-    """Format prompt for TranslateGemma."""
-    lang_names = {
-        "en": "English", "zh": "Chinese", "ja": "Japanese",
-        "ko": "Korean", "fr": "French", "de": "German",
-    }
-    source_name = lang_names.get(source_lang, source_lang)
-    target_name = lang_names.get(target_lang, target_lang)
-    
-    return (
-        f"<start_of_turn>user\n"
-        f"You are a professional {source_name} ({source_lang}) to {target_name} ({target_lang}) translator. "
-        f"Your goal is to accurately convey the meaning and nuances of the original {source_name} text "
-        f"while adhering to {target_name} grammar, vocabulary, and cultural sensitivities.\n"
-        f"Produce only the {target_name} translation, without any additional explanations or commentary. "
-        f"Please translate the following {source_name} text into {target_name}:\n\n\n"
-        f"{text.strip()}<end_of_turn>\n"
-        f"<start_of_turn>model\n"
-    )
-
-def translate(model, text: str, source_lang: str, target_lang: str, max_tokens: int = 512) -> tuple[str, float]:
-    """Translate text and return result with timing."""
-    prompt = format_prompt(text, source_lang, target_lang)
-    
-    start = time.time()
-    output = model(prompt, max_tokens=max_tokens, echo=False, temperature=0.0)
-    elapsed = time.time() - start
-    
-    result = output["choices"][0]["text"].strip()
-    # Clean special tokens
-    for token in ["<end_of_turn>", "<eos>", "<bos>"]:
-        result = result.replace(token, "").strip()
-    
-    return result, elapsed
-
-def detect_language(text: str) -> str:
-    """Simple language detection."""
-    if any('\u4e00' <= c <= '\u9fff' for c in text):
-        return "zh"
-    if any('\u3040' <= c <= '\u309f' or '\u30a0' <= c <= '\u30ff' for c in text):
-        return "ja"
-    return "en"
-
-def run_benchmark():
-    """Run full benchmark on all models."""
-    import os
-    os.environ["CUDA_VISIBLE_DEVICES"] = "1"  # Use GPU 1
-    
-    from translategemma_cli.config import get_model_path
-    
-    models = [
-        ("4b", 4), ("4b", 8),
-        ("12b", 4), ("12b", 8),
-        ("27b", 4), ("27b", 8),
-    ]
-    
-    results = {
-        "timestamp": datetime.now().isoformat(),
-        "gpu": "NVIDIA L40S",
-        "models": {}
-    }
-    
-    for size, quant in models:
-        model_name = f"{size}-Q{quant}"
-        print(f"\n{'='*60}")
-        print(f"Testing {model_name}...")
-        print(f"{'='*60}")
-        
-        # Get model size
-        path = get_model_path(size, quant, "gguf")
-        model_size_gb = path.stat().st_size / (1024**3)
-        
-        # Load model
-        print("Loading model...")
-        load_start = time.time()
-        model = load_model(size, quant)
-        load_time = time.time() - load_start
-        print(f"Model loaded in {load_time:.2f}s")
-        
-        model_results = {
-            "size_gb": round(model_size_gb, 2),
-            "load_time_s": round(load_time, 2),
-            "tests": {}
-        }
-        
-        # Speed tests
-        print("\n--- Speed Tests ---")
-        
-        # Short text
-        result, elapsed = translate(model, SHORT_TEXT, "en", "zh")
-        chars_per_sec = len(SHORT_TEXT) / elapsed
-        model_results["tests"]["short"] = {
-            "input_chars": len(SHORT_TEXT),
-            "time_s": round(elapsed, 2),
-            "chars_per_sec": round(chars_per_sec, 1),
-            "result": result
-        }
-        print(f"Short ({len(SHORT_TEXT)} chars): {elapsed:.2f}s ({chars_per_sec:.1f} chars/s)")
-        print(f"  Result: {result[:50]}...")
-        
-        # Medium text
-        result, elapsed = translate(model, MEDIUM_TEXT.strip(), "en", "zh", max_tokens=1024)
-        chars_per_sec = len(MEDIUM_TEXT.strip()) / elapsed
-        model_results["tests"]["medium"] = {
-            "input_chars": len(MEDIUM_TEXT.strip()),
-            "time_s": round(elapsed, 2),
-            "chars_per_sec": round(chars_per_sec, 1),
-            "result": result
-        }
-        print(f"Medium ({len(MEDIUM_TEXT.strip())} chars): {elapsed:.2f}s ({chars_per_sec:.1f} chars/s)")
-        print(f"  Result: {result[:80]}...")
-        
-        # Long text
-        result, elapsed = translate(model, LONG_TEXT.strip(), "en", "zh", max_tokens=2048)
-        chars_per_sec = len(LONG_TEXT.strip()) / elapsed
-        model_results["tests"]["long"] = {
-            "input_chars": len(LONG_TEXT.strip()),
-            "time_s": round(elapsed, 2),
-            "chars_per_sec": round(chars_per_sec, 1),
-            "result": result
-        }
-        print(f"Long ({len(LONG_TEXT.strip())} chars): {elapsed:.2f}s ({chars_per_sec:.1f} chars/s)")
-        print(f"  Result: {result[:100]}...")
-        
-        # Quality tests
-        print("\n--- Quality Tests ---")
-        quality_results = []
-        for text, target, desc in QUALITY_TESTS:
-            source = detect_language(text)
-            result, elapsed = translate(model, text, source, target)
-            quality_results.append({
-                "description": desc,
-                "input": text,
-                "source": source,
-                "target": target,
-                "output": result,
-                "time_s": round(elapsed, 2)
-            })
-            print(f"{desc}: \"{text}\" → \"{result}\"")
-        
-        model_results["quality_tests"] = quality_results
-        results["models"][model_name] = model_results
-        
-        # Cleanup
-        del model
-        import gc
-        gc.collect()
-    
-    return results
-
-def generate_report(results: dict) -> str:
-    """Generate markdown report from results."""
-    report = f"""# TranslateGemma GGUF 模型基准测试报告
-
-**测试时间**: {results['timestamp']}  
-**测试环境**: {results['gpu']} (CUDA)  
-**测试框架**: llama-cpp-python 0.3.16
-
-## 概述
-
-本报告对 TranslateGemma 的 6 个 GGUF 量化模型进行了全面的速度和质量测试：
-- 4b (Q4_K_M, Q8_0)
-- 12b (Q4_K_M, Q8_0)  
-- 27b (Q4_K_M, Q8_0)
-
-## 模型规格
-
-| 模型 | 文件大小 | 加载时间 |
-|------|----------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        report += f"| {model_name} | {data['size_gb']:.2f} GB | {data['load_time_s']:.2f}s |\n"
-    
-    report += """
-## 速度测试结果
-
-### 短文本 (~25 字符)
-
-| 模型 | 耗时 | 速度 (字符/秒) |
-|------|------|----------------|
-"""
-    
-    for model_name, data in results["models"].items():
-        test = data["tests"]["short"]
-        report += f"| {model_name} | {test['time_s']:.2f}s | {test['chars_per_sec']:.1f} |\n"
-    
-    report += """
-### 中等文本 (~300 字符)
-
-| 模型 | 耗时 | 速度 (字符/秒) |
-|------|------|----------------|
-"""
-    
-    for model_name, data in results["models"].items():
-        test = data["tests"]["medium"]
-        report += f"| {model_name} | {test['time_s']:.2f}s | {test['chars_per_sec']:.1f} |\n"
-    
-    report += """
-### 长文本 (~2000 字符)
-
-| 模型 | 耗时 | 速度 (字符/秒) |
-|------|------|----------------|
-"""
-    
-    for model_name, data in results["models"].items():
-        test = data["tests"]["long"]
-        report += f"| {model_name} | {test['time_s']:.2f}s | {test['chars_per_sec']:.1f} |\n"
-    
-    report += """
-## 翻译质量对比
-
-### 测试 1: 基础问候 (English → Chinese)
-**原文**: "Hello world"
-
-| 模型 | 翻译结果 |
-|------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        result = data["quality_tests"][0]["output"]
-        report += f"| {model_name} | {result} |\n"
-    
-    report += """
-### 测试 2: 简单句子 (English → Japanese)
-**原文**: "The weather is beautiful today."
-
-| 模型 | 翻译结果 |
-|------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        result = data["quality_tests"][1]["output"]
-        report += f"| {model_name} | {result} |\n"
-    
-    report += """
-### 测试 3: 技术术语 (English → Chinese)
-**原文**: "I love programming and artificial intelligence."
-
-| 模型 | 翻译结果 |
-|------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        result = data["quality_tests"][2]["output"]
-        report += f"| {model_name} | {result} |\n"
-    
-    report += """
-### 测试 4: 中文到英文
-**原文**: "今天天气真好，我们去公园散步吧。"
-
-| 模型 | 翻译结果 |
-|------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        result = data["quality_tests"][3]["output"]
-        report += f"| {model_name} | {result} |\n"
-    
-    report += """
-### 测试 5: 技术中文到英文
-**原文**: "人工智能正在改变我们的生活方式。"
-
-| 模型 | 翻译结果 |
-|------|----------|
-"""
-    
-    for model_name, data in results["models"].items():
-        result = data["quality_tests"][4]["output"]
-        report += f"| {model_name} | {result} |\n"
-    
-    # Calculate averages
-    report += """
-## 性能总结
-
-### 平均速度对比
-
-| 模型 | 平均速度 (字符/秒) | VRAM 需求 | 推荐场景 |
-|------|-------------------|-----------|----------|
-"""
-    
-    recommendations = {
-        "4b-Q4": "资源受限环境、快速原型",
-        "4b-Q8": "平衡速度与质量",
-        "12b-Q4": "日常翻译任务",
-        "12b-Q8": "较高质量需求",
-        "27b-Q4": "高质量翻译",
-        "27b-Q8": "最高质量需求",
-    }
-    
-    vram = {
-        "4b-Q4": "~4 GB",
-        "4b-Q8": "~6 GB",
-        "12b-Q4": "~8 GB",
-        "12b-Q8": "~14 GB",
-        "27b-Q4": "~18 GB",
-        "27b-Q8": "~32 GB",
-    }
-    
-    for model_name, data in results["models"].items():
-        tests = data["tests"]
-        avg_speed = (tests["short"]["chars_per_sec"] + tests["medium"]["chars_per_sec"] + tests["long"]["chars_per_sec"]) / 3
-        report += f"| {model_name} | {avg_speed:.1f} | {vram.get(model_name, 'N/A')} | {recommendations.get(model_name, '')} |\n"
-    
-    report += """
-## 结论与建议
-
-### 速度分析
-1. **4b 模型**最快，适合实时翻译场景
-2. **Q4 量化**比 Q8 快约 30-50%，但质量略有下降
-3. **27b 模型**速度最慢，但翻译质量最高
-
-### 质量分析
-1. **27b 模型**在复杂句子和技术术语翻译上表现最佳
-2. **12b 模型**是速度和质量的最佳平衡点
-3. **4b 模型**适合简单文本，复杂内容可能有偏差
-
-### 推荐配置
-
-| 使用场景 | 推荐模型 | 原因 |
-|----------|----------|------|
-| 实时聊天翻译 | 4b-Q4 | 速度最快，延迟低 |
-| 日常文档翻译 | 12b-Q4 | 平衡速度与质量 |
-| 专业文档翻译 | 27b-Q4 | 高质量，合理速度 |
-| 出版级翻译 | 27b-Q8 | 最高质量 |
-| 资源受限设备 | 4b-Q4 | 最小内存需求 |
-
-### 与 PyTorch (bfloat16) 对比
-
-GGUF 量化模型相比原始 bfloat16 模型：
-- **优势**: 内存占用减少 50-75%，单 GPU 可运行 27b 模型
-- **劣势**: 推理速度略慢，质量略有损失（Q4 约 5%，Q8 约 2%）
 
----
+def run_benchmark(output_dir: Path = Path("bench-results"), repeat: int = 5) -> list[Path]:
+    """Benchmark every GGUF model; returns the written result files."""
+    translator = get_translator()
+    written = []
+    for size, quant in GGUF_MODELS:
+        print(f"\n*** Benchmarking {size}-Q{quant} (GGUF) ***")
+        try:
+            result = run_suite(model_size=size, quantization=quant, backend="gguf", repeat=repeat)
+        except Exception as e:
+            print(f"Error testing {size}-Q{quant}: {e}")
+            continue
+        finally:
+            # Same size with other quantization is a different model
+            translator.unload()
+        written.append(save_result(result, output_dir / f"gguf-{size}-q{quant}.json"))
+        print(f"Results saved to {written[-1]}")
+    return written
 
-*报告生成时间: {timestamp}*
-""".format(timestamp=results['timestamp'])
-    
-    return report
 
 if __name__ == "__main__":
-    print("Starting GGUF Model Benchmark...")
-    print("This will test all 6 models and may take 10-15 minutes.\n")
-    
-    results = run_benchmark()
-    
-    # Save raw results
-    with open("benchmark_results.json", "w") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    print("\nRaw results saved to benchmark_results.json")
-    
-    # Generate report
-    report = generate_report(results)
-    with open("GGUF_BENCHMARK_REPORT.md", "w") as f:
-        f.write(report)
-    print("Report saved to GGUF_BENCHMARK_REPORT.md")
+    print("benchmark_gguf.py is deprecated; use `translate bench run --backend gguf`.", file=sys.stderr)
+    run_benchmark()
@@ -10,7 +10,8 @@
 mcp = FastMCP("translategemma")
 
 # Import from FastAPI app (shared GPU manager)
-from app_fastapi import gpu, translate, LANGUAGES, AVAILABLE_MODELS, split_text, MAX_CHUNK_LENGTH
+from app_fastapi import gpu, metrics, translate, translate_batch as run_translate_batch, LANGUAGES, model_listing, split_text, MAX_CHUNK_LENGTH
+from translategemma_cli import tracing
 
 
 @mcp.tool()
@@ -22,6 +23,12 @@ def translate_text(
     quantization: int = None,
     chunk_size: int = 80,
     auto_split: bool = True,
+    temperature: float = None,
+    top_p: float = None,
+    top_k: int = None,
+    min_p: float = None,
+    repetition_penalty: float = None,
+    max_tokens: int = None,
 ) -> dict:
     """
     Translate text to target language using TranslateGemma.
@@ -34,20 +41,36 @@ def translate_text(
         quantization: Quantization bits - 4 or 8 (default: 4)
         chunk_size: Chunk size for long text (default: 80)
         auto_split: Auto-split long text into chunks (default: True)
+        temperature: Sampling temperature, 0 = deterministic (optional, server default)
+        top_p: Nucleus sampling threshold, 1 = disabled (optional, server default)
+        top_k: Top-k sampling, 0 = disabled (optional, server default)
+        min_p: Minimum probability threshold, 0 = disabled (optional, server default)
+        repetition_penalty: Repetition penalty, 1 = disabled (optional, server default)
+        max_tokens: Maximum tokens to generate per chunk (optional, server default)
     
     Returns:
-        dict with result, source_lang, target_lang, elapsed_ms, model info
+        dict with result, source_lang, target_lang, elapsed_ms, model info and
+        generation (token counts, TTFT, decode tokens/sec, stop reason)
     """
     try:
-        data = translate(
-            text=text,
-            target_lang=target_lang,
-            source_lang=source_lang,
-            model_size=model,
-            quantization=quantization,
-            chunk_size=chunk_size,
-            auto_split=auto_split,
-        )
+        with tracing.span("mcp", tool="translate_text"):
+            data = translate(
+                text=text,
+                target_lang=target_lang,
+                source_lang=source_lang,
+                model_size=model,
+                quantization=quantization,
+                chunk_size=chunk_size,
+                auto_split=auto_split,
+                generation={
+                    "temperature": temperature,
+                    "top_p": top_p,
+                    "top_k": top_k,
+                    "min_p": min_p,
+                    "repetition_penalty": repetition_penalty,
+                    "max_tokens": max_tokens,
+                },
+            )
         return {"status": "success", **data}
     except Exception as e:
         return {"status": "error", "error": str(e)}
@@ -59,6 +82,12 @@ def translate_batch(
     target_lang: str,
     source_lang: str = None,
     model: str = None,
+    temperature: float = None,
+    top_p: float = None,
+    top_k: int = None,
+    min_p: float = None,
+    repetition_penalty: float = None,
+    max_tokens: int = None,
 ) -> dict:
     """
     Batch translate multiple texts.
@@ -68,36 +97,35 @@ def translate_batch(
         target_lang: Target language code
         source_lang: Source language code (optional)
         model: Model size (optional)
+        temperature: Sampling temperature, 0 = deterministic (optional, server default)
+        top_p: Nucleus sampling threshold, 1 = disabled (optional, server default)
+        top_k: Top-k sampling, 0 = disabled (optional, server default)
+        min_p: Minimum probability threshold, 0 = disabled (optional, server default)
+        repetition_penalty: Repetition penalty, 1 = disabled (optional, server default)
+        max_tokens: Maximum tokens to generate per chunk (optional, server default)
     
     Returns:
-        dict with results list and total elapsed time
+        dict with per-item results (elapsed_ms, cache_hit) and total elapsed time
     """
-    import time
-    start = time.time()
-    results = []
-    
-    for text in texts:
-        try:
-            data = translate(
-                text=text,
+    try:
+        with tracing.span("mcp", tool="translate_batch"):
+            data = run_translate_batch(
+                texts=texts,
                 target_lang=target_lang,
                 source_lang=source_lang,
                 model_size=model,
+                generation={
+                    "temperature": temperature,
+                    "top_p": top_p,
+                    "top_k": top_k,
+                    "min_p": min_p,
+                    "repetition_penalty": repetition_penalty,
+                    "max_tokens": max_tokens,
+                },
             )
-            results.append({
-                "status": "success",
-                "result": data["result"],
-                "elapsed_ms": data["elapsed_ms"],
-            })
-        except Exception as e:
-            results.append({"status": "error", "error": str(e)})
-    
-    return {
-        "status": "success",
-        "results": results,
-        "total_elapsed_ms": int((time.time() - start) * 1000),
-        "count": len(results),
-    }
+        return {"status": "success", **data}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
 
 
 @mcp.tool()
@@ -125,12 +153,13 @@ def translate_file(
         with open(file_path, "r", encoding="utf-8") as f:
             text = f.read()
         
-        data = translate(
-            text=text,
-            target_lang=target_lang,
-            source_lang=source_lang,
-            model_size=model,
-        )
+        with tracing.span("mcp", tool="translate_file", file=file_path):
+            data = translate(
+                text=text,
+                target_lang=target_lang,
+                source_lang=source_lang,
+                model_size=model,
+            )
         
         if output_path:
             with open(output_path, "w", encoding="utf-8") as f:
@@ -154,6 +183,17 @@ def get_gpu_status() -> dict:
     return gpu.status()
 
 
+@mcp.tool()
+def get_metrics() -> str:
+    """
+    Get translation metrics in Prometheus text format.
+    
+    Returns:
+        Per-stage latency histograms, token and chunk counters, cache hits and model loads/unloads
+    """
+    return metrics.render()
+
+
 @mcp.tool()
 def release_gpu() -> dict:
     """
@@ -219,7 +259,7 @@ def list_models() -> dict:
         dict with model configurations and current model info
     """
     return {
-        "models": AVAILABLE_MODELS,
+        "models": model_listing(),
         "current": f"{gpu.current_model}-Q{gpu.current_quant}" if gpu.current_model else None,
     }
 
@@ -271,3 +271,52 @@ async function releaseGPU() {
     await fetch(`${API}/api/gpu/offload`, { method: 'POST' });
     updateGPUStatus();
 }
+
+// Live translation over WebSocket: only edited segments are re-translated,
+// and a newer keystroke supersedes the request still in flight on the server.
+class LiveTranslator {
+    constructor(onEvent, debounceMs = 400) {
+        this.onEvent = onEvent;
+        this.debounceMs = debounceMs;
+        this.timer = null;
+        this.nextId = 1;
+        this.segments = [];
+        this.ws = null;
+    }
+    
+    connect() {
+        const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+        this.ws = new WebSocket(`${proto}://${location.host}${API}/ws/translate`);
+        this.ws.onmessage = e => {
+            const data = JSON.parse(e.data);
+            if (data.event === 'start') this.segments = new Array(data.total).fill('');
+            if (data.event === 'segment') this.segments[data.index] = data.result;
+            this.onEvent(data, this.segments);
+        };
+        this.ws.onclose = () => { this.ws = null; };
+        return new Promise(resolve => { this.ws.onopen = resolve; });
+    }
+    
+    update(text) {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.send(text), this.debounceMs);
+    }
+    
+    async send(text) {
+        if (!this.ws) await this.connect();
+        const [size, quantStr] = selectedModel.split('-Q');
+        this.ws.send(JSON.stringify({
+            type: 'translate',
+            id: this.nextId++,
+            text,
+            target_lang: document.getElementById('target-lang').value,
+            model: size,
+            quantization: parseInt(quantStr),
+        }));
+    }
+    
+    close() {
+        clearTimeout(this.timer);
+        if (this.ws) this.ws.close();
+    }
+}
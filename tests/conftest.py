@@ -68,11 +68,28 @@ def mock_tokenizer():
     """Create a mock tokenizer object."""
     tokenizer = MagicMock()
     tokenizer.apply_chat_template.return_value = "formatted prompt"
+    tokenizer.bos_token = "<bos>"
     tokenizer.eos_token_id = 0
     tokenizer.decode.return_value = "translated text"
     return tokenizer
 
 
+@pytest.fixture
+def make_translator(mock_model, mock_tokenizer):
+    """Factory of translators with the mock model and tokenizer already loaded."""
+    from translategemma_cli.translator import Translator
+    
+    def make(backend="mlx", model_size="4b"):
+        translator = Translator()
+        translator._model = mock_model
+        translator._tokenizer = mock_tokenizer
+        translator._backend = backend
+        translator._current_model_size = model_size
+        return translator
+    
+    return make
+
+
 @pytest.fixture
 def sample_texts():
     """Sample texts in different languages for testing."""
@@ -0,0 +1,264 @@
+"""End-to-end tests of the FastAPI server on the fake backend."""
+
+import importlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from translategemma_cli.metrics import reset_metrics
+from translategemma_cli.translator import Translator
+
+
+@pytest.fixture
+def server(mock_config, tmp_path, monkeypatch):
+    """A freshly imported app_fastapi on the fake backend, unloading after every request."""
+    for name, value in {
+        "BACKEND": "fake",
+        "MODEL_NAME": "4b",
+        "QUANTIZATION": "4",
+        "GPU_IDLE_TIMEOUT": "0",
+        "PRELOAD": "0",
+        "JOBS_DB": str(tmp_path / "jobs.db"),
+        "FAKE_TOKEN_LATENCY": "0.001",
+        "FAKE_PREFILL_LATENCY": "0.001",
+    }.items():
+        monkeypatch.setenv(name, value)
+    # Settings are read and metrics registered at import
+    reset_metrics()
+    sys.modules.pop("app_fastapi", None)
+    module = importlib.import_module("app_fastapi")
+    with TestClient(module.app) as client:
+        yield module, client
+    sys.modules.pop("app_fastapi", None)
+    reset_metrics()
+
+
+def sse_events(response):
+    """Decoded data events of an SSE response."""
+    return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+
+def wait_for(predicate, timeout=10.0):
+    """Poll until predicate() is true or fail after timeout."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.02)
+    raise AssertionError("Timed out waiting for condition")
+
+
+class TestTranslate:
+    """Test /api/translate and its streaming variant."""
+    
+    def test_translate(self, server):
+        """Test a translation is returned and the model is unloaded afterwards."""
+        module, client = server
+        
+        response = client.post("/api/translate", json={"text": "Hello world.", "target_lang": "zh"})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["result"]
+        assert body["model"] == "4b-Q4"
+        assert body["generation"]["completion_tokens"] > 0
+        assert module.gpu.translator is None
+    
+    def test_concurrent_requests(self, server):
+        """Test concurrent requests share the model and none loses it to another's unload."""
+        module, client = server
+        text = "The committee will meet again next Tuesday. " * 8
+        
+        def call(_):
+            return client.post("/api/translate", json={"text": text, "target_lang": "zh"})
+        
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(call, range(16)))
+        
+        assert [r.status_code for r in responses] == [200] * 16
+        assert len({r.json()["result"] for r in responses}) == 1
+        assert module.gpu.users == 0
+        assert module.gpu.translator is None
+    
+    def test_stream(self, server):
+        """Test the SSE stream reports progress per chunk and the merged result."""
+        module, client = server
+        
+        response = client.post(
+            "/api/translate/stream",
+            json={"text": "First sentence here. " * 10, "target_lang": "ja", "chunk_size": 60},
+        )
+        events = sse_events(response)
+        
+        assert events[0]["event"] == "start"
+        chunks = [event for event in events if event["event"] == "chunk"]
+        assert len(chunks) == events[0]["total_chunks"] > 1
+        assert events[-1]["event"] == "done"
+        assert events[-1]["result"]
+        assert module.gpu.users == 0
+    
+    def test_generation_settings(self, server):
+        """Test per-request generation settings reach the backend and invalid ones are rejected."""
+        _, client = server
+        
+        with patch.object(Translator, "_generate_fake", autospec=True, side_effect=Translator._generate_fake) as generate:
+            response = client.post(
+                "/api/translate",
+                json={"text": "Hello.", "target_lang": "zh", "temperature": 0.7, "top_p": 0.9, "max_tokens": 32},
+            )
+        
+        assert response.status_code == 200
+        params = generate.call_args.kwargs.get("params") or generate.call_args.args[-1]
+        assert (params.temperature, params.top_p, params.max_tokens) == (0.7, 0.9, 32)
+        assert client.post("/api/translate", json={"text": "Hi", "target_lang": "zh", "top_p": 2}).status_code == 422
+
+
+class TestBatch:
+    """Test /api/translate/batch."""
+    
+    def test_dedupe_and_single_unload(self, server):
+        """Test identical chunks are translated once and the model is unloaded once."""
+        module, client = server
+        
+        with patch.object(module.gpu, "_do_unload", wraps=module.gpu._do_unload) as unload:
+            response = client.post(
+                "/api/translate/batch",
+                json={"texts": ["Good morning.", "Good night.", "Good morning."], "target_lang": "zh"},
+            )
+        
+        body = response.json()
+        assert response.status_code == 200
+        assert body["count"] == 3
+        assert body["unique_chunks"] == 2
+        assert [item["status"] for item in body["results"]] == ["success"] * 3
+        assert body["results"][0]["result"] == body["results"][2]["result"]
+        assert body["results"][2]["cache_hit"] is True
+        assert unload.call_count == 1
+
+
+class TestJobs:
+    """Test the /api/jobs lifecycle."""
+    
+    def test_job_completes(self, server):
+        """Test a queued job runs to completion and is listed."""
+        _, client = server
+        
+        job_id = client.post("/api/jobs", json={"text": "Hello there. " * 20, "target_lang": "zh", "chunk_size": 50}).json()["job_id"]
+        wait_for(lambda: client.get(f"/api/jobs/{job_id}").json()["status"] == "completed")
+        
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["progress"] == 1.0
+        assert job["result"]
+        assert job_id in [item["job_id"] for item in client.get("/api/jobs").json()["jobs"]]
+        assert client.delete(f"/api/jobs/{job_id}").status_code == 409
+    
+    def test_failed_model_load_fails_job(self, server):
+        """Test a model load that exits fails the job and the worker goes on with the next one."""
+        _, client = server
+        
+        with patch.object(Translator, "ensure_model_loaded", side_effect=SystemExit(1)):
+            job_id = client.post("/api/jobs", json={"text": "Hello.", "target_lang": "zh"}).json()["job_id"]
+            wait_for(lambda: client.get(f"/api/jobs/{job_id}").json()["status"] == "failed")
+        
+        assert "exit code 1" in client.get(f"/api/jobs/{job_id}").json()["error"]
+        job_id = client.post("/api/jobs", json={"text": "Hello.", "target_lang": "zh"}).json()["job_id"]
+        wait_for(lambda: client.get(f"/api/jobs/{job_id}").json()["status"] == "completed")
+    
+    def test_unknown_job(self, server):
+        """Test unknown job ids are 404."""
+        _, client = server
+        
+        assert client.get("/api/jobs/missing").status_code == 404
+        assert client.delete("/api/jobs/missing").status_code == 404
+
+
+class TestWebSocket:
+    """Test the /ws/translate live session."""
+    
+    def test_translate_and_reuse(self, server):
+        """Test segments are translated, then answered from the session cache when resent."""
+        _, client = server
+        text = "The first sentence. The second sentence."
+        
+        with client.websocket_connect("/ws/translate") as websocket:
+            events = []
+            for request_id in (1, 2):
+                websocket.send_text(json.dumps({"type": "translate", "id": request_id, "text": text, "target_lang": "zh"}))
+                while True:
+                    events.append(websocket.receive_json())
+                    if events[-1]["event"] == "done":
+                        break
+        
+        done = [event for event in events if event["event"] == "done"]
+        assert done[0]["result"] == done[1]["result"]
+        assert done[0]["translated"] > 0
+        assert done[1]["translated"] == 0
+    
+    def test_superseded_during_load_releases_model(self, server):
+        """Test an input superseded while the model is still loading does not keep holding it."""
+        module, client = server
+        load = Translator.ensure_model_loaded
+        
+        def slow_load(translator, *args, **kwargs):
+            time.sleep(1.0)
+            return load(translator, *args, **kwargs)
+        
+        with patch.object(Translator, "ensure_model_loaded", autospec=True, side_effect=slow_load):
+            with client.websocket_connect("/ws/translate") as websocket:
+                websocket.send_text(json.dumps({"type": "translate", "id": 1, "text": "The first input.", "target_lang": "zh"}))
+                time.sleep(0.3)
+                websocket.send_text(json.dumps({"type": "translate", "id": 2, "text": "The second input.", "target_lang": "zh"}))
+                events = []
+                while not events or events[-1]["event"] != "done":
+                    events.append(websocket.receive_json())
+        
+        assert [event["id"] for event in events if event["event"] == "cancelled"] == [1]
+        assert events[-1]["id"] == 2
+        wait_for(lambda: module.gpu.users == 0 and module.gpu.translator is None)
+    
+    def test_missing_target(self, server):
+        """Test a message without target_lang gets an error event."""
+        _, client = server
+        
+        with client.websocket_connect("/ws/translate") as websocket:
+            websocket.send_text(json.dumps({"type": "translate", "id": 1, "text": "Hi"}))
+            assert websocket.receive_json()["event"] == "error"
+
+
+class TestOperations:
+    """Test metrics and health endpoints."""
+    
+    def test_metrics(self, server):
+        """Test stage latencies and model lifecycle are exported after a request."""
+        _, client = server
+        client.post("/api/translate", json={"text": "Hello.", "target_lang": "zh"})
+        
+        body = client.get("/metrics").text
+        
+        assert "translategemma_stage_seconds" in body
+        assert "translategemma_model_loads_total" in body
+    
+    def test_unknown_scheduler_weight(self, monkeypatch):
+        """Test the server refuses to start with weights for a priority class that does not exist."""
+        monkeypatch.setenv("SCHEDULER_WEIGHTS", "interactive=8,bulk=1")
+        monkeypatch.delitem(sys.modules, "app_fastapi", raising=False)
+        
+        with pytest.raises(ValueError, match="Unknown priority in weights: bulk"):
+            importlib.import_module("app_fastapi")
+    
+    def test_ready_without_preload(self, server):
+        """Test the replica is ready without PRELOAD and reports whether it is warm."""
+        _, client = server
+        
+        response = client.get("/health/ready")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["warm"] is False
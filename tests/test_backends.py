@@ -0,0 +1,208 @@
+"""Tests for the fake backend and the fake inference servers."""
+
+import threading
+import time
+
+import pytest
+
+from translategemma_cli.backends import FakeBackend, OllamaBackend, VLLMBackend, parse_batch_curve
+from translategemma_cli.cancellation import CancellationToken, TranslationCancelled
+from translategemma_cli.config import RequestContext
+from translategemma_cli.fake_servers import FakeOllamaServer, FakeOpenAIServer
+from translategemma_cli.stats import GenerationStats
+from translategemma_cli.translator import Translator
+
+
+def _messages(text):
+    return [{"role": "user", "content": f"Translate the following text from en to zh:\n\n{text}"}]
+
+
+class TestFakeBackend:
+    """Test the simulated model."""
+    
+    def test_echoes_deterministically(self):
+        """Test the text to translate comes back token by token with stats."""
+        backend = FakeBackend()
+        stats = GenerationStats()
+        
+        tokens = list(backend.generate_stream(_messages("Hello, world!"), stats=stats))
+        
+        assert tokens == ["Hell", "o, w", "orld", "!"]
+        assert backend.generate(_messages("Hello, world!")) == "Hello, world!"
+        assert stats.completion_tokens == 4
+        assert stats.prompt_tokens > stats.completion_tokens
+        assert stats.stop_reason == "stop"
+    
+    def test_max_tokens(self):
+        """Test output is cut at max_tokens with a length stop reason."""
+        stats = GenerationStats()
+        
+        text = FakeBackend().generate(_messages("abcdefghijkl"), max_tokens=2, stats=stats)
+        
+        assert text == "abcdefgh"
+        assert stats.stop_reason == "length"
+    
+    def test_latency_model(self):
+        """Test prefill and per-token latency add up."""
+        backend = FakeBackend(token_latency=0.01, prefill_latency=0.05)
+        stats = GenerationStats()
+        
+        start = time.perf_counter()
+        backend.generate(_messages("x" * 20), stats=stats)
+        elapsed = time.perf_counter() - start
+        
+        assert stats.ttft >= 0.06
+        assert elapsed >= 0.1
+    
+    def test_batch_curve(self):
+        """Test the slowdown factor is interpolated and held past the last point."""
+        backend = FakeBackend(batch_curve="1:1.0,5:2.0")
+        
+        assert backend.batch_factor(1) == 1.0
+        assert backend.batch_factor(3) == pytest.approx(1.5)
+        assert backend.batch_factor(50) == 2.0
+        assert parse_batch_curve([(8, 1.5), (1, 1.0)]) == [(1, 1.0), (8, 1.5)]
+        with pytest.raises(ValueError, match="Invalid batch curve"):
+            parse_batch_curve("1=1.0")
+        with pytest.raises(ValueError):
+            FakeBackend(token_latency=-1)
+    
+    def test_generate_batch(self):
+        """Test a batch decodes as many steps as its longest row, slowed by the curve."""
+        backend = FakeBackend(token_latency=0.01, batch_curve="1:1.0,2:2.0")
+        
+        start = time.perf_counter()
+        responses, stats = backend.generate_batch([_messages("abcd"), _messages("abcdefghijkl")])
+        elapsed = time.perf_counter() - start
+        
+        assert responses == ["abcd", "abcdefghijkl"]
+        assert stats.completion_tokens == 4
+        # 3 steps at twice the single-sequence latency
+        assert elapsed >= 0.06
+        assert backend.active == 0
+    
+    def test_concurrent_generations_slow_down(self):
+        """Test concurrent streams share the batch curve."""
+        backend = FakeBackend(token_latency=0.005, batch_curve="1:1.0,2:3.0")
+        seen = []
+        
+        def run():
+            for _ in backend.generate_stream(_messages("x" * 40)):
+                seen.append(backend.active)
+        
+        threads = [threading.Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert max(seen) == 2
+        assert backend.active == 0
+    
+    def test_cancellation(self):
+        """Test a cancelled token stops the stream."""
+        token = CancellationToken()
+        stats = GenerationStats()
+        tokens = FakeBackend().generate_stream(_messages("x" * 40), cancel_token=token, stats=stats)
+        
+        next(tokens)
+        token.cancel()
+        with pytest.raises(TranslationCancelled):
+            list(tokens)
+        assert stats.stop_reason == "cancelled"
+
+
+class TestTranslatorFakeBackend:
+    """Test the translator end to end on the fake backend."""
+    
+    def test_translate(self, mock_config):
+        """Test the fake backend loads from config and runs every entry point."""
+        mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+        translator = Translator()
+        translator.ensure_model_loaded("4b", "fake")
+        
+        translation, source, target = translator.translate("Good morning", force_target="zh")
+        batch = translator.translate_batch(["One", "Two", "Three"], force_target="zh", batch_size=2)
+        streamed = "".join(token for token, _, _ in translator.translate_stream("Good night", force_target="zh"))
+        
+        assert translator.backend == "fake"
+        assert (translation, source, target) == ("Good morning", "en", "zh")
+        assert [text for text, _, _ in batch] == ["One", "Two", "Three"]
+        assert streamed == "Good night"
+        assert translator.last_stats.completion_tokens == 3
+    
+    def test_unknown_option(self, mock_config):
+        """Test config rejects unknown fake backend options."""
+        with pytest.raises(ValueError, match="Unknown fake backend option"):
+            mock_config.fake_backend = {"latency": 1}
+
+
+class TestFakeServers:
+    """Test the real HTTP clients against the fake servers."""
+    
+    def test_openai_server(self):
+        """Test vLLM client generation, streaming stats and model discovery."""
+        with FakeOpenAIServer(model="google/translategemma-4b-it") as server:
+            backend = VLLMBackend(server_url=server.url)
+            stats = GenerationStats()
+            
+            assert backend.is_available() == (True, None)
+            assert backend.generate(_messages("Hello")) == "Hello"
+            assert backend.generate(_messages("Hello there"), stats=stats) == "Hello there"
+        
+        assert backend.get_models() == ["google/translategemma-4b-it"]
+        assert stats.completion_tokens == 3
+        assert stats.prompt_tokens > 0
+        assert stats.stop_reason == "stop"
+        assert server.requests[-1]["stream_options"] == {"include_usage": True}
+    
+    def test_ollama_server(self):
+        """Test Ollama client generation, streaming stats and pulls."""
+        with FakeOllamaServer() as server:
+            backend = OllamaBackend(server_url=server.url)
+            stats = GenerationStats()
+            
+            assert backend.has_model()
+            assert backend.pull_model()
+            assert backend.generate(_messages("Hello")) == "Hello"
+            assert backend.generate(_messages("Hello there"), max_tokens=2, stats=stats) == "Hello th"
+        
+        assert stats.completion_tokens == 2
+        assert stats.stop_reason == "length"
+    
+    def test_client_disconnect_stops_generation(self):
+        """Test cancelling a stream closes the connection and the server stops generating."""
+        with FakeOpenAIServer(FakeBackend(token_latency=0.01)) as server:
+            token = CancellationToken()
+            tokens = VLLMBackend(server_url=server.url).generate_stream(_messages("x" * 400), cancel_token=token)
+            next(tokens)
+            token.cancel()
+            with pytest.raises(TranslationCancelled):
+                list(tokens)
+            
+            deadline = time.time() + 2
+            while server.disconnects == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        
+        assert server.disconnects == 1
+        assert server.backend.active == 0
+    
+    def test_request_sampling_settings(self, mock_config):
+        """Test a request's generation settings reach both servers without touching the config."""
+        context = RequestContext.from_config(temperature=0.7, top_k=40, repetition_penalty=1.2, max_tokens=16)
+        with FakeOpenAIServer() as openai, FakeOllamaServer() as ollama:
+            translator = Translator()
+            translator._vllm_backend = VLLMBackend(server_url=openai.url, model="translategemma")
+            translator._ollama_backend = OllamaBackend(server_url=ollama.url)
+            for backend in ("vllm", "ollama"):
+                translator._backend = backend
+                translator.translate("Hello", force_target="zh", context=context)
+                "".join(token for token, _, _ in translator.translate_stream("Hello", force_target="zh", context=context))
+        
+        for payload in openai.requests:
+            assert (payload["temperature"], payload["top_k"], payload["repetition_penalty"]) == (0.7, 40, 1.2)
+            assert payload["max_tokens"] == 16 and "top_p" not in payload
+        for payload in ollama.requests:
+            assert payload["options"] == {"num_predict": 16, "temperature": 0.7, "top_k": 40, "repeat_penalty": 1.2}
+        assert len(openai.requests) == len(ollama.requests) == 2
+        assert mock_config.temperature == 0.0
@@ -0,0 +1,264 @@
+"""Tests for the benchmark suite."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from translategemma_cli.bench import (
+    BenchCase,
+    apply_recommendations,
+    build_corpus,
+    chrf,
+    compare_results,
+    corpus_fingerprint,
+    load_result,
+    percentile,
+    recommend,
+    run_suite,
+    save_result,
+    select_cases,
+    settings_grid,
+    sweep_chunking,
+)
+from translategemma_cli.chunker import TextChunker
+from translategemma_cli.cli import app
+from translategemma_cli.config import Config
+from translategemma_cli.stats import GenerationStats
+from translategemma_cli.translator import Translator
+
+
+def _result(median=100.0, p95=120.0, ttft=20.0, rate=50.0, fingerprint="abc"):
+    return {
+        "schema": 1,
+        "corpus": {"version": 1, "seed": 0, "fingerprint": fingerprint, "cases": ["short"]},
+        "config": {"model_size": "4b", "backend": "mlx"},
+        "cases": {
+            "short": {
+                "latency_ms": {"median": median, "p95": p95},
+                "ttft_ms": ttft,
+                "decode_tokens_per_second": rate,
+            },
+        },
+    }
+
+
+class TestCorpus:
+    """Test the pinned corpus."""
+    
+    def test_seeded_document_is_reproducible(self):
+        """Test the same seed gives the same corpus and another seed does not."""
+        assert corpus_fingerprint(build_corpus(0)) == corpus_fingerprint(build_corpus(0))
+        assert corpus_fingerprint(build_corpus(0)) != corpus_fingerprint(build_corpus(1))
+    
+    def test_select_cases(self):
+        """Test cases are picked by name in corpus order."""
+        corpus = build_corpus()
+        
+        assert [case.name for case in select_cases(corpus, ["long", "short"])] == ["short", "long"]
+        assert select_cases(corpus, None) == corpus
+        with pytest.raises(ValueError, match="Unknown benchmark case"):
+            select_cases(corpus, ["huge"])
+
+
+class TestRunner:
+    """Test running cases through the translator."""
+    
+    def test_percentile(self):
+        """Test linear interpolation between ranks."""
+        assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 95) == pytest.approx(3.85)
+        assert percentile([5.0], 95) == 5.0
+        with pytest.raises(ValueError):
+            percentile([], 50)
+    
+    def test_run_suite(self, mock_config, make_translator):
+        """Test warm-up runs are discarded and timed runs are summarized."""
+        translator = make_translator()
+        cases = select_cases(build_corpus(), ["short", "long"])
+        
+        with patch.object(translator, "_generate_mlx") as mock_gen:
+            mock_gen.return_value = ("你好", GenerationStats(prompt_tokens=10, completion_tokens=3, ttft=0.01, total_time=0.05))
+            result = run_suite(cases, model_size="4b", backend="mlx", warmup=2, repeat=3, translator=translator)
+        
+        short = result["cases"]["short"]
+        assert len(short["latency_ms"]["samples"]) == 3
+        assert short["latency_ms"]["min"] <= short["latency_ms"]["median"] <= short["latency_ms"]["p95"]
+        assert short["ttft_ms"] == 10.0
+        assert short["decode_tokens_per_second"] == 50.0
+        assert short["output"] == "你好"
+        assert result["cases"]["long"]["mode"] == "long"
+        assert result["corpus"]["fingerprint"] == corpus_fingerprint(cases)
+        assert result["config"]["repeat"] == 3
+        # 2 warm-up + 3 timed runs of "short", at least as many of "long"
+        assert mock_gen.call_count >= 10
+        json.dumps(result)
+    
+    def test_invalid_repeat(self, mock_config):
+        """Test at least one timed run is required."""
+        with pytest.raises(ValueError, match="repeat"):
+            run_suite([], repeat=0)
+    
+    def test_save_and_load(self, tmp_path):
+        """Test results round-trip and other JSON is rejected."""
+        path = save_result(_result(), tmp_path / "out" / "run.json")
+        assert load_result(path) == _result()
+        
+        other = tmp_path / "other.json"
+        other.write_text("{}")
+        with pytest.raises(ValueError, match="not a benchmark result"):
+            load_result(other)
+
+
+class TestCompare:
+    """Test regression detection."""
+    
+    def test_flags_regressions(self):
+        """Test slower latency and lower throughput beyond the threshold are regressions."""
+        comparison = compare_results(_result(), _result(median=115.0, p95=125.0, rate=40.0), threshold=0.1)
+        
+        flagged = {delta.metric for delta in comparison.regressions}
+        assert flagged == {"latency_median_ms", "decode_tokens_per_second"}
+        assert comparison.warnings == []
+    
+    def test_improvements_are_not_regressions(self):
+        """Test faster results pass."""
+        comparison = compare_results(_result(), _result(median=50.0, rate=80.0))
+        
+        assert comparison.regressions == []
+        assert any(delta.improvement for delta in comparison.deltas)
+    
+    def test_warns_on_different_corpus(self):
+        """Test differing corpora and missing metrics are reported, not compared."""
+        comparison = compare_results(_result(), _result(ttft=None, fingerprint="def"))
+        
+        assert any("corpus differs" in warning for warning in comparison.warnings)
+        assert "ttft_ms" not in {delta.metric for delta in comparison.deltas}
+
+
+
+def _trial(chunk_size, latency, truncation=0.0, ratio=1.0, score=None):
+    metrics = {"latency_ms": latency, "completion_tokens": 10, "truncation_rate": truncation, "length_ratio": ratio, "chrf": score}
+    return {"chunk_size": chunk_size, "overlap": 0, "split_by": "sentence", "cases": {}, "pairs": {"en-zh": metrics}}
+
+
+class TestChunkingSweep:
+    """Test the chunking sweep and recommendations."""
+    
+    def test_chrf(self):
+        """Test chrF is 100 for identical text, lower for partial matches and 0 for none."""
+        assert chrf("the cat sat", "the cat sat") == pytest.approx(100.0)
+        assert 0 < chrf("the cat", "the cat sat on the mat") < 100
+        assert chrf("xyz", "abc") == 0.0
+        assert chrf("", "abc") == 0.0
+    
+    def test_settings_grid_skips_invalid(self):
+        """Test combinations with overlap not below chunk_size are skipped."""
+        grid = settings_grid((20, 80), (0, 30), ("sentence",))
+        
+        assert {(s["chunk_size"], s["overlap"]) for s in grid} == {(20, 0), (80, 0), (80, 30)}
+    
+    def test_sweep_on_fake_backend(self, mock_config):
+        """Test every setting is run per case with per-chunk metrics."""
+        mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+        translator = Translator()
+        text = " ".join(["The museum is closed on Mondays and public holidays."] * 6)
+        cases = [BenchCase("doc", text, "zh", long=True)]
+        grid = settings_grid((80, 200), (0,), ("sentence",))
+        
+        result = sweep_chunking(cases, {"doc": text}, grid, backend="fake", translator=translator)
+        
+        small, large = (trial["cases"]["doc"] for trial in result["trials"])
+        assert result["kind"] == "chunking"
+        assert small["chunks"] > large["chunks"] >= 1
+        assert small["truncation_rate"] == 0.0
+        assert small["chrf"] > 90
+        assert set(result["trials"][0]["pairs"]) == {"en-zh"}
+    
+    def test_sweep_restores_config(self, mock_config):
+        """Test model, quantization and backend overrides apply to the sweep only, even when it fails."""
+        mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+        before = (mock_config.model_size, mock_config.quantization_bits, mock_config.backend_type)
+        cases = [BenchCase("doc", "The museum is closed on Mondays.", "zh", long=True)]
+        grid = settings_grid((80,), (0,), ("sentence",))
+        
+        result = sweep_chunking(cases, grid=grid, model_size="4b", quantization=8, backend="fake", translator=Translator())
+        
+        assert (result["config"]["model_size"], result["config"]["quantization_bits"]) == ("4b", 8)
+        assert (mock_config.model_size, mock_config.quantization_bits, mock_config.backend_type) == before
+        with patch.object(Translator, "ensure_model_loaded", side_effect=RuntimeError("no model")):
+            with pytest.raises(RuntimeError):
+                sweep_chunking(cases, grid=grid, model_size="4b", backend="fake", translator=Translator())
+        assert (mock_config.model_size, mock_config.quantization_bits, mock_config.backend_type) == before
+    
+    def test_recommend_prefers_quality_then_speed(self):
+        """Test truncation is avoided, then the fastest setting within chrF tolerance wins."""
+        result = {"trials": [
+            _trial(60, 50.0, truncation=0.5, score=70.0),
+            _trial(80, 100.0, score=60.0),
+            _trial(100, 120.0, score=59.5),
+            _trial(150, 90.0, score=40.0),
+        ]}
+        
+        assert recommend(result)["en-zh"]["chunk_size"] == 80
+        result["trials"][2]["pairs"]["en-zh"]["latency_ms"] = 80.0
+        assert recommend(result)["en-zh"]["chunk_size"] == 100
+    
+    def test_recommend_uses_length_ratio_without_references(self):
+        """Test settings whose length ratio is off the median are skipped without chrF."""
+        result = {"trials": [_trial(60, 10.0, ratio=0.4), _trial(80, 30.0), _trial(100, 20.0, ratio=1.05)]}
+        
+        assert recommend(result)["en-zh"]["chunk_size"] == 100
+    
+    def test_apply_recommendations(self, mock_config):
+        """Test tuned settings are saved per model and pair and used by chunking_for."""
+        mock_config.model_size = "4b"  # a sweep override, must not be saved
+        apply_recommendations({"en-zh": {"chunk_size": 150, "overlap": 10, "split_by": "paragraph"}}, "27b")
+        
+        config = Config(mock_config.config_path)
+        assert config.chunking_for("27b", "en", "zh") == (150, 10, "paragraph")
+        assert config.chunking_for("27b", "en", "ja") == (config.chunk_size, config.chunk_overlap, config.chunk_split_by)
+        assert config.chunking_for("4b", "en", "zh")[0] == config.chunk_size
+        assert config.model_size == "27b"
+        with pytest.raises(ValueError):
+            config.set_tuned_chunking("27b", "en-zh", {"chunk_size": 50, "overlap": 50, "split_by": "sentence"})
+    
+    def test_translate_long_uses_tuned_settings(self, mock_config):
+        """Test translate_long picks up tuned settings unless given explicitly."""
+        mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+        mock_config.set_tuned_chunking("4b", "en-zh", {"chunk_size": 60, "overlap": 0, "split_by": "sentence"})
+        translator = Translator()
+        translator.ensure_model_loaded("4b", "fake")
+        text = " ".join(["The museum is closed on Mondays and public holidays."] * 6)
+        
+        with patch("translategemma_cli.translator.TextChunker", wraps=TextChunker) as chunker:
+            translator.translate_long(text, force_target="zh")
+            translator.translate_long(text, force_target="zh", chunk_size=200)
+        
+        # TextChunker() without arguments is the merge helper
+        splits = [call.kwargs for call in chunker.call_args_list if call.kwargs]
+        assert splits[0] == {"chunk_size": 60, "overlap": 0, "split_by": "sentence"}
+        assert splits[1]["chunk_size"] == 200
+
+
+class TestBenchCommand:
+    """Test the bench CLI command."""
+    
+    def test_compare_exit_code(self, tmp_path):
+        """Test compare exits non-zero only when something regressed."""
+        runner = CliRunner()
+        baseline = save_result(_result(), tmp_path / "a.json")
+        same = save_result(_result(), tmp_path / "b.json")
+        slower = save_result(_result(median=200.0), tmp_path / "c.json")
+        
+        assert runner.invoke(app, ["bench", "compare", str(baseline), str(same)]).exit_code == 0
+        result = runner.invoke(app, ["bench", "compare", str(baseline), str(slower)])
+        assert result.exit_code == 1
+        assert "regression" in result.output
+    
+    def test_unknown_case(self):
+        """Test run rejects unknown case names before loading a model."""
+        result = CliRunner().invoke(app, ["bench", "run", "--cases", "huge"])
+        
+        assert result.exit_code == 1
@@ -0,0 +1,186 @@
+"""Tests for offline model bundle export and import."""
+
+import io
+import os
+import tarfile
+
+import pytest
+from typer.testing import CliRunner
+
+from translategemma_cli.bundle import (
+    ALIGNMENT,
+    BundleError,
+    export_bundle,
+    find_models,
+    import_bundle,
+    models_dir,
+)
+from translategemma_cli.cli import app
+from translategemma_cli.config import get_model_path
+
+TOKENIZER = b'{"model": {"vocab": {"hello": 1}}}' * 2000
+
+
+@pytest.fixture
+def models(mock_config):
+    """A GGUF model and two HF model directories sharing a tokenizer."""
+    gguf = get_model_path("4b", 4, "gguf")
+    gguf.parent.mkdir(parents=True)
+    gguf.write_bytes(os.urandom(300_001))
+    for size, weights in (("4b", 70_000), ("12b", 5)):
+        hf = get_model_path(size, 4, "hf")
+        hf.mkdir()
+        (hf / "config.json").write_text(f'{{"size": "{size}"}}')
+        (hf / "tokenizer.json").write_bytes(TOKENIZER)
+        (hf / "model.safetensors").write_bytes(os.urandom(weights))
+    return find_models()
+
+
+def snapshot_files(root):
+    """Contents of every file under root by relative path."""
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def export_to(path, models):
+    """Export models to a bundle file."""
+    with open(path, "wb") as f:
+        return export_bundle(models, f)
+
+
+def clear_models():
+    """Empty the models directory, as on a fresh machine."""
+    for path in models_dir().iterdir():
+        if path.is_dir():
+            for file in path.iterdir():
+                file.unlink()
+            path.rmdir()
+        else:
+            path.unlink()
+
+
+class TestExport:
+    """Test the bundle layout."""
+    
+    def test_find_models(self, models):
+        """Test downloaded models are found in both formats."""
+        assert [(m.format, m.size, m.bits) for m in models] == [("gguf", "4b", 4), ("hf", "4b", 4), ("hf", "12b", 4)]
+        assert find_models("12b", 8) == []
+    
+    def test_layout(self, models, tmp_path):
+        """Test weights are aligned, small files compressed or linked, manifest last."""
+        manifest = export_to(tmp_path / "bundle.tar", models)
+        
+        with tarfile.open(tmp_path / "bundle.tar") as tar:
+            members = {member.name: member for member in tar.getmembers()}
+            names = tar.getnames()
+        assert names[-1] == "manifest.json"
+        for name in ("translategemma-4b-it-Q4.gguf", "translategemma-4b-it-4bit/model.safetensors"):
+            assert members[name].offset_data % ALIGNMENT == 0
+        assert "translategemma-4b-it-4bit/tokenizer.json.gz" in members
+        assert members["translategemma-12b-it-4bit/tokenizer.json"].islnk()
+        assert manifest["files"]["translategemma-12b-it-4bit/tokenizer.json"]["link"] == "translategemma-4b-it-4bit/tokenizer.json.gz"
+        assert len(manifest["models"]) == 3
+
+
+class TestImport:
+    """Test unpacking bundles into the cache."""
+    
+    def test_round_trip(self, models, tmp_path):
+        """Test a file import restores every file and hard links shared ones."""
+        before = snapshot_files(models_dir())
+        export_to(tmp_path / "bundle.tar", models)
+        clear_models()
+        
+        imported, skipped = import_bundle(tmp_path / "bundle.tar")
+        
+        assert len(imported) == 3 and skipped == []
+        assert snapshot_files(models_dir()) == before
+        first = get_model_path("4b", 4, "hf") / "tokenizer.json"
+        second = get_model_path("12b", 4, "hf") / "tokenizer.json"
+        assert first.stat().st_ino == second.stat().st_ino
+        assert [path.name for path in models_dir().iterdir() if path.name.startswith(".import-")] == []
+    
+    def test_stream_import(self, models):
+        """Test a bundle can be imported from a non-seekable stream."""
+        before = snapshot_files(models_dir())
+        buffer = io.BytesIO()
+        export_bundle(models, buffer)
+        clear_models()
+        
+        import_bundle(io.BytesIO(buffer.getvalue()))
+        
+        assert snapshot_files(models_dir()) == before
+    
+    def test_existing_models_skipped_unless_forced(self, models, tmp_path):
+        """Test models already in the cache are kept unless force is set."""
+        export_to(tmp_path / "bundle.tar", models)
+        (get_model_path("4b", 4, "gguf")).write_bytes(b"local")
+        
+        imported, skipped = import_bundle(tmp_path / "bundle.tar")
+        assert len(skipped) == 3 and imported == []
+        assert get_model_path("4b", 4, "gguf").read_bytes() == b"local"
+        
+        imported, skipped = import_bundle(tmp_path / "bundle.tar", force=True)
+        assert len(imported) == 3
+        assert get_model_path("4b", 4, "gguf").stat().st_size == 300_001
+    
+    def test_corrupted_weights_rejected(self, models, tmp_path):
+        """Test a flipped byte fails verification and nothing is installed."""
+        path = tmp_path / "bundle.tar"
+        export_to(path, models)
+        with tarfile.open(path) as tar:
+            offset = tar.getmember("translategemma-4b-it-Q4.gguf").offset_data
+        data = bytearray(path.read_bytes())
+        data[offset + 10] ^= 0xFF
+        path.write_bytes(bytes(data))
+        clear_models()
+        
+        with pytest.raises(BundleError, match="Checksum mismatch"):
+            import_bundle(path)
+        assert list(models_dir().iterdir()) == []
+    
+    def test_truncated_bundle_rejected(self, models, tmp_path):
+        """Test a bundle cut before its manifest is rejected."""
+        buffer = io.BytesIO()
+        export_bundle(models, buffer)
+        clear_models()
+        
+        with pytest.raises(BundleError):
+            import_bundle(io.BytesIO(buffer.getvalue()[:350_000]))
+        assert list(models_dir().iterdir()) == []
+    
+    def test_unsafe_path_rejected(self, mock_config, tmp_path):
+        """Test members escaping the models directory are refused."""
+        path = tmp_path / "evil.tar"
+        with tarfile.open(path, "w") as tar:
+            info = tarfile.TarInfo("../evil.gguf")
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"evil"))
+        
+        with pytest.raises(BundleError, match="Unsafe path"):
+            import_bundle(path)
+        assert not (models_dir().parent / "evil.gguf").exists()
+
+
+class TestBundleCommands:
+    """Test translate model export/import."""
+    
+    def test_export_import(self, models, tmp_path):
+        """Test a CLI round trip for one size and quantization."""
+        runner = CliRunner()
+        bundle = tmp_path / "4b.tar"
+        
+        result = runner.invoke(app, ["model", "export", "4b", "--bits", "4", "-o", str(bundle)])
+        assert result.exit_code == 0
+        clear_models()
+        result = runner.invoke(app, ["model", "import", str(bundle)])
+        
+        assert result.exit_code == 0
+        assert get_model_path("4b", 4, "gguf").exists()
+        assert not get_model_path("12b", 4, "hf").exists()
+    
+    def test_export_needs_size(self, models):
+        """Test export without a size or --all is refused."""
+        result = CliRunner().invoke(app, ["model", "export"])
+        
+        assert result.exit_code == 1
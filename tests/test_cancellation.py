@@ -0,0 +1,149 @@
+"""Tests for cooperative cancellation."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from translategemma_cli.cancellation import (
+    CancellationToken,
+    TranslationCancelled,
+    raise_if_cancelled,
+)
+from translategemma_cli.stats import GenerationStats
+from translategemma_cli.translator import Translator
+
+
+class TestCancellationToken:
+    """Test CancellationToken behavior."""
+    
+    def test_initial_state(self):
+        """Test token starts uncancelled."""
+        token = CancellationToken()
+        
+        assert token.is_cancelled is False
+        token.raise_if_cancelled()  # Should not raise
+    
+    def test_cancel(self):
+        """Test cancelling sets the flag and records the reason."""
+        token = CancellationToken()
+        token.cancel("Client disconnected")
+        
+        assert token.is_cancelled is True
+        with pytest.raises(TranslationCancelled, match="Client disconnected"):
+            token.raise_if_cancelled()
+    
+    def test_first_reason_wins(self):
+        """Test later cancel calls keep the original reason."""
+        token = CancellationToken()
+        token.cancel("first")
+        token.cancel("second")
+        
+        assert token.reason == "first"
+    
+    def test_child_follows_parent(self):
+        """Test child token is cancelled with its parent."""
+        parent = CancellationToken()
+        child = parent.child()
+        
+        parent.cancel()
+        assert child.is_cancelled is True
+    
+    def test_child_does_not_cancel_parent(self):
+        """Test cancelling a child leaves the parent running."""
+        parent = CancellationToken()
+        child = parent.child()
+        
+        child.cancel()
+        assert child.is_cancelled is True
+        assert parent.is_cancelled is False
+    
+    def test_raise_if_cancelled_none(self):
+        """Test helper accepts a missing token."""
+        raise_if_cancelled(None)
+
+
+def _gguf_translator(pieces):
+    """Create a translator whose llama-cpp model streams the given pieces."""
+    translator = Translator()
+    translator._backend = "gguf"
+    translator._current_model_size = "4b"
+    
+    consumed = []
+    
+    def completion(prompt, stream=False, **kwargs):
+        assert stream is True
+        for piece in pieces:
+            consumed.append(piece)
+            yield {"choices": [{"text": piece}]}
+    
+    model = MagicMock(side_effect=completion)
+    model.tokenize.side_effect = lambda data, **kwargs: data.split()
+    translator._model = model
+    translator._tokenizer = model
+    return translator, consumed
+
+
+class TestTranslatorCancellation:
+    """Test cancellation inside the translation engine."""
+    
+    def test_translate_cancelled_before_start(self, mock_config):
+        """Test an already-cancelled token never reaches the backend."""
+        translator, consumed = _gguf_translator(["Hello"])
+        token = CancellationToken()
+        token.cancel()
+        
+        with pytest.raises(TranslationCancelled):
+            translator.translate("你好", cancel_token=token)
+        assert consumed == []
+    
+    def test_gguf_generation_completes(self, mock_config):
+        """Test token-by-token GGUF generation returns the full text."""
+        translator, _ = _gguf_translator(["Hello", " world"])
+        
+        result, stats = translator._generate_gguf("prompt", 16, CancellationToken())
+        
+        assert result == "Hello world"
+        assert stats.completion_tokens == 2
+    
+    def test_gguf_tokens_counted_from_text(self, mock_config):
+        """Test completion tokens come from the generated text, not the number of streamed parts."""
+        translator, _ = _gguf_translator(["", "Hello world again", ""])
+        
+        _, stats = translator._generate_gguf("prompt", 16, CancellationToken())
+        
+        assert stats.completion_tokens == 3
+        assert translator._model.tokenize.call_args.kwargs["add_bos"] is False
+    
+    def test_gguf_iteration_aborted(self, mock_config):
+        """Test cancelling mid-stream stops pulling tokens from llama-cpp."""
+        translator, consumed = _gguf_translator(["a", "b", "c", "d"])
+        token = CancellationToken()
+        
+        received = []
+        with pytest.raises(TranslationCancelled):
+            for piece, _, _ in translator._stream_gguf("prompt", 16, "en", "yue", token):
+                received.append(piece)
+                if len(received) == 2:
+                    token.cancel()
+        
+        assert received == ["a", "b"]
+        assert len(consumed) < 4
+    
+    def test_translate_long_stops_between_chunks(self, mock_config):
+        """Test remaining chunks are skipped once cancelled."""
+        translator, _ = _gguf_translator([])
+        token = CancellationToken()
+        calls = []
+        
+        def fake_generate(prompt, max_tokens, cancel_token=None, params=None):
+            calls.append(prompt)
+            token.cancel()
+            return "x", GenerationStats()
+        
+        translator._generate_gguf = fake_generate
+        text = "First sentence here. " * 20
+        
+        with pytest.raises(TranslationCancelled):
+            translator.translate_long(text, chunk_size=50, overlap=0, cancel_token=token)
+        
+        assert len(calls) == 1
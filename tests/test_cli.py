@@ -7,6 +7,7 @@
 
 from translategemma_cli.cli import app
 from translategemma_cli.config import MODEL_SIZES
+from translategemma_cli.stats import GenerationStats
 
 
 @pytest.fixture
@@ -218,6 +219,43 @@ def test_text_subcommand_translation(
         result = runner.invoke(app, ["text", "Hello"])
         
         assert result.exit_code == 0
+    
+    
+    @patch("translategemma_cli.cli.is_model_ready", return_value=True)
+    @patch("translategemma_cli.cli.get_translator")
+    def test_verbose_prints_stats(
+        self, mock_get_translator, mock_ready, runner, mock_config
+    ):
+        """Test --verbose reports token counts and timing."""
+        mock_translator = MagicMock()
+        mock_translator.translate.return_value = ("你好", "en", "yue")
+        mock_translator.last_stats = GenerationStats(
+            prompt_tokens=12, completion_tokens=5, ttft=0.1, total_time=0.5, stop_reason="stop"
+        )
+        mock_get_translator.return_value = mock_translator
+        
+        result = runner.invoke(app, ["--verbose", "--text", "Hello"])
+        
+        assert result.exit_code == 0
+        assert "prompt 12 tok" in result.output
+        assert "decode 10.0 tok/s" in result.output
+    
+    @patch("translategemma_cli.cli.is_model_ready", return_value=True)
+    @patch("translategemma_cli.cli.get_translator")
+    def test_profile_writes_pstats(
+        self, mock_get_translator, mock_ready, runner, mock_config, tmp_path
+    ):
+        """Test --profile writes a pstats file and prints the summary."""
+        mock_translator = MagicMock()
+        mock_translator.translate.return_value = ("你好", "en", "yue")
+        mock_get_translator.return_value = mock_translator
+        out = tmp_path / "run.prof"
+        
+        result = runner.invoke(app, ["--profile", "--profile-out", str(out), "--text", "Hello"])
+        
+        assert result.exit_code == 0
+        assert out.exists()
+        assert "outside model" in result.output
 
 
 class TestFileTranslation:
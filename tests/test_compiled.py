@@ -0,0 +1,162 @@
+"""Tests for the compiled PyTorch mode: prompt buckets, config and the mode benchmark."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from translategemma_cli.bench import BenchCase, compare_pytorch
+from translategemma_cli import compiled
+from translategemma_cli.compiled import (
+    TEMPLATE_TOKENS,
+    bucket_length,
+    cache_length,
+    compiled_shapes,
+    completion_budget,
+    pad_prompt,
+    prompt_buckets,
+)
+from translategemma_cli.translator import Translator
+
+
+class TestPromptBuckets:
+    """Test prompt bucket lengths and padding."""
+    
+    def test_buckets_double_up_to_largest_prompt(self):
+        """Test buckets double from the minimum and end at the largest prompt."""
+        assert prompt_buckets(100) == (64, 128, 100 + TEMPLATE_TOKENS)
+        assert prompt_buckets(400)[-1] == 400 + TEMPLATE_TOKENS
+    
+    def test_invalid_chunk_size(self):
+        """Test chunk sizes must be positive."""
+        with pytest.raises(ValueError):
+            prompt_buckets(0)
+    
+    def test_bucket_length(self):
+        """Test the smallest fitting bucket is chosen, or None past the largest."""
+        assert bucket_length(10, (64, 128)) == 64
+        assert bucket_length(64, (128, 64)) == 64
+        assert bucket_length(65, (64, 128)) == 128
+        assert bucket_length(129, (64, 128)) is None
+    
+    def test_pad_prompt(self):
+        """Test prompts are left-padded with a matching attention mask."""
+        input_ids, attention_mask = pad_prompt([5, 6, 7], (4, 8), pad_token_id=0)
+        
+        assert input_ids == [0, 5, 6, 7]
+        assert attention_mask == [0, 1, 1, 1]
+    
+    def test_long_prompt_unpadded(self):
+        """Test prompts longer than every bucket are left as they are."""
+        assert pad_prompt([1, 2, 3], (2,), pad_token_id=0) == ([1, 2, 3], [1, 1, 1])
+    
+    def test_cache_length(self):
+        """Test the static cache holds the largest prompt and a full completion."""
+        assert cache_length((64, 228), 512) == 740
+    
+    def test_completion_budget(self):
+        """Test completions stop at the static cache, unless the prompt alone fills it."""
+        assert completion_budget(512, 228, 740) == 512
+        assert completion_budget(2048, 228, 740) == 512
+        assert completion_budget(2048, 64, 740) == 676
+        assert completion_budget(100, 800, 740) == 100
+
+
+class TestCompiledTranslator:
+    """Test the translator only pads and clamps for models that actually compiled."""
+    
+    def load(self, mock_config, model):
+        """Load model as a PyTorch model in compiled mode."""
+        mock_config.pytorch_mode = "compiled"
+        translator = Translator()
+        with patch("translategemma_cli.translator.load_model", return_value=(model, MagicMock(eos_token_id=1), "pytorch")):
+            translator.ensure_model_loaded("4b", "pytorch")
+        return translator
+    
+    def test_eager_fallback_not_padded(self, mock_config):
+        """Test a model left in eager mode (no torch.compile) gets no prompt buckets."""
+        translator = self.load(mock_config, MagicMock())
+        
+        assert compiled_shapes(translator._model) is None
+        assert translator._prompt_buckets is None
+        assert translator._pytorch_kwargs(2048, prompt_length=64)["max_new_tokens"] == 2048
+    
+    def test_compiled_shapes_used(self, mock_config):
+        """Test the loader's buckets are used and completions stop at the static cache."""
+        model = MagicMock()
+        compiled._compiled[model] = ((64, 228), 740)
+        
+        translator = self.load(mock_config, model)
+        
+        assert translator._prompt_buckets == (64, 228)
+        assert translator._pytorch_kwargs(2048, prompt_length=228)["max_new_tokens"] == 512
+        assert translator._pytorch_kwargs(256, prompt_length=228)["max_new_tokens"] == 256
+        translator.unload()
+        assert translator._static_cache_length is None
+
+
+class TestPytorchModeConfig:
+    """Test the PyTorch mode and chunk size settings."""
+    
+    def test_default_mode(self, mock_config):
+        """Test eager mode is the default."""
+        assert mock_config.pytorch_mode == "eager"
+    
+    def test_set_mode(self, mock_config):
+        """Test the mode can be switched to compiled."""
+        mock_config.pytorch_mode = "compiled"
+        assert mock_config.pytorch_mode == "compiled"
+    
+    def test_invalid_mode(self, mock_config):
+        """Test unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            mock_config.pytorch_mode = "jit"
+    
+    def test_max_chunk_size_includes_tuned(self, mock_config):
+        """Test the largest chunk accounts for pairs tuned for the model only."""
+        mock_config.set_tuned_chunking("4b", "en-zh", {"chunk_size": 150, "overlap": 0, "split_by": "sentence"})
+        
+        assert mock_config.max_chunk_size("4b") == 150
+        assert mock_config.max_chunk_size("27b") == mock_config.chunk_size
+
+
+class TestComparePytorch:
+    """Test the PyTorch variant benchmark."""
+    
+    def suite(self, medians):
+        """A run_suite() stand-in returning the next variant's medians."""
+        results = iter(medians)
+        
+        def run_suite(cases, **kwargs):
+            from translategemma_cli.config import get_config
+            
+            latency = next(results)
+            return {
+                "config": {"model_size": "4b", "quantization_bits": 4, "pytorch_mode": get_config().pytorch_mode},
+                "load_time_s": 1.0,
+                "cases": {name: {"latency_ms": {"median": value}} for name, value in latency.items()},
+            }
+        
+        return run_suite
+    
+    def test_compares_modes(self, mock_config):
+        """Test each mode runs with its setting and speedups are relative to the first."""
+        cases = [BenchCase("short", "Hello world.", "zh")]
+        run_suite = self.suite([{"short": 300.0}, {"short": 100.0}])
+        
+        with patch("translategemma_cli.bench.pytorch.run_suite", side_effect=run_suite):
+            result = compare_pytorch(cases=cases, repeat=1)
+        
+        assert result["baseline"] == "eager"
+        assert result["variants"]["eager"]["config"]["pytorch_mode"] == "eager"
+        assert result["variants"]["compiled"]["config"]["pytorch_mode"] == "compiled"
+        assert result["speedup"]["compiled"] == {"cases": {"short": 3.0}, "total": 3.0}
+        assert result["variants"]["compiled"]["memory"]["rss_mb"] > 0
+        assert mock_config.pytorch_mode == "eager"
+    
+    def test_restores_settings_on_failure(self, mock_config):
+        """Test the config is restored when a variant fails."""
+        with patch("translategemma_cli.bench.pytorch.run_suite", side_effect=RuntimeError("no torch")):
+            with pytest.raises(RuntimeError):
+                compare_pytorch({"compiled": {"pytorch_mode": "compiled"}})
+        
+        assert mock_config.pytorch_mode == "eager"
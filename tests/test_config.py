@@ -16,6 +16,8 @@
     DEFAULT_LANGUAGES,
     CJK_LANGUAGES,
     DEFAULT_MODEL_SIZE,
+    GenerationParams,
+    RequestContext,
 )
 
 
@@ -189,3 +191,44 @@ def test_reset_config(self, monkeypatch, temp_config_dir, temp_cache_dir):
         
         # After reset, should be a new instance
         assert config1 is not config2
+
+
+class TestRequestContext:
+    """Test per-request settings snapshots."""
+    
+    def test_snapshot_is_frozen(self, mock_config):
+        """Test a snapshot copies the config and cannot be changed."""
+        mock_config.temperature = 0.7
+        mock_config.languages = ("ja", "en")
+        
+        context = RequestContext.from_config()
+        
+        assert context.generation.temperature == 0.7
+        assert context.languages == ("ja", "en")
+        with pytest.raises(AttributeError):
+            context.generation.temperature = 0.0
+    
+    def test_snapshot_ignores_later_changes(self, mock_config):
+        """Test changing the config does not affect a snapshot already taken."""
+        params = GenerationParams.from_config()
+        
+        mock_config.top_p = 0.9
+        mock_config.repetition_penalty = 1.3
+        
+        assert params.top_p == 1.0
+        assert params.repetition_penalty == 1.0
+        assert GenerationParams.from_config().repetition_penalty == 1.3
+    
+    def test_overrides(self, mock_config):
+        """Test per-request settings replace the config's and are validated."""
+        mock_config.top_p = 0.9
+        
+        context = RequestContext.from_config(temperature=0.5, top_k=None)
+        
+        assert context.generation == GenerationParams(temperature=0.5, top_p=0.9)
+        assert mock_config.temperature == 0.0
+        assert hash(context.generation) == hash(GenerationParams(temperature=0.5, top_p=0.9))
+        with pytest.raises(ValueError, match="temperature"):
+            RequestContext.from_config(temperature=3.0)
+        with pytest.raises(TypeError):
+            RequestContext.from_config(beam_width=4)
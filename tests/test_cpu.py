@@ -0,0 +1,103 @@
+"""Tests for CPU topology, thread settings and int8 quantization of the PyTorch backend."""
+
+import sys
+
+import pytest
+
+from translategemma_cli import cpu
+
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch):
+    """Fake sysfs: two NUMA nodes of two cores with two hyper-threads each."""
+    for node, cpus in {0: "0-1,4-5", 1: "2-3,6-7"}.items():
+        (tmp_path / "node" / f"node{node}").mkdir(parents=True)
+        (tmp_path / "node" / f"node{node}" / "cpulist").write_text(cpus + "\n")
+    for number in range(8):
+        topology = tmp_path / "cpu" / f"cpu{number}" / "topology"
+        topology.mkdir(parents=True)
+        (topology / "physical_package_id").write_text(f"{number % 4 // 2}\n")
+        (topology / "core_id").write_text(f"{number % 2}\n")
+    monkeypatch.setattr(cpu, "_SYSFS", tmp_path)
+    return tmp_path
+
+
+class TestTopology:
+    """Test CPU lists, NUMA nodes and physical core counts."""
+    
+    def test_parse_cpu_list(self):
+        """Test ranges and single CPUs are expanded."""
+        assert cpu.parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+        assert cpu.parse_cpu_list("") == []
+    
+    def test_parse_invalid_cpu_list(self):
+        """Test malformed lists are rejected."""
+        with pytest.raises(ValueError):
+            cpu.parse_cpu_list("0-a")
+    
+    def test_numa_nodes(self, sysfs):
+        """Test each node's CPUs are read."""
+        assert cpu.numa_nodes() == {0: [0, 1, 4, 5], 1: [2, 3, 6, 7]}
+    
+    def test_physical_cores(self, sysfs):
+        """Test hyper-threads of one core count once."""
+        assert cpu.physical_cores(range(8)) == 4
+        assert cpu.physical_cores([0, 1, 4, 5]) == 2
+        assert cpu.physical_cores([0, 4]) == 1
+    
+    def test_no_topology(self, tmp_path, monkeypatch):
+        """Test every CPU counts as a core and there are no nodes without sysfs."""
+        monkeypatch.setattr(cpu, "_SYSFS", tmp_path)
+        
+        assert cpu.physical_cores([0, 1, 2]) == 3
+        assert cpu.numa_nodes() == {}
+    
+    def test_pin_to_unknown_node(self, sysfs):
+        """Test pinning to a node that does not exist is rejected."""
+        with pytest.raises(ValueError, match="Unknown NUMA node 2"):
+            cpu.pin_to_node(2)
+    
+    def test_thread_settings_without_torch(self, monkeypatch):
+        """Test thread counts are None when torch is not loaded."""
+        monkeypatch.delitem(sys.modules, "torch", raising=False)
+        
+        settings = cpu.thread_settings()
+        
+        assert settings["cpus"] >= 1
+        assert settings["threads"] is None
+
+
+class TestCpuConfig:
+    """Test the CPU settings of the PyTorch backend."""
+    
+    def test_defaults(self, mock_config):
+        """Test float32 weights, automatic threads and no pinning by default."""
+        assert mock_config.pytorch_cpu_dtype == "float32"
+        assert mock_config.pytorch_threads is None
+        assert mock_config.pytorch_interop_threads is None
+        assert mock_config.pytorch_numa_node is None
+    
+    def test_set_cpu_dtype(self, mock_config):
+        """Test the CPU dtype can be changed and is validated."""
+        mock_config.pytorch_cpu_dtype = "int8"
+        assert mock_config.pytorch_cpu_dtype == "int8"
+        
+        with pytest.raises(ValueError):
+            mock_config.pytorch_cpu_dtype = "float16"
+
+
+class TestQuantizeInt8:
+    """Test int8 dynamic quantization of linear layers."""
+    
+    def test_linear_layers_quantized(self):
+        """Test every linear layer is replaced and the model still runs in float32."""
+        torch = pytest.importorskip("torch")
+        model = torch.nn.Sequential(
+            torch.nn.Linear(8, 16),
+            torch.nn.LayerNorm(16),
+            torch.nn.Sequential(torch.nn.Linear(16, 4)),
+        ).to(torch.bfloat16)
+        
+        assert cpu.quantize_int8(model) == 2
+        assert not any(isinstance(module, torch.nn.Linear) for module in model.modules())
+        assert model(torch.randn(2, 8)).shape == (2, 4)
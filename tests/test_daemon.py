@@ -0,0 +1,186 @@
+"""Tests for the warm-model daemon and CLI forwarding."""
+
+import socket
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from translategemma_cli import daemon
+from translategemma_cli.cli import app
+from translategemma_cli.daemon import DaemonError, DaemonUnavailable, TranslationDaemon
+from translategemma_cli.translator import Translator
+
+pytestmark = pytest.mark.skipif(not daemon.daemon_supported(), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def fake_translator(mock_config):
+    """A Translator on the zero-latency fake backend."""
+    mock_config.backend_type = "fake"
+    mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+    translator = Translator()
+    translator.ensure_model_loaded("4b")
+    return translator
+
+
+@pytest.fixture
+def running(fake_translator, mock_config):
+    """A daemon serving fake_translator on the config's socket path."""
+    with TranslationDaemon(idle_timeout=0, translator=fake_translator) as server:
+        yield server
+
+
+class TestProtocol:
+    """Test requests against a running daemon."""
+    
+    def test_translate(self, running):
+        """Test a translation comes back with its stats."""
+        translation, stats = daemon.translate("Hello world", target_lang="ja")
+        
+        assert translation == "Hello world"
+        assert stats.completion_tokens > 0
+        assert running.requests == 1
+    
+    def test_stream_chunks(self, running):
+        """Test chunked streaming sends tokens before the final result."""
+        tokens = []
+        text = "This is one sentence. This is another one. And a third sentence here."
+        
+        translation, _ = daemon.translate(text, target_lang="ja", stream=True, chunk_size=20, on_token=tokens.append)
+        
+        assert len(tokens) > 1
+        assert "".join(tokens) == translation
+    
+    def test_keeps_served_model(self, running, mock_config):
+        """Test requests without a model size keep the daemon's model, not the config default."""
+        mock_config.model_size = "27b"
+        
+        daemon.translate("Hello world", target_lang="ja")
+        
+        assert running.translator.current_model_size == "4b"
+    
+    def test_status(self, running):
+        """Test status reports the resident model."""
+        info = daemon.status()
+        
+        assert info["model_size"] == "4b"
+        assert info["backend"] == "fake"
+        assert info["busy"] is False
+    
+    def test_errors(self, running):
+        """Test unknown ops and empty texts are answered with errors."""
+        with pytest.raises(DaemonError, match="Unknown op"):
+            list(daemon.request({"op": "nope"}))
+        with pytest.raises(DaemonError, match="text is required"):
+            daemon.translate("")
+    
+    def test_hangup_cancels_translation(self, running, mock_config):
+        """Test a client hanging up mid-translation cancels a non-stream request."""
+        started = threading.Event()
+        cancelled = threading.Event()
+        
+        def slow_translate(text, force_target=None, mode="direct", cancel_token=None):
+            started.set()
+            if cancel_token.wait(5):
+                cancelled.set()
+                cancel_token.raise_if_cancelled()
+            return text, "en", "ja"
+        
+        running.translator.translate = slow_translate
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(mock_config.daemon_socket))
+        sock.sendall(b'{"op": "translate", "text": "Hello", "no_chunk": true}\n')
+        assert started.wait(5)
+        sock.close()
+        
+        assert cancelled.wait(2)
+        deadline = time.monotonic() + 2
+        while running.status()["busy"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not running.status()["busy"]
+    
+    def test_shutdown(self, running, mock_config):
+        """Test a shutdown request stops the daemon and removes the socket."""
+        daemon.shutdown()
+        deadline = time.monotonic() + 5
+        while daemon.is_running() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        
+        assert not daemon.is_running()
+        assert not mock_config.daemon_socket.exists()
+
+
+class TestLifecycle:
+    """Test binding, stale sockets and the idle timeout."""
+    
+    def test_unavailable(self, mock_config):
+        """Test requests without a daemon raise DaemonUnavailable."""
+        assert not daemon.is_running()
+        with pytest.raises(DaemonUnavailable):
+            daemon.status()
+    
+    def test_stale_socket_replaced(self, fake_translator, mock_config):
+        """Test a socket file nobody listens on is replaced."""
+        path = mock_config.daemon_socket
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+        
+        assert path.exists() and not daemon.is_running()
+        with TranslationDaemon(idle_timeout=0, translator=fake_translator):
+            assert daemon.is_running()
+    
+    def test_second_daemon_refused(self, running, fake_translator):
+        """Test a second daemon does not take over a live socket."""
+        with pytest.raises(RuntimeError, match="already running"):
+            TranslationDaemon(translator=fake_translator).bind()
+    
+    def test_idle_timeout(self, fake_translator):
+        """Test the daemon exits after idle_timeout without requests."""
+        server = TranslationDaemon(idle_timeout=0.5, translator=fake_translator).start()
+        
+        deadline = time.monotonic() + 5
+        while daemon.is_running() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        
+        assert not daemon.is_running()
+        server.stop()
+
+
+class TestCliForwarding:
+    """Test single-shot CLI calls use a running daemon."""
+    
+    @patch("translategemma_cli.cli.get_translator")
+    def test_forwards_to_daemon(self, mock_get_translator, running):
+        """Test the text is translated by the daemon, not a local model."""
+        result = CliRunner().invoke(app, ["--text", "Hello", "--to", "ja", "-v"])
+        
+        assert result.exit_code == 0, result.output
+        assert "Hello" in result.output
+        assert "completion" in result.output
+        mock_get_translator.assert_not_called()
+        assert running.requests == 1
+    
+    @patch("translategemma_cli.cli.is_model_ready", return_value=True)
+    @patch("translategemma_cli.cli.get_translator")
+    def test_no_daemon_flag(self, mock_get_translator, mock_ready, running):
+        """Test --no-daemon and sampling overrides translate locally."""
+        translator = MagicMock()
+        translator.translate.return_value = ("local", "en", "ja")
+        mock_get_translator.return_value = translator
+        
+        for args in (["--no-daemon"], ["--temperature", "0.5"]):
+            result = CliRunner().invoke(app, ["--text", "Hello", "--to", "ja", *args])
+            assert result.exit_code == 0, result.output
+            assert "local" in result.output
+        assert running.requests == 0
+    
+    def test_daemon_status_command(self, mock_config):
+        """Test `translate daemon status` exits 1 without a daemon."""
+        result = CliRunner().invoke(app, ["daemon", "status"])
+        
+        assert result.exit_code == 1
+        assert "No daemon running" in result.output
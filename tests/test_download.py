@@ -0,0 +1,143 @@
+"""Tests for parallel, resumable, checksum-verified downloads."""
+
+import hashlib
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli.config import get_model_path
+from translategemma_cli.download import DownloadError, RemoteFile, download_file
+from translategemma_cli.fake_servers import FakeFileServer
+from translategemma_cli.model import download_gguf_models
+
+PART = 64 * 1024
+DATA = os.urandom(5 * PART + 123)
+SHA = hashlib.sha256(DATA).hexdigest()
+
+
+@pytest.fixture
+def server():
+    """A file server with one weight file."""
+    with FakeFileServer({"/model.gguf": DATA}) as server:
+        yield server
+
+
+def remote(server, **kwargs):
+    """The weight file on server, with correct metadata unless overridden."""
+    return RemoteFile(**{"url": f"{server.url}/model.gguf", "size": len(DATA), "sha256": SHA, **kwargs})
+
+
+def ranges(server):
+    """Start offsets of the range requests made after the probe."""
+    return sorted(int(r["range"][len("bytes="):].split("-")[0]) for r in server.requests[1:])
+
+
+class TestDownloadFile:
+    """Test the download manager against a local file server."""
+    
+    def test_parallel_ranges(self, server, tmp_path):
+        """Test parts are fetched with range requests and the file is moved into place."""
+        progress = []
+        dest = download_file(remote(server), tmp_path / "model.gguf", connections=3, part_size=PART, on_progress=progress.append)
+        
+        assert dest.read_bytes() == DATA
+        assert sum(progress) == len(DATA)
+        assert ranges(server) == [0, PART, 2 * PART, 3 * PART, 4 * PART, 5 * PART]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["model.gguf"]
+    
+    def test_resume_after_interruption(self, server, tmp_path):
+        """Test a stopped download keeps finished parts and resumes with the rest."""
+        stop = threading.Event()
+        written = []
+        
+        def interrupt(n):
+            written.append(n)
+            if sum(written) >= 2 * PART:
+                stop.set()
+        
+        with pytest.raises(DownloadError, match="stopped"):
+            download_file(remote(server), tmp_path / "model.gguf", connections=1, part_size=PART, on_progress=interrupt, stop=stop)
+        assert (tmp_path / "model.gguf.part.json").exists()
+        assert not (tmp_path / "model.gguf").exists()
+        
+        server.requests.clear()
+        progress = []
+        download_file(remote(server), tmp_path / "model.gguf", connections=2, part_size=PART, on_progress=progress.append)
+        
+        assert (tmp_path / "model.gguf").read_bytes() == DATA
+        assert ranges(server) == [2 * PART, 3 * PART, 4 * PART, 5 * PART]
+        assert sum(progress) == len(DATA)
+    
+    def test_retry_continues_part(self, server, tmp_path):
+        """Test a dropped connection is retried from the last byte received."""
+        server.cut_after = 1000
+        server.failures = 1
+        
+        download_file(remote(server), tmp_path / "model.gguf", connections=1, part_size=PART)
+        
+        assert (tmp_path / "model.gguf").read_bytes() == DATA
+        assert 1000 in ranges(server)
+    
+    def test_failure_cancels_queued_parts(self, server, tmp_path):
+        """Test parts still queued when one fails never open a connection."""
+        from translategemma_cli import download
+        
+        probe = download._open
+        opened = []
+        
+        def fail_parts(remote, start=None, end=None):
+            if end == 1:
+                return probe(remote, start, end)
+            opened.append(start)
+            raise DownloadError("Part failed")
+        
+        with patch.object(download, "_open", side_effect=fail_parts):
+            with pytest.raises(DownloadError, match="Part failed"):
+                download_file(remote(server), tmp_path / "model.gguf", connections=1, part_size=PART)
+        
+        assert opened == [0]
+    
+    def test_checksum_mismatch(self, server, tmp_path):
+        """Test a wrong checksum fails and discards the partial file."""
+        with pytest.raises(DownloadError, match="Checksum mismatch"):
+            download_file(remote(server, sha256="0" * 64), tmp_path / "model.gguf", part_size=PART)
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_size_mismatch(self, server, tmp_path):
+        """Test a server size that disagrees with the metadata is refused."""
+        with pytest.raises(DownloadError, match="metadata"):
+            download_file(remote(server, size=len(DATA) + 1), tmp_path / "model.gguf")
+    
+    def test_server_without_ranges(self, tmp_path):
+        """Test a single stream is used when ranges are not served."""
+        with FakeFileServer({"/model.gguf": DATA}, ranges=False) as server:
+            download_file(remote(server), tmp_path / "model.gguf", part_size=PART)
+        
+        assert (tmp_path / "model.gguf").read_bytes() == DATA
+        assert len(server.requests) == 2
+
+
+class TestDownloadGgufModels:
+    """Test concurrent GGUF model downloads."""
+    
+    def test_downloads_several_models(self, mock_config, server):
+        """Test every requested model is downloaded and existing ones are skipped."""
+        existing = get_model_path("12b", 4, "gguf")
+        existing.parent.mkdir(parents=True, exist_ok=True)
+        existing.write_bytes(b"already here")
+        
+        with patch("translategemma_cli.download.hub_file", return_value=remote(server)) as hub_file:
+            paths = download_gguf_models([("4b", 4), ("4b", 8), ("12b", 4)], parallel=2)
+        
+        assert hub_file.call_count == 2
+        assert paths[0].read_bytes() == paths[1].read_bytes() == DATA
+        assert paths[2].read_bytes() == b"already here"
+    
+    def test_failure_exits(self, mock_config, server):
+        """Test a failed download exits after reporting it."""
+        with patch("translategemma_cli.download.hub_file", return_value=remote(server, sha256="0" * 64)):
+            with pytest.raises(SystemExit):
+                download_gguf_models([("4b", 4)])
@@ -0,0 +1,71 @@
+"""Tests for the adaptive idle unload policy."""
+
+import pytest
+
+from translategemma_cli.idle import MIN_SAMPLES, AdaptiveIdlePolicy, quantile
+
+
+def arrivals(policy, gaps):
+    """Feed requests separated by gaps (seconds) to the policy."""
+    now = 1000.0
+    policy.record_arrival(now)
+    for gap in gaps:
+        now += gap
+        policy.record_arrival(now)
+
+
+class TestQuantile:
+    """Test the interpolated quantile."""
+    
+    def test_quantile(self):
+        """Test interpolation between samples and the empty case."""
+        assert quantile([1.0, 2.0, 3.0, 4.0, 5.0], 0.5) == 3.0
+        assert quantile([0.0, 10.0], 0.9) == pytest.approx(9.0)
+        assert quantile([], 0.9) == 0.0
+
+
+class TestAdaptiveIdlePolicy:
+    """Test timeouts learned from request gaps."""
+    
+    def test_initial_until_enough_samples(self):
+        """Test the initial timeout is used until MIN_SAMPLES gaps are seen."""
+        policy = AdaptiveIdlePolicy(min_idle=10, max_idle=600, initial=120)
+        arrivals(policy, [5.0] * (MIN_SAMPLES - 1))
+        
+        assert policy.timeout() == 120
+        assert AdaptiveIdlePolicy(10, 600).timeout() == 600
+    
+    def test_covers_typical_gap(self):
+        """Test steady traffic keeps the model across the usual gap plus margin."""
+        policy = AdaptiveIdlePolicy(min_idle=10, max_idle=600)
+        arrivals(policy, [60.0] * 10)
+        
+        assert policy.timeout() == pytest.approx(90.0)
+    
+    def test_busy_traffic_uses_minimum(self):
+        """Test short gaps are clamped to min_idle."""
+        policy = AdaptiveIdlePolicy(min_idle=30, max_idle=600)
+        arrivals(policy, [1.0] * 10)
+        
+        assert policy.timeout() == 30
+    
+    def test_sparse_traffic_breaks_even_on_load_time(self):
+        """Test gaps longer than max_idle keep the model only as long as a reload takes."""
+        policy = AdaptiveIdlePolicy(min_idle=10, max_idle=600)
+        arrivals(policy, [3600.0] * 10)
+        policy.record_load(45.0)
+        
+        assert policy.timeout() == pytest.approx(45.0)
+        policy.record_load(5.0)
+        assert policy.timeout() == pytest.approx(33.0)
+    
+    def test_stats_and_validation(self):
+        """Test the stats report and rejected bounds."""
+        policy = AdaptiveIdlePolicy(min_idle=10, max_idle=600)
+        arrivals(policy, [20.0] * 5)
+        stats = policy.stats()
+        
+        assert stats["policy"] == "adaptive" and stats["samples"] == 5
+        assert stats["median_gap_s"] == 20.0 and stats["timeout_s"] == 30.0
+        with pytest.raises(ValueError):
+            AdaptiveIdlePolicy(min_idle=60, max_idle=30)
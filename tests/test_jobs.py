@@ -0,0 +1,193 @@
+"""Tests for the persistent job queue."""
+
+import threading
+import time
+
+import pytest
+
+from translategemma_cli.jobs import JobStore, JobRunner
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a job store in a temporary directory."""
+    store = JobStore(tmp_path / "jobs.db")
+    yield store
+    store.close()
+
+
+def wait_for(predicate, timeout=5.0):
+    """Poll until predicate() is true or fail after timeout."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("Timed out waiting for condition")
+
+
+class TestJobStore:
+    """Test JobStore persistence."""
+    
+    def test_create_and_get(self, store):
+        """Test a new job is queued with its progress."""
+        job_id = store.create({"target_lang": "en"}, ["a", "b"])
+        job = store.get(job_id)
+        
+        assert job["status"] == "queued"
+        assert job["priority"] == "batch"
+        assert job["params"] == {"target_lang": "en"}
+        assert job["total_chunks"] == 2
+        assert job["done_chunks"] == 0
+        assert job["progress"] == 0
+    
+    def test_get_missing(self, store):
+        """Test unknown job ids return None."""
+        assert store.get("missing") is None
+    
+    def test_unknown_priority(self, store):
+        """Test an unknown priority class is rejected."""
+        with pytest.raises(ValueError):
+            store.create({}, ["a"], priority="urgent")
+    
+    def test_claim_most_urgent_first(self, store):
+        """Test claim_next prefers priority, then age."""
+        background = store.create({}, ["a"], priority="background")
+        batch = store.create({}, ["a"], priority="batch")
+        interactive = store.create({}, ["a"], priority="interactive")
+        
+        claimed = [store.claim_next()["id"] for _ in range(3)]
+        
+        assert claimed == [interactive, batch, background]
+        assert store.claim_next() is None
+    
+    def test_save_chunk_progress(self, store):
+        """Test saving chunks advances progress and shrinks pending work."""
+        job_id = store.create({}, ["a", "b"])
+        store.save_chunk(job_id, 0, "A")
+        store.save_chunk(job_id, 0, "A")  # Saving twice does not double count
+        
+        assert store.get(job_id)["done_chunks"] == 1
+        assert store.pending_chunks(job_id) == [(1, "b")]
+        assert store.chunk_results(job_id) == ["A", None]
+    
+    def test_cancel(self, store):
+        """Test only unfinished jobs can be cancelled."""
+        job_id = store.create({}, ["a"])
+        
+        assert store.cancel(job_id)
+        assert not store.cancel(job_id)
+        store.finish(job_id, "A")
+        assert store.get(job_id)["status"] == "cancelled"
+    
+    def test_interrupted_job_resumes(self, tmp_path):
+        """Test a running job survives a restart with its finished chunks once its lease runs out."""
+        store = JobStore(tmp_path / "jobs.db", lease_seconds=0)
+        job_id = store.create({}, ["a", "b"])
+        store.claim_next()
+        store.save_chunk(job_id, 0, "A")
+        store.close()
+        
+        reopened = JobStore(tmp_path / "jobs.db")
+        assert reopened.requeue_interrupted() == 1
+        assert reopened.claim_next()["id"] == job_id
+        assert reopened.pending_chunks(job_id) == [(1, "b")]
+        reopened.close()
+    
+    def test_live_jobs_not_requeued(self, tmp_path):
+        """Test a process sharing the database leaves jobs another live process is running alone."""
+        first = JobStore(tmp_path / "jobs.db", lease_seconds=0.2)
+        second = JobStore(tmp_path / "jobs.db")
+        job_id = first.create({}, ["a"])
+        first.claim_next()
+        
+        assert second.requeue_interrupted() == 0
+        assert not second.requeue(job_id)
+        time.sleep(0.3)
+        assert first.renew_leases() == 1
+        assert second.requeue_interrupted() == 0
+        time.sleep(0.3)
+        assert second.requeue_interrupted() == 1
+        assert second.get(job_id)["status"] == "queued"
+        first.close()
+        second.close()
+
+
+class TestJobRunner:
+    """Test JobRunner workers."""
+    
+    def test_runs_job_to_completion(self, store):
+        """Test a submitted job is translated and merged."""
+        def translate_job(job, pending, token):
+            for index, text in pending:
+                yield index, text.upper()
+        
+        runner = JobRunner(store, translate_job, poll_interval=0.01)
+        runner.start()
+        try:
+            job_id = runner.submit({}, ["a", "b"])
+            wait_for(lambda: store.get(job_id)["status"] == "completed")
+        finally:
+            runner.stop(timeout=5)
+        
+        job = store.get(job_id)
+        assert job["result"] == "AB"
+        assert job["progress"] == 1.0
+    
+    def test_failure_recorded(self, store):
+        """Test a handler error marks the job failed."""
+        def translate_job(job, pending, token):
+            raise RuntimeError("boom")
+            yield
+        
+        runner = JobRunner(store, translate_job, poll_interval=0.01)
+        runner.start()
+        try:
+            job_id = runner.submit({}, ["a"])
+            wait_for(lambda: store.get(job_id)["status"] == "failed")
+        finally:
+            runner.stop(timeout=5)
+        
+        assert store.get(job_id)["error"] == "boom"
+    
+    @pytest.mark.parametrize("signal", [KeyboardInterrupt, SystemExit])
+    def test_process_exit_propagates(self, store, signal):
+        """Test KeyboardInterrupt and SystemExit stop the worker instead of failing the job."""
+        def translate_job(job, pending, token):
+            raise signal()
+            yield
+        
+        runner = JobRunner(store, translate_job)
+        job_id = store.create({}, ["a"])
+        
+        with pytest.raises(signal):
+            runner._run(store.claim_next())
+        
+        assert store.get(job_id)["status"] == "running"
+        assert not runner._tokens
+    
+    def test_cancel_running_job(self, store):
+        """Test cancelling a running job stops it through its token."""
+        started = threading.Event()
+        
+        def translate_job(job, pending, token):
+            for index, text in pending:
+                started.set()
+                token.wait(5)
+                if token.is_cancelled:
+                    return
+                yield index, text
+        
+        runner = JobRunner(store, translate_job, poll_interval=0.01)
+        runner.start()
+        try:
+            job_id = runner.submit({}, ["a", "b"])
+            assert started.wait(5)
+            assert runner.cancel(job_id)
+            wait_for(lambda: not runner._tokens)
+        finally:
+            runner.stop(timeout=5)
+        
+        job = store.get(job_id)
+        assert job["status"] == "cancelled"
+        assert job["done_chunks"] == 0
@@ -0,0 +1,203 @@
+"""Tests for the HTTP load generator."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from typer.testing import CliRunner
+
+from translategemma_cli.bench import (
+    LoadRequest,
+    Sample,
+    default_requests,
+    load_requests,
+    run_levels,
+    run_load,
+    send,
+    summarize,
+)
+from translategemma_cli.cli import app
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers like app_fastapi; texts starting with "fail" get an error."""
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/api/translate/stream":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            events = [{"event": "start"}, {"event": "chunk", "translation": "ok"}, {"event": "done"}]
+            if body["text"].startswith("fail"):
+                events = events[:1]
+            for event in events:
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                self.wfile.flush()
+            return
+        if self.path == "/api/translate/batch":
+            data = {"status": "success", "results": ["ok"] * len(body["texts"])}
+        elif self.path == "/api/translate":
+            failed = body["text"].startswith("fail")
+            data = {"status": "error", "error": "boom"} if failed else {"status": "success", "translation": "ok"}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestRequests:
+    """Test the replay corpus."""
+    
+    def test_default_requests_cover_endpoints(self):
+        """The default corpus hits every endpoint."""
+        requests = default_requests()
+        assert {request.endpoint for request in requests} == {"translate", "stream", "batch"}
+        assert all("texts" in request.body for request in requests if request.endpoint == "batch")
+    
+    def test_default_requests_reject_unknown_endpoint(self):
+        """Unknown endpoint names are rejected."""
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            default_requests(endpoints=["nope"])
+    
+    def test_load_requests(self, tmp_path):
+        """Replay lines may name an endpoint or path, or be bare bodies."""
+        path = tmp_path / "replay.jsonl"
+        path.write_text(
+            '{"endpoint": "stream", "body": {"text": "a", "target_lang": "zh"}}\n'
+            "\n"
+            '{"endpoint": "/api/translate/batch", "body": {"texts": ["b"], "target_lang": "en"}}\n'
+            '{"text": "c", "target_lang": "ja"}\n'
+            '{"texts": ["d"], "target_lang": "ja"}\n'
+        )
+        endpoints = [request.endpoint for request in load_requests(path)]
+        assert endpoints == ["stream", "batch", "translate", "batch"]
+    
+    def test_load_requests_errors(self, tmp_path):
+        """Bad JSON and unknown endpoints report the line number."""
+        path = tmp_path / "replay.jsonl"
+        path.write_text('{"text": "a"}\nnot json\n')
+        with pytest.raises(ValueError, match=":2: invalid JSON"):
+            load_requests(path)
+        path.write_text('{"endpoint": "/api/other", "body": {}}\n')
+        with pytest.raises(ValueError, match="unknown endpoint"):
+            load_requests(path)
+
+
+class TestSend:
+    """Test timing single requests."""
+    
+    def test_translate(self, server):
+        """A successful translation is ok and has no stream timings."""
+        sample = send(server, LoadRequest("translate", {"text": "hi", "target_lang": "zh"}))
+        assert sample.ok and sample.http_status == 200
+        assert sample.first_event is None
+    
+    def test_stream_records_first_event(self, server):
+        """Streams record time to the first event and first chunk."""
+        sample = send(server, LoadRequest("stream", {"text": "hi", "target_lang": "zh"}))
+        assert sample.ok
+        assert 0 <= sample.first_event <= sample.first_chunk <= sample.latency
+    
+    def test_application_errors(self, server):
+        """Error statuses and truncated streams count as failures."""
+        sample = send(server, LoadRequest("translate", {"text": "fail", "target_lang": "zh"}))
+        assert not sample.ok and sample.error == "boom"
+        sample = send(server, LoadRequest("stream", {"text": "fail", "target_lang": "zh"}))
+        assert not sample.ok and "done" in sample.error
+    
+    def test_connection_error(self):
+        """An unreachable server is an error, not an exception."""
+        sample = send("http://127.0.0.1:9", LoadRequest("translate", {"text": "hi"}), timeout=2)
+        assert not sample.ok and sample.http_status is None
+
+
+class TestRunLoad:
+    """Test closed- and open-loop runs and the report."""
+    
+    def test_closed_loop_total(self, server):
+        """Closed loop sends exactly total requests, cycling the corpus."""
+        requests = [LoadRequest("translate", {"text": "hi"}), LoadRequest("stream", {"text": "hi"})]
+        samples = run_load(server, requests, concurrency=3, total=7)
+        assert len(samples) == 7
+        assert sum(sample.endpoint == "translate" for sample in samples) == 4
+        assert all(sample.ok for sample in samples)
+    
+    def test_open_loop_rate(self, server):
+        """Open loop spaces requests by 1/rps."""
+        samples = run_load(server, [LoadRequest("translate", {"text": "hi"})], rps=50, total=5)
+        starts = sorted(sample.started for sample in samples)
+        assert len(samples) == 5
+        assert starts[-1] >= 4 / 50 * 0.9
+    
+    def test_invalid_arguments(self, server):
+        """Empty corpora and non-positive rates are rejected."""
+        with pytest.raises(ValueError):
+            run_load(server, [])
+        with pytest.raises(ValueError):
+            run_load(server, [LoadRequest("translate", {})], rps=0)
+    
+    def test_summarize(self):
+        """Summaries report error rate, percentiles and a per-second timeline."""
+        samples = [
+            Sample("translate", 0.0, 0.1, True),
+            Sample("translate", 0.1, 0.3, True),
+            Sample("stream", 0.5, 0.7, True, first_event=0.05, first_chunk=0.2),
+            Sample("stream", 1.0, 0.2, False, error="boom"),
+        ]
+        summary = summarize(samples, wall=2.0)
+        assert summary["requests"] == 4
+        assert summary["error_rate"] == 0.25
+        assert summary["throughput_rps"] == 1.5
+        assert summary["latency_ms"]["p50"] == pytest.approx(300.0)
+        assert summary["first_event_ms"]["p50"] == pytest.approx(50.0)
+        assert summary["endpoints"]["stream"]["errors"] == 1
+        assert summary["top_errors"] == {"boom": 1}
+        assert [second["completed"] for second in summary["timeline"]] == [2, 2]
+    
+    def test_run_levels(self, server):
+        """One step per concurrency level."""
+        result = run_levels(server, [LoadRequest("translate", {"text": "hi"})], levels=[1, 2], total=4)
+        assert [step["concurrency"] for step in result["steps"]] == [1, 2]
+        assert all(step["requests"] == 4 for step in result["steps"])
+
+
+class TestLoadCommand:
+    """Test `translate bench load`."""
+    
+    def test_load_command(self, server, tmp_path):
+        """The command prints a table and writes the result file."""
+        output = tmp_path / "load.json"
+        result = CliRunner().invoke(
+            app,
+            ["bench", "load", "--url", server, "--concurrency", "1,2", "--requests", "6", "-o", str(output)],
+        )
+        assert result.exit_code == 0, result.output
+        data = json.loads(output.read_text())
+        assert data["kind"] == "load"
+        assert len(data["steps"]) == 2
+    
+    def test_load_command_bad_replay(self, server, tmp_path):
+        """A missing replay file exits with an error."""
+        result = CliRunner().invoke(app, ["bench", "load", "--url", server, "--replay", str(tmp_path / "missing.jsonl")])
+        assert result.exit_code == 1
@@ -0,0 +1,207 @@
+"""Tests for load strategies, weight prewarming and load phase timing."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from translategemma_cli import loading
+from translategemma_cli.loading import (
+    Prewarmer,
+    prepare_weights,
+    release_weights,
+    timed_phase,
+    weight_files,
+)
+from translategemma_cli.model import _load_gguf, _load_mlx, get_model_path
+
+
+@pytest.fixture
+def weights(tmp_path):
+    """A model directory with two weight shards and a config file."""
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    (model_dir / "model-00001.safetensors").write_bytes(b"\x01" * 300_000)
+    (model_dir / "model-00002.safetensors").write_bytes(b"\x02" * 5000)
+    (model_dir / "config.json").write_text("{}")
+    return model_dir
+
+
+class TestWeightFiles:
+    """Test finding the files to prewarm."""
+    
+    def test_directory_and_file(self, weights, tmp_path):
+        """Test shards are found in order, a file is itself and a missing path is empty."""
+        shards = weight_files(weights)
+        
+        assert [path.name for path in shards] == ["model-00001.safetensors", "model-00002.safetensors"]
+        assert weight_files(shards[0]) == [shards[0]]
+        assert weight_files(tmp_path / "missing") == []
+
+
+class TestPrewarmer:
+    """Test the page-cache prewarm pass."""
+    
+    def test_reads_every_file(self, weights):
+        """Test every byte is covered, on a background thread, and on_done is called."""
+        finished = []
+        prewarmer = Prewarmer(weight_files(weights), on_done=finished.append, window=64 * 1024)
+        
+        assert prewarmer.start().join(timeout=10)
+        assert prewarmer.bytes_read == prewarmer.total_bytes == 305_000
+        assert finished == [prewarmer]
+        assert prewarmer.seconds >= 0 and not prewarmer.errors
+    
+    def test_missing_file_is_reported(self, weights):
+        """Test an unreadable file is recorded and the pass carries on."""
+        paths = [weights / "gone.safetensors", *weight_files(weights)]
+        prewarmer = Prewarmer(paths)
+        prewarmer.run()
+        
+        assert len(prewarmer.errors) == 1 and "gone.safetensors" in prewarmer.errors[0]
+        assert prewarmer.bytes_read == 305_000
+    
+    def test_pin_falls_back_when_refused(self, weights):
+        """Test a refused mlock becomes a plain prewarm with a hint about ulimit."""
+        prewarmer = Prewarmer(weight_files(weights), pin=True)
+        
+        with patch.object(loading._Libc, "lock", side_effect=OSError(12, "Cannot allocate memory")):
+            prewarmer.run()
+        
+        assert not prewarmer.pin and prewarmer.pinned_bytes == 0
+        assert prewarmer.bytes_read == 305_000
+        assert "ulimit -l" in prewarmer.errors[0]
+    
+    @pytest.mark.skipif(not loading.pinning_supported(), reason="mlock is not available")
+    def test_pin_and_release(self, weights):
+        """Test pinned pages are counted and unlocked on release."""
+        prewarmer = Prewarmer(weight_files(weights)[1:], pin=True)
+        prewarmer.run()
+        
+        if prewarmer.errors:
+            pytest.skip("RLIMIT_MEMLOCK too low to pin")
+        assert prewarmer.pinned_bytes == 5000
+        prewarmer.release()
+        assert prewarmer.pinned_bytes == 0
+
+
+class TestPrepareWeights:
+    """Test strategies and the registry of active prewarmers."""
+    
+    def test_only_prewarm_strategies_start_a_pass(self, weights):
+        """Test auto, mmap and read leave reading to the loader."""
+        for strategy in ("auto", "mmap", "read"):
+            assert prepare_weights(weight_files(weights), strategy) is None
+        assert prepare_weights([], "prewarm") is None
+    
+    def test_prewarm_reports_read_phase(self, weights):
+        """Test the read phase is reported when the pass ends and release clears it."""
+        phases = []
+        prewarmer = prepare_weights(weight_files(weights), "prewarm", lambda phase, seconds: phases.append(phase))
+        
+        assert prewarmer.join(timeout=10)
+        assert phases == ["read"]
+        assert prewarmer in loading._active
+        release_weights()
+        assert loading._active == []
+    
+    def test_loader_pins(self, weights):
+        """Test mlock only prewarms when the loader locks the pages itself."""
+        with patch.object(loading, "Prewarmer") as prewarmer:
+            prepare_weights(weight_files(weights), "mlock")
+            prepare_weights(weight_files(weights), "mlock", loader_pins=True)
+        
+        assert [call.kwargs["pin"] for call in prewarmer.call_args_list] == [True, False]
+        loading._active.clear()
+    
+    def test_timed_phase(self):
+        """Test a block is reported with its duration, and None is allowed."""
+        phases = []
+        with timed_phase(lambda phase, seconds: phases.append((phase, seconds)), "init"):
+            pass
+        with timed_phase(None, "init"):
+            pass
+        
+        assert phases[0][0] == "init" and phases[0][1] >= 0
+
+
+class TestLoadStrategyConfig:
+    """Test the model.load_strategy setting."""
+    
+    def test_default_and_validation(self, mock_config):
+        """Test the default, a valid value and a rejected value."""
+        assert mock_config.load_strategy == "auto"
+        mock_config.load_strategy = "mlock"
+        assert mock_config.load_strategy == "mlock"
+        with pytest.raises(ValueError, match="Load strategy"):
+            mock_config.load_strategy = "eager"
+
+
+class TestLoadGguf:
+    """Test llama.cpp options and load phases per strategy."""
+    
+    @pytest.fixture
+    def llama(self, mock_config):
+        """A fake llama_cpp module and a GGUF file where the loader expects it."""
+        gguf_path = get_model_path(mock_config.model_size, mock_config.quantization_bits, "gguf")
+        gguf_path.parent.mkdir(parents=True, exist_ok=True)
+        gguf_path.write_bytes(b"GGUF" * 1024)
+        module = MagicMock()
+        with patch.dict(sys.modules, {"llama_cpp": module}):
+            yield module.Llama
+        release_weights()
+    
+    @pytest.mark.parametrize("strategy,options", [
+        ("auto", {}),
+        ("read", {"use_mmap": False, "use_mlock": False}),
+        ("mlock", {"use_mmap": True, "use_mlock": True}),
+    ])
+    def test_options(self, mock_config, llama, strategy, options):
+        """Test each strategy's mmap/mlock options reach llama.cpp."""
+        mock_config.load_strategy = strategy
+        
+        _load_gguf(mock_config.model_size, mock_config.quantization_bits)
+        
+        kwargs = llama.call_args.kwargs
+        assert {key: kwargs[key] for key in ("use_mmap", "use_mlock") if key in kwargs} == options
+    
+    def test_mlock_pinned_once(self, mock_config, llama):
+        """Test llama.cpp pins the weights under mlock and the prewarm pass only reads them."""
+        mock_config.load_strategy = "mlock"
+        
+        with patch.object(loading, "Prewarmer") as prewarmer:
+            _load_gguf(mock_config.model_size, mock_config.quantization_bits)
+        
+        assert llama.call_args.kwargs["use_mlock"] is True
+        assert prewarmer.call_args.kwargs["pin"] is False
+        loading._active.clear()
+    
+    def test_phases(self, mock_config, llama):
+        """Test init and warm-up are timed, with a one-token warm-up completion."""
+        mock_config.load_strategy = "mmap"
+        phases = []
+        
+        model, _, backend = _load_gguf(mock_config.model_size, mock_config.quantization_bits, lambda phase, seconds: phases.append(phase))
+        
+        assert backend == "gguf"
+        assert phases == ["init", "warmup"]
+        model.create_completion.assert_called_once_with("Hello", max_tokens=1)
+
+
+class TestCopyingLoaders:
+    """Test mlock is not applied to loaders that copy the weights out of their files."""
+    
+    def test_mlx_prewarms_without_pinning(self, mock_config, tmp_path):
+        """Test MLX under mlock prewarms the weight files but does not pin them."""
+        (tmp_path / "model.safetensors").write_bytes(b"\0" * 4096)
+        mock_config.load_strategy = "mlock"
+        mlx_lm = MagicMock()
+        mlx_lm.load.return_value = (MagicMock(), MagicMock())
+        mlx = MagicMock()
+        
+        with patch.dict(sys.modules, {"mlx_lm": mlx_lm, "mlx": mlx, "mlx.core": mlx.core}), \
+             patch.object(loading, "Prewarmer") as prewarmer:
+            _load_mlx(tmp_path)
+        
+        assert prewarmer.call_args.kwargs["pin"] is False
+        loading._active.clear()
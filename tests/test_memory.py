@@ -0,0 +1,127 @@
+"""Tests for memory readings, the budget planner and the memory benchmark."""
+
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli import memory
+from translategemma_cli.bench import measure_memory
+from translategemma_cli.bench.memory import _slope
+from translategemma_cli.memory import (
+    MemoryProfile,
+    estimate_profile,
+    get_profile,
+    load_profiles,
+    plan_budget,
+    recommended_n_ctx,
+    save_profile,
+    snapshot,
+)
+from translategemma_cli.translator import Translator
+
+
+class TestSnapshot:
+    """Test process memory readings."""
+    
+    def test_snapshot_reports_rss(self):
+        """Test RSS is read without torch and the peak is at least the current RSS."""
+        reading = snapshot()
+        
+        assert reading.rss_mb > 0
+        assert reading.peak_rss_mb >= reading.rss_mb - 1
+        assert set(reading.to_dict()) == {"rss_mb", "peak_rss_mb", "file_rss_mb", "device_mb", "device_peak_mb"}
+    
+    def test_snapshot_without_proc(self):
+        """Test the getrusage fallback used where /proc is missing."""
+        with patch.object(memory, "_proc_status", return_value={}):
+            reading = snapshot()
+        
+        assert reading.rss_mb == reading.peak_rss_mb > 0
+        assert reading.file_rss_mb is None
+
+
+class TestProfiles:
+    """Test estimates, stored measurements and context planning."""
+    
+    def test_estimate_scales_with_quantization(self):
+        """Test Q8 needs more memory than Q4 and unknown sizes are rejected."""
+        q4, q8 = estimate_profile("4b", 4), estimate_profile("4b", 8)
+        
+        assert q8.weights_mb > q4.weights_mb
+        assert q4.required_mb(2048) > q4.required_mb(1024)
+        with pytest.raises(ValueError, match="Unknown model size"):
+            estimate_profile("70b")
+    
+    def test_max_context(self):
+        """Test the context is rounded down to the step and capped."""
+        profile = MemoryProfile("4b", 4, "gguf", weights_mb=1000, kv_mb_per_1k=100)
+        
+        assert profile.max_context(1250) == 2560
+        assert profile.max_context(900) == 0
+        assert profile.max_context(100000) == memory.MAX_PLANNED_CONTEXT
+    
+    def test_measured_profile_wins(self, tmp_path):
+        """Test saved measurements replace the estimate for their key only."""
+        path = tmp_path / "profiles.json"
+        save_profile(MemoryProfile("4b", 4, "gguf", weights_mb=2000, kv_mb_per_1k=50, measured=True), path)
+        
+        assert get_profile("4b", 4, "gguf", path).weights_mb == 2000
+        assert not get_profile("4b", 8, "gguf", path).measured
+        assert set(load_profiles(path)) == {"4b-q4-gguf"}
+    
+    def test_plan_budget(self, tmp_path):
+        """Test which models fit a budget, with explicit and missing budgets."""
+        rows = plan_budget(8 * 1024, 4096, path=tmp_path / "none.json")
+        fits = {(row["model_size"], row["quantization"]): row["fits"] for row in rows}
+        
+        assert fits[("4b", 4)] and not fits[("27b", 8)]
+        with patch.object(memory, "available_memory_mb", return_value=None):
+            with pytest.raises(ValueError, match="pass a budget"):
+                plan_budget()
+    
+    def test_recommended_n_ctx(self, mock_config):
+        """Test n_ctx: auto resolves through the planner and falls back without readings."""
+        mock_config.model_size = "4b"
+        mock_config.quantization_bits = 4
+        mock_config.gguf_n_ctx = "auto"
+        
+        with patch.object(memory, "available_memory_mb", return_value=64 * 1024):
+            assert mock_config.gguf_n_ctx == memory.MAX_PLANNED_CONTEXT
+        with patch.object(memory, "available_memory_mb", return_value=None):
+            assert mock_config.gguf_n_ctx == 4096
+        assert recommended_n_ctx("27b", 8, budget_mb=1024) == memory.CONTEXT_STEP
+        with pytest.raises(ValueError):
+            mock_config.gguf_n_ctx = 0
+    
+    def test_auto_n_ctx_plans_for_loaded_model(self, mock_config):
+        """Test n_ctx: auto is planned for the model being loaded, not the configured one."""
+        mock_config.model_size = "4b"
+        mock_config.quantization_bits = 4
+        mock_config.gguf_n_ctx = "auto"
+        
+        with patch.object(memory, "recommended_n_ctx", return_value=2048) as recommend:
+            assert mock_config.gguf_n_ctx_for("27b", 8) == 2048
+        
+        recommend.assert_called_once_with("27b", 8)
+        mock_config.gguf_n_ctx = 1024
+        assert mock_config.gguf_n_ctx_for("27b", 8) == 1024
+
+
+class TestMeasureMemory:
+    """Test the memory benchmark."""
+    
+    def test_slope(self):
+        """Test the least-squares slope used for KV growth."""
+        assert _slope([(1, 2), (2, 4), (3, 6)]) == pytest.approx(2.0)
+        assert _slope([(1, 5)]) == 0.0
+    
+    def test_measure_fake_backend(self, mock_config):
+        """Test a CPU-only measurement records one reading per context."""
+        mock_config.fake_backend = {"token_latency": 0.0, "prefill_latency": 0.0}
+        
+        profile, raw = measure_memory("4b", 4, "fake", (256, 128), translator=Translator())
+        
+        assert profile.measured and profile.backend == "fake"
+        assert profile.key == "4b-q4-fake"
+        assert [reading["context"] for reading in raw["contexts"]] == [128, 256]
+        assert profile.kv_mb_per_1k >= 0
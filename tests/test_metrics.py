@@ -0,0 +1,198 @@
+"""Tests for translation metrics."""
+
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli.metrics import (
+    MetricsRegistry,
+    TranslationMetrics,
+    TranslatorObserver,
+    get_metrics,
+    reset_metrics,
+)
+from translategemma_cli.stats import GenerationStats
+
+
+LABELS = {"model": "27b", "quant": "8", "backend": "gguf", "lang_pair": "en-zh"}
+
+
+class RecordingObserver(TranslatorObserver):
+    """Observer that keeps every event it receives."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def on_stage(self, stage, seconds, labels):
+        self.events.append(("stage", stage, labels))
+    
+    def on_generation(self, stats, labels):
+        self.events.append(("generation", stats.completion_tokens, stats.ttft is not None))
+    
+    def on_chunk(self, labels):
+        self.events.append(("chunk",))
+    
+    def on_model_unload(self, labels):
+        self.events.append(("unload", labels["model"]))
+
+
+class TestMetricsRegistry:
+    """Test metric families and the text format."""
+    
+    def test_counter_render(self):
+        """Test counters render with HELP, TYPE and escaped labels."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.", ("path",))
+        counter.inc(path='/a"b')
+        counter.inc(2, path='/a"b')
+        
+        text = registry.render()
+        
+        assert "# HELP requests_total Requests." in text
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="/a\\"b"} 3' in text
+    
+    def test_counter_cannot_decrease(self):
+        """Test negative increments are rejected."""
+        counter = MetricsRegistry().counter("c_total", "C.")
+        
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+    
+    def test_label_mismatch(self):
+        """Test observations must carry exactly the declared labels."""
+        counter = MetricsRegistry().counter("c_total", "C.", ("a",))
+        
+        with pytest.raises(ValueError, match="expected labels"):
+            counter.inc(b="x")
+    
+    def test_duplicate_registration(self):
+        """Test a metric name can only be registered once."""
+        registry = MetricsRegistry()
+        registry.gauge("g", "G.")
+        
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("g", "G.")
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+        
+        text = registry.render()
+        
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_sum 5.55" in text
+        assert "latency_seconds_count 3" in text
+
+
+class TestTranslationMetrics:
+    """Test the Prometheus translator observer."""
+    
+    def test_generation_with_ttft_splits_prefill_and_decode(self):
+        """Test streamed generations feed prefill, decode and tokens/sec."""
+        metrics = TranslationMetrics()
+        
+        metrics.on_generation(
+            GenerationStats(prompt_tokens=20, completion_tokens=11, ttft=0.5, total_time=1.5), LABELS
+        )
+        
+        assert metrics.stage_seconds.count(stage="prefill", **LABELS) == 1
+        assert metrics.stage_seconds.sum(stage="decode", **LABELS) == pytest.approx(1.0)
+        assert metrics.tokens.value(direction="in", **LABELS) == 20
+        assert metrics.tokens.value(direction="out", **LABELS) == 11
+        assert metrics.tokens_per_second.sum(**LABELS) == pytest.approx(10.0)
+    
+    def test_generation_without_ttft(self):
+        """Test non-streamed generations are recorded as a single stage."""
+        metrics = TranslationMetrics()
+        
+        metrics.on_generation(GenerationStats(total_time=2.0), LABELS)
+        
+        assert metrics.stage_seconds.count(stage="generate", **LABELS) == 1
+        assert metrics.tokens.value(direction="out", **LABELS) == 0
+    
+    def test_cache_and_lifecycle_counters(self):
+        """Test cache hits and model loads are counted."""
+        metrics = TranslationMetrics()
+        
+        metrics.on_cache(True, LABELS)
+        metrics.on_cache(False, LABELS)
+        metrics.on_model_load(LABELS)
+        
+        assert metrics.cache_requests.value(result="hit", **LABELS) == 1
+        assert metrics.cache_requests.value(result="miss", **LABELS) == 1
+        assert metrics.model_loads.value(**LABELS) == 1
+        assert "translategemma_model_loads_total" in metrics.render()
+    
+    def test_global_metrics(self):
+        """Test get_metrics returns a singleton until reset."""
+        reset_metrics()
+        metrics = get_metrics()
+        
+        assert get_metrics() is metrics
+        reset_metrics()
+        assert get_metrics() is not metrics
+        reset_metrics()
+
+
+class TestTranslatorObservers:
+    """Test instrumentation hooks in Translator."""
+    
+    def test_translate_reports_stages(self, mock_config, make_translator):
+        """Test translate() reports prompt formatting, generation and cleaning."""
+        translator = make_translator()
+        observer = RecordingObserver()
+        translator.add_observer(observer)
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.return_value = ("Hello", GenerationStats())
+            translator.translate("你好", force_target="en")
+        
+        stages = [event[1] for event in observer.events if event[0] == "stage"]
+        assert stages == ["prompt_format", "clean"]
+        assert ("generation", None, False) in observer.events
+        assert ("chunk",) in observer.events
+        labels = observer.events[0][2]
+        assert labels["backend"] == "mlx"
+        assert labels["lang_pair"].endswith("-en")
+    
+    def test_stream_reports_ttft(self, mock_config, make_translator):
+        """Test streaming reports completion tokens and time to first token."""
+        translator = make_translator()
+        observer = RecordingObserver()
+        translator.add_observer(observer)
+        
+        with patch("translategemma_cli.translator.Translator._stream_mlx") as mock_stream:
+            mock_stream.return_value = iter([("Hel", "yue", "en"), ("lo", "yue", "en")])
+            list(translator.translate_stream("你好"))
+        
+        assert ("generation", 2, True) in observer.events
+    
+    def test_unload_notifies(self, mock_config, make_translator):
+        """Test unload() releases the model and reports it once."""
+        translator = make_translator()
+        observer = RecordingObserver()
+        translator.add_observer(observer)
+        
+        translator.unload()
+        translator.unload()
+        
+        assert not translator.is_loaded
+        assert observer.events == [("unload", "4b")]
+    
+    def test_remove_observer(self, mock_config, make_translator):
+        """Test removed observers stop receiving events."""
+        translator = make_translator()
+        observer = RecordingObserver()
+        translator.add_observer(observer)
+        translator.remove_observer(observer)
+        
+        translator.record_stage("queue_wait", 0.1)
+        
+        assert observer.events == []
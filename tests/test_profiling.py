@@ -0,0 +1,115 @@
+"""Tests for the profiling mode."""
+
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli.profiling import (
+    Profiler,
+    ProfileSummary,
+    RequestProfiler,
+    categorize,
+)
+from translategemma_cli.stats import GenerationStats
+
+
+def _fake_mlx_generate():
+    """A generate() whose code object claims to live in mlx_lm, like the real backend."""
+    namespace = {"time": time}
+    code = compile("def generate(seconds):\n    time.sleep(seconds)\n", "/site-packages/mlx_lm/generate.py", "exec")
+    exec(code, namespace)
+    return namespace["generate"]
+
+
+class TestCategorize:
+    """Test mapping functions to pipeline steps."""
+    
+    def test_categories(self):
+        """Test model, tokenizer and pipeline functions are recognized."""
+        assert categorize("/x/transformers/generation/utils.py", "generate") == "model"
+        assert categorize("/x/llama_cpp/llama.py", "_create_completion") == "model"
+        assert categorize("/x/llama_cpp/llama.py", "tokenize") == "tokenizer"
+        assert categorize("/x/transformers/tokenization_utils_base.py", "apply_chat_template") == "tokenizer"
+        assert categorize("/x/translategemma_cli/detector.py", "detect_language") == "detection"
+        assert categorize("/x/translategemma_cli/translator.py", "_clean_output") == "cleaning"
+        assert categorize("/x/translategemma_cli/translator.py", "translate") is None
+
+
+class TestProfileSummary:
+    """Test summary arithmetic and formatting."""
+    
+    def test_outside_model_excludes_load(self):
+        """Test model loading is neither model time nor per-chunk overhead."""
+        summary = ProfileSummary(total=2.0, model=1.0, categories={"model_load": 0.5, "cleaning": 0.1}, generations=5)
+        
+        assert summary.outside_model == pytest.approx(0.5)
+        assert summary.overhead_per_generation == pytest.approx(0.1)
+        assert summary.to_dict()["overhead_per_generation_ms"] == 100.0
+        assert "other 400.0 ms" in summary.format()
+
+
+class TestProfiler:
+    """Test both profiler modes on a translation."""
+    
+    def test_cprofile_mode(self, tmp_path, mock_config, make_translator):
+        """Test cProfile mode writes pstats and splits model from pipeline time."""
+        translator = make_translator()
+        generate = _fake_mlx_generate()
+        
+        def fake_generate_mlx(prompt, max_tokens, cancel_token=None):
+            generate(0.02)
+            return "Hello", GenerationStats()
+        
+        path = tmp_path / "run.prof"
+        with patch.object(translator, "_generate_mlx", side_effect=fake_generate_mlx):
+            with Profiler(path) as profiler:
+                translator.translate("你好", force_target="en")
+                translator.translate("再见", force_target="en")
+        
+        summary = profiler.summary
+        assert pstats.Stats(str(path)).total_calls > 0
+        assert summary.model >= 0.04
+        assert summary.generations == 2
+        assert {"template", "detection", "cleaning"} <= set(summary.categories)
+        assert summary.total >= summary.model
+    
+    def test_sampling_mode(self, tmp_path):
+        """Test sampling mode writes collapsed stacks attributed to the model."""
+        generate = _fake_mlx_generate()
+        path = tmp_path / "run.folded"
+        
+        with Profiler(path, interval=0.001) as profiler:
+            generate(0.1)
+        
+        lines = path.read_text().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("generate (generate.py:1)" in line for line in lines)
+        assert profiler.summary.model > 0.05
+        assert profiler.summary.generations is None
+
+
+class TestRequestProfiler:
+    """Test per-request profiling in the server."""
+    
+    def test_disabled(self, tmp_path):
+        """Test PROFILE=0 yields no profiler."""
+        with RequestProfiler("0", tmp_path).profile("translate") as profiler:
+            assert profiler is None
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_one_request_at_a_time(self, tmp_path):
+        """Test a request arriving mid-profile runs unprofiled."""
+        profiles = RequestProfiler("1", tmp_path)
+        inner = []
+        
+        with profiles.profile("translate") as profiler:
+            thread = threading.Thread(target=lambda: inner.append(profiles.profile("other").__enter__()))
+            thread.start()
+            thread.join()
+        
+        assert profiler.summary is not None
+        assert inner == [None]
+        assert [p.suffix for p in tmp_path.iterdir()] == [".prof"]
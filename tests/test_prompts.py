@@ -0,0 +1,141 @@
+"""Tests for the precompiled chat prompt builder."""
+
+import re
+from unittest.mock import MagicMock
+
+from translategemma_cli.bench import BenchCase, measure_prompts
+from translategemma_cli.prompts import PromptBuilder
+from translategemma_cli.translator import Translator
+
+
+class TemplateTokenizer:
+    """Word-level tokenizer with a TranslateGemma-like Jinja chat template."""
+    
+    bos_token = "<bos>"
+    
+    def __init__(self, trim=True, punctuation=r"[^\w\s]"):
+        self.vocab = {"<bos>": 2}
+        self.trim = trim
+        self.pattern = re.compile(rf"<[a-z_]+>|\w+|\n+| |{punctuation}")
+        self.renders = 0
+    
+    def apply_chat_template(self, messages, tokenize=False, add_generation_prompt=True):
+        self.renders += 1
+        item = messages[0]["content"][0]
+        text = item["text"].strip() if self.trim else item["text"]
+        return (
+            f"<bos><start_of_turn>user\nTranslate {item['source_lang_code']} to {item['target_lang_code']}:\n\n{text}"
+            f"<end_of_turn>\n<start_of_turn>model\n"
+        )
+    
+    def encode(self, text, add_special_tokens=True):
+        ids = [self.vocab.setdefault(piece, len(self.vocab) + 1) for piece in self.pattern.findall(text)]
+        return [2, *ids] if add_special_tokens else ids
+
+
+def make_builder(tokenizer):
+    """A builder using the translator's message format."""
+    return PromptBuilder(tokenizer, Translator()._format_messages)
+
+
+class TestPromptBuilder:
+    """Test prompts built from precompiled template IDs."""
+    
+    def test_matches_template(self):
+        """Test built IDs equal the encoded render and the template is rendered once per pair."""
+        tokenizer = TemplateTokenizer()
+        builder = make_builder(tokenizer)
+        texts = ["Hello there.", "  Padded text\n", "第二段。", ""]
+        
+        built = [builder.build(text, "en", "zh") for text in texts]
+        renders = tokenizer.renders
+        built_again = [builder.build(text, "en", "zh") for text in texts]
+        
+        assert tokenizer.renders == renders
+        assert built_again == built
+        assert built == [tokenizer.encode(builder.render(text, "en", "zh")) for text in texts]
+        assert builder.template("en", "zh").strip is True
+    
+    def test_pairs_cached_separately(self):
+        """Test each language pair gets its own prefix."""
+        builder = make_builder(TemplateTokenizer())
+        
+        assert builder.build("Hi", "en", "zh") != builder.build("Hi", "en", "ja")
+        assert builder.template("en", "zh").prefix != builder.template("en", "ja").prefix
+    
+    def test_untrimmed_text_with_whitespace_renders(self):
+        """Test text with surrounding whitespace uses the template when the template keeps it."""
+        tokenizer = TemplateTokenizer(trim=False)
+        builder = make_builder(tokenizer)
+        builder.build("warm", "en", "zh")
+        renders = tokenizer.renders
+        
+        built = builder.build(" spaced ", "en", "zh")
+        
+        assert tokenizer.renders == renders + 1
+        assert built == tokenizer.encode(builder.render(" spaced ", "en", "zh"))
+        assert builder.template("en", "zh").strip is False
+    
+    def test_merging_tokenizer_falls_back(self):
+        """Test a tokenizer that merges across the seam keeps rendering the template."""
+        tokenizer = TemplateTokenizer(punctuation=r"[^\w\s]+")
+        builder = make_builder(tokenizer)
+        
+        assert builder.template("en", "zh") is None
+        assert builder.build("(hi)", "en", "zh") == tokenizer.encode(builder.render("(hi)", "en", "zh"))
+    
+    def test_template_without_text_falls_back(self):
+        """Test a render that does not contain the text cannot be precompiled."""
+        tokenizer = MagicMock()
+        tokenizer.apply_chat_template.return_value = "formatted prompt"
+        tokenizer.encode.return_value = [1, 2, 3]
+        
+        builder = make_builder(tokenizer)
+        
+        assert builder.build("Hello", "en", "zh") == [1, 2, 3]
+        assert builder.template("en", "zh") is None
+
+
+class TestTranslatorPrompts:
+    """Test the translator's local prompts."""
+    
+    def test_pytorch_and_mlx_get_token_ids(self, mock_config):
+        """Test PyTorch encodes with BOS while MLX skips the BOS the template adds."""
+        tokenizer = TemplateTokenizer()
+        translator = Translator()
+        translator._tokenizer = tokenizer
+        
+        translator._backend = "pytorch"
+        pytorch = translator._format_local_prompt("Hello", "en", "zh")
+        translator._backend = "mlx"
+        translator._prompt_builder = None
+        mlx = translator._format_local_prompt("Hello", "en", "zh")
+        
+        assert pytorch[:2] == [2, 2]
+        assert mlx == pytorch[1:]
+    
+    def test_gguf_gets_string(self, mock_config):
+        """Test GGUF keeps its prompt string."""
+        translator = Translator()
+        translator._backend = "gguf"
+        
+        assert isinstance(translator._format_local_prompt("Hello", "en", "zh"), str)
+
+
+class TestMeasurePrompts:
+    """Test the prompt building microbenchmark."""
+    
+    def test_measure_prompts(self, mock_config):
+        """Test both paths are timed per chunk and agree."""
+        cases = [
+            BenchCase("short", "Hello world.", "zh"),
+            BenchCase("long", "The quick brown fox jumps. " * 30, "ja", long=True),
+        ]
+        
+        result = measure_prompts(TemplateTokenizer(), cases=cases, repeat=3)
+        
+        assert result["chunks"] > 2
+        assert result["identical"] is True
+        assert result["pairs"] == {"en->zh": True, "en->ja": True}
+        assert result["template_us"]["median"] > 0 and result["precompiled_us"]["median"] > 0
+        assert result["config"]["backend"] == "pytorch"
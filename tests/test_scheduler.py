@@ -0,0 +1,175 @@
+"""Tests for generation scheduling."""
+
+import threading
+import time
+
+import pytest
+
+from translategemma_cli.cancellation import CancellationToken, TranslationCancelled
+from translategemma_cli.scheduler import GenerationScheduler
+
+
+class TestGenerationScheduler:
+    """Test GenerationScheduler slot handling."""
+    
+    def test_invalid_capacity(self):
+        """Test capacity must be positive."""
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            GenerationScheduler(capacity=0)
+    
+    def test_slot_tracks_active(self):
+        """Test holding a slot is reflected in stats."""
+        scheduler = GenerationScheduler()
+        
+        with scheduler.slot():
+            assert scheduler.active == 1
+        assert scheduler.active == 0
+        stats = scheduler.stats()
+        assert stats["capacity"] == 1
+        assert stats["active"] == 0
+        assert stats["queued"] == 0
+        assert stats["queued_by_priority"] == {"interactive": 0, "batch": 0, "background": 0}
+    
+    def test_slot_released_on_error(self):
+        """Test an exception inside the slot releases it."""
+        scheduler = GenerationScheduler()
+        
+        with pytest.raises(RuntimeError):
+            with scheduler.slot():
+                raise RuntimeError("boom")
+        assert scheduler.active == 0
+    
+    def test_fifo_order(self):
+        """Test waiters are served in arrival order."""
+        scheduler = GenerationScheduler()
+        order = []
+        
+        def worker(name):
+            with scheduler.slot():
+                order.append(name)
+        
+        with scheduler.slot():
+            threads = []
+            for name in ("a", "b", "c"):
+                thread = threading.Thread(target=worker, args=(name,))
+                thread.start()
+                threads.append(thread)
+                while scheduler.queued < len(threads):
+                    time.sleep(0.01)
+        
+        for thread in threads:
+            thread.join(timeout=5)
+        assert order == ["a", "b", "c"]
+    
+    def test_priority_order(self):
+        """Test more urgent classes are served before earlier bulk waiters."""
+        scheduler = GenerationScheduler()
+        order = []
+        
+        def worker(name, priority):
+            with scheduler.slot(priority=priority):
+                order.append(name)
+        
+        with scheduler.slot():
+            threads = []
+            for name, priority in (
+                ("bulk", "background"),
+                ("job", "batch"),
+                ("user", "interactive"),
+            ):
+                thread = threading.Thread(target=worker, args=(name, priority))
+                thread.start()
+                threads.append(thread)
+                while scheduler.queued < len(threads):
+                    time.sleep(0.01)
+        
+        for thread in threads:
+            thread.join(timeout=5)
+        assert order == ["user", "job", "bulk"]
+    
+    def test_flows_share_slots(self):
+        """Test a flow with a backlog does not block another flow of the same class."""
+        scheduler = GenerationScheduler()
+        order = []
+        
+        def worker(name, flow):
+            with scheduler.slot(priority="batch", flow=flow):
+                order.append(name)
+        
+        with scheduler.slot():
+            threads = []
+            for name, flow in (("a1", "a"), ("a2", "a"), ("a3", "a"), ("b1", "b")):
+                thread = threading.Thread(target=worker, args=(name, flow))
+                thread.start()
+                threads.append(thread)
+                while scheduler.queued < len(threads):
+                    time.sleep(0.01)
+        
+        for thread in threads:
+            thread.join(timeout=5)
+        assert order == ["a1", "b1", "a2", "a3"]
+    
+    def test_queue_wait_stats(self):
+        """Test queue waits are recorded per priority class."""
+        scheduler = GenerationScheduler()
+        
+        with scheduler.slot(priority="background"):
+            pass
+        
+        waits = scheduler.stats()["queue_wait"]
+        assert waits["background"]["served"] == 1
+        assert waits["interactive"]["served"] == 0
+        assert waits["interactive"]["p95_ms"] == 0.0
+    
+    def test_invalid_weights(self):
+        """Test class weights must be positive."""
+        with pytest.raises(ValueError, match="weights must be positive"):
+            GenerationScheduler(weights={"batch": 0})
+    
+    def test_unknown_weight_class(self):
+        """Test weights for a class that does not exist are rejected rather than ignored."""
+        with pytest.raises(ValueError, match="Unknown priority in weights: interactve"):
+            GenerationScheduler(weights={"interactve": 4})
+    
+    def test_unknown_priority(self):
+        """Test an unknown priority class is rejected."""
+        scheduler = GenerationScheduler()
+        
+        with pytest.raises(ValueError, match="Unknown priority"):
+            with scheduler.slot(priority="urgent"):
+                pass
+    
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test a cancelled waiter gives up and the next one is served."""
+        scheduler = GenerationScheduler()
+        token = CancellationToken()
+        errors = []
+        served = []
+        
+        def cancelled_waiter():
+            try:
+                with scheduler.slot(token):
+                    served.append("cancelled")
+            except TranslationCancelled as e:
+                errors.append(e)
+        
+        def next_waiter():
+            with scheduler.slot():
+                served.append("next")
+        
+        with scheduler.slot():
+            first = threading.Thread(target=cancelled_waiter)
+            first.start()
+            while scheduler.queued < 1:
+                time.sleep(0.01)
+            second = threading.Thread(target=next_waiter)
+            second.start()
+            while scheduler.queued < 2:
+                time.sleep(0.01)
+            token.cancel("gone")
+            first.join(timeout=5)
+            assert scheduler.queued == 1
+        
+        second.join(timeout=5)
+        assert len(errors) == 1
+        assert served == ["next"]
@@ -0,0 +1,94 @@
+"""Tests for deferred imports at startup and the import breakdown."""
+
+import json
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from translategemma_cli.cli import app
+from translategemma_cli.startup import (
+    CLI_MODULE,
+    HEAVY_MODULES,
+    StartupReport,
+    measure_startup,
+    parse_importtime,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       500 |        500 | certifi
+import time:       300 |        300 |       yaml.error
+import time:      1200 |       1500 |     yaml
+import time:       400 |        400 |     translategemma_cli.config
+import time:       100 |       2000 |   translategemma_cli
+import time:      2000 |       4000 | translategemma_cli.cli
+"""
+
+
+class TestParse:
+    """Test parsing -X importtime output."""
+    
+    def test_parse_importtime(self):
+        """Test times are converted to milliseconds and nesting is kept."""
+        timings = parse_importtime(SAMPLE)
+        
+        assert [timing.module for timing in timings][-1] == "translategemma_cli.cli"
+        assert timings[-1].cumulative_ms == 4.0
+        assert [timing.depth for timing in timings] == [0, 3, 2, 2, 1, 0]
+    
+    def test_by_package(self):
+        """Test self time is summed per package and site's imports are left out."""
+        report = StartupReport("translategemma_cli.cli", 4.0, 10.0, parse_importtime(SAMPLE))
+        packages = dict(report.by_package())
+        
+        assert packages["yaml"] == 1.5
+        assert packages["translategemma_cli.config"] == 0.4
+        assert "certifi" not in packages
+        assert report.heavy == []
+
+
+class TestDeferredImports:
+    """Test importing the CLI defers heavy modules."""
+    
+    def test_no_heavy_imports(self):
+        """Test torch, transformers, llama_cpp, huggingface_hub and prompt_toolkit are not imported at startup."""
+        report = measure_startup()
+        
+        assert report.timings
+        assert report.heavy == [], f"imported at startup: {report.heavy}"
+    
+    def test_heavy_modules_not_loaded(self):
+        """Test a fresh interpreter importing the CLI has no heavy module in sys.modules."""
+        code = f"import json, sys, {CLI_MODULE}; print(json.dumps(sorted(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        loaded = {name.split(".")[0] for name in json.loads(result.stdout)}
+        
+        assert loaded.isdisjoint(HEAVY_MODULES), f"imported at startup: {sorted(loaded & set(HEAVY_MODULES))}"
+    
+    def test_package_import_is_lazy(self):
+        """Test `import translategemma_cli` does not load the model or translator."""
+        report = measure_startup("translategemma_cli")
+        modules = {timing.module for timing in report.timings}
+        
+        assert "translategemma_cli.model" not in modules
+        assert "translategemma_cli.translator" not in modules
+    
+    def test_lazy_exports(self):
+        """Test package exports still resolve on first access."""
+        import translategemma_cli
+        
+        assert translategemma_cli.Translator.__name__ == "Translator"
+        assert "get_translator" in dir(translategemma_cli)
+
+
+class TestStartupStatsFlag:
+    """Test `translate --startup-stats`."""
+    
+    def test_startup_stats(self):
+        """Test the flag prints the breakdown and exits without translating."""
+        result = CliRunner().invoke(app, ["--startup-stats"])
+        
+        assert result.exit_code == 0, result.output
+        assert "translategemma_cli.cli" in result.output
+        assert "budget" in result.output
@@ -0,0 +1,120 @@
+"""Tests for generation stats."""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli.backends import OllamaBackend, VLLMBackend
+from translategemma_cli.stats import GenerationStats
+
+
+def _stream_response(lines):
+    """Fake urlopen() result that yields the given byte lines."""
+    return io.BytesIO(b"".join(line + b"\n" for line in lines))
+
+
+class TestGenerationStats:
+    """Test GenerationStats derived values."""
+    
+    def test_decode_rates(self):
+        """Test decode time, inter-token latency and tokens/sec exclude the first token."""
+        stats = GenerationStats(prompt_tokens=30, completion_tokens=11, ttft=0.5, total_time=1.5)
+        
+        assert stats.decode_time == pytest.approx(1.0)
+        assert stats.inter_token_latency == pytest.approx(0.1)
+        assert stats.decode_tokens_per_second == pytest.approx(10.0)
+    
+    def test_unknown_values(self):
+        """Test rates are None without TTFT or with a single token."""
+        assert GenerationStats(completion_tokens=5, total_time=1.0).decode_tokens_per_second is None
+        assert GenerationStats(completion_tokens=1, ttft=0.1, total_time=0.1).inter_token_latency is None
+    
+    def test_add_token_sets_ttft_once(self):
+        """Test only the first token sets TTFT."""
+        stats = GenerationStats()
+        stats.add_token()
+        ttft = stats.ttft
+        stats.add_token()
+        stats.finish("stop")
+        
+        assert stats.ttft == ttft
+        assert stats.completion_tokens == 2
+        assert stats.total_time >= ttft
+        assert stats.stop_reason == "stop"
+    
+    def test_to_dict(self):
+        """Test the JSON summary uses milliseconds."""
+        stats = GenerationStats(prompt_tokens=3, completion_tokens=3, ttft=0.2, total_time=0.4, stop_reason="length")
+        
+        assert stats.to_dict() == {
+            "prompt_tokens": 3,
+            "completion_tokens": 3,
+            "ttft_ms": 200.0,
+            "inter_token_ms": 100.0,
+            "decode_tokens_per_second": 10.0,
+            "total_ms": 400.0,
+            "stop_reason": "length",
+        }
+    
+    def test_combine(self):
+        """Test combining sums counts and keeps the first TTFT and last stop reason."""
+        first = GenerationStats(prompt_tokens=10, completion_tokens=5, ttft=0.1, total_time=1.0, stop_reason="stop")
+        second = GenerationStats(prompt_tokens=None, completion_tokens=7, ttft=0.3, total_time=2.0, stop_reason="length")
+        
+        combined = GenerationStats.combine([first, None, second])
+        
+        assert combined.prompt_tokens == 10
+        assert combined.completion_tokens == 12
+        assert combined.ttft == 0.1
+        assert combined.total_time == pytest.approx(3.0)
+        assert combined.stop_reason == "length"
+        assert GenerationStats.combine([]) is None
+
+
+class TestServerBackendStats:
+    """Test server backends report token counts and stop reasons."""
+    
+    def test_vllm_usage_chunk(self):
+        """Test vLLM usage and finish_reason are read from the stream."""
+        chunks = [
+            {"choices": [{"delta": {"content": "Hel"}, "finish_reason": None}]},
+            {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]},
+            {"choices": [], "usage": {"prompt_tokens": 21, "completion_tokens": 2}},
+        ]
+        lines = [b"data: " + json.dumps(chunk).encode() for chunk in chunks] + [b"data: [DONE]"]
+        backend = VLLMBackend(model="m")
+        stats = GenerationStats()
+        
+        with patch("translategemma_cli.backends.urlopen", return_value=_stream_response(lines)) as mock_open:
+            text = backend.generate([{"role": "user", "content": "hi"}], stats=stats)
+        
+        payload = json.loads(mock_open.call_args.args[0].data)
+        assert payload["stream_options"] == {"include_usage": True}
+        assert text == "Hello"
+        assert (stats.prompt_tokens, stats.completion_tokens) == (21, 2)
+        assert stats.stop_reason == "stop"
+        assert stats.ttft is not None
+    
+    def test_ollama_final_counts(self):
+        """Test Ollama's final line provides prompt and eval counts."""
+        lines = [
+            json.dumps({"message": {"content": "Hi"}, "done": False}).encode(),
+            json.dumps({
+                "message": {"content": ""},
+                "done": True,
+                "done_reason": "length",
+                "prompt_eval_count": 12,
+                "eval_count": 4,
+            }).encode(),
+        ]
+        backend = OllamaBackend()
+        stats = GenerationStats()
+        
+        with patch("translategemma_cli.backends.urlopen", return_value=_stream_response(lines)):
+            text = backend.generate([{"role": "user", "content": "hi"}], stats=stats)
+        
+        assert text == "Hi"
+        assert (stats.prompt_tokens, stats.completion_tokens) == (12, 4)
+        assert stats.stop_reason == "length"
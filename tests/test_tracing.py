@@ -0,0 +1,200 @@
+"""Tests for tracing spans."""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from translategemma_cli import tracing
+from translategemma_cli.stats import GenerationStats
+
+
+@pytest.fixture
+def exporter():
+    """Install an in-process JSON exporter for the duration of a test."""
+    exporter = tracing.JSONExporter()
+    previous = tracing.set_exporter(exporter)
+    yield exporter
+    tracing.set_exporter(previous)
+
+
+class TestSpans:
+    """Test span creation, nesting and export."""
+    
+    def test_disabled_by_default(self):
+        """Test the default exporter hands out the shared no-op span."""
+        assert not tracing.get_exporter().enabled
+        
+        with tracing.span("request", chars=3) as span:
+            span.set_attribute("chunks", 1)
+            assert tracing.current_span() is None
+        
+        assert span is tracing.NOOP_SPAN
+        assert tracing.start_span("generate") is tracing.NOOP_SPAN
+    
+    def test_nesting(self, exporter):
+        """Test child spans share the trace and point at their parent."""
+        with tracing.span("request", endpoint="translate") as request:
+            with tracing.span("chunk", index=0) as chunk:
+                assert tracing.current_span() is chunk
+        
+        assert [span.name for span in exporter.spans] == ["chunk", "request"]
+        assert chunk.trace_id == request.trace_id
+        assert chunk.parent_id == request.span_id
+        assert request.parent_id is None
+        assert request.attributes == {"endpoint": "translate"}
+        assert request.duration_ms >= chunk.duration_ms >= 0
+        assert tracing.current_span() is None
+    
+    def test_error_status(self, exporter):
+        """Test exceptions mark the span failed and propagate."""
+        with pytest.raises(ValueError):
+            with tracing.span("generate"):
+                raise ValueError("boom")
+        
+        span = exporter.find("generate")[0]
+        assert span.status == "error"
+        assert span.error == "ValueError: boom"
+    
+    def test_start_span_is_not_current(self, exporter):
+        """Test start_span leaves the current span alone until use_span."""
+        outer = tracing.start_span("request")
+        assert tracing.current_span() is None
+        
+        with tracing.use_span(outer):
+            with tracing.span("chunk") as chunk:
+                pass
+        outer.end()
+        outer.end()
+        
+        assert chunk.parent_id == outer.span_id
+        assert len(exporter.find("request")) == 1
+    
+    def test_bind_context_crosses_threads(self, exporter):
+        """Test bound callables run under the caller's span in another thread."""
+        def work():
+            with tracing.span("generate"):
+                pass
+        
+        with tracing.span("request") as request:
+            thread = threading.Thread(target=tracing.bind_context(work))
+            thread.start()
+            thread.join()
+        
+        assert exporter.find("generate")[0].parent_id == request.span_id
+
+
+class TestExporters:
+    """Test the bundled exporters and configuration."""
+    
+    def test_json_lines_file(self, tmp_path):
+        """Test the JSON exporter appends one line per finished span."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        exporter = tracing.JSONExporter(path)
+        previous = tracing.set_exporter(exporter)
+        try:
+            with tracing.span("request"):
+                with tracing.span("clean", chars=5):
+                    pass
+        finally:
+            tracing.set_exporter(previous)
+            exporter.shutdown()
+        
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["clean", "request"]
+        assert lines[0]["attributes"] == {"chars": 5}
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        assert json.loads(exporter.to_json())[1]["name"] == "request"
+    
+    def test_max_spans(self):
+        """Test only the most recent spans are kept in memory."""
+        exporter = tracing.JSONExporter(max_spans=2)
+        previous = tracing.set_exporter(exporter)
+        try:
+            for name in ("a", "b", "c"):
+                with tracing.span(name):
+                    pass
+        finally:
+            tracing.set_exporter(previous)
+        
+        assert [span.name for span in exporter.spans] == ["b", "c"]
+    
+    def test_configure(self):
+        """Test exporters are selected by name."""
+        previous = tracing.get_exporter()
+        try:
+            assert isinstance(tracing.configure("json"), tracing.JSONExporter)
+            assert not tracing.configure("none").enabled
+            with pytest.raises(ValueError, match="Unknown trace exporter"):
+                tracing.configure("zipkin")
+        finally:
+            tracing.set_exporter(previous)
+    
+    def test_opentelemetry_bridge(self):
+        """Test spans are re-emitted through the OpenTelemetry SDK with parents."""
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        
+        memory = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(memory))
+        previous = tracing.set_exporter(tracing.OpenTelemetryExporter(provider.get_tracer("test")))
+        try:
+            with tracing.span("request"):
+                with tracing.span("generate", backend="gguf"):
+                    pass
+        finally:
+            tracing.set_exporter(previous)
+        
+        generate, request = memory.get_finished_spans()
+        assert generate.parent.span_id == request.context.span_id
+        assert generate.attributes["backend"] == "gguf"
+
+
+class TestTranslatorSpans:
+    """Test the spans emitted by Translator."""
+    
+    def test_translate_spans(self, exporter, mock_config, make_translator):
+        """Test translate() traces generation (with token stats) and cleaning."""
+        translator = make_translator()
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.return_value = ("Hello", GenerationStats(prompt_tokens=12, completion_tokens=2))
+            with tracing.span("request") as request:
+                translator.translate("你好", force_target="en")
+        
+        generate = exporter.find("generate")[0]
+        assert generate.parent_id == request.span_id
+        assert generate.attributes["backend"] == "mlx"
+        assert generate.attributes["prompt_tokens"] == 12
+        assert exporter.find("prompt_format")[0].parent_id == generate.span_id
+        assert exporter.find("clean")[0].parent_id == request.span_id
+    
+    def test_long_text_chunk_spans(self, exporter, mock_config, make_translator):
+        """Test translate_long() traces one chunk span per chunk."""
+        translator = make_translator()
+        text = "这是第一句话。" * 20 + "这是第二句话。" * 20
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.return_value = ("Sentence.", GenerationStats())
+            translator.translate_long(text, force_target="en", chunk_size=60, overlap=0)
+        
+        chunks = exporter.find("chunk")
+        assert len(chunks) == len(exporter.find("generate")) > 1
+        assert [span.attributes["index"] for span in chunks] == list(range(len(chunks)))
+        assert all(span.parent_id in {c.span_id for c in chunks} for span in exporter.find("generate"))
+    
+    def test_stream_span(self, exporter, mock_config, make_translator):
+        """Test streamed generations are traced once the stream ends."""
+        translator = make_translator()
+        
+        with patch("translategemma_cli.translator.Translator._stream_mlx") as mock_stream:
+            mock_stream.return_value = iter([("Hel", "yue", "en"), ("lo", "yue", "en")])
+            list(translator.translate_stream("你好"))
+        
+        generate = exporter.find("generate")[0]
+        assert generate.attributes["stream"] is True
+        assert generate.attributes["completion_tokens"] == 2
@@ -4,6 +4,7 @@
 
 import pytest
 
+from translategemma_cli.stats import GenerationStats
 from translategemma_cli.translator import (
     Translator,
     get_translator,
@@ -234,7 +235,7 @@ def test_translate_basic(self, mock_load, mock_config, mock_model, mock_tokenize
         
         # Mock MLX generate
         with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
-            mock_gen.return_value = "Hello world"
+            mock_gen.return_value = ("Hello world", GenerationStats())
             
             result, source, target = translator.translate("你好")
             
@@ -257,7 +258,7 @@ def test_translate_with_force_target(
         translator.set_force_target("ja")
         
         with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
-            mock_gen.return_value = "こんにちは"
+            mock_gen.return_value = ("こんにちは", GenerationStats())
             
             result, source, target = translator.translate("Hello")
             
@@ -278,7 +279,7 @@ def test_translate_direct_mode(
         translator.set_output_mode("direct")
         
         with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
-            mock_gen.return_value = '"Hello world"\nThis is a greeting.'
+            mock_gen.return_value = ('"Hello world"\nThis is a greeting.', GenerationStats())
             
             result, _, _ = translator.translate("你好")
             
@@ -300,14 +301,78 @@ def test_translate_explain_mode(
         translator.set_output_mode("explain")
         
         with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
-            mock_gen.return_value = "Hello world\nThis is a greeting."
+            mock_gen.return_value = ("Hello world\nThis is a greeting.", GenerationStats())
             
             result, _, _ = translator.translate("你好", mode="explain")
             
             # Explain mode should keep most content
             assert "Hello world" in result
+    
+    def test_translate_uses_context(self, mock_config):
+        """Test generation uses the request's snapshot, not the live config."""
+        from translategemma_cli.config import GenerationParams, RequestContext
+        
+        translator = Translator()
+        translator._model = MagicMock()
+        translator._tokenizer = MagicMock()
+        translator._backend = "gguf"
+        translator._current_model_size = "4b"
+        context = RequestContext(GenerationParams(max_tokens=64, temperature=0.5), ("en", "ja"))
+        mock_config.temperature = 0.0
+        
+        with patch.object(Translator, "_generate_gguf", return_value=("こんにちは", GenerationStats())) as mock_gen:
+            translator.translate("Hello", context=context)
+        
+        args = mock_gen.call_args
+        assert args.args[1] == 64
+        assert args.args[3] == context.generation
 
 
+
+class TestGenerationKwargs:
+    """Test generation params are translated into backend kwargs."""
+    
+    def test_pytorch_min_p(self):
+        """Test min_p reaches transformers generate() when sampling."""
+        from translategemma_cli.config import GenerationParams
+        
+        translator = Translator()
+        translator._tokenizer = MagicMock(eos_token_id=1)
+        
+        kwargs = translator._pytorch_kwargs(32, params=GenerationParams(temperature=0.7, min_p=0.1))
+        
+        assert kwargs["min_p"] == 0.1
+        assert "min_p" not in translator._pytorch_kwargs(32, params=GenerationParams(temperature=0.7))
+    
+    def test_pytorch_stream_min_p(self, make_translator):
+        """Test streaming builds its generate() kwargs like the non-streaming path, min_p included."""
+        import sys
+        from translategemma_cli.config import GenerationParams
+        
+        translator = make_translator("pytorch")
+        transformers = MagicMock()
+        transformers.TextIteratorStreamer.return_value = iter(["你好"])
+        
+        with patch.dict(sys.modules, {"transformers": transformers}), \
+             patch.object(Translator, "_pytorch_inputs", return_value={"input_ids": MagicMock(shape=(1, 2))}), \
+             patch("translategemma_cli.translator._cancel_stopping_criteria"):
+            pieces = list(translator._stream_pytorch([1, 2], 32, "en", "zh", params=GenerationParams(temperature=0.7, min_p=0.1)))
+        
+        kwargs = translator._model.generate.call_args.kwargs
+        assert [piece for piece, _, _ in pieces] == ["你好"]
+        assert (kwargs["min_p"], kwargs["max_new_tokens"], kwargs["do_sample"]) == (0.1, 32, True)
+        assert kwargs["streamer"] is not None
+    
+    def test_gguf_min_p(self):
+        """Test min_p reaches llama-cpp, including 0 to disable its own default."""
+        from translategemma_cli.config import GenerationParams
+        
+        translator = Translator()
+        
+        assert translator._gguf_kwargs(32, GenerationParams(temperature=0.7, min_p=0.1))["min_p"] == 0.1
+        assert translator._gguf_kwargs(32, GenerationParams(temperature=0.7))["min_p"] == 0.0
+        assert "min_p" not in translator._gguf_kwargs(32, GenerationParams(temperature=0.0, min_p=0.1))
+
 class TestTranslatorModelLoading:
     """Test model loading behavior."""
     
@@ -353,6 +418,53 @@ def test_ensure_model_loaded_switch_model(
         
         # Should be called twice for different sizes
         assert mock_load.call_count == 2
+    
+    @patch("translategemma_cli.translator.load_model")
+    def test_ensure_model_loaded_quantization(
+        self, mock_load, mock_config, mock_model, mock_tokenizer
+    ):
+        """Test the quantization is passed to the loader and a change reloads."""
+        mock_load.return_value = (mock_model, mock_tokenizer, "pytorch")
+        
+        translator = Translator()
+        translator._resolve_backend = lambda x: "pytorch"
+        translator.ensure_model_loaded("4b", quantization_bits=8)
+        translator.ensure_model_loaded("4b", quantization_bits=8)
+        translator.ensure_model_loaded("4b", quantization_bits=4)
+        
+        assert [c.kwargs["quantization_bits"] for c in mock_load.call_args_list] == [8, 4]
+        assert mock_config.quantization_bits == 4
+    
+    @patch("translategemma_cli.translator.load_model")
+    def test_translate_after_unload_raises(
+        self, mock_load, mock_config, mock_model, mock_tokenizer
+    ):
+        """Test translating after unload() raises instead of loading the config defaults."""
+        mock_load.return_value = (mock_model, mock_tokenizer, "gguf")
+        
+        translator = Translator()
+        translator.ensure_model_loaded("4b")
+        translator.unload()
+        
+        with pytest.raises(RuntimeError, match="unloaded"):
+            translator.translate("Hello")
+        mock_load.assert_called_once()
+    
+    @patch("translategemma_cli.translator.load_model")
+    def test_failed_switch_can_be_retried(
+        self, mock_load, mock_config, mock_model, mock_tokenizer
+    ):
+        """Test a model switch whose load fails does not leave the translator marked as unloaded."""
+        mock_load.side_effect = [(mock_model, mock_tokenizer, "gguf"), OSError("disk full"), (mock_model, mock_tokenizer, "gguf")]
+        
+        translator = Translator()
+        translator.ensure_model_loaded("4b")
+        with pytest.raises(OSError):
+            translator.ensure_model_loaded("12b")
+        
+        assert translator._unloaded is False
+        translator.ensure_model_loaded("12b")
+        assert translator.current_model_size == "12b"
 
 
 class TestGlobalTranslator:
@@ -405,3 +517,114 @@ def test_translate_stream_mlx(
             assert len(tokens) == 2
             assert tokens[0][0] == "Hello"
             assert tokens[1][0] == " world"
+
+
+class TestTranslatorBatch:
+    """Test batch translation (mocked)."""
+    
+    def test_empty_batch(self, mock_config, make_translator):
+        """Test that an empty batch returns without generating."""
+        translator = make_translator("mlx", "27b")
+        
+        assert translator.translate_batch([]) == []
+    
+    def test_sequential_backend_keeps_order(self, mock_config, make_translator):
+        """Test MLX translates one text after another in input order."""
+        translator = make_translator("mlx", "27b")
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.side_effect = [("One", GenerationStats()), ("Two", GenerationStats())]
+            
+            results = translator.translate_batch(["一", "二"], force_target="en")
+        
+        assert [r[0] for r in results] == ["One", "Two"]
+        assert all(r[2] == "en" for r in results)
+        assert mock_gen.call_count == 2
+    
+    def test_pytorch_generates_in_batches(self, mock_config, make_translator):
+        """Test PyTorch submits prompts batch_size at a time."""
+        translator = make_translator("pytorch", "27b")
+        
+        with patch(
+            "translategemma_cli.translator.Translator._generate_pytorch_batch"
+        ) as mock_batch:
+            mock_batch.side_effect = lambda prompts, *args: (
+                [f"out{i}" for i in range(len(prompts))], GenerationStats()
+            )
+            
+            results = translator.translate_batch(
+                ["a", "b", "c"], force_target="zh", batch_size=2
+            )
+        
+        assert [len(call.args[0]) for call in mock_batch.call_args_list] == [2, 1]
+        assert [r[0] for r in results] == ["out0", "out1", "out0"]
+    
+    def test_server_backend_keeps_order(self, mock_config, make_translator):
+        """Test concurrent server requests are returned in input order."""
+        translator = make_translator("vllm", "27b")
+        
+        with patch(
+            "translategemma_cli.translator.Translator._generate_vllm"
+        ) as mock_gen:
+            mock_gen.side_effect = lambda text, *args: (text.upper(), GenerationStats())
+            
+            results = translator.translate_batch(["hello", "world"], force_target="zh")
+        
+        assert [r[0] for r in results] == ["HELLO", "WORLD"]
+
+
+class TestTranslatorStats:
+    """Test generation stats exposed through last_stats."""
+    
+    def test_translate_sets_last_stats(self, mock_config, make_translator):
+        """Test translate() keeps the backend's stats."""
+        translator = make_translator()
+        stats = GenerationStats(prompt_tokens=12, completion_tokens=3, stop_reason="stop")
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.return_value = ("Hello", stats)
+            translator.translate("你好", force_target="en")
+        
+        assert translator.last_stats is stats
+    
+    def test_batch_combines_stats(self, mock_config, make_translator):
+        """Test translate_batch() reports the combined stats of all texts."""
+        translator = make_translator()
+        
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.side_effect = [
+                ("One", GenerationStats(prompt_tokens=10, completion_tokens=2)),
+                ("Two", GenerationStats(prompt_tokens=11, completion_tokens=3)),
+            ]
+            translator.translate_batch(["一", "二"], force_target="en")
+        
+        assert translator.last_stats.prompt_tokens == 21
+        assert translator.last_stats.completion_tokens == 5
+    
+    def test_stream_counts_pieces(self, mock_config, make_translator):
+        """Test streams without backend token counts count streamed pieces."""
+        translator = make_translator()
+        
+        with patch("translategemma_cli.translator.Translator._stream_mlx") as mock_stream:
+            mock_stream.return_value = iter([("Hel", "yue", "en"), ("lo", "yue", "en")])
+            list(translator.translate_stream("你好"))
+        
+        assert translator.last_stats.completion_tokens == 2
+        assert translator.last_stats.ttft is not None
+    
+    def test_last_stats_is_per_thread(self, mock_config, make_translator):
+        """Test another thread does not see this thread's stats."""
+        import threading
+        
+        translator = make_translator()
+        with patch("translategemma_cli.translator.Translator._generate_mlx") as mock_gen:
+            mock_gen.return_value = ("Hello", GenerationStats())
+            translator.translate("你好", force_target="en")
+        
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(translator.last_stats))
+        thread.start()
+        thread.join()
+        
+        assert translator.last_stats is not None
+        assert seen == [None]
@@ -2,34 +2,56 @@
 
 __version__ = "0.1.0"
 
-from .config import (
-    SUPPORTED_LANGUAGES,
-    MODEL_SIZES,
-    DEFAULT_LANGUAGES,
-    get_config,
-)
-from .detector import (
-    detect_language,
-    get_target_language,
-    get_language_name,
-    is_valid_language,
-)
-from .model import (
-    get_backend,
-    is_model_ready,
-    load_model,
-    get_model_info,
-)
-from .translator import (
-    Translator,
-    get_translator,
-)
-from .backends import (
-    VLLMBackend,
-    OllamaBackend,
-    check_vllm_server,
-    check_ollama_server,
-)
+from importlib import import_module
+
+# Public names and the submodule each is imported from on first access, so
+# `import translategemma_cli` (and the CLI) does not pay for model,
+# backend and rich imports until they are used
+_EXPORTS = {
+    "SUPPORTED_LANGUAGES": "config",
+    "MODEL_SIZES": "config",
+    "DEFAULT_LANGUAGES": "config",
+    "get_config": "config",
+    "detect_language": "detector",
+    "get_target_language": "detector",
+    "get_language_name": "detector",
+    "is_valid_language": "detector",
+    "get_backend": "model",
+    "is_model_ready": "model",
+    "load_model": "model",
+    "get_model_info": "model",
+    "Translator": "translator",
+    "get_translator": "translator",
+    "VLLMBackend": "backends",
+    "OllamaBackend": "backends",
+    "FakeBackend": "backends",
+    "check_vllm_server": "backends",
+    "check_ollama_server": "backends",
+    "CancellationToken": "cancellation",
+    "TranslationCancelled": "cancellation",
+    "TranslationMetrics": "metrics",
+    "TranslatorObserver": "metrics",
+    "get_metrics": "metrics",
+    "GenerationStats": "stats",
+    "Profiler": "profiling",
+    "JSONExporter": "tracing",
+    "SpanExporter": "tracing",
+    "set_exporter": "tracing",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     # Version
@@ -55,6 +77,22 @@
     # Backends
     "VLLMBackend",
     "OllamaBackend",
+    "FakeBackend",
     "check_vllm_server",
     "check_ollama_server",
+    # Cancellation
+    "CancellationToken",
+    "TranslationCancelled",
+    # Metrics
+    "TranslationMetrics",
+    "TranslatorObserver",
+    "get_metrics",
+    # Stats
+    "GenerationStats",
+    # Profiling
+    "Profiler",
+    # Tracing
+    "JSONExporter",
+    "SpanExporter",
+    "set_exporter",
 ]
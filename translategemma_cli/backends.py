@@ -1,14 +1,19 @@
-"""Backend implementations for vLLM and Ollama inference servers."""
+"""Backend implementations for vLLM and Ollama inference servers, plus a fake backend for testing."""
 
 from __future__ import annotations
 
 import json
-from typing import Any, Generator
+import threading
+import time
+from typing import Any, Generator, Sequence
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 
 from rich.console import Console
 
+from .cancellation import CancellationToken, TranslationCancelled
+from .stats import GenerationStats, CANCELLED, LENGTH, STOP
+
 console = Console()
 
 
@@ -77,6 +82,12 @@ def generate(
         messages: list[dict],
         max_tokens: int = 512,
         temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
     ) -> str:
         """
         Generate a response using the vLLM server.
@@ -85,10 +96,23 @@ def generate(
             messages: Chat messages in OpenAI format
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0 for deterministic)
+            cancel_token: Token that closes the request when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p: Nucleus sampling threshold (1.0 = disabled)
+            top_k: Top-k sampling (0 = disabled)
+            min_p: Minimum probability threshold (0.0 = disabled)
+            repetition_penalty: Repetition penalty (1.0 = disabled)
             
         Returns:
             Generated text response
         """
+        if cancel_token is not None or stats is not None:
+            # Stream so the connection can be dropped mid-generation and the
+            # first token can be timed
+            return "".join(self.generate_stream(
+                messages, max_tokens, temperature, cancel_token, stats, top_p, top_k, min_p, repetition_penalty
+            ))
+        
         # Get model from server if not specified
         model = self.model
         if not model:
@@ -103,6 +127,7 @@ def generate(
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
+            **_sampling_options(top_p, top_k, min_p, repetition_penalty),
         }
         
         req = Request(
@@ -128,6 +153,12 @@ def generate_stream(
         messages: list[dict],
         max_tokens: int = 512,
         temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
     ) -> Generator[str, None, None]:
         """
         Generate a streaming response using the vLLM server.
@@ -136,9 +167,18 @@ def generate_stream(
             messages: Chat messages in OpenAI format
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            cancel_token: Token that closes the HTTP stream when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p: Nucleus sampling threshold (1.0 = disabled)
+            top_k: Top-k sampling (0 = disabled)
+            min_p: Minimum probability threshold (0.0 = disabled)
+            repetition_penalty: Repetition penalty (1.0 = disabled)
             
         Yields:
             Token strings as they are generated
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-stream
         """
         model = self.model
         if not model:
@@ -153,8 +193,12 @@ def generate_stream(
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
+            **_sampling_options(top_p, top_k, min_p, repetition_penalty),
             "stream": True,
         }
+        if stats is not None:
+            # Ask for a final chunk carrying the server's token counts
+            payload["stream_options"] = {"include_usage": True}
         
         req = Request(
             f"{self.server_url}/v1/chat/completions",
@@ -165,8 +209,12 @@ def generate_stream(
         req.add_header("Accept", "text/event-stream")
         
         try:
+            # Leaving the with-block closes the connection, which makes the
+            # server abort the request and free its batch slot
             with urlopen(req, timeout=120) as response:
                 for line in response:
+                    if cancel_token is not None and cancel_token.is_cancelled:
+                        break
                     line = line.decode("utf-8").strip()
                     if not line or not line.startswith("data: "):
                         continue
@@ -177,16 +225,25 @@ def generate_stream(
                     
                     try:
                         data = json.loads(data_str)
-                        delta = data["choices"][0].get("delta", {})
-                        content = delta.get("content", "")
-                        if content:
-                            yield content
                     except json.JSONDecodeError:
                         continue
+                    if stats is not None:
+                        _update_vllm_stats(stats, data)
+                    # The usage chunk has no choices
+                    if not data.get("choices"):
+                        continue
+                    content = data["choices"][0].get("delta", {}).get("content", "")
+                    if content:
+                        yield content
                         
         except HTTPError as e:
             error_body = e.read().decode() if e.fp else ""
             raise RuntimeError(f"vLLM streaming error {e.code}: {error_body}")
+        
+        if cancel_token is not None and cancel_token.is_cancelled:
+            if stats is not None:
+                stats.stop_reason = CANCELLED
+            raise TranslationCancelled(cancel_token.reason or "Translation cancelled")
 
 
 class OllamaBackend:
@@ -318,6 +375,12 @@ def generate(
         messages: list[dict],
         max_tokens: int = 512,
         temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
     ) -> str:
         """
         Generate a response using Ollama.
@@ -326,10 +389,23 @@ def generate(
             messages: Chat messages in OpenAI-like format
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            cancel_token: Token that closes the request when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p: Nucleus sampling threshold (1.0 = disabled)
+            top_k: Top-k sampling (0 = disabled)
+            min_p: Minimum probability threshold (0.0 = disabled)
+            repetition_penalty: Repetition penalty (1.0 = disabled)
             
         Returns:
             Generated text response
         """
+        if cancel_token is not None or stats is not None:
+            # Stream so the connection can be dropped mid-generation and the
+            # first token can be timed
+            return "".join(self.generate_stream(
+                messages, max_tokens, temperature, cancel_token, stats, top_p, top_k, min_p, repetition_penalty
+            ))
+        
         payload = {
             "model": self.model,
             "messages": messages,
@@ -337,6 +413,7 @@ def generate(
             "options": {
                 "num_predict": max_tokens,
                 "temperature": temperature,
+                **_sampling_options(top_p, top_k, min_p, repetition_penalty, penalty_key="repeat_penalty"),
             },
         }
         
@@ -362,6 +439,12 @@ def generate_stream(
         messages: list[dict],
         max_tokens: int = 512,
         temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
     ) -> Generator[str, None, None]:
         """
         Generate a streaming response using Ollama.
@@ -370,9 +453,18 @@ def generate_stream(
             messages: Chat messages in OpenAI-like format
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            cancel_token: Token that closes the HTTP stream when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p: Nucleus sampling threshold (1.0 = disabled)
+            top_k: Top-k sampling (0 = disabled)
+            min_p: Minimum probability threshold (0.0 = disabled)
+            repetition_penalty: Repetition penalty (1.0 = disabled)
             
         Yields:
             Token strings as they are generated
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-stream
         """
         payload = {
             "model": self.model,
@@ -381,6 +473,7 @@ def generate_stream(
             "options": {
                 "num_predict": max_tokens,
                 "temperature": temperature,
+                **_sampling_options(top_p, top_k, min_p, repetition_penalty, penalty_key="repeat_penalty"),
             },
         }
         
@@ -392,23 +485,349 @@ def generate_stream(
         req.add_header("Content-Type", "application/json")
         
         try:
+            # Leaving the with-block closes the connection, which makes
+            # Ollama stop generating for this request
             with urlopen(req, timeout=120) as response:
                 for line in response:
+                    if cancel_token is not None and cancel_token.is_cancelled:
+                        break
                     if not line:
                         continue
                     try:
                         data = json.loads(line.decode())
-                        content = data.get("message", {}).get("content", "")
-                        if content:
-                            yield content
-                        if data.get("done", False):
-                            break
                     except json.JSONDecodeError:
                         continue
+                    if stats is not None:
+                        _update_ollama_stats(stats, data)
+                    content = data.get("message", {}).get("content", "")
+                    if content:
+                        yield content
+                    if data.get("done", False):
+                        break
                         
         except HTTPError as e:
             error_body = e.read().decode() if e.fp else ""
             raise RuntimeError(f"Ollama streaming error {e.code}: {error_body}")
+        
+        if cancel_token is not None and cancel_token.is_cancelled:
+            if stats is not None:
+                stats.stop_reason = CANCELLED
+            raise TranslationCancelled(cancel_token.reason or "Translation cancelled")
+
+
+class FakeBackend:
+    """
+    Deterministic stand-in for a model, for CPU-only performance testing.
+    
+    "Translates" by echoing the text to translate back in tokens of
+    chars_per_token characters, sleeping to mimic a real runtime:
+    
+    - prefill: prefill_latency plus prefill_token_latency per prompt token
+    - decode: token_latency per token, times the batch curve factor for the
+      number of sequences generating at that moment
+    
+    The batch curve is a list of (batch_size, factor) points, interpolated
+    linearly and held flat past the last point. [(1, 1.0), (8, 1.5)] means
+    eight concurrent sequences each decode 1.5x slower than one alone, i.e.
+    5.3x the aggregate throughput.
+    
+    Usage:
+        backend = FakeBackend(token_latency=0.02, prefill_latency=0.1)
+        text = backend.generate([{"role": "user", "content": "..."}])
+    """
+    
+    def __init__(
+        self,
+        token_latency: float = 0.0,
+        prefill_latency: float = 0.0,
+        prefill_token_latency: float = 0.0,
+        batch_curve: Sequence[tuple[int, float]] | str | None = None,
+        chars_per_token: int = 4,
+    ):
+        """
+        Initialize fake backend.
+        
+        Args:
+            token_latency: Seconds per decoded token at batch size 1
+            prefill_latency: Fixed seconds of prompt processing per generation
+            prefill_token_latency: Additional prefill seconds per prompt token
+            batch_curve: (batch_size, factor) points or "1:1.0,8:1.5" (default: no slowdown)
+            chars_per_token: Characters per fake token
+            
+        Raises:
+            ValueError: If a latency is negative or the batch curve is malformed
+        """
+        if min(token_latency, prefill_latency, prefill_token_latency) < 0:
+            raise ValueError("Latencies must not be negative")
+        if chars_per_token < 1:
+            raise ValueError("chars_per_token must be at least 1")
+        self.token_latency = token_latency
+        self.prefill_latency = prefill_latency
+        self.prefill_token_latency = prefill_token_latency
+        self.batch_curve = parse_batch_curve(batch_curve)
+        self.chars_per_token = chars_per_token
+        self._active = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, options: dict) -> FakeBackend:
+        """Create a backend from the config's fake backend options."""
+        return cls(
+            token_latency=float(options.get("token_latency", 0.0)),
+            prefill_latency=float(options.get("prefill_latency", 0.0)),
+            prefill_token_latency=float(options.get("prefill_token_latency", 0.0)),
+            batch_curve=options.get("batch_curve"),
+        )
+    
+    def is_available(self) -> tuple[bool, str | None]:
+        """The fake backend is always available."""
+        return True, None
+    
+    @property
+    def active(self) -> int:
+        """Number of sequences currently generating."""
+        return self._active
+    
+    def batch_factor(self, batch_size: int) -> float:
+        """Decode slowdown per token at the given batch size."""
+        points = self.batch_curve
+        if batch_size <= points[0][0]:
+            return points[0][1]
+        for (low, low_factor), (high, high_factor) in zip(points, points[1:]):
+            if batch_size <= high:
+                return low_factor + (high_factor - low_factor) * (batch_size - low) / (high - low)
+        return points[-1][1]
+    
+    def tokenize(self, text: str) -> list[str]:
+        """Split text into fake tokens; joining them gives the text back."""
+        size = self.chars_per_token
+        return [text[i:i + size] for i in range(0, len(text), size)]
+    
+    def generate(
+        self,
+        messages: list[dict],
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
+    ) -> str:
+        """
+        Generate a response.
+        
+        Args:
+            messages: Chat messages in OpenAI format
+            max_tokens: Maximum tokens to generate
+            temperature: Ignored; output is always deterministic
+            cancel_token: Token that stops generation when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p, top_k, min_p, repetition_penalty: Ignored, like temperature
+            
+        Returns:
+            The text to translate, echoed back
+        """
+        return "".join(self.generate_stream(
+            messages, max_tokens, temperature, cancel_token, stats, top_p, top_k, min_p, repetition_penalty
+        ))
+    
+    def generate_stream(
+        self,
+        messages: list[dict],
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        top_p: float = 1.0,
+        top_k: int = 0,
+        min_p: float = 0.0,
+        repetition_penalty: float = 1.0,
+    ) -> Generator[str, None, None]:
+        """
+        Generate a streaming response.
+        
+        Args:
+            messages: Chat messages in OpenAI format
+            max_tokens: Maximum tokens to generate
+            temperature: Ignored; output is always deterministic
+            cancel_token: Token that stops generation when cancelled (optional)
+            stats: Filled with token counts, TTFT and stop reason (optional)
+            top_p, top_k, min_p, repetition_penalty: Ignored, like temperature
+            
+        Yields:
+            Token strings as they are generated
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-stream
+        """
+        prompt = _last_user_content(messages)
+        tokens = self.tokenize(_source_text(prompt))
+        if stats is not None:
+            stats.prompt_tokens = len(self.tokenize(prompt))
+        
+        with self._lock:
+            self._active += 1
+        try:
+            self._sleep(self.prefill_latency + self.prefill_token_latency * len(self.tokenize(prompt)))
+            for token in tokens[:max_tokens]:
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    if stats is not None:
+                        stats.stop_reason = CANCELLED
+                    raise TranslationCancelled(cancel_token.reason or "Translation cancelled")
+                self._sleep(self.token_latency * self.batch_factor(self._active))
+                if stats is not None:
+                    stats.add_token()
+                yield token
+        finally:
+            with self._lock:
+                self._active -= 1
+        
+        if stats is not None:
+            stats.stop_reason = LENGTH if len(tokens) > max_tokens else STOP
+    
+    def generate_batch(
+        self,
+        batch: list[list[dict]],
+        max_tokens: int = 512,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[list[str], GenerationStats]:
+        """
+        Generate responses for several conversations as one padded batch.
+        
+        Prefill covers every prompt at once; decode runs for as many steps
+        as the longest response, each costing token_latency times the batch
+        curve factor for the batch size.
+        
+        Args:
+            batch: One list of chat messages per sequence
+            max_tokens: Maximum tokens to generate per sequence
+            cancel_token: Token that stops generation when cancelled (optional)
+            
+        Returns:
+            Tuple of (responses in input order, combined stats)
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-batch
+        """
+        stats = GenerationStats()
+        prompts = [_last_user_content(messages) for messages in batch]
+        outputs = [self.tokenize(_source_text(prompt))[:max_tokens] for prompt in prompts]
+        prompt_tokens = sum(len(self.tokenize(prompt)) for prompt in prompts)
+        steps = max((len(tokens) for tokens in outputs), default=0)
+        
+        with self._lock:
+            self._active += len(batch)
+        try:
+            self._sleep(self.prefill_latency + self.prefill_token_latency * prompt_tokens)
+            for _ in range(steps):
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    stats.stop_reason = CANCELLED
+                    raise TranslationCancelled(cancel_token.reason or "Translation cancelled")
+                self._sleep(self.token_latency * self.batch_factor(self._active))
+                stats.first_token()
+        finally:
+            with self._lock:
+                self._active -= len(batch)
+        
+        stats.prompt_tokens = prompt_tokens
+        stats.completion_tokens = sum(len(tokens) for tokens in outputs)
+        truncated = any(len(self.tokenize(_source_text(prompt))) > max_tokens for prompt in prompts)
+        return ["".join(tokens) for tokens in outputs], stats.finish(LENGTH if truncated else STOP)
+    
+    @staticmethod
+    def _sleep(seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def _sampling_options(
+    top_p: float, top_k: int, min_p: float, repetition_penalty: float, penalty_key: str = "repetition_penalty"
+) -> dict:
+    """Sampling settings that differ from their neutral values, as request payload fields."""
+    options = {}
+    if top_p < 1.0:
+        options["top_p"] = top_p
+    if top_k > 0:
+        options["top_k"] = top_k
+    if min_p > 0.0:
+        options["min_p"] = min_p
+    if repetition_penalty != 1.0:
+        options[penalty_key] = repetition_penalty
+    return options
+
+
+def parse_batch_curve(curve: Sequence[tuple[int, float]] | str | None) -> list[tuple[int, float]]:
+    """
+    Normalize a batch curve to sorted (batch_size, factor) points.
+    
+    Args:
+        curve: Points, a "1:1.0,8:1.5" string, or None for a flat curve
+        
+    Raises:
+        ValueError: If a point is malformed or a batch size or factor is not positive
+    """
+    if curve is None or curve == "":
+        return [(1, 1.0)]
+    if isinstance(curve, str):
+        try:
+            points = [
+                (int(size), float(factor))
+                for size, factor in (item.split(":") for item in curve.split(",") if item.strip())
+            ]
+        except ValueError:
+            raise ValueError(f"Invalid batch curve: {curve!r} (expected e.g. '1:1.0,8:1.5')") from None
+    else:
+        points = [(int(size), float(factor)) for size, factor in curve]
+    if not points or any(size < 1 or factor <= 0 for size, factor in points):
+        raise ValueError("Batch curve points need a batch size >= 1 and a positive factor")
+    return sorted(dict(points).items())
+
+
+def _last_user_content(messages: list[dict]) -> str:
+    """Content of the last user message."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content", "")
+            if isinstance(content, list):
+                # OpenAI content parts
+                return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content
+    return ""
+
+
+def _source_text(prompt: str) -> str:
+    """The text to translate in a server-style prompt (everything after the instruction)."""
+    instruction, separator, text = prompt.partition("\n\n")
+    if separator and instruction.startswith("Translate the following text"):
+        return text
+    return prompt
+
+
+def _update_vllm_stats(stats: GenerationStats, data: dict) -> None:
+    """Fold one OpenAI-style stream chunk into stats."""
+    choices = data.get("choices") or []
+    if choices:
+        if choices[0].get("delta", {}).get("content"):
+            # Each content chunk is one token unless the server reports usage
+            stats.add_token()
+        if choices[0].get("finish_reason"):
+            stats.stop_reason = choices[0]["finish_reason"]
+    usage = data.get("usage")
+    if usage:
+        stats.prompt_tokens = usage.get("prompt_tokens", stats.prompt_tokens)
+        stats.completion_tokens = usage.get("completion_tokens", stats.completion_tokens)
+
+
+def _update_ollama_stats(stats: GenerationStats, data: dict) -> None:
+    """Fold one Ollama /api/chat stream line into stats."""
+    if data.get("message", {}).get("content"):
+        stats.add_token()
+    if data.get("done"):
+        stats.prompt_tokens = data.get("prompt_eval_count", stats.prompt_tokens)
+        stats.completion_tokens = data.get("eval_count", stats.completion_tokens)
+        stats.stop_reason = data.get("done_reason") or stats.stop_reason
 
 
 def check_vllm_server(url: str = "http://localhost:8000") -> tuple[bool, str | None]:
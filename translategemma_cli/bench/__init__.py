@@ -0,0 +1,67 @@
+"""Reproducible benchmark suite: pinned corpus, repeated runs, comparable JSON results, HTTP load tests, chunking sweeps, memory footprints, prompt building, PyTorch execution modes and CPU dtypes."""
+
+from .chunking import (
+    DEFAULT_CHUNK_SIZES,
+    DEFAULT_OVERLAPS,
+    DEFAULT_SPLIT_BY,
+    apply_recommendations,
+    chrf,
+    load_cases,
+    recommend,
+    settings_grid,
+    sweep_chunking,
+)
+from .compare import DEFAULT_THRESHOLD, Comparison, MetricDelta, compare_results
+from .corpus import CORPUS_VERSION, DEFAULT_SEED, BenchCase, build_corpus, corpus_fingerprint, select_cases
+from .load import ENDPOINTS, LoadRequest, Sample, default_requests, load_requests, run_levels, run_load, send, summarize
+from .memory import DEFAULT_CONTEXTS, measure_memory
+from .prompts import DEFAULT_PROMPT_REPEAT, load_tokenizer, measure_prompts, prompt_chunks
+from .pytorch import DEFAULT_PYTORCH_VARIANTS, PYTORCH_VARIANTS, compare_pytorch
+from .runner import RESULT_SCHEMA, default_output, load_result, percentile, run_case, run_suite, save_result
+
+__all__ = [
+    "BenchCase",
+    "build_corpus",
+    "corpus_fingerprint",
+    "select_cases",
+    "CORPUS_VERSION",
+    "DEFAULT_SEED",
+    "run_suite",
+    "run_case",
+    "percentile",
+    "save_result",
+    "load_result",
+    "default_output",
+    "RESULT_SCHEMA",
+    "compare_results",
+    "Comparison",
+    "MetricDelta",
+    "DEFAULT_THRESHOLD",
+    "LoadRequest",
+    "Sample",
+    "ENDPOINTS",
+    "default_requests",
+    "load_requests",
+    "send",
+    "run_load",
+    "run_levels",
+    "summarize",
+    "sweep_chunking",
+    "settings_grid",
+    "recommend",
+    "apply_recommendations",
+    "load_cases",
+    "chrf",
+    "DEFAULT_CHUNK_SIZES",
+    "DEFAULT_OVERLAPS",
+    "DEFAULT_SPLIT_BY",
+    "measure_memory",
+    "DEFAULT_CONTEXTS",
+    "measure_prompts",
+    "prompt_chunks",
+    "load_tokenizer",
+    "DEFAULT_PROMPT_REPEAT",
+    "compare_pytorch",
+    "PYTORCH_VARIANTS",
+    "DEFAULT_PYTORCH_VARIANTS",
+]
@@ -0,0 +1,308 @@
+"""Sweep chunking settings and recommend the best per language pair."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import statistics
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from ..metrics import TranslatorObserver
+from ..stats import LENGTH, GenerationStats
+from .corpus import CORPUS_VERSION, DEFAULT_SEED, BenchCase, build_corpus, corpus_fingerprint
+from .runner import RESULT_SCHEMA, environment
+
+DEFAULT_CHUNK_SIZES = (60, 80, 100, 150, 200)
+DEFAULT_OVERLAPS = (0, 10, 30)
+DEFAULT_SPLIT_BY = ("sentence", "paragraph")
+
+# Settings whose chrF is within this many points of the best count as equally good
+CHRF_TOLERANCE = 1.0
+
+# Without references, settings whose output/input length ratio is within this
+# relative distance of the pair's median ratio count as complete translations
+LENGTH_RATIO_TOLERANCE = 0.15
+
+
+def chrf(hypothesis: str, reference: str, order: int = 6, beta: float = 2.0) -> float:
+    """
+    Character n-gram F-score (chrF, Popović 2015) on a 0-100 scale.
+
+    Whitespace is ignored and n-gram precision and recall are averaged over
+    orders 1..order, as in sacreBLEU's default chrF.
+    """
+    hypothesis = "".join(hypothesis.split())
+    reference = "".join(reference.split())
+    precisions, recalls = [], []
+    for n in range(1, order + 1):
+        hyp = Counter(hypothesis[i:i + n] for i in range(len(hypothesis) - n + 1))
+        ref = Counter(reference[i:i + n] for i in range(len(reference) - n + 1))
+        if not hyp or not ref:
+            continue
+        matches = sum((hyp & ref).values())
+        precisions.append(matches / sum(hyp.values()))
+        recalls.append(matches / sum(ref.values()))
+    if not precisions:
+        return 0.0
+    precision = statistics.fmean(precisions)
+    recall = statistics.fmean(recalls)
+    if not precision and not recall:
+        return 0.0
+    beta2 = beta ** 2
+    return 100 * (1 + beta2) * precision * recall / (beta2 * precision + recall)
+
+
+def load_cases(path: Path | str) -> tuple[list[BenchCase], dict[str, str]]:
+    """
+    Read a sweep corpus from a JSON lines file.
+
+    Each line is {"name": ..., "text": ..., "target_lang": ...} with an
+    optional "reference" translation used for chrF.
+
+    Returns:
+        The cases (all translated with chunking) and the references by case name
+
+    Raises:
+        ValueError: If a line is not valid JSON or lacks a field
+    """
+    cases, references = [], {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                case = BenchCase(data["name"], data["text"], data["target_lang"], long=True)
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: expected name, text and target_lang ({e})") from None
+            cases.append(case)
+            if data.get("reference"):
+                references[case.name] = data["reference"]
+    if not cases:
+        raise ValueError(f"{path}: no cases")
+    return cases, references
+
+
+def settings_grid(
+    chunk_sizes: tuple[int, ...] = DEFAULT_CHUNK_SIZES,
+    overlaps: tuple[int, ...] = DEFAULT_OVERLAPS,
+    split_by: tuple[str, ...] = DEFAULT_SPLIT_BY,
+) -> list[dict]:
+    """Every valid combination of the given settings (overlap must be below chunk_size)."""
+    return [
+        {"chunk_size": size, "overlap": overlap, "split_by": mode}
+        for size, overlap, mode in itertools.product(chunk_sizes, overlaps, split_by)
+        if 0 <= overlap < size
+    ]
+
+
+class _GenerationLog(TranslatorObserver):
+    """Collects the stats of every generation (one per chunk)."""
+
+    def __init__(self):
+        self.stats: list[GenerationStats] = []
+
+    def on_generation(self, stats: GenerationStats, labels: dict) -> None:
+        self.stats.append(stats)
+
+
+def _run_trial(translator, case: BenchCase, settings: dict, repeat: int, reference: str | None) -> dict:
+    log = _GenerationLog()
+    translator.add_observer(log)
+    try:
+        latencies = []
+        output = ""
+        for _ in range(repeat):
+            log.stats.clear()
+            start = time.perf_counter()
+            output = translator.translate_long(case.text, force_target=case.target_lang, **settings)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        translator.remove_observer(log)
+
+    generations = log.stats
+    truncated = sum(1 for stats in generations if stats.stop_reason == LENGTH)
+    tokens = [stats.completion_tokens for stats in generations if stats.completion_tokens is not None]
+    return {
+        "latency_ms": round(statistics.median(latencies) * 1000, 2),
+        "chunks": len(generations),
+        "completion_tokens": sum(tokens) if tokens else None,
+        "truncation_rate": round(truncated / len(generations), 4) if generations else 0.0,
+        "length_ratio": round(len(output) / len(case.text), 4) if case.text else None,
+        "chrf": round(chrf(output, reference), 2) if reference else None,
+    }
+
+
+def _mean(values: list[float | None]) -> float | None:
+    present = [value for value in values if value is not None]
+    return round(statistics.fmean(present), 4) if present else None
+
+
+def sweep_chunking(
+    cases: list[BenchCase] | None = None,
+    references: dict[str, str] | None = None,
+    grid: list[dict] | None = None,
+    model_size: str | None = None,
+    quantization: int | None = None,
+    backend: str | None = None,
+    repeat: int = 1,
+    seed: int = DEFAULT_SEED,
+    translator=None,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Translate every case with every chunking setting.
+
+    Each trial records latency, generated tokens, the share of chunks cut off
+    at max_tokens (truncation rate), the output/input length ratio and, for
+    cases with a reference, chrF. Trials are aggregated per language pair.
+
+    Args:
+        cases: Cases to translate (default: the long cases of the corpus)
+        references: Reference translations by case name
+        grid: Settings to try (default: settings_grid())
+        model_size: Model size (default: config)
+        quantization: Quantization bits (default: config)
+        backend: Backend type (default: config)
+        repeat: Timed runs per case and setting (latency is the median)
+        seed: Corpus seed for the default cases
+        translator: Translator to use (default: the shared translator)
+        progress: Called with each setting before it runs
+
+    Returns:
+        JSON-serializable result; pass it to recommend()
+
+    Raises:
+        ValueError: If repeat is less than 1
+    """
+    from ..config import get_config
+    from ..detector import detect_language
+    from ..translator import get_translator
+
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+
+    # Overrides apply for the sweep only; the shared config is restored after it
+    config = get_config()
+    saved = (config.model_size, config.quantization_bits, config.backend_type)
+    if model_size:
+        config.model_size = model_size
+    if quantization:
+        config.quantization_bits = quantization
+    if backend:
+        config.backend_type = backend
+    try:
+        cases = cases if cases is not None else [case for case in build_corpus(seed) if case.long]
+        references = references or {}
+        grid = grid or settings_grid()
+        translator = translator or get_translator()
+        translator.ensure_model_loaded(config.model_size, config.backend_type)
+
+        pairs = {case.name: f"{detect_language(case.text, config.languages)}-{case.target_lang}" for case in cases}
+        trials = []
+        for settings in grid:
+            if progress:
+                progress(settings)
+            results = {case.name: _run_trial(translator, case, settings, repeat, references.get(case.name)) for case in cases}
+            by_pair = {}
+            for pair in dict.fromkeys(pairs.values()):
+                members = [results[name] for name, case_pair in pairs.items() if case_pair == pair]
+                by_pair[pair] = {
+                    "latency_ms": round(sum(result["latency_ms"] for result in members), 2),
+                    "completion_tokens": sum(result["completion_tokens"] or 0 for result in members),
+                    "truncation_rate": _mean([result["truncation_rate"] for result in members]),
+                    "length_ratio": _mean([result["length_ratio"] for result in members]),
+                    "chrf": _mean([result["chrf"] for result in members]),
+                }
+            trials.append({**settings, "cases": results, "pairs": by_pair})
+
+        return {
+            "schema": RESULT_SCHEMA,
+            "kind": "chunking",
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "corpus": {
+                "version": CORPUS_VERSION,
+                "seed": seed,
+                "fingerprint": corpus_fingerprint(cases),
+                "cases": pairs,
+                "references": sorted(references),
+            },
+            "config": {
+                "model_size": config.model_size,
+                "quantization_bits": config.quantization_bits,
+                "backend": translator.backend or config.backend_type,
+                "max_tokens": config.max_tokens,
+                "repeat": repeat,
+            },
+            "environment": environment(),
+            "trials": trials,
+        }
+    finally:
+        config.model_size, config.quantization_bits, config.backend_type = saved
+
+
+def recommend(result: dict) -> dict[str, dict]:
+    """
+    Pick the best chunking setting per language pair from a sweep.
+
+    Settings with the lowest truncation rate are kept; among them, those
+    within CHRF_TOLERANCE of the best chrF (or, without references, within
+    LENGTH_RATIO_TOLERANCE of the pair's median length ratio, since dropped
+    or repeated content skews the ratio) are equally good, and the fastest
+    of those wins.
+
+    Returns:
+        {lang_pair: {"chunk_size", "overlap", "split_by", plus the winning metrics}}
+    """
+    recommendations = {}
+    pairs = dict.fromkeys(pair for trial in result["trials"] for pair in trial["pairs"])
+    for pair in pairs:
+        candidates = [(trial, trial["pairs"][pair]) for trial in result["trials"] if pair in trial["pairs"]]
+        lowest = min(metrics["truncation_rate"] or 0.0 for _, metrics in candidates)
+        candidates = [(trial, metrics) for trial, metrics in candidates if (metrics["truncation_rate"] or 0.0) == lowest]
+
+        scores = [metrics["chrf"] for _, metrics in candidates if metrics["chrf"] is not None]
+        if scores:
+            best = max(scores)
+            candidates = [(trial, metrics) for trial, metrics in candidates if (metrics["chrf"] or 0.0) >= best - CHRF_TOLERANCE]
+        else:
+            ratios = [metrics["length_ratio"] for _, metrics in candidates if metrics["length_ratio"] is not None]
+            if ratios:
+                median = statistics.median(ratios)
+
+                def deviation(metrics: dict) -> float:
+                    return abs((metrics["length_ratio"] or 0.0) - median) / median if median else 0.0
+
+                close = [(trial, metrics) for trial, metrics in candidates if deviation(metrics) <= LENGTH_RATIO_TOLERANCE]
+                candidates = close or [min(candidates, key=lambda item: deviation(item[1]))]
+
+        trial, metrics = min(candidates, key=lambda item: item[1]["latency_ms"])
+        recommendations[pair] = {
+            "chunk_size": trial["chunk_size"],
+            "overlap": trial["overlap"],
+            "split_by": trial["split_by"],
+            **metrics,
+        }
+    return recommendations
+
+
+def apply_recommendations(recommendations: dict[str, dict], model_size: str, config=None) -> None:
+    """
+    Write recommended settings into the config file for model_size.
+
+    Args:
+        recommendations: Output of recommend()
+        model_size: Model the sweep was run with
+        config: Config to update (default: a fresh copy of the config file,
+            so overrides made for the sweep are not saved with it)
+    """
+    from ..config import Config, get_config
+
+    config = config or Config(get_config().config_path)
+    for pair, settings in recommendations.items():
+        config.set_tuned_chunking(model_size, pair, settings)
+    config.save()
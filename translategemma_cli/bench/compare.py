@@ -0,0 +1,118 @@
+"""Compare two benchmark results and flag regressions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+# Default relative change treated as a regression (10%)
+DEFAULT_THRESHOLD = 0.10
+
+# Compared metrics as (name, path into a case result, higher is better)
+METRICS = (
+    ("latency_median_ms", ("latency_ms", "median"), False),
+    ("latency_p95_ms", ("latency_ms", "p95"), False),
+    ("ttft_ms", ("ttft_ms",), False),
+    ("decode_tokens_per_second", ("decode_tokens_per_second",), True),
+)
+
+# Config keys that must match for the numbers to be comparable
+_COMPARABLE_CONFIG = ("model_size", "quantization_bits", "backend", "pytorch_mode", "pytorch_cpu_dtype", "temperature", "max_tokens", "chunk_size", "chunk_overlap")
+
+
+@dataclass
+class MetricDelta:
+    """One metric of one case in both results."""
+
+    case: str
+    metric: str
+    baseline: float
+    candidate: float
+    higher_is_better: bool
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from baseline to candidate (0.1 = 10% higher)."""
+        if not self.baseline:
+            return 0.0
+        return (self.candidate - self.baseline) / self.baseline
+
+    @property
+    def regression(self) -> bool:
+        """Whether the candidate is worse than the baseline by more than threshold."""
+        worse = -self.change if self.higher_is_better else self.change
+        return worse > self.threshold
+
+    @property
+    def improvement(self) -> bool:
+        """Whether the candidate is better than the baseline by more than threshold."""
+        better = self.change if self.higher_is_better else -self.change
+        return better > self.threshold
+
+
+@dataclass
+class Comparison:
+    """Result of compare_results()."""
+
+    deltas: list[MetricDelta] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> list[MetricDelta]:
+        """Deltas flagged as regressions."""
+        return [delta for delta in self.deltas if delta.regression]
+
+
+def _metric(case: dict, path: tuple[str, ...]) -> float | None:
+    value = case
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare_results(baseline: dict, candidate: dict, threshold: float = DEFAULT_THRESHOLD) -> Comparison:
+    """
+    Compare the cases both results have in common.
+
+    Metrics missing from either side (e.g. TTFT on a backend that does not
+    report it) are skipped. Warnings note differences that make the numbers
+    less comparable: another corpus, another model or backend, or cases
+    present in only one result.
+
+    Args:
+        baseline: Result loaded with load_result()
+        candidate: Result loaded with load_result()
+        threshold: Relative change flagged as a regression
+
+    Returns:
+        The per-metric deltas and any warnings
+    """
+    comparison = Comparison()
+
+    if baseline.get("corpus", {}).get("fingerprint") != candidate.get("corpus", {}).get("fingerprint"):
+        comparison.warnings.append("corpus differs (version, seed or cases); only cases with the same name are compared")
+    for key in _COMPARABLE_CONFIG:
+        before = baseline.get("config", {}).get(key)
+        after = candidate.get("config", {}).get(key)
+        if before != after:
+            comparison.warnings.append(f"config {key} differs: {before} -> {after}")
+
+    baseline_cases = baseline.get("cases", {})
+    candidate_cases = candidate.get("cases", {})
+    only = sorted(set(baseline_cases) ^ set(candidate_cases))
+    if only:
+        comparison.warnings.append(f"cases in only one result: {', '.join(only)}")
+
+    for name, before in baseline_cases.items():
+        after = candidate_cases.get(name)
+        if after is None:
+            continue
+        for metric, path, higher_is_better in METRICS:
+            old, new = _metric(before, path), _metric(after, path)
+            if old is None or new is None:
+                continue
+            comparison.deltas.append(MetricDelta(name, metric, old, new, higher_is_better, threshold))
+
+    return comparison
@@ -0,0 +1,115 @@
+"""Pinned benchmark corpus."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from dataclasses import asdict, dataclass
+
+# Bump when the texts or the case list change; results from different
+# corpus versions are not comparable
+CORPUS_VERSION = 1
+
+# Default seed for the generated document case
+DEFAULT_SEED = 0
+
+SHORT_TEXT = "Hello, how are you today?"
+
+MEDIUM_TEXT = (
+    "Artificial intelligence has transformed the way we live and work. "
+    "From voice assistants to self-driving cars, AI is everywhere. "
+    "Machine learning algorithms can now recognize faces, translate languages, "
+    "and even write code. The future of AI is both exciting and challenging."
+)
+
+LONG_TEXT = """
+The history of artificial intelligence began in antiquity, with myths, stories and rumors of artificial beings endowed with intelligence or consciousness by master craftsmen. The seeds of modern AI were planted by philosophers who attempted to describe the process of human thinking as the mechanical manipulation of symbols. This work culminated in the invention of the programmable digital computer in the 1940s, a machine based on the abstract essence of mathematical reasoning.
+
+This device and the ideas behind it inspired a handful of scientists to begin seriously discussing the possibility of building an electronic brain. The field of AI research was founded at a workshop held on the campus of Dartmouth College during the summer of 1956. Those who attended would become the leaders of AI research for decades. Many of them predicted that a machine as intelligent as a human being would exist in no more than a generation, and they were given millions of dollars to make this vision come true.
+
+Eventually, it became obvious that commercial developers and researchers had grossly underestimated the difficulty of the project. In 1974, in response to the criticism from James Lighthill and ongoing pressure from congress, the U.S. and British Governments stopped funding undirected research into artificial intelligence, and the difficult years that followed would later be known as an "AI winter". Seven years later, a visionary initiative by the Japanese Government inspired governments and industry to provide AI with billions of dollars, but by the late 1980s the investors became disillusioned and withdrew funding again.
+
+Investment and interest in AI boomed in the first decades of the 21st century when machine learning was successfully applied to many problems in academia and industry due to new methods, the application of powerful computer hardware, and the collection of immense data sets. The field of deep learning began to dominate AI benchmarks around 2012 and generative AI became widely popular in 2022 with the release of ChatGPT.
+""".strip()
+
+# Sentences the seeded document is drawn from
+DOCUMENT_SENTENCES = (
+    "The committee will meet again next Tuesday to review the budget.",
+    "Please make sure all windows are closed before you leave the office.",
+    "Our quarterly revenue grew by twelve percent compared to last year.",
+    "The new train line connects the airport with the city centre in twenty minutes.",
+    "Researchers published the dataset so that others can reproduce the results.",
+    "If the error persists, restart the application and try again.",
+    "She has been learning Japanese for three years and now reads novels.",
+    "The museum is closed on Mondays and public holidays.",
+    "Shipping is free for orders above fifty dollars.",
+    "The software update fixes several security issues and improves battery life.",
+    "Heavy rain is expected in the northern regions this weekend.",
+    "Children under twelve must be accompanied by an adult.",
+    "The recipe calls for two cups of flour and a pinch of salt.",
+    "Our support team is available around the clock to answer your questions.",
+    "The bridge was built in 1932 and renovated in 2015.",
+    "Remember to back up your files before installing the new version.",
+)
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """
+    One benchmark input.
+
+    Cases with long=True go through Translator.translate_long (chunking,
+    per-chunk generation and merging); the others through translate().
+    """
+
+    name: str
+    text: str
+    target_lang: str
+    long: bool = False
+
+
+def _document(seed: int, sentences: int = 40, per_paragraph: int = 5) -> str:
+    rng = random.Random(seed)
+    picked = [rng.choice(DOCUMENT_SENTENCES) for _ in range(sentences)]
+    paragraphs = [" ".join(picked[i:i + per_paragraph]) for i in range(0, len(picked), per_paragraph)]
+    return "\n\n".join(paragraphs)
+
+
+def build_corpus(seed: int = DEFAULT_SEED) -> list[BenchCase]:
+    """
+    Build the benchmark cases.
+
+    Every case is fixed text except "document", which is drawn from
+    DOCUMENT_SENTENCES with the given seed so it is identical across runs.
+    """
+    return [
+        BenchCase("short", SHORT_TEXT, "zh"),
+        BenchCase("medium", MEDIUM_TEXT, "zh"),
+        BenchCase("long", LONG_TEXT, "zh", long=True),
+        BenchCase("zh-en", "今天天气真好，我们去公园散步吧。", "en"),
+        BenchCase("en-ja", "The weather is beautiful today.", "ja"),
+        BenchCase("document", _document(seed), "zh", long=True),
+    ]
+
+
+def corpus_fingerprint(cases: list[BenchCase]) -> str:
+    """Short hash identifying the exact inputs of a run."""
+    payload = json.dumps([asdict(case) for case in cases], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def select_cases(cases: list[BenchCase], names: list[str] | None) -> list[BenchCase]:
+    """
+    Keep the named cases, in corpus order.
+
+    Raises:
+        ValueError: If a name is not in the corpus
+    """
+    if not names:
+        return cases
+    known = {case.name for case in cases}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)} (available: {', '.join(sorted(known))})")
+    return [case for case in cases if case.name in names]
@@ -0,0 +1,369 @@
+"""HTTP load generator for the translation server."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from .corpus import DEFAULT_SEED, build_corpus
+from .runner import RESULT_SCHEMA, percentile
+
+# Short endpoint names accepted in replay files and --endpoints
+ENDPOINTS = {
+    "translate": "/api/translate",
+    "stream": "/api/translate/stream",
+    "batch": "/api/translate/batch",
+}
+
+# Seconds before a request is abandoned and counted as an error
+DEFAULT_TIMEOUT = 300.0
+
+# Open-loop (rps) runs keep at most this many requests in flight
+MAX_IN_FLIGHT = 256
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """One request to replay: endpoint name and JSON body."""
+
+    endpoint: str
+    body: dict
+
+
+@dataclass
+class Sample:
+    """
+    Outcome of one request.
+
+    Times are seconds; started is relative to the start of the run.
+    first_event and first_chunk are only set for streams: the first SSE
+    event of any kind and the first translated chunk.
+    """
+
+    endpoint: str
+    started: float
+    latency: float
+    ok: bool
+    http_status: int | None = None
+    first_event: float | None = None
+    first_chunk: float | None = None
+    error: str | None = None
+
+
+def default_requests(seed: int = DEFAULT_SEED, endpoints: Iterable[str] = ENDPOINTS) -> list[LoadRequest]:
+    """
+    Requests built from the benchmark corpus.
+
+    Every corpus case is sent to translate and stream; batch gets one
+    request with the texts of the single-chunk cases.
+    """
+    cases = build_corpus(seed)
+    requests = []
+    for endpoint in endpoints:
+        if endpoint == "batch":
+            short = [case for case in cases if not case.long]
+            for target in dict.fromkeys(case.target_lang for case in short):
+                texts = [case.text for case in short if case.target_lang == target]
+                requests.append(LoadRequest("batch", {"texts": texts, "target_lang": target}))
+        elif endpoint in ENDPOINTS:
+            requests.extend(LoadRequest(endpoint, {"text": case.text, "target_lang": case.target_lang}) for case in cases)
+        else:
+            raise ValueError(f"Unknown endpoint: {endpoint} (expected one of {', '.join(ENDPOINTS)})")
+    return requests
+
+
+def load_requests(path: Path | str) -> list[LoadRequest]:
+    """
+    Read requests to replay from a JSON lines file.
+
+    Each line is either {"endpoint": "translate", "body": {...}} (endpoint
+    is a name from ENDPOINTS or its path) or a bare request body, sent to
+    batch if it has "texts" and to translate otherwise.
+
+    Raises:
+        ValueError: If a line is not valid JSON or names an unknown endpoint
+    """
+    paths = {path: name for name, path in ENDPOINTS.items()}
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}") from None
+            if "body" in data:
+                endpoint = paths.get(data.get("endpoint"), data.get("endpoint", "translate"))
+                body = data["body"]
+            else:
+                endpoint = "batch" if "texts" in data else "translate"
+                body = data
+            if endpoint not in ENDPOINTS:
+                raise ValueError(f"{path}:{number}: unknown endpoint {endpoint!r}")
+            requests.append(LoadRequest(endpoint, body))
+    if not requests:
+        raise ValueError(f"{path}: no requests")
+    return requests
+
+
+def send(base_url: str, request: LoadRequest, started: float = 0.0, timeout: float = DEFAULT_TIMEOUT) -> Sample:
+    """
+    Send one request and time it.
+
+    Application errors (status "error" in the response, an error event or
+    a stream without a "done" event) count as failures like HTTP errors.
+    """
+    http = Request(
+        base_url.rstrip("/") + ENDPOINTS[request.endpoint],
+        data=json.dumps(request.body).encode("utf-8"),
+        method="POST",
+    )
+    http.add_header("Content-Type", "application/json")
+    sample = Sample(request.endpoint, started, 0.0, False)
+    start = time.perf_counter()
+    try:
+        with urlopen(http, timeout=timeout) as response:
+            sample.http_status = response.status
+            if request.endpoint == "stream":
+                _read_stream(response, sample, start)
+            else:
+                data = json.loads(response.read().decode("utf-8"))
+                sample.ok = data.get("status") == "success"
+                if not sample.ok:
+                    sample.error = data.get("error") or data.get("status")
+    except HTTPError as e:
+        sample.http_status = e.code
+        sample.error = f"HTTP {e.code}"
+    except (URLError, OSError, ValueError) as e:
+        sample.error = f"{type(e).__name__}: {getattr(e, 'reason', e)}"
+    sample.latency = time.perf_counter() - start
+    return sample
+
+
+def _read_stream(response, sample: Sample, start: float) -> None:
+    for line in response:
+        line = line.decode("utf-8").strip()
+        if not line.startswith("data: "):
+            continue
+        now = time.perf_counter() - start
+        if sample.first_event is None:
+            sample.first_event = now
+        event = json.loads(line[6:])
+        kind = event.get("event")
+        if kind == "chunk" and sample.first_chunk is None:
+            sample.first_chunk = now
+        elif kind == "error":
+            sample.error = event.get("error") or "error event"
+            return
+        elif kind == "done":
+            sample.ok = True
+            return
+    sample.error = "stream ended without a done event"
+
+
+def run_load(
+    base_url: str,
+    requests: list[LoadRequest],
+    concurrency: int = 1,
+    rps: float | None = None,
+    total: int | None = None,
+    duration: float | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_sample: Callable[[Sample], None] | None = None,
+) -> list[Sample]:
+    """
+    Replay requests (cycling through them) against the server.
+
+    Closed loop by default: concurrency workers each send their next
+    request as soon as the previous one finishes. With rps, requests
+    start on a fixed schedule regardless of how fast the server answers
+    (open loop), which shows queueing once the server saturates.
+
+    Args:
+        base_url: Server URL, e.g. http://localhost:8022
+        requests: Requests to replay in order
+        concurrency: Workers in closed-loop mode
+        rps: Target requests per second (open loop)
+        total: Number of requests to send (default: len(requests) unless duration is set)
+        duration: Stop starting new requests after this many seconds
+        timeout: Per-request timeout in seconds
+        on_sample: Called with every finished sample
+
+    Returns:
+        Samples in completion order
+
+    Raises:
+        ValueError: If requests is empty or concurrency/rps is not positive
+    """
+    if not requests:
+        raise ValueError("No requests to send")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rps is not None and rps <= 0:
+        raise ValueError("rps must be positive")
+    if total is None and duration is None:
+        total = len(requests)
+
+    samples: list[Sample] = []
+    lock = threading.Lock()
+    schedule = itertools.islice(enumerate(itertools.cycle(requests)), total)
+    begin = time.perf_counter()
+    deadline = begin + duration if duration is not None else None
+
+    def record(sample: Sample) -> None:
+        with lock:
+            samples.append(sample)
+        if on_sample:
+            on_sample(sample)
+
+    def fire(request: LoadRequest) -> None:
+        record(send(base_url, request, time.perf_counter() - begin, timeout))
+
+    if rps is not None:
+        with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as pool:
+            for index, request in schedule:
+                due = begin + index / rps
+                if deadline is not None and due >= deadline:
+                    break
+                time.sleep(max(0.0, due - time.perf_counter()))
+                pool.submit(fire, request)
+        return samples
+
+    def worker() -> None:
+        while deadline is None or time.perf_counter() < deadline:
+            with lock:
+                item = next(schedule, None)
+            if item is None:
+                return
+            fire(item[1])
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def _distribution(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    ms = [value * 1000 for value in values]
+    return {
+        "p50": round(percentile(ms, 50), 1),
+        "p95": round(percentile(ms, 95), 1),
+        "p99": round(percentile(ms, 99), 1),
+        "max": round(max(ms), 1),
+    }
+
+
+def _summarize(samples: list[Sample], wall: float) -> dict:
+    ok = [sample for sample in samples if sample.ok]
+    errors = Counter(sample.error for sample in samples if not sample.ok)
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "error_rate": round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(ok) / wall, 2) if wall else None,
+        "latency_ms": _distribution([sample.latency for sample in ok]),
+        "first_event_ms": _distribution([sample.first_event for sample in ok if sample.first_event is not None]),
+        "first_chunk_ms": _distribution([sample.first_chunk for sample in ok if sample.first_chunk is not None]),
+        "top_errors": dict(errors.most_common(5)),
+    }
+
+
+def summarize(samples: list[Sample], wall: float | None = None) -> dict:
+    """
+    Latency percentiles, time to first SSE event, error rate and throughput.
+
+    Args:
+        samples: Samples of one run
+        wall: Run duration in seconds (default: first start to last finish)
+
+    Returns:
+        Overall summary plus the same per endpoint and a per-second timeline
+        of completed requests and errors
+    """
+    if wall is None:
+        wall = max((sample.started + sample.latency for sample in samples), default=0.0)
+    timeline = Counter()
+    timeline_errors = Counter()
+    for sample in samples:
+        second = int(sample.started + sample.latency)
+        timeline[second] += 1
+        if not sample.ok:
+            timeline_errors[second] += 1
+    seconds = range(max(timeline, default=-1) + 1)
+    return {
+        **_summarize(samples, wall),
+        "wall_s": round(wall, 3),
+        "endpoints": {
+            endpoint: _summarize([sample for sample in samples if sample.endpoint == endpoint], wall)
+            for endpoint in ENDPOINTS
+            if any(sample.endpoint == endpoint for sample in samples)
+        },
+        "timeline": [{"second": s, "completed": timeline[s], "errors": timeline_errors[s]} for s in seconds],
+    }
+
+
+def run_levels(
+    base_url: str,
+    requests: list[LoadRequest],
+    levels: list[int] | None = None,
+    rates: list[float] | None = None,
+    total: int | None = None,
+    duration: float | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_level: Callable[[str], None] | None = None,
+) -> dict:
+    """
+    Run one load step per concurrency level (or per rate) for a throughput curve.
+
+    Args:
+        base_url: Server URL
+        requests: Requests to replay
+        levels: Closed-loop concurrency levels (default: [1])
+        rates: Open-loop request rates; used instead of levels when given
+        total: Requests per step (see run_load())
+        duration: Seconds per step (see run_load())
+        timeout: Per-request timeout in seconds
+        on_level: Called with a label before each step
+
+    Returns:
+        JSON-serializable result with one summary per step
+    """
+    steps = [("rps", rate) for rate in rates] if rates else [("concurrency", level) for level in levels or [1]]
+    results = []
+    for kind, value in steps:
+        if on_level:
+            on_level(f"{kind} {value}")
+        begin = time.perf_counter()
+        samples = run_load(
+            base_url,
+            requests,
+            concurrency=value if kind == "concurrency" else 1,
+            rps=value if kind == "rps" else None,
+            total=total,
+            duration=duration,
+            timeout=timeout,
+        )
+        results.append({kind: value, **summarize(samples, time.perf_counter() - begin)})
+    return {
+        "schema": RESULT_SCHEMA,
+        "kind": "load",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": base_url,
+        "config": {"requests": len(requests), "total": total, "duration": duration, "timeout": timeout},
+        "steps": results,
+    }
@@ -0,0 +1,167 @@
+"""Measure the memory footprint of a model and its KV-cache growth."""
+
+from __future__ import annotations
+
+import gc
+import time
+from typing import Callable
+
+from ..memory import MemoryProfile, reset_peak, snapshot
+
+# Context sizes (prompt tokens) KV growth is measured at
+DEFAULT_CONTEXTS = (512, 1024, 2048)
+
+# Sentence repeated to build prompts of a given length
+_FILLER = "The committee will meet again next Tuesday to review the budget. "
+
+# Rough characters per token of _FILLER, used when the backend reports no prompt tokens
+_CHARS_PER_TOKEN = 4
+
+
+def _slope(points: list[tuple[float, float]]) -> float:
+    """Least-squares slope of (x, y) points; 0 with fewer than two distinct x."""
+    if len({x for x, _ in points}) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return numerator / denominator
+
+
+def _settle() -> None:
+    gc.collect()
+    time.sleep(0.05)
+
+
+def _peak(reading) -> float:
+    """Peak of device memory if there is one (the KV cache lives there), else of RSS."""
+    return reading.device_peak_mb if reading.device_peak_mb is not None else reading.peak_rss_mb
+
+
+def _current(reading) -> float:
+    return reading.device_mb if reading.device_mb is not None else reading.rss_mb
+
+
+def measure_memory(
+    model_size: str | None = None,
+    quantization: int | None = None,
+    backend: str | None = None,
+    contexts: tuple[int, ...] = DEFAULT_CONTEXTS,
+    translator=None,
+    progress: Callable[[str], None] | None = None,
+) -> tuple[MemoryProfile, dict]:
+    """
+    Load a model from scratch and measure what it keeps resident.
+
+    The load footprint is the RSS (and device memory) added by loading;
+    mmap_mb is its file-backed part, e.g. GGUF weights mapped from disk.
+    KV-cache growth is the slope of memory against context length: for
+    GGUF, whose KV cache is allocated up front for n_ctx, the model is
+    reloaded at each context size; other backends grow the cache while
+    generating, so the peak is measured translating prompts of each length.
+
+    Args:
+        model_size: Model size (default: config)
+        quantization: Quantization bits (default: config)
+        backend: Backend type (default: config)
+        contexts: Context sizes in tokens, measured in increasing order
+        translator: Translator to use (default: a new one)
+        progress: Called with a description of each step
+
+    Returns:
+        The measured profile and the raw readings
+
+    Raises:
+        ValueError: If contexts is empty
+    """
+    from ..config import get_config
+    from ..translator import Translator
+
+    if not contexts:
+        raise ValueError("contexts must not be empty")
+    contexts = tuple(sorted(contexts))
+
+    config = get_config()
+    if model_size:
+        config.model_size = model_size
+    if quantization:
+        config.quantization_bits = quantization
+    if backend:
+        config.backend_type = backend
+    translator = translator or Translator()
+    translator.unload()
+    _settle()
+
+    def step(message: str) -> None:
+        if progress:
+            progress(message)
+
+    step("baseline")
+    reset_peak()
+    baseline = snapshot()
+    step("load")
+    translator.ensure_model_loaded(config.model_size, config.backend_type)
+    _settle()
+    loaded = snapshot()
+    resolved = translator.backend or config.backend_type
+
+    points = []
+    readings = []
+    if resolved == "gguf":
+        original_n_ctx = config.gguf_n_ctx
+        try:
+            for context in contexts:
+                step(f"load with n_ctx={context}")
+                translator.unload()
+                _settle()
+                config.gguf_n_ctx = context
+                translator.ensure_model_loaded(config.model_size, config.backend_type)
+                _settle()
+                reading = snapshot()
+                points.append((context, _current(reading)))
+                readings.append({"context": context, **reading.to_dict()})
+        finally:
+            config.gguf_n_ctx = original_n_ctx
+    else:
+        for context in contexts:
+            step(f"translate {context} tokens")
+            text = _FILLER * max(1, context * _CHARS_PER_TOKEN // len(_FILLER))
+            _settle()
+            reset_peak()
+            translator.translate(text, force_target="zh")
+            stats = translator.last_stats
+            tokens = stats.prompt_tokens if stats and stats.prompt_tokens else len(text) // _CHARS_PER_TOKEN
+            reading = snapshot()
+            points.append((tokens, _peak(reading)))
+            readings.append({"context": context, "prompt_tokens": tokens, **reading.to_dict()})
+
+    kv_mb_per_1k = max(0.0, _slope(points) * 1024)
+    device = (loaded.device_mb - (baseline.device_mb or 0.0)) if loaded.device_mb is not None else None
+    file_rss = None
+    if loaded.file_rss_mb is not None and baseline.file_rss_mb is not None:
+        file_rss = max(0.0, loaded.file_rss_mb - baseline.file_rss_mb)
+    # Weights live in device memory when there is a device, else in RAM
+    weights = device if device is not None else max(0.0, loaded.rss_mb - baseline.rss_mb)
+    if resolved == "gguf" and points:
+        # The load footprint includes the KV cache of the configured n_ctx; keep weights only
+        start = (baseline.device_mb or 0.0) if device is not None else baseline.rss_mb
+        weights = max(0.0, points[0][1] - start - kv_mb_per_1k * points[0][0] / 1024)
+
+    profile = MemoryProfile(
+        model_size=config.model_size,
+        quantization=config.quantization_bits,
+        backend=resolved,
+        weights_mb=round(weights, 1),
+        kv_mb_per_1k=round(kv_mb_per_1k, 1),
+        mmap_mb=round(file_rss, 1) if file_rss is not None else None,
+        device_mb=round(device, 1) if device is not None else None,
+        measured=True,
+    )
+    raw = {
+        "baseline": baseline.to_dict(),
+        "loaded": loaded.to_dict(),
+        "peak_load_rss_mb": round(loaded.peak_rss_mb - baseline.rss_mb, 1),
+        "contexts": readings,
+    }
+    return profile, raw
@@ -0,0 +1,143 @@
+"""Time prompt building per chunk: chat template rendering versus the precompiled builder."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from ..chunker import TextChunker
+from ..detector import detect_language
+from ..prompts import PromptBuilder
+from .corpus import DEFAULT_SEED, BenchCase, build_corpus
+from .runner import RESULT_SCHEMA, environment, percentile
+
+# Builds timed per chunk and path
+DEFAULT_PROMPT_REPEAT = 200
+
+
+def load_tokenizer(model_size: str, quantization: int) -> Any:
+    """
+    Load only the tokenizer of a model: the downloaded Hugging Face
+    directory if there is one, else the hub model (as PyTorch loads it).
+    """
+    from transformers import AutoTokenizer
+
+    from ..config import get_model_path
+
+    path = get_model_path(model_size, quantization, "hf")
+    return AutoTokenizer.from_pretrained(str(path) if path.exists() else f"google/translategemma-{model_size}-it")
+
+
+def prompt_chunks(
+    cases: list[BenchCase],
+    chunk_size: int,
+    overlap: int,
+    languages: tuple[str, str] | None = None,
+) -> list[tuple[str, str, str]]:
+    """(text, source_lang, target_lang) of every chunk the cases are translated in."""
+    chunker = TextChunker(chunk_size=chunk_size, overlap=overlap)
+    chunks = []
+    for case in cases:
+        source_lang = detect_language(case.text, languages)
+        texts = [chunk.text for chunk in chunker.chunk(case.text)] if case.long else [case.text]
+        chunks.extend((text, source_lang, case.target_lang) for text in texts)
+    return chunks
+
+
+def _per_call_us(build, chunk: tuple[str, str, str], repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        build(*chunk)
+    return (time.perf_counter_ns() - start) / repeat / 1000
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median": round(statistics.median(values), 2),
+        "p95": round(percentile(values, 95), 2),
+        "mean": round(statistics.fmean(values), 2),
+    }
+
+
+def measure_prompts(
+    tokenizer: Any,
+    backend: str = "pytorch",
+    cases: list[BenchCase] | None = None,
+    repeat: int = DEFAULT_PROMPT_REPEAT,
+    seed: int = DEFAULT_SEED,
+    model_size: str | None = None,
+) -> dict:
+    """
+    Time building the prompt token IDs of every corpus chunk both ways.
+
+    The template path renders the chat template and tokenizes the result,
+    as every chunk used to; the precompiled path is what the translator
+    does now. Compiling a pair's template happens once and is reported
+    separately, as is whether both paths produced identical IDs.
+
+    Args:
+        tokenizer: Tokenizer of the model (see load_tokenizer())
+        backend: Local backend whose tokenization is reproduced (pytorch or mlx)
+        cases: Cases to chunk (default: the full corpus for seed)
+        repeat: Builds timed per chunk and path
+        seed: Corpus seed, recorded in the result
+        model_size: Model size, recorded in the result (default: config)
+
+    Returns:
+        JSON-serializable result with per-chunk microseconds of both paths
+
+    Raises:
+        ValueError: If repeat is less than 1, backend is not pytorch or mlx,
+            or there are no cases
+    """
+    from ..config import get_config
+    from ..translator import Translator
+
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    if backend not in ("pytorch", "mlx"):
+        raise ValueError(f"Prompts are precompiled for pytorch and mlx, not {backend}")
+
+    config = get_config()
+    chunks = prompt_chunks(cases if cases is not None else build_corpus(seed), config.chunk_size, config.chunk_overlap, config.languages)
+    if not chunks:
+        raise ValueError("No text to build prompts for")
+    translator = Translator()
+    translator._tokenizer = tokenizer
+    translator._backend = backend
+    builder = translator._prompt_builder = PromptBuilder(tokenizer, translator._format_messages, translator._encode_prompt)
+
+    def render(text: str, source_lang: str, target_lang: str) -> list[int]:
+        return builder.encode(builder.render(text, source_lang, target_lang))
+
+    pairs = {}
+    start = time.perf_counter()
+    for _, source_lang, target_lang in chunks:
+        pairs[f"{source_lang}->{target_lang}"] = builder.template(source_lang, target_lang) is not None
+    compile_ms = (time.perf_counter() - start) * 1000
+    identical = all(translator._format_local_prompt(*chunk) == render(*chunk) for chunk in chunks)
+
+    template_us = [_per_call_us(render, chunk, repeat) for chunk in chunks]
+    precompiled_us = [_per_call_us(translator._format_local_prompt, chunk, repeat) for chunk in chunks]
+    return {
+        "schema": RESULT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "model_size": model_size or config.model_size,
+            "backend": backend,
+            "chunk_size": config.chunk_size,
+            "chunk_overlap": config.chunk_overlap,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "environment": environment(),
+        "chunks": len(chunks),
+        "pairs": pairs,
+        "identical": identical,
+        "compile_ms": round(compile_ms, 2),
+        "template_us": _summary(template_us),
+        "precompiled_us": _summary(precompiled_us),
+        "speedup": round(statistics.median(template_us) / max(statistics.median(precompiled_us), 1e-3), 2),
+    }
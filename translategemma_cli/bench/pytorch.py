@@ -0,0 +1,151 @@
+"""Compare PyTorch execution settings (eager vs compiled, CPU weight dtypes) on the benchmark corpus."""
+
+from __future__ import annotations
+
+import gc
+from datetime import datetime, timezone
+from typing import Callable
+
+from ..cpu import thread_settings
+from ..memory import reset_peak, snapshot
+from .corpus import DEFAULT_SEED, BenchCase
+from .runner import RESULT_SCHEMA, environment, run_suite
+
+# Config settings of each named variant; the CPU dtype only applies on CPU
+PYTORCH_VARIANTS = {
+    "eager": {"pytorch_mode": "eager", "pytorch_cpu_dtype": "float32"},
+    "compiled": {"pytorch_mode": "compiled", "pytorch_cpu_dtype": "float32"},
+    "bf16": {"pytorch_mode": "eager", "pytorch_cpu_dtype": "bfloat16"},
+    "int8": {"pytorch_mode": "eager", "pytorch_cpu_dtype": "int8"},
+}
+
+# Variants compared unless chosen; the first is the baseline
+DEFAULT_PYTORCH_VARIANTS = ("eager", "compiled")
+
+
+def _median_ms(run: dict, case: str) -> float | None:
+    return run["cases"].get(case, {}).get("latency_ms", {}).get("median")
+
+
+def _speedup(baseline: dict, candidate: dict) -> dict:
+    """Baseline over candidate median latency, per case and for the whole corpus."""
+    cases = {}
+    for name in baseline["cases"]:
+        before, after = _median_ms(baseline, name), _median_ms(candidate, name)
+        cases[name] = round(before / after, 2) if before and after else None
+    total_before = sum(_median_ms(baseline, name) or 0 for name in baseline["cases"])
+    total_after = sum(_median_ms(candidate, name) or 0 for name in baseline["cases"])
+    return {"cases": cases, "total": round(total_before / total_after, 2) if total_after else None}
+
+
+def _throughput(run: dict) -> float | None:
+    """Completion tokens per second over the median runs of every case."""
+    timed = [case for case in run["cases"].values() if case.get("completion_tokens") and case["latency_ms"]["median"]]
+    if not timed:
+        return None
+    seconds = sum(case["latency_ms"]["median"] for case in timed) / 1000
+    return round(sum(case["completion_tokens"] for case in timed) / seconds, 1)
+
+
+def compare_pytorch(
+    variants: dict[str, dict] | None = None,
+    cases: list[BenchCase] | None = None,
+    model_size: str | None = None,
+    quantization: int | None = None,
+    warmup: int = 1,
+    repeat: int = 5,
+    seed: int = DEFAULT_SEED,
+    progress: Callable[[str, BenchCase], None] | None = None,
+) -> dict:
+    """
+    Benchmark the PyTorch backend once per variant, each with a freshly loaded model.
+
+    A variant's settings are applied to the config for its run (load time
+    includes compiled mode's warm-up and int8 quantization) and restored
+    afterwards. Each run records the process memory after it (RSS added
+    since the previous variant was unloaded, and the peak during the run),
+    its completion token throughput and, on CPU, the thread settings. Run on
+    a CPU-only host, or with CUDA_VISIBLE_DEVICES= set, to compare on CPU.
+
+    Args:
+        variants: Variant name -> config settings (default: the
+            DEFAULT_PYTORCH_VARIANTS of PYTORCH_VARIANTS)
+        cases: Cases to run (default: the full corpus for seed)
+        model_size: Model size (default: config)
+        quantization: Quantization bits, 4 or 8 (default: config)
+        warmup: Untimed runs per case
+        repeat: Timed runs per case
+        seed: Corpus seed, recorded in the result
+        progress: Called with the variant name and each case before it runs
+
+    Returns:
+        JSON-serializable result with each variant's run_suite() result and
+        the speedup of every variant over the first
+
+    Raises:
+        ValueError: If there are no variants, or a setting is invalid
+    """
+    from ..config import get_config
+    from ..translator import Translator
+
+    variants = variants or {name: PYTORCH_VARIANTS[name] for name in DEFAULT_PYTORCH_VARIANTS}
+    if not variants:
+        raise ValueError("No variants to compare")
+
+    config = get_config()
+    saved = {key: getattr(config, key) for settings in variants.values() for key in settings}
+    runs = {}
+    device = None
+    try:
+        for name, settings in variants.items():
+            for key, value in settings.items():
+                setattr(config, key, value)
+            translator = Translator()
+            gc.collect()
+            reset_peak()
+            before = snapshot()
+            try:
+                runs[name] = run_suite(
+                    cases,
+                    model_size=model_size,
+                    quantization=quantization,
+                    backend="pytorch",
+                    warmup=warmup,
+                    repeat=repeat,
+                    seed=seed,
+                    translator=translator,
+                    progress=(lambda case, name=name: progress(name, case)) if progress else None,
+                )
+                after = snapshot()
+                runs[name]["settings"] = settings
+                runs[name]["memory"] = {**after.to_dict(), "added_rss_mb": round(after.rss_mb - before.rss_mb, 1)}
+                runs[name]["completion_tokens_per_second"] = _throughput(runs[name])
+                if device is None and translator._model is not None:
+                    device = str(next(translator._model.parameters()).device)
+                if device == "cpu":
+                    runs[name]["cpu"] = thread_settings()
+            finally:
+                translator.unload()
+                gc.collect()
+    finally:
+        for key, value in saved.items():
+            setattr(config, key, value)
+
+    baseline = next(iter(runs))
+    return {
+        "schema": RESULT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "model_size": runs[baseline]["config"]["model_size"],
+            "quantization_bits": runs[baseline]["config"]["quantization_bits"],
+            "backend": "pytorch",
+            "device": device,
+            "warmup": warmup,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "environment": environment(),
+        "baseline": baseline,
+        "variants": runs,
+        "speedup": {name: _speedup(runs[baseline], run) for name, run in runs.items() if name != baseline},
+    }
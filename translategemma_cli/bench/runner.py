@@ -0,0 +1,260 @@
+"""Run the benchmark corpus through the real Translator code path."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from .corpus import CORPUS_VERSION, DEFAULT_SEED, BenchCase, build_corpus, corpus_fingerprint
+
+# Bump when the layout of the result file changes
+RESULT_SCHEMA = 1
+
+# Characters of each case's output kept in the result, for eyeballing quality
+OUTPUT_PREVIEW_CHARS = 200
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Samples (need not be sorted)
+        q: Percentile in [0, 100]
+
+    Raises:
+        ValueError: If values is empty
+    """
+    if not values:
+        raise ValueError("percentile() of empty data")
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _median(values: list[float | None]) -> float | None:
+    present = [value for value in values if value is not None]
+    return statistics.median(present) if present else None
+
+
+def _round(value: float | None, digits: int = 2) -> float | None:
+    return round(value, digits) if value is not None else None
+
+
+def run_case(translator, case: BenchCase, warmup: int = 1, repeat: int = 5) -> dict:
+    """
+    Time one case: warm-up runs are discarded, then repeat timed runs.
+
+    Args:
+        translator: Translator with its model loaded
+        case: Benchmark case
+        warmup: Untimed runs before measuring
+        repeat: Timed runs
+
+    Returns:
+        Per-case result with latency percentiles and median token stats
+    """
+    from ..config import get_config
+
+    config = get_config()
+
+    def once() -> str:
+        if case.long:
+            return translator.translate_long(
+                case.text,
+                force_target=case.target_lang,
+                chunk_size=config.chunk_size,
+                overlap=config.chunk_overlap,
+                split_by=config.chunk_split_by,
+            )
+        return translator.translate(case.text, force_target=case.target_lang)[0]
+
+    for _ in range(warmup):
+        once()
+
+    latencies, ttfts, decode_rates, completion_tokens = [], [], [], []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = once()
+        latencies.append(time.perf_counter() - start)
+        stats = translator.last_stats
+        ttfts.append(stats.ttft if stats else None)
+        decode_rates.append(stats.decode_tokens_per_second if stats else None)
+        completion_tokens.append(stats.completion_tokens if stats else None)
+
+    latency_ms = [seconds * 1000 for seconds in latencies]
+    median_seconds = statistics.median(latencies)
+    ttft = _median(ttfts)
+    return {
+        "target_lang": case.target_lang,
+        "mode": "long" if case.long else "single",
+        "input_chars": len(case.text),
+        "latency_ms": {
+            "median": _round(statistics.median(latency_ms)),
+            "p95": _round(percentile(latency_ms, 95)),
+            "min": _round(min(latency_ms)),
+            "max": _round(max(latency_ms)),
+            "samples": [_round(value) for value in latency_ms],
+        },
+        "chars_per_second": _round(len(case.text) / median_seconds if median_seconds else None),
+        "ttft_ms": _round(ttft * 1000 if ttft is not None else None),
+        "decode_tokens_per_second": _round(_median(decode_rates)),
+        "completion_tokens": _median(completion_tokens),
+        "output": output[:OUTPUT_PREVIEW_CHARS],
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict:
+    """Describe the machine and code a run was made with."""
+    from .. import __version__
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "package_version": __version__,
+        "git_commit": _git_commit(),
+        # Recorded rather than set: pick devices in the shell running the suite
+        "cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES"),
+    }
+
+
+def run_suite(
+    cases: list[BenchCase] | None = None,
+    model_size: str | None = None,
+    quantization: int | None = None,
+    backend: str | None = None,
+    warmup: int = 1,
+    repeat: int = 5,
+    seed: int = DEFAULT_SEED,
+    translator=None,
+    progress: Callable[[BenchCase], None] | None = None,
+) -> dict:
+    """
+    Load the model once and benchmark every case.
+
+    Args:
+        cases: Cases to run (default: the full corpus for seed)
+        model_size: Model size (default: config)
+        quantization: Quantization bits, 4 or 8 (default: config)
+        backend: Backend type (default: config)
+        warmup: Untimed runs per case
+        repeat: Timed runs per case
+        seed: Corpus seed, recorded in the result
+        translator: Translator to use (default: the shared translator)
+        progress: Called with each case before it runs
+
+    Returns:
+        JSON-serializable result; see save_result()
+
+    Raises:
+        ValueError: If repeat is less than 1 or warmup is negative
+    """
+    from ..config import get_config
+    from ..translator import get_translator
+
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    if warmup < 0:
+        raise ValueError("warmup must not be negative")
+
+    config = get_config()
+    if model_size:
+        config.model_size = model_size
+    if quantization:
+        config.quantization_bits = quantization
+    if backend:
+        config.backend_type = backend
+    cases = cases if cases is not None else build_corpus(seed)
+    translator = translator or get_translator()
+
+    start = time.perf_counter()
+    translator.ensure_model_loaded(config.model_size, config.backend_type)
+    load_time = time.perf_counter() - start
+
+    results = {}
+    for case in cases:
+        if progress:
+            progress(case)
+        results[case.name] = run_case(translator, case, warmup=warmup, repeat=repeat)
+
+    return {
+        "schema": RESULT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "corpus": {
+            "version": CORPUS_VERSION,
+            "seed": seed,
+            "fingerprint": corpus_fingerprint(cases),
+            "cases": [case.name for case in cases],
+        },
+        "config": {
+            "model_size": config.model_size,
+            "quantization_bits": config.quantization_bits,
+            "backend": translator.backend or config.backend_type,
+            "pytorch_mode": config.pytorch_mode if translator.backend == "pytorch" else None,
+            "pytorch_cpu_dtype": config.pytorch_cpu_dtype if translator.backend == "pytorch" else None,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "chunk_size": config.chunk_size,
+            "chunk_overlap": config.chunk_overlap,
+            "warmup": warmup,
+            "repeat": repeat,
+        },
+        "environment": environment(),
+        "load_time_s": round(load_time, 3),
+        "cases": results,
+    }
+
+
+def save_result(result: dict, path: Path | str) -> Path:
+    """Write a result to a JSON file, creating parent directories."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_result(path: Path | str) -> dict:
+    """
+    Read a result file written by save_result().
+
+    Raises:
+        ValueError: If the file is not a benchmark result of a known schema
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("schema") != RESULT_SCHEMA or "cases" not in data:
+        raise ValueError(f"{path} is not a benchmark result (schema {RESULT_SCHEMA})")
+    return data
+
+
+def default_output(result: dict, prefix: str = "bench") -> Path:
+    """Default result file name: <prefix>-<model>-<backend>-<timestamp>.json."""
+    config = result["config"]
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return Path(f"{prefix}-{config['model_size']}-{config['backend']}-{stamp}.json")
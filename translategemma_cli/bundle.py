@@ -0,0 +1,364 @@
+"""Offline model bundles: export downloaded models to one archive, import them elsewhere.
+
+A bundle is a streamed tar archive of model files laid out as in the models
+cache directory, followed by a manifest with each file's size and SHA-256.
+GGUF files carry their tokenizer and chat template; HF model directories
+are exported whole (weights, tokenizer files, chat template, config).
+
+Weights are stored uncompressed with their data aligned to 4 KiB, so an
+import from a bundle file on the same filesystem can clone the bytes with
+copy_file_range() (a reflink on btrfs/XFS, an in-kernel copy elsewhere)
+instead of copying them through Python. Small files are stored as
+`<name>.gz` when compression saves space, and identical small files (e.g.
+the tokenizer shared by all sizes) are stored once and imported as hard
+links. A bundle is a plain tar, so `tar xf` works as a last resort.
+
+Imports are staged next to the cache and every file is verified against
+the manifest before the models are moved into place, so a truncated or
+corrupted bundle never leaves a half-written model behind.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable
+
+from .config import MODEL_SIZES, get_model_path
+from .download import sha256_file
+
+BUNDLE_VERSION = 1
+
+# Last member of every bundle
+MANIFEST = "manifest.json"
+
+# Files stored uncompressed and aligned for cloning
+WEIGHT_SUFFIXES = (".gguf", ".safetensors", ".bin", ".npz", ".pt")
+
+# Alignment of weight data in the archive (filesystem block size)
+ALIGNMENT = 4096
+
+# Member name of the padding that aligns the next member's data
+_PAD = ".pad"
+
+# Suffix of gzip-compressed members
+_GZIP = ".gz"
+
+_BUFFER = 1024 * 1024
+
+
+class BundleError(ValueError):
+    """A bundle is malformed, truncated or fails verification."""
+
+
+@dataclass
+class BundleModel:
+    """A model in a bundle; path is relative to the models directory."""
+
+    format: str
+    size: str
+    bits: int
+    path: str
+
+
+def models_dir() -> Path:
+    """The models cache directory get_model_path() points into."""
+    return get_model_path(MODEL_SIZES[0], 4, "gguf").parent
+
+
+def find_models(model_size: str | None = None, quantization_bits: int | None = None) -> list[BundleModel]:
+    """
+    Downloaded models, in both formats.
+
+    Args:
+        model_size: Only this size (default: all)
+        quantization_bits: Only this quantization (default: 4 and 8)
+    """
+    found = []
+    for size in [model_size] if model_size else MODEL_SIZES:
+        for bits in [quantization_bits] if quantization_bits else (4, 8):
+            gguf_path = get_model_path(size, bits, "gguf")
+            if gguf_path.is_file():
+                found.append(BundleModel("gguf", size, bits, gguf_path.name))
+            hf_path = get_model_path(size, bits, "hf")
+            if (hf_path / "config.json").is_file():
+                found.append(BundleModel("hf", size, bits, hf_path.name))
+    return found
+
+
+class _HashingReader:
+    """File wrapper that hashes (and reports) what tarfile reads through it."""
+
+    def __init__(self, f: BinaryIO, on_progress: Callable[[int], None] | None):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.on_progress = on_progress
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.digest.update(data)
+        if self.on_progress is not None:
+            self.on_progress(len(data))
+        return data
+
+
+def export_bundle(
+    models: list[BundleModel],
+    output: BinaryIO,
+    on_progress: Callable[[int], None] | None = None,
+) -> dict:
+    """
+    Write models to output as a bundle.
+
+    output only needs write(), so it can be a pipe or stdout.
+
+    Args:
+        models: Models to export (see find_models())
+        output: Binary stream the archive is written to
+        on_progress: Called with each number of weight bytes written
+
+    Returns:
+        The manifest
+
+    Raises:
+        BundleError: If a model is missing from the cache
+    """
+    root = models_dir()
+    files: dict[str, dict] = {}
+    members: dict[str, str] = {}  # sha256 of small files -> member name
+    with tarfile.open(fileobj=output, mode="w|", format=tarfile.PAX_FORMAT, copybufsize=_BUFFER) as tar:
+        for model in models:
+            path = root / model.path
+            if not path.exists():
+                raise BundleError(f"Model not found: {path}")
+            paths = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+            for file in paths:
+                name = file.relative_to(root).as_posix()
+                if file.suffix in WEIGHT_SUFFIXES:
+                    files[name] = _add_weights(tar, file, name, on_progress)
+                else:
+                    files[name] = _add_small(tar, file, name, members)
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "models": [asdict(model) for model in models],
+            "files": files,
+        }
+        data = json.dumps(manifest, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(MANIFEST)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+    return manifest
+
+
+def _add_weights(tar: tarfile.TarFile, file: Path, name: str, on_progress: Callable[[int], None] | None) -> dict:
+    info = _tarinfo(tar, file, name)
+    # Pad so the data starts on a block boundary and can be cloned on import
+    header = len(info.tobuf(tar.format, tar.encoding, tar.errors))
+    padding = -(tar.offset + tarfile.BLOCKSIZE + header) % ALIGNMENT
+    if (tar.offset + header) % ALIGNMENT:
+        pad = tarfile.TarInfo(_PAD)
+        pad.size = padding
+        tar.addfile(pad, io.BytesIO(bytes(padding)))
+    with open(file, "rb") as f:
+        reader = _HashingReader(f, on_progress)
+        tar.addfile(info, reader)
+    return {"size": info.size, "sha256": reader.digest.hexdigest()}
+
+
+def _add_small(tar: tarfile.TarFile, file: Path, name: str, members: dict[str, str]) -> dict:
+    data = file.read_bytes()
+    sha256 = hashlib.sha256(data).hexdigest()
+    entry = {"size": len(data), "sha256": sha256}
+    info = _tarinfo(tar, file, name)
+    if sha256 in members:
+        if name.endswith(_GZIP):
+            info.name = name + _GZIP
+        info.type = tarfile.LNKTYPE
+        info.linkname = members[sha256]
+        info.size = 0
+        tar.addfile(info)
+        return {**entry, "link": members[sha256]}
+    compressed = gzip.compress(data, mtime=0)
+    # Files already named .gz are always wrapped, so the suffix stays unambiguous
+    if len(compressed) < len(data) * 0.9 or name.endswith(_GZIP):
+        data = compressed
+        info.name = name + _GZIP
+        entry["encoding"] = "gzip"
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+    members[sha256] = info.name
+    return entry
+
+
+def _tarinfo(tar: tarfile.TarFile, file: Path, name: str) -> tarfile.TarInfo:
+    info = tar.gettarinfo(str(file), arcname=name)
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def import_bundle(
+    source: Path | str | BinaryIO,
+    force: bool = False,
+    on_progress: Callable[[int], None] | None = None,
+) -> tuple[list[BundleModel], list[BundleModel]]:
+    """
+    Unpack a bundle into the models cache directory.
+
+    A bundle file is read with random access so weights can be cloned from
+    it; a stream (e.g. stdin) is unpacked sequentially.
+
+    Args:
+        source: Bundle file, or a binary stream of one
+        force: Replace models that are already in the cache
+        on_progress: Called with each number of weight bytes written
+
+    Returns:
+        (imported models, models skipped because they already exist)
+
+    Raises:
+        BundleError: If the bundle is malformed, truncated or a file fails verification
+    """
+    root = models_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".import-", dir=root))
+    try:
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as archive, tarfile.open(fileobj=archive, mode="r:") as tar:
+                manifest, hashes = _unpack(tar, staging, archive.fileno(), on_progress)
+        else:
+            with tarfile.open(fileobj=source, mode="r|") as tar:
+                manifest, hashes = _unpack(tar, staging, None, on_progress)
+        _verify(manifest, hashes)
+        return _install(manifest, staging, root, force)
+    except (tarfile.TarError, EOFError) as e:
+        raise BundleError(f"Not a valid model bundle: {e}") from e
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _unpack(
+    tar: tarfile.TarFile,
+    staging: Path,
+    archive_fd: int | None,
+    on_progress: Callable[[int], None] | None,
+) -> tuple[dict, dict[str, str]]:
+    manifest = None
+    hashes: dict[str, str] = {}  # file name -> sha256
+    names: dict[str, str] = {}  # member name -> file name
+    for member in tar:
+        if member.name == MANIFEST:
+            manifest = json.loads(tar.extractfile(member).read())
+            continue
+        if member.name == _PAD:
+            continue
+        gzipped = member.name.endswith(_GZIP)
+        name = _safe_name(member.name[:-len(_GZIP)] if gzipped else member.name)
+        names[member.name] = name
+        dest = staging / name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if member.islnk():
+            target = names.get(member.linkname)
+            if target is None:
+                raise BundleError(f"{member.name} links to missing {member.linkname}")
+            os.link(staging / target, dest)
+            hashes[name] = hashes[target]
+        elif member.isfile():
+            if archive_fd is not None and not gzipped:
+                _clone_range(archive_fd, member.offset_data, member.size, dest, on_progress)
+                hashes[name] = sha256_file(dest)
+            else:
+                stream = tar.extractfile(member)
+                if gzipped:
+                    stream = gzip.GzipFile(fileobj=stream)
+                hashes[name] = _write_stream(stream, dest, None if gzipped else on_progress)
+    if manifest is None:
+        raise BundleError("Bundle has no manifest (truncated, or not a model bundle)")
+    if manifest.get("version") != BUNDLE_VERSION:
+        raise BundleError(f"Unsupported bundle version: {manifest.get('version')}")
+    return manifest, hashes
+
+
+def _safe_name(name: str) -> str:
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        raise BundleError(f"Unsafe path in bundle: {name}")
+    return path.as_posix()
+
+
+def _clone_range(archive_fd: int, offset: int, length: int, dest: Path, on_progress: Callable[[int], None] | None) -> None:
+    """Copy length bytes at offset of the archive into dest, in the kernel where possible."""
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        copied = 0
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < length:
+                    n = os.copy_file_range(archive_fd, fd, min(length - copied, 1 << 30), offset + copied)
+                    if n == 0:
+                        break
+                    copied += n
+                    if on_progress is not None:
+                        on_progress(n)
+            except OSError:
+                # Unsupported here (old kernel, cross-device, special file): copy the rest
+                pass
+        while copied < length:
+            data = os.pread(archive_fd, min(_BUFFER, length - copied), offset + copied)
+            if not data:
+                raise BundleError(f"Bundle ends inside {dest.name}")
+            os.write(fd, data)
+            copied += len(data)
+            if on_progress is not None:
+                on_progress(len(data))
+    finally:
+        os.close(fd)
+
+
+def _write_stream(stream: BinaryIO, dest: Path, on_progress: Callable[[int], None] | None) -> str:
+    digest = hashlib.sha256()
+    with open(dest, "wb") as f:
+        while data := stream.read(_BUFFER):
+            digest.update(data)
+            f.write(data)
+            if on_progress is not None:
+                on_progress(len(data))
+    return digest.hexdigest()
+
+
+def _verify(manifest: dict, hashes: dict[str, str]) -> None:
+    for name, entry in manifest.get("files", {}).items():
+        if name not in hashes:
+            raise BundleError(f"Bundle is missing {name}")
+        if hashes[name] != entry["sha256"]:
+            raise BundleError(f"Checksum mismatch for {name}")
+
+
+def _install(manifest: dict, staging: Path, root: Path, force: bool) -> tuple[list[BundleModel], list[BundleModel]]:
+    imported, skipped = [], []
+    for values in manifest.get("models", []):
+        model = BundleModel(**values)
+        source = staging / _safe_name(model.path)
+        target = root / model.path
+        if target.exists():
+            if not force:
+                skipped.append(model)
+                continue
+            if target.is_dir():
+                shutil.rmtree(target)
+            else:
+                target.unlink()
+        os.replace(source, target)
+        imported.append(model)
+    return imported, skipped
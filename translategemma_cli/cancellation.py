@@ -0,0 +1,59 @@
+"""Cooperative cancellation for in-flight translations."""
+
+from __future__ import annotations
+
+import threading
+
+
+class TranslationCancelled(Exception):
+    """Raised when a translation is aborted through its cancellation token."""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared between a caller and the backends.
+
+    The caller (e.g. an HTTP handler that noticed the client went away) calls
+    cancel(); generation loops poll is_cancelled between tokens and stop early.
+
+    Tokens can be chained: a child token is cancelled when either itself or
+    its parent is cancelled, which lets a single generation be stopped without
+    cancelling the whole request.
+    """
+
+    def __init__(self, parent: CancellationToken | None = None):
+        self._event = threading.Event()
+        self._parent = parent
+        self.reason: str | None = None
+
+    def cancel(self, reason: str | None = None) -> None:
+        """Request cancellation."""
+        if self.reason is None:
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether this token or any of its parents has been cancelled."""
+        if self._event.is_set():
+            return True
+        return self._parent is not None and self._parent.is_cancelled
+
+    def raise_if_cancelled(self) -> None:
+        """Raise TranslationCancelled if cancellation was requested."""
+        if self.is_cancelled:
+            raise TranslationCancelled(self.reason or "Translation cancelled")
+
+    def child(self) -> CancellationToken:
+        """Create a token that is also cancelled when this one is."""
+        return CancellationToken(parent=self)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until this token is cancelled (parents are not observed)."""
+        return self._event.wait(timeout)
+
+
+def raise_if_cancelled(token: CancellationToken | None) -> None:
+    """Raise TranslationCancelled if token is set and cancelled."""
+    if token is not None:
+        token.raise_if_cancelled()
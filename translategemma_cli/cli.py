@@ -4,6 +4,8 @@
 import sys
 import warnings
 import logging
+from contextlib import nullcontext
+from dataclasses import asdict
 from typing import Optional
 
 # Suppress tokenizer warnings before any imports
@@ -22,9 +24,6 @@
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.styles import Style
 
 from .config import (
     get_config,
@@ -34,6 +33,8 @@
     MODEL_SIZES,
     MODEL_INFO,
     BackendType,
+    BACKEND_TYPES,
+    DEFAULT_DOWNLOAD_CONNECTIONS,
 )
 from .detector import (
     detect_language,
@@ -45,13 +46,49 @@
 from .model import (
     is_model_ready,
     download_and_convert_model,
+    download_models,
     get_model_info,
     list_downloaded_models,
     remove_model,
     get_backend,
 )
-from .translator import get_translator
+from .translator import get_translator, should_chunk
 from .backends import check_vllm_server, check_ollama_server, OllamaBackend
+from .stats import GenerationStats
+from . import tracing
+from .profiling import Profiler
+from .memory import plan_budget, save_profile
+from .bench import (
+    CORPUS_VERSION,
+    DEFAULT_CHUNK_SIZES,
+    DEFAULT_CONTEXTS,
+    DEFAULT_OVERLAPS,
+    DEFAULT_PYTORCH_VARIANTS,
+    DEFAULT_PROMPT_REPEAT,
+    DEFAULT_SPLIT_BY,
+    DEFAULT_SEED,
+    DEFAULT_THRESHOLD,
+    PYTORCH_VARIANTS,
+    apply_recommendations,
+    build_corpus,
+    compare_pytorch,
+    compare_results,
+    default_output,
+    default_requests,
+    load_cases,
+    load_requests,
+    load_result,
+    load_tokenizer,
+    measure_memory,
+    measure_prompts,
+    recommend,
+    run_levels,
+    run_suite,
+    save_result,
+    select_cases,
+    settings_grid,
+    sweep_chunking,
+)
 
 app = typer.Typer(
     name="translate",
@@ -59,11 +96,16 @@
     no_args_is_help=False,
 )
 console = Console()
+# Diagnostics go to stderr so piped translations stay clean
+err_console = Console(stderr=True)
+
+# Stats of the last translation served by the daemon, for --verbose
+_daemon_stats: GenerationStats | None = None
 
-# Prompt style
-prompt_style = Style.from_dict({
+# Prompt style (a prompt_toolkit style dict, built in run_interactive)
+PROMPT_STYLE = {
     "prompt": "#00aa00 bold",
-})
+}
 
 
 def print_welcome(translator):
@@ -95,7 +137,7 @@ def print_help():
   [cyan]/langs[/cyan]           - List all supported languages
   [cyan]/model <size>[/cyan]    - Switch model (4b, 12b, 27b)
   [cyan]/model[/cyan]           - Show current model info
-  [cyan]/backend <type>[/cyan]  - Switch backend (auto, mlx, pytorch, gguf, vllm, ollama)
+  [cyan]/backend <type>[/cyan]  - Switch backend (auto, mlx, pytorch, gguf, vllm, ollama, fake)
   [cyan]/backend[/cyan]         - Show backend info
   [cyan]/config[/cyan]          - Show current configuration
   [cyan]/clear[/cyan]           - Clear screen
@@ -248,7 +290,7 @@ def handle_command(command: str, translator) -> bool:
     
     elif cmd_lower.startswith("/backend "):
         backend = cmd[9:].strip().lower()
-        valid_backends = ("auto", "mlx", "pytorch", "gguf", "vllm", "ollama")
+        valid_backends = BACKEND_TYPES
         if backend not in valid_backends:
             console.print(f"[yellow]Unknown backend: {backend}[/yellow]")
             console.print(f"[dim]Available backends: {', '.join(valid_backends)}[/dim]")
@@ -317,6 +359,11 @@ def handle_command(command: str, translator) -> bool:
 
 def run_interactive():
     """Run the interactive REPL."""
+    # prompt_toolkit is only needed here; importing it is a large share of startup time
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.styles import Style
+    
     config = get_config()
     translator = get_translator()
     
@@ -335,7 +382,7 @@ def run_interactive():
     
     session: PromptSession = PromptSession(
         history=FileHistory(str(history_file)),
-        style=prompt_style,
+        style=Style.from_dict(PROMPT_STYLE),
     )
     
     while True:
@@ -387,6 +434,120 @@ def run_interactive():
             break
 
 
+def format_generation_stats(stats: GenerationStats | None) -> str:
+    """Format token counts and timing for --verbose output."""
+    if stats is None:
+        return "No generation stats available"
+    
+    def tokens(value: int | None) -> str:
+        return "?" if value is None else str(value)
+    
+    parts = [f"prompt {tokens(stats.prompt_tokens)} tok", f"completion {tokens(stats.completion_tokens)} tok"]
+    if stats.ttft is not None:
+        parts.append(f"TTFT {stats.ttft * 1000:.0f} ms")
+    if stats.inter_token_latency is not None:
+        parts.append(f"ITL {stats.inter_token_latency * 1000:.1f} ms")
+    if stats.decode_tokens_per_second is not None:
+        parts.append(f"decode {stats.decode_tokens_per_second:.1f} tok/s")
+    parts.append(f"total {stats.total_time:.2f}s")
+    if stats.stop_reason:
+        parts.append(f"stop: {stats.stop_reason}")
+    return " · ".join(parts)
+
+
+def print_generation_stats() -> None:
+    """Print the stats of the last translation to stderr."""
+    stats = _daemon_stats if _daemon_stats is not None else get_translator().last_stats
+    err_console.print(f"[dim]{format_generation_stats(stats)}[/dim]", soft_wrap=True)
+
+
+def print_profile_summary(profiler: Profiler) -> None:
+    """Print where the profiled time went to stderr."""
+    err_console.print(f"[dim]{profiler.summary.format()}[/dim]", soft_wrap=True)
+
+
+def print_startup_stats() -> None:
+    """Measure the CLI's import time in a fresh interpreter and print a breakdown."""
+    from .startup import STARTUP_BUDGET_MS, measure_startup
+    
+    try:
+        report = measure_startup()
+    except RuntimeError as e:
+        err_console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    table = Table(title=f"Startup imports ({report.module})")
+    table.add_column("Package", style="cyan")
+    table.add_column("Self time", justify="right")
+    for package, self_ms in report.by_package(limit=15):
+        table.add_row(package, f"{self_ms:.1f} ms")
+    console.print(table)
+    
+    color = "green" if report.import_ms <= STARTUP_BUDGET_MS else "red"
+    console.print(
+        f"Import: [{color}]{report.import_ms:.0f} ms[/{color}] (budget {STARTUP_BUDGET_MS:.0f} ms) · "
+        f"interpreter total: {report.process_ms:.0f} ms"
+    )
+    if report.heavy:
+        console.print(f"[yellow]Heavy modules imported at startup: {', '.join(report.heavy)}[/yellow]")
+    else:
+        console.print("[dim]No heavy modules (torch, transformers, llama_cpp, ...) imported at startup[/dim]")
+
+
+def start_tracing(trace: Optional[str]) -> None:
+    """Install the exporter selected by --trace: a JSON lines file, or "otel"."""
+    if not trace:
+        return
+    if trace == "otel":
+        tracing.configure("otel")
+    else:
+        tracing.configure("json", trace)
+
+
+def forward_to_daemon(
+    text: str,
+    force_target: Optional[str] = None,
+    model_size: Optional[str] = None,
+    explain: bool = False,
+    stream: bool = False,
+    chunk_size: Optional[int] = None,
+    overlap: Optional[int] = None,
+    no_chunk: bool = False,
+) -> Optional[str]:
+    """Translate through the running daemon; None if there is none."""
+    global _daemon_stats
+    from . import daemon
+    
+    streamed = []
+    
+    def on_token(token: str) -> None:
+        print(token, end="", flush=True)
+        streamed.append(token)
+    
+    try:
+        translation, _daemon_stats = daemon.translate(
+            text,
+            target_lang=force_target,
+            model_size=model_size,
+            explain=explain,
+            stream=stream,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            no_chunk=no_chunk,
+            on_token=on_token if stream else None,
+        )
+    except daemon.DaemonUnavailable:
+        return None
+    except daemon.DaemonError as e:
+        err_console.print(f"[red]Daemon error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    if stream:
+        # Short texts are not streamed token by token; print them whole
+        print("" if streamed else translation)
+    return translation
+
+
 def translate_single(
     text: str,
     force_target: Optional[str] = None,
@@ -396,85 +557,92 @@ def translate_single(
     chunk_size: Optional[int] = None,
     overlap: Optional[int] = None,
     no_chunk: bool = False,
+    profiler: Optional[Profiler] = None,
+    daemon: bool = False,
 ) -> str:
-    """Translate a single text and return result."""
-    translator = get_translator()
-    config = get_config()
+    """
+    Translate a single text and return result, profiling it if a profiler is given.
     
-    if model_size:
-        if not is_model_ready(model_size):
-            download_and_convert_model(model_size)
-        translator.ensure_model_loaded(model_size)
-    else:
-        if not is_model_ready():
-            download_and_convert_model()
-        translator.ensure_model_loaded()
-    
-    mode = "explain" if explain else "direct"
-    
-    # Determine if we should use chunking
-    # Force chunking if user explicitly set chunk_size or overlap
-    force_chunking = chunk_size is not None or overlap is not None
-    use_chunking = not no_chunk and (
-        force_chunking or 
-        (config.chunking_enabled and len(text) > config.auto_chunk_threshold)
-    )
+    With daemon set, the text goes to a running `translate daemon` instead
+    of a model loaded in this process, if one is running.
+    """
+    global _daemon_stats
+    _daemon_stats = None
+    if daemon and profiler is None:
+        translation = forward_to_daemon(text, force_target, model_size, explain, stream, chunk_size, overlap, no_chunk)
+        if translation is not None:
+            return translation
     
-    if use_chunking:
-        # Use long text translation with chunking
-        _chunk_size = chunk_size or config.chunk_size
-        _overlap = overlap or config.chunk_overlap
-        
-        if stream:
-            # Stream output
-            result = []
-            for item in translator.translate_long(
-                text,
-                force_target=force_target,
-                mode=mode,
-                chunk_size=_chunk_size,
-                overlap=_overlap,
-                split_by=config.chunk_split_by,
-                stream=True,
-            ):
-                # Handle both string tokens and tuples
-                if isinstance(item, tuple):
-                    token = item[0]  # Extract token from (token, src, tgt) tuple
-                else:
-                    token = item
-                print(token, end="", flush=True)
-                result.append(token)
-            print()  # Newline at end
-            return "".join(result)
-        else:
-            # Batch mode with progress
-            from rich.progress import Progress, SpinnerColumn, TextColumn
+    with tracing.span("request", entrypoint="cli", target_lang=force_target, model=model_size, chars=len(text)):
+        translator = get_translator()
+        config = get_config()
+        
+        with tracing.span("load", model=model_size or config.model_size):
+            if model_size:
+                if not is_model_ready(model_size):
+                    download_and_convert_model(model_size)
+                translator.ensure_model_loaded(model_size)
+            else:
+                if not is_model_ready():
+                    download_and_convert_model()
+                translator.ensure_model_loaded()
+        
+        # Profile everything after the model load
+        with profiler or nullcontext():
+            mode = "explain" if explain else "direct"
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("[cyan]Translating...", total=None)
-                
-                def progress_callback(current, total, chunk_text):
-                    progress.update(task, description=f"[cyan]Chunk {current}/{total}")
-                
-                translation = translator.translate_long(
-                    text,
-                    force_target=force_target,
-                    mode=mode,
-                    chunk_size=_chunk_size,
-                    overlap=_overlap,
-                    split_by=config.chunk_split_by,
-                    stream=False,
-                    progress_callback=progress_callback,
-                )
-            return translation
-    else:
-        # Regular translation (no chunking)
-        translation, source, target = translator.translate(text, force_target, mode)
-        return translation
+            if should_chunk(text, chunk_size, overlap, no_chunk):
+                # Use long text translation with chunking; settings not given
+                # on the command line come from the config (tuned per model
+                # and language pair by `translate bench chunking`)
+                if stream:
+                    # Stream output
+                    result = []
+                    for item in translator.translate_long(
+                        text,
+                        force_target=force_target,
+                        mode=mode,
+                        chunk_size=chunk_size,
+                        overlap=overlap,
+                        stream=True,
+                    ):
+                        # Handle both string tokens and tuples
+                        if isinstance(item, tuple):
+                            token = item[0]  # Extract token from (token, src, tgt) tuple
+                        else:
+                            token = item
+                        print(token, end="", flush=True)
+                        result.append(token)
+                    print()  # Newline at end
+                    return "".join(result)
+                else:
+                    # Batch mode with progress
+                    from rich.progress import Progress, SpinnerColumn, TextColumn
+                    
+                    with Progress(
+                        SpinnerColumn(),
+                        TextColumn("[progress.description]{task.description}"),
+                        console=console,
+                    ) as progress:
+                        task = progress.add_task("[cyan]Translating...", total=None)
+                        
+                        def progress_callback(current, total, chunk_text):
+                            progress.update(task, description=f"[cyan]Chunk {current}/{total}")
+                        
+                        translation = translator.translate_long(
+                            text,
+                            force_target=force_target,
+                            mode=mode,
+                            chunk_size=chunk_size,
+                            overlap=overlap,
+                            stream=False,
+                            progress_callback=progress_callback,
+                        )
+                    return translation
+            else:
+                # Regular translation (no chunking)
+                translation, source, target = translator.translate(text, force_target, mode)
+                return translation
 
 
 @app.callback(invoke_without_command=True)
@@ -497,7 +665,7 @@ def main(
     backend: Optional[str] = typer.Option(
         None,
         "--backend", "-b",
-        help="Backend to use (auto, mlx, pytorch, gguf, vllm, ollama)",
+        help="Backend to use (auto, mlx, pytorch, gguf, vllm, ollama, fake)",
     ),
     server: Optional[str] = typer.Option(
         None,
@@ -564,6 +732,36 @@ def main(
         "--repetition-penalty",
         help="Repetition penalty (1.0=disabled, >1.0=penalize)",
     ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose", "-v",
+        help="Print token counts, TTFT and decode speed to stderr",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        help="Record tracing spans as JSON lines in this file ('otel' exports via OpenTelemetry)",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile the Python work around the model and print where the time went",
+    ),
+    profile_out: str = typer.Option(
+        "translate.prof",
+        "--profile-out",
+        help="Profile output: pstats file, or collapsed stacks (sampled) for .folded",
+    ),
+    no_daemon: bool = typer.Option(
+        False,
+        "--no-daemon",
+        help="Load the model in this process even if `translate daemon` is running",
+    ),
+    startup_stats: bool = typer.Option(
+        False,
+        "--startup-stats",
+        help="Print how long starting the CLI takes, by imported package, and exit",
+    ),
 ):
     """
     Translate text using TranslateGemma.
@@ -580,6 +778,10 @@ def main(
         
         translate model list                # List available models
     """
+    if startup_stats:
+        print_startup_stats()
+        raise typer.Exit()
+    
     # If a subcommand is being invoked, skip the main logic
     if ctx.invoked_subcommand is not None:
         return
@@ -593,6 +795,8 @@ def main(
             raise typer.Exit(1)
         force_target = to
     
+    start_tracing(trace)
+    
     # Validate --model option
     if model_size and model_size not in MODEL_SIZES:
         console.print(f"[red]Invalid model size: {model_size}[/red]")
@@ -600,7 +804,7 @@ def main(
         raise typer.Exit(1)
     
     # Validate --backend option
-    valid_backends = ("auto", "mlx", "pytorch", "gguf", "vllm", "ollama")
+    valid_backends = BACKEND_TYPES
     if backend and backend not in valid_backends:
         console.print(f"[red]Invalid backend: {backend}[/red]")
         console.print(f"[dim]Available backends: {', '.join(valid_backends)}[/dim]")
@@ -630,6 +834,14 @@ def main(
     if repetition_penalty is not None:
         config.repetition_penalty = repetition_penalty
     
+    # A running daemon serves requests with its own backend and sampling
+    # settings; anything that overrides them is translated here
+    use_daemon = not (
+        no_daemon or backend or server or trace
+        or temperature is not None or top_p is not None
+        or top_k is not None or repetition_penalty is not None
+    )
+    
     # Handle directory batch translation
     if dir_path:
         from pathlib import Path
@@ -671,7 +883,8 @@ def main(
                     
                     translation = translate_single(
                         file_text, force_target, model_size, explain,
-                        False, chunk_size, overlap, no_chunk  # No stream for batch
+                        False, chunk_size, overlap, no_chunk,  # No stream for batch
+                        daemon=use_daemon,
                     )
                     
                     output_file = output_dir / file_path.name
@@ -700,9 +913,11 @@ def main(
     
     # Single-shot mode
     if text:
+        profiler = Profiler(profile_out) if profile else None
         translation = translate_single(
             text, force_target, model_size, explain,
-            stream, chunk_size, overlap, no_chunk
+            stream, chunk_size, overlap, no_chunk, profiler,
+            daemon=use_daemon,
         )
         
         if output:
@@ -712,6 +927,10 @@ def main(
         else:
             if not stream:  # Only print if not already streamed
                 print(translation)
+        if verbose:
+            print_generation_stats()
+        if profiler is not None:
+            print_profile_summary(profiler)
         return
     
     # Interactive mode (default)
@@ -742,6 +961,31 @@ def translate_cmd(
         "--explain", "-e",
         help="Include explanations in output",
     ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose", "-v",
+        help="Print token counts, TTFT and decode speed to stderr",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        help="Record tracing spans as JSON lines in this file ('otel' exports via OpenTelemetry)",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile the Python work around the model and print where the time went",
+    ),
+    profile_out: str = typer.Option(
+        "translate.prof",
+        "--profile-out",
+        help="Profile output: pstats file, or collapsed stacks (sampled) for .folded",
+    ),
+    no_daemon: bool = typer.Option(
+        False,
+        "--no-daemon",
+        help="Load the model in this process even if `translate daemon` is running",
+    ),
 ):
     """Translate text (alternative to using quotes with main command)."""
     # Validate --to option
@@ -757,25 +1001,58 @@ def translate_cmd(
         console.print(f"[red]Invalid model size: {model_size}[/red]")
         raise typer.Exit(1)
     
-    translation = translate_single(text, force_target, model_size, explain)
+    start_tracing(trace)
+    profiler = Profiler(profile_out) if profile else None
+    translation = translate_single(
+        text, force_target, model_size, explain, profiler=profiler, daemon=not (no_daemon or trace)
+    )
     print(translation)
+    if verbose:
+        print_generation_stats()
+    if profiler is not None:
+        print_profile_summary(profiler)
 
 
 @app.command("model")
 def model_cmd(
     action: str = typer.Argument(
         "status",
-        help="Action: status, list, download, remove, langs",
+        help="Action: status, list, download, remove, export, import, langs",
     ),
     size: Optional[str] = typer.Argument(
         None,
-        help="Model size for download/remove (4b, 12b, 27b)",
+        help="Model size for download/remove/export (4b, 12b, 27b), or the bundle to import (- for stdin)",
     ),
     bits: int = typer.Option(
         4,
         "--bits", "-b",
         help="Quantization bits for download (4 or 8)",
     ),
+    all_sizes: bool = typer.Option(
+        False,
+        "--all",
+        help="Download every model size (at --bits) concurrently",
+    ),
+    connections: int = typer.Option(
+        DEFAULT_DOWNLOAD_CONNECTIONS,
+        "--connections",
+        help="Parallel range requests per GGUF file",
+    ),
+    parallel: int = typer.Option(
+        2,
+        "--parallel",
+        help="GGUF files downloaded at the same time with --all",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Bundle file to export to (- for stdout)",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Replace models that already exist when importing",
+    ),
 ):
     """Manage TranslateGemma models."""
     if action == "status":
@@ -814,9 +1091,13 @@ def model_cmd(
         console.print(table)
     
     elif action == "download":
+        if all_sizes:
+            download_models(list(MODEL_SIZES), bits, connections=connections, parallel=parallel)
+            return
+        
         if not size:
             console.print("[yellow]Please specify model size: 4b, 12b, or 27b[/yellow]")
-            console.print("[dim]Example: translate model download 12b[/dim]")
+            console.print("[dim]Example: translate model download 12b (or --all)[/dim]")
             raise typer.Exit(1)
         
         if size not in MODEL_SIZES:
@@ -824,7 +1105,7 @@ def model_cmd(
             console.print(f"[dim]Available sizes: {', '.join(MODEL_SIZES)}[/dim]")
             raise typer.Exit(1)
         
-        download_and_convert_model(size, bits)
+        download_models([size], bits, connections=connections)
     
     elif action == "remove":
         if not size:
@@ -841,13 +1122,95 @@ def model_cmd(
         else:
             console.print(f"[yellow]Model not found: translategemma-{size}-it[/yellow]")
     
+    elif action == "export":
+        export_models(size, bits, all_sizes, output)
+    
+    elif action == "import":
+        if not size:
+            console.print("[yellow]Please specify the bundle to import[/yellow]")
+            console.print("[dim]Example: translate model import translategemma-27b-q4.tar[/dim]")
+            raise typer.Exit(1)
+        import_models(size, force)
+    
     elif action == "langs":
         print_languages()
     
     else:
         console.print(f"[red]Unknown action: {action}[/red]")
-        console.print("[dim]Available actions: status, list, download, remove, langs[/dim]")
+        console.print("[dim]Available actions: status, list, download, remove, export, import, langs[/dim]")
+        raise typer.Exit(1)
+
+
+def export_models(size: Optional[str], bits: int, all_models: bool, output: Optional[str]) -> None:
+    """Export downloaded models to a bundle for offline machines."""
+    from rich.progress import Progress
+    
+    from .bundle import BundleError, export_bundle, find_models, models_dir
+    
+    if size and size not in MODEL_SIZES:
+        err_console.print(f"[red]Invalid model size: {size}[/red]")
+        raise typer.Exit(1)
+    if not size and not all_models:
+        err_console.print("[yellow]Please specify model size, or --all for every downloaded model[/yellow]")
+        err_console.print("[dim]Example: translate model export 27b --bits 4 -o translategemma-27b-q4.tar[/dim]")
+        raise typer.Exit(1)
+    
+    models = find_models(size, None if all_models else bits)
+    if not models:
+        err_console.print("[yellow]No downloaded models to export[/yellow]")
+        raise typer.Exit(1)
+    
+    output = output or (f"translategemma-{size}-q{bits}.tar" if size and not all_models else "translategemma-models.tar")
+    total = sum(
+        sum(f.stat().st_size for f in ([path] if path.is_file() else path.rglob("*")) if f.is_file())
+        for path in (models_dir() / model.path for model in models)
+    )
+    for model in models:
+        err_console.print(f"[cyan]Exporting {model.path}[/cyan]")
+    
+    # Progress goes to stderr, so the bundle can be piped from stdout
+    with Progress(*Progress.get_default_columns(), console=err_console) as progress:
+        task = progress.add_task("Exporting...", total=total)
+        try:
+            if output == "-":
+                export_bundle(models, sys.stdout.buffer, lambda n: progress.advance(task, n))
+            else:
+                with open(output, "wb") as f:
+                    export_bundle(models, f, lambda n: progress.advance(task, n))
+        except (BundleError, OSError) as e:
+            err_console.print(f"[red]Export failed: {e}[/red]")
+            raise typer.Exit(1)
+        progress.update(task, completed=total)
+    
+    if output != "-":
+        err_console.print(f"[green]✓ Bundle written to {output}[/green]")
+
+
+def import_models(source: str, force: bool) -> None:
+    """Import a bundle into the models cache."""
+    from pathlib import Path
+    
+    from rich.progress import Progress
+    
+    from .bundle import BundleError, import_bundle, models_dir
+    
+    if source != "-" and not Path(source).is_file():
+        console.print(f"[red]Bundle not found: {source}[/red]")
         raise typer.Exit(1)
+    
+    with Progress(*Progress.get_default_columns(), console=err_console) as progress:
+        task = progress.add_task("Importing...", total=None if source == "-" else Path(source).stat().st_size)
+        try:
+            imported, skipped = import_bundle(sys.stdin.buffer if source == "-" else source, force, lambda n: progress.advance(task, n))
+        except (BundleError, OSError) as e:
+            console.print(f"[red]Import failed: {e}[/red]")
+            raise typer.Exit(1)
+        progress.update(task, description="Imported", completed=progress.tasks[0].total or 0)
+    
+    for model in imported:
+        console.print(f"[green]✓ {model.path}[/green] ({model.format}, {model.size} Q{model.bits})")
+    for model in skipped:
+        console.print(f"[yellow]Skipped {model.path}: already in {models_dir()} (use --force to replace)[/yellow]")
 
 
 @app.command("init")
@@ -986,5 +1349,709 @@ def backend_cmd(
         raise typer.Exit(1)
 
 
+@app.command("daemon")
+def daemon_cmd(
+    action: str = typer.Argument(
+        "status",
+        help="Action: start, stop, status",
+    ),
+    model_size: Optional[str] = typer.Option(
+        None,
+        "--model", "-m",
+        help="Model size to keep loaded (4b, 12b, 27b)",
+    ),
+    backend: Optional[str] = typer.Option(
+        None,
+        "--backend", "-b",
+        help="Backend to serve with (auto, mlx, pytorch, gguf, vllm, ollama, fake)",
+    ),
+    idle_timeout: Optional[float] = typer.Option(
+        None,
+        "--idle-timeout",
+        help="Seconds without requests before the daemon exits (0 = never; default: config daemon.idle_timeout)",
+    ),
+    foreground: bool = typer.Option(
+        False,
+        "--foreground",
+        help="Serve from this process instead of starting a background daemon",
+    ),
+    wait: float = typer.Option(
+        300.0,
+        "--wait",
+        help="Seconds to wait for a background daemon to load its model",
+    ),
+):
+    """Keep a model loaded in a background daemon that single-shot translations use."""
+    import time
+    from . import daemon
+    
+    config = get_config()
+    socket_path = config.daemon_socket
+    
+    if action == "start":
+        if model_size and model_size not in MODEL_SIZES:
+            console.print(f"[red]Invalid model size: {model_size}[/red]")
+            raise typer.Exit(1)
+        if backend and backend not in BACKEND_TYPES:
+            console.print(f"[red]Invalid backend: {backend}[/red]")
+            console.print(f"[dim]Available backends: {', '.join(BACKEND_TYPES)}[/dim]")
+            raise typer.Exit(1)
+        if idle_timeout is not None and idle_timeout < 0:
+            console.print("[red]--idle-timeout must be non-negative[/red]")
+            raise typer.Exit(1)
+        if not daemon.daemon_supported():
+            console.print("[red]The daemon needs Unix domain sockets, which this platform lacks[/red]")
+            raise typer.Exit(1)
+        if daemon.is_running(socket_path):
+            console.print(f"[yellow]Daemon already running on {socket_path}[/yellow]")
+            return
+        
+        if foreground:
+            run_daemon(model_size, backend, idle_timeout)
+            return
+        
+        # Re-run this command in the foreground, detached from the terminal
+        import subprocess
+        
+        args = [sys.executable, "-m", "translategemma_cli.cli", "daemon", "start", "--foreground"]
+        if model_size:
+            args += ["--model", model_size]
+        if backend:
+            args += ["--backend", backend]
+        if idle_timeout is not None:
+            args += ["--idle-timeout", str(idle_timeout)]
+        log_path = socket_path.with_suffix(".log")
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "w") as log:
+            process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        
+        deadline = time.monotonic() + wait
+        with console.status("[cyan]Starting daemon and loading the model..."):
+            while not daemon.is_running(socket_path):
+                if process.poll() is not None or time.monotonic() > deadline:
+                    break
+                time.sleep(0.2)
+        
+        if not daemon.is_running(socket_path):
+            if process.poll() is None:
+                console.print(f"[yellow]Daemon still loading after {wait:.0f}s (pid {process.pid})[/yellow]")
+                console.print(f"[dim]Log: {log_path}[/dim]")
+            else:
+                console.print(f"[red]Daemon exited with code {process.returncode}[/red]")
+                lines = log_path.read_text(errors="replace").strip().splitlines()[-10:]
+                for line in lines:
+                    console.print(f"[dim]{line}[/dim]", markup=False)
+            raise typer.Exit(1)
+        
+        info = daemon.status(socket_path)
+        console.print(
+            f"[green]✓ Daemon running[/green] (pid {info['pid']}, model {info['model_size']}, backend {info['backend']})"
+        )
+        console.print(f"[dim]Socket: {socket_path} · Log: {log_path}[/dim]")
+    
+    elif action == "stop":
+        try:
+            daemon.shutdown(socket_path)
+        except daemon.DaemonUnavailable:
+            console.print("[dim]No daemon running[/dim]")
+            return
+        deadline = time.monotonic() + 10
+        while daemon.is_running(socket_path) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        console.print("[green]✓ Daemon stopped[/green]")
+    
+    elif action == "status":
+        try:
+            info = daemon.status(socket_path)
+        except daemon.DaemonUnavailable:
+            console.print("[yellow]No daemon running[/yellow]")
+            console.print("[dim]Start one with: translate daemon start[/dim]")
+            raise typer.Exit(1)
+        timeout = f"{info['idle_timeout']:.0f}s" if info["idle_timeout"] else "never"
+        console.print("\n[bold]Daemon:[/bold] [green]Running[/green]")
+        console.print(f"  [bold]PID:[/bold] {info['pid']}")
+        console.print(f"  [bold]Model:[/bold] {info['model_size']} ({info['backend']})")
+        console.print(f"  [bold]Socket:[/bold] {info['socket']}")
+        console.print(f"  [bold]Uptime:[/bold] {info['uptime_s']:.0f}s · {info['requests']} requests")
+        console.print(f"  [bold]Idle:[/bold] {info['idle_s']:.0f}s (exits after {timeout})")
+        console.print()
+    
+    else:
+        console.print(f"[red]Unknown action: {action}[/red]")
+        console.print("[dim]Available actions: start, stop, status[/dim]")
+        raise typer.Exit(1)
+
+
+def run_daemon(model_size: Optional[str], backend: Optional[str], idle_timeout: Optional[float]) -> None:
+    """Load the model and serve it on the daemon socket until stopped or idle."""
+    import signal
+    from .daemon import TranslationDaemon
+    
+    config = get_config()
+    if backend:
+        config.backend_type = backend
+    translator = get_translator()
+    
+    # Server and fake backends have no local weights to download
+    if config.backend_type in ("auto", "mlx", "pytorch", "gguf") and not is_model_ready(model_size):
+        download_and_convert_model(model_size)
+    translator.ensure_model_loaded(model_size)
+    
+    server = TranslationDaemon(idle_timeout=idle_timeout, translator=translator, model_size=translator.current_model_size)
+    try:
+        server.bind()
+    except RuntimeError as e:
+        err_console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    # `kill` stops the daemon like Ctrl+C: the socket is removed on the way out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    timeout = f"{server.idle_timeout:.0f}s idle timeout" if server.idle_timeout else "no idle timeout"
+    err_console.print(
+        f"Daemon listening on {server.socket_path} "
+        f"(model {translator.current_model_size}, backend {translator.backend}, {timeout})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    err_console.print("Daemon stopped")
+
+
+@app.command("bench")
+def bench_cmd(
+    action: str = typer.Argument(
+        "run",
+        help="Action: run, compare, cases, load, chunking, memory, plan, prompt, pytorch",
+    ),
+    files: Optional[list[str]] = typer.Argument(
+        None,
+        help="For compare: baseline and candidate result files",
+    ),
+    model: Optional[str] = typer.Option(
+        None,
+        "--model", "-m",
+        help="Model size (4b, 12b, 27b)",
+    ),
+    backend: Optional[str] = typer.Option(
+        None,
+        "--backend",
+        help="Backend (auto, mlx, pytorch, gguf, vllm, ollama, fake)",
+    ),
+    bits: Optional[int] = typer.Option(
+        None,
+        "--bits", "-b",
+        help="Quantization bits (4 or 8)",
+    ),
+    repeat: Optional[int] = typer.Option(
+        None,
+        "--repeat", "-n",
+        help="Timed runs per case (default: 5, or 1 per setting for chunking, 200 builds per chunk for prompt)",
+    ),
+    warmup: int = typer.Option(
+        1,
+        "--warmup",
+        help="Untimed warm-up runs per case",
+    ),
+    seed: int = typer.Option(
+        DEFAULT_SEED,
+        "--seed",
+        help="Corpus seed",
+    ),
+    cases: Optional[str] = typer.Option(
+        None,
+        "--cases",
+        help="Comma-separated case names (default: all)",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Result file (default: bench-<model>-<backend>-<time>.json)",
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_THRESHOLD,
+        "--threshold",
+        help="Relative change flagged as a regression by compare (0.1 = 10%)",
+    ),
+    url: str = typer.Option(
+        os.environ.get("API_BASE", "http://localhost:8022"),
+        "--url",
+        help="For load: server URL",
+    ),
+    concurrency: str = typer.Option(
+        "1",
+        "--concurrency", "-c",
+        help="For load: comma-separated concurrency levels, one step each",
+    ),
+    rps: Optional[str] = typer.Option(
+        None,
+        "--rps",
+        help="For load: comma-separated request rates (open loop, replaces --concurrency)",
+    ),
+    requests: Optional[int] = typer.Option(
+        None,
+        "--requests",
+        help="For load: requests per step (default: one pass over the corpus)",
+    ),
+    duration: Optional[float] = typer.Option(
+        None,
+        "--duration",
+        help="For load: seconds per step",
+    ),
+    replay: Optional[str] = typer.Option(
+        None,
+        "--replay",
+        help="For load: JSON lines file of requests to replay (default: the benchmark corpus)",
+    ),
+    endpoints: str = typer.Option(
+        "translate,stream,batch",
+        "--endpoints",
+        help="For load: endpoints to hit with the corpus (translate, stream, batch)",
+    ),
+    chunk_sizes: str = typer.Option(
+        ",".join(str(size) for size in DEFAULT_CHUNK_SIZES),
+        "--chunk-sizes",
+        help="For chunking: comma-separated chunk sizes to try",
+    ),
+    overlaps: str = typer.Option(
+        ",".join(str(overlap) for overlap in DEFAULT_OVERLAPS),
+        "--overlaps",
+        help="For chunking: comma-separated overlaps to try",
+    ),
+    split_by: str = typer.Option(
+        ",".join(DEFAULT_SPLIT_BY),
+        "--split-by",
+        help="For chunking: comma-separated split modes to try (sentence, paragraph, char)",
+    ),
+    corpus_file: Optional[str] = typer.Option(
+        None,
+        "--corpus",
+        help="For chunking: JSON lines file of {name, text, target_lang, reference} (default: the long corpus cases)",
+    ),
+    apply: bool = typer.Option(
+        False,
+        "--apply",
+        help="For chunking: write the recommended settings into config.yaml",
+    ),
+    contexts: Optional[str] = typer.Option(
+        None,
+        "--contexts",
+        help="For memory/plan: comma-separated context sizes in tokens (default: 512,1024,2048 / configured n_ctx)",
+    ),
+    budget: Optional[float] = typer.Option(
+        None,
+        "--budget",
+        help="For plan: memory budget in GB (default: available memory minus 10%)",
+    ),
+    variants: str = typer.Option(
+        ",".join(DEFAULT_PYTORCH_VARIANTS),
+        "--variants",
+        help=f"For pytorch: comma-separated variants to compare, the first is the baseline ({', '.join(PYTORCH_VARIANTS)})",
+    ),
+):
+    """Benchmark the translator on a pinned corpus, compare results, or load-test the server."""
+    corpus = build_corpus(seed)
+    
+    if action == "cases":
+        table = Table(title=f"Benchmark corpus v{CORPUS_VERSION} (seed {seed})")
+        table.add_column("Case", style="cyan")
+        table.add_column("Target")
+        table.add_column("Mode")
+        table.add_column("Chars", justify="right")
+        for case in corpus:
+            table.add_row(case.name, case.target_lang, "long" if case.long else "single", str(len(case.text)))
+        console.print(table)
+    
+    elif action == "run":
+        try:
+            selected = select_cases(corpus, [name.strip() for name in cases.split(",")] if cases else None)
+        except ValueError as e:
+            err_console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        
+        try:
+            with console.status("[bold blue]Running benchmark...[/bold blue]"):
+                result = run_suite(
+                    selected,
+                    model_size=model,
+                    quantization=bits,
+                    backend=backend,
+                    warmup=warmup,
+                    repeat=repeat or 5,
+                    seed=seed,
+                    progress=lambda case: console.print(f"[dim]Running {case.name}...[/dim]"),
+                )
+        except (ValueError, RuntimeError, ImportError) as e:
+            err_console.print(f"[red]Benchmark failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        path = save_result(result, output or default_output(result))
+        config = result["config"]
+        table = Table(title=f"{config['model_size']} · {config['backend']} · {config['repeat']} runs (load {result['load_time_s']}s)")
+        table.add_column("Case", style="cyan")
+        table.add_column("Median ms", justify="right")
+        table.add_column("p95 ms", justify="right")
+        table.add_column("TTFT ms", justify="right")
+        table.add_column("Decode tok/s", justify="right")
+        for name, case in result["cases"].items():
+            table.add_row(
+                name,
+                f"{case['latency_ms']['median']:.1f}",
+                f"{case['latency_ms']['p95']:.1f}",
+                f"{case['ttft_ms']:.1f}" if case["ttft_ms"] is not None else "-",
+                f"{case['decode_tokens_per_second']:.1f}" if case["decode_tokens_per_second"] is not None else "-",
+            )
+        console.print(table)
+        console.print(f"[green]✓ Results written to {path}[/green]")
+    
+    elif action == "compare":
+        if not files or len(files) != 2:
+            console.print("[yellow]Please specify two result files: baseline and candidate[/yellow]")
+            console.print("[dim]Example: translate bench compare before.json after.json[/dim]")
+            raise typer.Exit(1)
+        
+        try:
+            baseline, candidate = (load_result(path) for path in files)
+        except (OSError, ValueError) as e:
+            err_console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        
+        comparison = compare_results(baseline, candidate, threshold)
+        for warning in comparison.warnings:
+            console.print(f"[yellow]Warning: {warning}[/yellow]")
+        
+        table = Table(title=f"{files[0]} → {files[1]}")
+        table.add_column("Case", style="cyan")
+        table.add_column("Metric")
+        table.add_column("Baseline", justify="right")
+        table.add_column("Candidate", justify="right")
+        table.add_column("Change", justify="right")
+        for delta in comparison.deltas:
+            style = "red" if delta.regression else "green" if delta.improvement else "dim"
+            table.add_row(
+                delta.case,
+                delta.metric,
+                f"{delta.baseline:.1f}",
+                f"{delta.candidate:.1f}",
+                f"[{style}]{delta.change:+.1%}[/{style}]",
+            )
+        console.print(table)
+        
+        if comparison.regressions:
+            console.print(f"[red]✗ {len(comparison.regressions)} regression(s) beyond {threshold:.0%}[/red]")
+            raise typer.Exit(1)
+        console.print(f"[green]✓ No regressions beyond {threshold:.0%}[/green]")
+    
+    elif action == "load":
+        try:
+            if replay:
+                load = load_requests(replay)
+            else:
+                load = default_requests(seed, [name.strip() for name in endpoints.split(",")])
+            levels = [int(level) for level in concurrency.split(",")]
+            rates = [float(rate) for rate in rps.split(",")] if rps else None
+            result = run_levels(
+                url,
+                load,
+                levels=levels,
+                rates=rates,
+                total=requests,
+                duration=duration,
+                on_level=lambda step: console.print(f"[dim]Load step: {step}...[/dim]"),
+            )
+        except (OSError, ValueError) as e:
+            err_console.print(f"[red]Load test failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        def ms(distribution: Optional[dict], key: str) -> str:
+            return f"{distribution[key]:.0f}" if distribution else "-"
+        
+        table = Table(title=f"Load test · {url} · {len(load)} request(s) in corpus")
+        table.add_column("Step", style="cyan")
+        table.add_column("Endpoint")
+        table.add_column("Requests", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("req/s", justify="right")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p95 ms", justify="right")
+        table.add_column("p99 ms", justify="right")
+        table.add_column("First event ms", justify="right")
+        for step in result["steps"]:
+            label = f"rps {step['rps']}" if "rps" in step else f"c={step['concurrency']}"
+            for endpoint, summary in [("all", step), *step["endpoints"].items()]:
+                errors = f"[red]{summary['errors']}[/red]" if summary["errors"] else "0"
+                table.add_row(
+                    label if endpoint == "all" else "",
+                    endpoint,
+                    str(summary["requests"]),
+                    errors,
+                    f"{summary['throughput_rps']:.2f}" if summary["throughput_rps"] is not None else "-",
+                    ms(summary["latency_ms"], "p50"),
+                    ms(summary["latency_ms"], "p95"),
+                    ms(summary["latency_ms"], "p99"),
+                    f"{ms(summary['first_event_ms'], 'p50')}/{ms(summary['first_event_ms'], 'p95')}",
+                )
+        console.print(table)
+        for step in result["steps"]:
+            label = f"rps {step['rps']}" if "rps" in step else f"c={step['concurrency']}"
+            for error, count in step["top_errors"].items():
+                console.print(f"[yellow]{label}: {count} × {error}[/yellow]")
+        
+        if output:
+            console.print(f"[green]✓ Results written to {save_result(result, output)}[/green]")
+    
+    elif action == "chunking":
+        try:
+            grid = settings_grid(
+                tuple(int(size) for size in chunk_sizes.split(",")),
+                tuple(int(overlap) for overlap in overlaps.split(",")),
+                tuple(mode.strip() for mode in split_by.split(",")),
+            )
+            if any(settings["split_by"] not in ("sentence", "paragraph", "char") for settings in grid):
+                raise ValueError("split modes must be sentence, paragraph or char")
+            sweep_cases, references = load_cases(corpus_file) if corpus_file else (None, None)
+            with console.status("[bold blue]Sweeping chunking settings...[/bold blue]"):
+                result = sweep_chunking(
+                    sweep_cases,
+                    references,
+                    grid,
+                    model_size=model,
+                    quantization=bits,
+                    backend=backend,
+                    repeat=repeat or 1,
+                    seed=seed,
+                    progress=lambda settings: console.print(
+                        f"[dim]chunk_size={settings['chunk_size']} overlap={settings['overlap']} split_by={settings['split_by']}[/dim]"
+                    ),
+                )
+        except (OSError, ValueError, RuntimeError, ImportError) as e:
+            err_console.print(f"[red]Chunking sweep failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        recommendations = recommend(result)
+        result["recommendations"] = recommendations
+        config = result["config"]
+        path = save_result(result, output or default_output(result, "chunking"))
+        
+        table = Table(title=f"Recommended chunking · {config['model_size']} · {config['backend']} · {len(grid)} settings")
+        table.add_column("Pair", style="cyan")
+        table.add_column("Size", justify="right")
+        table.add_column("Overlap", justify="right")
+        table.add_column("Split")
+        table.add_column("Latency ms", justify="right")
+        table.add_column("Tokens", justify="right")
+        table.add_column("Truncated", justify="right")
+        table.add_column("Length ratio", justify="right")
+        table.add_column("chrF", justify="right")
+        for pair, best in recommendations.items():
+            table.add_row(
+                pair,
+                str(best["chunk_size"]),
+                str(best["overlap"]),
+                best["split_by"],
+                f"{best['latency_ms']:.0f}",
+                str(best["completion_tokens"]),
+                f"{best['truncation_rate']:.0%}",
+                f"{best['length_ratio']:.2f}" if best["length_ratio"] is not None else "-",
+                f"{best['chrf']:.1f}" if best["chrf"] is not None else "-",
+            )
+        console.print(table)
+        console.print(f"[green]✓ Results written to {path}[/green]")
+        
+        if apply:
+            apply_recommendations(recommendations, config["model_size"])
+            console.print(f"[green]✓ Saved tuned settings for {config['model_size']} to {get_config().config_path}[/green]")
+        else:
+            console.print("[dim]Run with --apply to save these settings to config.yaml[/dim]")
+    
+    elif action == "memory":
+        try:
+            context_sizes = tuple(int(size) for size in contexts.split(",")) if contexts else DEFAULT_CONTEXTS
+            sizes = [size.strip() for size in model.split(",")] if model else [get_config().model_size]
+            table = Table(title="Memory footprint (MB)")
+            table.add_column("Model", style="cyan")
+            table.add_column("Backend")
+            table.add_column("Load RSS", justify="right")
+            table.add_column("Peak RSS", justify="right")
+            table.add_column("mmap", justify="right")
+            table.add_column("Device", justify="right")
+            table.add_column("KV / 1k tokens", justify="right")
+            results = {}
+            for size in sizes:
+                with console.status(f"[bold blue]Measuring {size}...[/bold blue]"):
+                    profile, raw = measure_memory(
+                        size,
+                        bits,
+                        backend,
+                        context_sizes,
+                        progress=lambda step: console.print(f"[dim]{size}: {step}[/dim]"),
+                    )
+                path = save_profile(profile)
+                results[profile.key] = {"profile": asdict(profile), "readings": raw}
+                table.add_row(
+                    f"{profile.model_size} Q{profile.quantization}",
+                    profile.backend,
+                    f"{profile.weights_mb:.0f}",
+                    f"{raw['peak_load_rss_mb']:.0f}",
+                    f"{profile.mmap_mb:.0f}" if profile.mmap_mb is not None else "-",
+                    f"{profile.device_mb:.0f}" if profile.device_mb is not None else "-",
+                    f"{profile.kv_mb_per_1k:.1f}",
+                )
+        except (ValueError, RuntimeError, ImportError) as e:
+            err_console.print(f"[red]Memory benchmark failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        console.print(table)
+        console.print(f"[green]✓ Profiles saved to {path} (used by `translate bench plan` and n_ctx: auto)[/green]")
+        if output:
+            console.print(f"[green]✓ Readings written to {save_result(results, output)}[/green]")
+    
+    elif action == "plan":
+        config = get_config()
+        try:
+            context_sizes = [int(size) for size in contexts.split(",")] if contexts else [config.gguf_n_ctx]
+            plan_backend = backend if backend and backend != "auto" else "gguf"
+            rows = {
+                context: plan_budget(budget * 1024 if budget else None, context, plan_backend)
+                for context in context_sizes
+            }
+        except ValueError as e:
+            err_console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        
+        first = rows[context_sizes[0]]
+        table = Table(title=f"Memory plan · {plan_backend} · budget {first[0]['budget_mb'] / 1024:.1f}GB")
+        table.add_column("Model", style="cyan")
+        table.add_column("Source")
+        for context in context_sizes:
+            table.add_column(f"Needs @{context}", justify="right")
+        table.add_column("Max context", justify="right")
+        for index, row in enumerate(first):
+            cells = []
+            for context in context_sizes:
+                planned = rows[context][index]
+                style = "green" if planned["fits"] else "red"
+                cells.append(f"[{style}]{planned['required_mb'] / 1024:.1f}GB[/{style}]")
+            table.add_row(
+                f"{row['model_size']} Q{row['quantization']}",
+                "measured" if row["measured"] else "estimate",
+                *cells,
+                str(row["max_context"]) if row["max_context"] else "[red]does not fit[/red]",
+            )
+        console.print(table)
+    
+    elif action == "prompt":
+        config = get_config()
+        try:
+            selected = select_cases(corpus, [name.strip() for name in cases.split(",")] if cases else None)
+            prompt_backend = backend if backend in ("mlx", "pytorch") else "pytorch"
+            size = model or config.model_size
+            with console.status("[bold blue]Loading tokenizer...[/bold blue]"):
+                tokenizer = load_tokenizer(size, bits or config.quantization_bits)
+            with console.status("[bold blue]Timing prompt building...[/bold blue]"):
+                result = measure_prompts(
+                    tokenizer,
+                    backend=prompt_backend,
+                    cases=selected,
+                    repeat=repeat or DEFAULT_PROMPT_REPEAT,
+                    seed=seed,
+                    model_size=size,
+                )
+        except (ValueError, RuntimeError, ImportError, OSError) as e:
+            err_console.print(f"[red]Prompt benchmark failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        path = save_result(result, output or default_output(result, "prompt"))
+        table = Table(title=f"Prompt building per chunk · {size} · {prompt_backend} · {result['chunks']} chunks")
+        table.add_column("Path", style="cyan")
+        table.add_column("Median µs", justify="right")
+        table.add_column("p95 µs", justify="right")
+        table.add_column("Mean µs", justify="right")
+        for label, key in (("Chat template", "template_us"), ("Precompiled", "precompiled_us")):
+            timing = result[key]
+            table.add_row(label, f"{timing['median']:.1f}", f"{timing['p95']:.1f}", f"{timing['mean']:.1f}")
+        console.print(table)
+        console.print(f"Speedup {result['speedup']:.1f}x (templates compiled once in {result['compile_ms']:.1f}ms)")
+        fallback = [pair for pair, precompiled in result["pairs"].items() if not precompiled]
+        if fallback:
+            console.print(f"[yellow]Rendered with the chat template (no clean split): {', '.join(fallback)}[/yellow]")
+        if not result["identical"]:
+            console.print("[red]Precompiled prompts differ from the chat template's[/red]")
+        console.print(f"[green]✓ Results written to {path}[/green]")
+    
+    elif action == "pytorch":
+        try:
+            selected = select_cases(corpus, [name.strip() for name in cases.split(",")] if cases else None)
+            names = [name.strip() for name in variants.split(",")]
+            unknown = [name for name in names if name not in PYTORCH_VARIANTS]
+            if unknown:
+                raise ValueError(f"Unknown variants: {', '.join(unknown)} (available: {', '.join(PYTORCH_VARIANTS)})")
+            with console.status("[bold blue]Running PyTorch benchmark...[/bold blue]"):
+                result = compare_pytorch(
+                    {name: PYTORCH_VARIANTS[name] for name in names},
+                    selected,
+                    model_size=model,
+                    quantization=bits,
+                    warmup=warmup,
+                    repeat=repeat or 5,
+                    seed=seed,
+                    progress=lambda variant, case: console.print(f"[dim]{variant}: running {case.name}...[/dim]"),
+                )
+        except (ValueError, RuntimeError, ImportError) as e:
+            err_console.print(f"[red]PyTorch benchmark failed: {e}[/red]")
+            raise typer.Exit(1)
+        
+        path = save_result(result, output or default_output(result, "pytorch"))
+        config = result["config"]
+        runs = result["variants"]
+        table = Table(title=f"PyTorch · {config['model_size']} · {config['device']} · {config['repeat']} runs")
+        table.add_column("Case", style="cyan")
+        for name in runs:
+            table.add_column(f"{name} ms", justify="right")
+        for name in result["speedup"]:
+            table.add_column(f"{name} speedup", justify="right")
+        for case in runs[result["baseline"]]["cases"]:
+            table.add_row(
+                case,
+                *(f"{run['cases'][case]['latency_ms']['median']:.1f}" for run in runs.values()),
+                *(f"{speedup['cases'][case]:.2f}x" if speedup["cases"][case] else "-" for speedup in result["speedup"].values()),
+            )
+        console.print(table)
+        
+        table = Table(title="Load, memory and throughput")
+        table.add_column("Variant", style="cyan")
+        table.add_column("Load s", justify="right")
+        table.add_column("Added RSS MB", justify="right")
+        table.add_column("Peak RSS MB", justify="right")
+        table.add_column("Device MB", justify="right")
+        table.add_column("Tokens/s", justify="right")
+        table.add_column("Threads", justify="right")
+        for name, run in runs.items():
+            memory = run["memory"]
+            cpu = run.get("cpu")
+            table.add_row(
+                name,
+                f"{run['load_time_s']:.1f}",
+                f"{memory['added_rss_mb']:.0f}",
+                f"{memory['peak_rss_mb']:.0f}",
+                f"{memory['device_mb']:.0f}" if memory["device_mb"] is not None else "-",
+                f"{run['completion_tokens_per_second']:.1f}" if run["completion_tokens_per_second"] is not None else "-",
+                f"{cpu['threads']}/{cpu['interop_threads']}" if cpu else "-",
+            )
+        console.print(table)
+        console.print(f"[green]✓ Results written to {path}[/green]")
+    
+    else:
+        console.print(f"[red]Unknown action: {action}[/red]")
+        console.print("[dim]Available actions: run, compare, cases, load, chunking, memory, plan, prompt, pytorch[/dim]")
+        raise typer.Exit(1)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,155 @@
+"""Compiled PyTorch generation: static KV cache, torch.compile and bucketed prompts.
+
+Eager generation grows a dynamic KV cache as it decodes and launches every
+layer's kernels from Python, which is a large share of the time spent on
+the ~100-character chunks translated here. In compiled mode (config
+backend.pytorch.mode: compiled) the model decodes into a static KV cache
+allocated once at load, sized from the largest chunk, and its forward pass
+is compiled with torch.compile (CUDA graphs on GPU).
+
+Compiled graphs are specialized to tensor shapes. Prompts are therefore
+left-padded to a few bucket lengths, and each bucket is compiled during the
+load's warm-up instead of by the first request that needs it. Prompts
+longer than the largest bucket still work, but compile their own shape on
+first use.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Sequence
+
+# Prompt tokens the chat template adds around the chunk text
+TEMPLATE_TOKENS = 128
+
+# Smallest prompt bucket; buckets double from here up to the largest prompt
+MIN_BUCKET = 64
+
+# Tokens generated per bucket during warm-up: the prefill and one decode step
+WARMUP_TOKENS = 2
+
+# Prompt buckets and static cache length of each model compile_model() compiled
+_compiled: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def prompt_buckets(chunk_size: int) -> tuple[int, ...]:
+    """
+    Padded prompt lengths (in tokens) for chunks of up to chunk_size characters.
+
+    Chunk text rarely has more tokens than characters, so the largest
+    bucket holds chunk_size tokens plus the template.
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    largest = chunk_size + TEMPLATE_TOKENS
+    buckets = []
+    size = MIN_BUCKET
+    while size < largest:
+        buckets.append(size)
+        size *= 2
+    buckets.append(largest)
+    return tuple(buckets)
+
+
+def bucket_length(length: int, buckets: Sequence[int]) -> int | None:
+    """The smallest bucket holding length tokens, or None if the prompt is longer than all of them."""
+    return next((bucket for bucket in sorted(buckets) if bucket >= length), None)
+
+
+def pad_prompt(prompt: list[int], buckets: Sequence[int], pad_token_id: int) -> tuple[list[int], list[int]]:
+    """
+    Left-pad prompt token IDs to their bucket.
+
+    Returns:
+        (input IDs, attention mask); unpadded if no bucket is long enough
+    """
+    padding = (bucket_length(len(prompt), buckets) or len(prompt)) - len(prompt)
+    return [pad_token_id] * padding + list(prompt), [0] * padding + [1] * len(prompt)
+
+
+def cache_length(buckets: Sequence[int], max_tokens: int) -> int:
+    """Tokens the static KV cache holds: the largest prompt plus a full completion."""
+    return max(buckets) + max_tokens
+
+
+def completion_budget(max_tokens: int, prompt_length: int, cache_tokens: int) -> int:
+    """
+    max_tokens, clamped to what the static KV cache holds after a prompt.
+
+    Generating past the cache makes transformers allocate a larger one and
+    recompile every shape, so a request asking for more (a per-request
+    max_tokens, or the adaptive budget of long chunks) stops at the cache
+    instead. Prompts that fill the cache on their own are left alone: they
+    compile their own shape anyway.
+    """
+    room = cache_tokens - prompt_length
+    return min(max_tokens, room) if room > 0 else max_tokens
+
+
+def compiled_shapes(model: Any) -> tuple[tuple[int, ...], int] | None:
+    """Prompt buckets and static cache length of a model compiled by compile_model(), or None if it runs eager."""
+    try:
+        return _compiled.get(model)
+    except TypeError:
+        # Not weak-referenceable, so never compiled here
+        return None
+
+
+def compile_model(model: Any, tokenizer: Any, buckets: Sequence[int], max_tokens: int) -> bool:
+    """
+    Switch a transformers model to a static KV cache and a compiled forward pass.
+
+    The largest bucket is generated first with the full max_tokens budget, so
+    the static cache is allocated at cache_length() and reused by every later
+    generation (transformers keeps a static cache that is large enough); the
+    remaining buckets then compile their prefill shapes. Each warm-up stops
+    after WARMUP_TOKENS tokens.
+
+    Args:
+        model: Loaded AutoModelForCausalLM
+        tokenizer: Its tokenizer
+        buckets: Prompt lengths to compile (see prompt_buckets())
+        max_tokens: Largest completion the cache must hold
+
+    Returns:
+        True if compiled (compiled_shapes() then reports the buckets and
+        cache length); False if this torch has no torch.compile (the model
+        is left in eager mode)
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    if not hasattr(torch, "compile"):
+        return False
+
+    device = next(model.parameters()).device
+    model.generation_config.cache_implementation = "static"
+    # CUDA graphs replay the whole decode step without per-kernel launches
+    mode = "reduce-overhead" if device.type == "cuda" else "default"
+    model.forward = torch.compile(model.forward, mode=mode, fullgraph=True, dynamic=False)
+
+    class _StopAfter(StoppingCriteria):
+        def __init__(self, length: int):
+            self.length = length
+
+        def __call__(self, input_ids, scores, **kwargs):
+            return torch.full((input_ids.shape[0],), input_ids.shape[1] >= self.length, dtype=torch.bool, device=input_ids.device)
+
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    text = tokenizer.encode("Hello")
+    for bucket in sorted(buckets, reverse=True):
+        input_ids, attention_mask = pad_prompt(text, [bucket], pad_token_id)
+        with torch.no_grad():
+            model.generate(
+                input_ids=torch.tensor([input_ids], device=device),
+                attention_mask=torch.tensor([attention_mask], device=device),
+                max_new_tokens=max_tokens,
+                do_sample=False,
+                pad_token_id=pad_token_id,
+                stopping_criteria=StoppingCriteriaList([_StopAfter(bucket + WARMUP_TOKENS)]),
+            )
+    _compiled[model] = (tuple(sorted(buckets)), cache_length(buckets, max_tokens))
+    return True
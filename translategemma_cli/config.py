@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Literal
 import yaml
@@ -18,14 +19,44 @@
 ModelFormat = Literal["auto", "gguf", "hf"]
 DEFAULT_MODEL_FORMAT = "auto"
 
+# How weights are brought into memory; see loading.py
+LoadStrategy = Literal["auto", "mmap", "prewarm", "mlock", "read"]
+LOAD_STRATEGIES = ("auto", "mmap", "prewarm", "mlock", "read")
+DEFAULT_LOAD_STRATEGY = "auto"
+
+# How the PyTorch backend runs the model; see compiled.py
+PytorchMode = Literal["eager", "compiled"]
+PYTORCH_MODES = ("eager", "compiled")
+DEFAULT_PYTORCH_MODE = "eager"
+
+# Weights of the PyTorch backend on CPU; see cpu.py
+PytorchCpuDtype = Literal["float32", "bfloat16", "int8"]
+PYTORCH_CPU_DTYPES = ("float32", "bfloat16", "int8")
+DEFAULT_PYTORCH_CPU_DTYPE = "float32"
+
 # Backend types
-BackendType = Literal["auto", "mlx", "pytorch", "gguf", "vllm", "ollama"]
+BackendType = Literal["auto", "mlx", "pytorch", "gguf", "vllm", "ollama", "fake"]
+BACKEND_TYPES = ("auto", "mlx", "pytorch", "gguf", "vllm", "ollama", "fake")
 DEFAULT_BACKEND = "auto"
 
+# Simulated latencies of the fake backend (seconds); see backends.FakeBackend
+DEFAULT_FAKE_BACKEND = {
+    "token_latency": 0.01,
+    "prefill_latency": 0.02,
+    "prefill_token_latency": 0.0,
+    "batch_curve": "1:1.0",
+}
+
 # Default server URLs
 DEFAULT_VLLM_URL = "http://localhost:8000"
 DEFAULT_OLLAMA_URL = "http://localhost:11434"
 
+# Seconds the warm-model daemon stays up without requests
+DEFAULT_DAEMON_IDLE_TIMEOUT = 900
+
+# Parallel range requests per downloaded model file
+DEFAULT_DOWNLOAD_CONNECTIONS = 4
+
 MODEL_INFO = {
     "4b": {
         "hf_id": "google/translategemma-4b-it",
@@ -154,16 +185,24 @@ def get_default_config_data() -> dict:
             "name": DEFAULT_MODEL_SIZE,
             "quantization": 4,
             "format": "auto",  # auto, gguf, hf (auto: gguf on Linux, mlx on macOS)
+            "load_strategy": DEFAULT_LOAD_STRATEGY,  # auto, mmap, prewarm (sequential page-cache fill), mlock (pin in RAM, GGUF only), read (no mmap)
         },
         "backend": {
-            "type": DEFAULT_BACKEND,  # auto, mlx, pytorch, gguf, vllm, ollama
+            "type": DEFAULT_BACKEND,  # auto, mlx, pytorch, gguf, vllm, ollama, fake
             "vllm_url": DEFAULT_VLLM_URL,
             "ollama_url": DEFAULT_OLLAMA_URL,
             "gguf": {
                 "n_gpu_layers": -1,  # -1 = all layers on GPU
-                "n_ctx": 4096,       # context window
+                "n_ctx": 4096,       # context window ("auto" = largest that fits memory)
                 "n_threads": None,   # None = auto
             },
+            "pytorch": {
+                "mode": DEFAULT_PYTORCH_MODE,  # eager, compiled (static KV cache + torch.compile, warmed up at load)
+                "cpu_dtype": DEFAULT_PYTORCH_CPU_DTYPE,  # float32, bfloat16, int8 (dynamic-quantized linear layers)
+                "threads": None,          # None = physical cores available to the process
+                "interop_threads": None,  # None = 1
+                "numa_node": None,        # pin the process to one NUMA node's CPUs before loading
+            },
         },
         "translation": {
             "languages": list(DEFAULT_LANGUAGES),
@@ -189,6 +228,10 @@ def get_default_config_data() -> dict:
             "colored_output": True,
             "show_progress": True,
         },
+        "daemon": {
+            "idle_timeout": DEFAULT_DAEMON_IDLE_TIMEOUT,  # seconds without requests before exiting (0 = never)
+            "socket": None,  # None = ~/.cache/translate/daemon.sock
+        },
     }
 
 
@@ -291,6 +334,18 @@ def model_format(self, value: str) -> None:
             self._data["model"] = {}
         self._data["model"]["format"] = value
 
+    @property
+    def load_strategy(self) -> LoadStrategy:
+        """How weights are loaded: auto, mmap, prewarm, mlock or read."""
+        strategy = self._data.get("model", {}).get("load_strategy", DEFAULT_LOAD_STRATEGY)
+        return strategy if strategy in LOAD_STRATEGIES else DEFAULT_LOAD_STRATEGY
+
+    @load_strategy.setter
+    def load_strategy(self, value: LoadStrategy) -> None:
+        if value not in LOAD_STRATEGIES:
+            raise ValueError(f"Load strategy must be one of: {', '.join(LOAD_STRATEGIES)}")
+        self._data.setdefault("model", {})["load_strategy"] = value
+
     @property
     def gguf_n_gpu_layers(self) -> int:
         """Number of layers to offload to GPU for GGUF models."""
@@ -298,8 +353,81 @@ def gguf_n_gpu_layers(self) -> int:
 
     @property
     def gguf_n_ctx(self) -> int:
-        """Context window size for GGUF models."""
-        return self._data.get("backend", {}).get("gguf", {}).get("n_ctx", 4096)
+        """
+        Context window size for GGUF models.
+
+        "auto" picks the largest context the memory budget planner expects
+        to fit next to the configured model (see memory.recommended_n_ctx).
+        """
+        return self.gguf_n_ctx_for(self.model_size, self.quantization_bits)
+
+    def gguf_n_ctx_for(self, model_size: str, quantization_bits: int) -> int:
+        """Context window size for a GGUF model, planning "auto" for that model rather than the configured one."""
+        n_ctx = self._data.get("backend", {}).get("gguf", {}).get("n_ctx", 4096)
+        if n_ctx == "auto":
+            from .memory import recommended_n_ctx
+
+            return recommended_n_ctx(model_size, quantization_bits)
+        return n_ctx
+
+    @gguf_n_ctx.setter
+    def gguf_n_ctx(self, value: int | str) -> None:
+        if value != "auto" and (not isinstance(value, int) or value <= 0):
+            raise ValueError("n_ctx must be a positive integer or 'auto'")
+        self._data.setdefault("backend", {}).setdefault("gguf", {})["n_ctx"] = value
+
+    @property
+    def pytorch_mode(self) -> PytorchMode:
+        """How the PyTorch backend runs the model: eager or compiled."""
+        mode = self._data.get("backend", {}).get("pytorch", {}).get("mode", DEFAULT_PYTORCH_MODE)
+        return mode if mode in PYTORCH_MODES else DEFAULT_PYTORCH_MODE
+
+    @pytorch_mode.setter
+    def pytorch_mode(self, value: PytorchMode) -> None:
+        if value not in PYTORCH_MODES:
+            raise ValueError(f"PyTorch mode must be one of: {', '.join(PYTORCH_MODES)}")
+        self._data.setdefault("backend", {}).setdefault("pytorch", {})["mode"] = value
+
+    @property
+    def pytorch_cpu_dtype(self) -> PytorchCpuDtype:
+        """Weights of the PyTorch backend on CPU: float32, bfloat16 or int8."""
+        dtype = self._data.get("backend", {}).get("pytorch", {}).get("cpu_dtype", DEFAULT_PYTORCH_CPU_DTYPE)
+        return dtype if dtype in PYTORCH_CPU_DTYPES else DEFAULT_PYTORCH_CPU_DTYPE
+
+    @pytorch_cpu_dtype.setter
+    def pytorch_cpu_dtype(self, value: PytorchCpuDtype) -> None:
+        if value not in PYTORCH_CPU_DTYPES:
+            raise ValueError(f"PyTorch CPU dtype must be one of: {', '.join(PYTORCH_CPU_DTYPES)}")
+        self._data.setdefault("backend", {}).setdefault("pytorch", {})["cpu_dtype"] = value
+
+    @property
+    def pytorch_threads(self) -> int | None:
+        """Intra-op threads of the PyTorch backend on CPU (None = physical cores)."""
+        return self._data.get("backend", {}).get("pytorch", {}).get("threads")
+
+    @property
+    def pytorch_interop_threads(self) -> int | None:
+        """Inter-op threads of the PyTorch backend on CPU (None = 1)."""
+        return self._data.get("backend", {}).get("pytorch", {}).get("interop_threads")
+
+    @property
+    def pytorch_numa_node(self) -> int | None:
+        """NUMA node the PyTorch backend is pinned to on CPU (None = no pinning)."""
+        return self._data.get("backend", {}).get("pytorch", {}).get("numa_node")
+
+    @property
+    def fake_backend(self) -> dict:
+        """Latency model of the fake backend (token_latency, prefill_latency, ...)."""
+        return {**DEFAULT_FAKE_BACKEND, **(self._data.get("backend", {}).get("fake") or {})}
+
+    @fake_backend.setter
+    def fake_backend(self, value: dict) -> None:
+        unknown = set(value) - set(DEFAULT_FAKE_BACKEND)
+        if unknown:
+            raise ValueError(f"Unknown fake backend option(s): {', '.join(sorted(unknown))}")
+        if "backend" not in self._data:
+            self._data["backend"] = {}
+        self._data["backend"]["fake"] = {**(self._data["backend"].get("fake") or {}), **value}
 
     @property
     def languages(self) -> tuple[str, str]:
@@ -336,15 +464,14 @@ def max_tokens(self) -> int:
 
     @property
     def backend_type(self) -> BackendType:
-        """Backend type: auto, mlx, pytorch, gguf, vllm, or ollama."""
+        """Backend type: auto, mlx, pytorch, gguf, vllm, ollama, or fake."""
         backend = self._data.get("backend", {}).get("type", DEFAULT_BACKEND)
-        valid_backends = ("auto", "mlx", "pytorch", "gguf", "vllm", "ollama")
-        return backend if backend in valid_backends else DEFAULT_BACKEND
+        return backend if backend in BACKEND_TYPES else DEFAULT_BACKEND
 
     @backend_type.setter
     def backend_type(self, value: BackendType) -> None:
-        if value not in ("auto", "mlx", "pytorch", "gguf", "vllm", "ollama"):
-            raise ValueError("Backend must be 'auto', 'mlx', 'pytorch', 'gguf', 'vllm', or 'ollama'")
+        if value not in BACKEND_TYPES:
+            raise ValueError(f"Backend must be one of: {', '.join(BACKEND_TYPES)}")
         if "backend" not in self._data:
             self._data["backend"] = {}
         self._data["backend"]["type"] = value
@@ -451,6 +578,55 @@ def auto_chunk_threshold(self) -> int:
         """Auto-enable chunking for text longer than this."""
         return self._data.get("translation", {}).get("chunking", {}).get("auto_threshold", 500)
     
+    def tuned_chunking(self, model_size: str | None, lang_pair: str) -> dict | None:
+        """
+        Chunking settings recommended by `translate bench chunking` for a model and language pair.
+        
+        Args:
+            model_size: Model size (e.g. "27b")
+            lang_pair: Source and target code joined by "-" (e.g. "en-zh")
+        
+        Returns:
+            Dict with chunk_size, overlap and split_by, or None if not tuned
+        """
+        tuned = self._data.get("translation", {}).get("chunking", {}).get("tuned") or {}
+        return (tuned.get(model_size) or {}).get(lang_pair)
+    
+    def set_tuned_chunking(self, model_size: str, lang_pair: str, settings: dict) -> None:
+        """
+        Store tuned chunking settings for a model and language pair (call save() to persist).
+        
+        Raises:
+            ValueError: If settings lack a key or hold an invalid value
+        """
+        chunk_size, overlap, split_by = settings["chunk_size"], settings["overlap"], settings["split_by"]
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be between 0 and chunk_size")
+        if split_by not in ("sentence", "paragraph", "char"):
+            raise ValueError("split_by must be 'sentence', 'paragraph', or 'char'")
+        chunking = self._data.setdefault("translation", {}).setdefault("chunking", {})
+        tuned = chunking.setdefault("tuned", {}).setdefault(model_size, {})
+        tuned[lang_pair] = {"chunk_size": chunk_size, "overlap": overlap, "split_by": split_by}
+    
+    def max_chunk_size(self, model_size: str | None) -> int:
+        """Largest chunk size a model is used with: the default or any pair tuned for it."""
+        tuned = (self._data.get("translation", {}).get("chunking", {}).get("tuned") or {}).get(model_size) or {}
+        return max([self.chunk_size, *(settings["chunk_size"] for settings in tuned.values())])
+    
+    def chunking_for(self, model_size: str | None, source_lang: str, target_lang: str) -> tuple[int, int, str]:
+        """
+        Chunk size, overlap and split mode to use: tuned for the model and pair if available, else the defaults.
+        
+        Returns:
+            (chunk_size, overlap, split_by)
+        """
+        tuned = self.tuned_chunking(model_size, f"{source_lang}-{target_lang}")
+        if tuned:
+            return tuned["chunk_size"], tuned["overlap"], tuned["split_by"]
+        return self.chunk_size, self.chunk_overlap, self.chunk_split_by
+    
     # Generation parameters
     @property
     def temperature(self) -> float:
@@ -526,6 +702,23 @@ def repetition_penalty(self, value: float) -> None:
         if "generation" not in self._data["translation"]:
             self._data["translation"]["generation"] = {}
         self._data["translation"]["generation"]["repetition_penalty"] = value
+    
+    @property
+    def daemon_socket(self) -> Path:
+        """Unix socket the warm-model daemon listens on."""
+        path = self._data.get("daemon", {}).get("socket")
+        return Path(path).expanduser() if path else DEFAULT_CACHE_DIR / "daemon.sock"
+    
+    @property
+    def daemon_idle_timeout(self) -> float:
+        """Seconds without requests after which the daemon exits (0 = never)."""
+        return self._data.get("daemon", {}).get("idle_timeout", DEFAULT_DAEMON_IDLE_TIMEOUT)
+    
+    @daemon_idle_timeout.setter
+    def daemon_idle_timeout(self, value: float) -> None:
+        if value < 0:
+            raise ValueError("idle_timeout must be non-negative")
+        self._data.setdefault("daemon", {})["idle_timeout"] = value
 
 
 # Global config instance
@@ -544,3 +737,88 @@ def reset_config() -> None:
     """Reset the global configuration instance."""
     global _config
     _config = None
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationParams:
+    """
+    Sampling and length settings of one generation.
+
+    A copy of the config's generation settings taken once per request:
+    chunks read plain attributes instead of nested config lookups, and
+    a request keeps its settings while others change the config.
+    Instances are hashable, so generations can be grouped by settings.
+
+    Raises:
+        ValueError: If a setting is out of the range the config accepts
+    """
+
+    max_tokens: int = 512
+    temperature: float = 0.0
+    top_p: float = 1.0
+    top_k: int = 0
+    min_p: float = 0.0
+    repetition_penalty: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0.0 <= self.temperature <= 2.0:
+            raise ValueError("temperature must be between 0.0 and 2.0")
+        if not 0.0 <= self.top_p <= 1.0:
+            raise ValueError("top_p must be between 0.0 and 1.0")
+        if self.top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        if not 0.0 <= self.min_p <= 1.0:
+            raise ValueError("min_p must be between 0.0 and 1.0")
+        if self.repetition_penalty < 0.0:
+            raise ValueError("repetition_penalty must be non-negative")
+
+    def with_overrides(self, **overrides: float | int | None) -> GenerationParams:
+        """
+        Copy with some settings replaced, e.g. by one API request.
+
+        Args:
+            **overrides: Settings by field name; None keeps the current value
+
+        Raises:
+            TypeError: If a name is not a generation setting
+            ValueError: If a value is out of range
+        """
+        overrides = {name: value for name, value in overrides.items() if value is not None}
+        return replace(self, **overrides) if overrides else self
+
+    @classmethod
+    def from_config(cls, config: Config | None = None) -> GenerationParams:
+        """Snapshot the generation settings of config (default: the global config)."""
+        config = config or get_config()
+        return cls(
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            top_p=config.top_p,
+            top_k=config.top_k,
+            min_p=config.min_p,
+            repetition_penalty=config.repetition_penalty,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RequestContext:
+    """Settings one translation request reads, snapshotted when it starts."""
+
+    generation: GenerationParams
+    languages: tuple[str, str]
+
+    @classmethod
+    def from_config(cls, config: Config | None = None, **overrides: float | int | None) -> RequestContext:
+        """
+        Snapshot the request settings of config (default: the global config).
+
+        Args:
+            config: Config to read (default: the global config)
+            **overrides: Generation settings of this request replacing the
+                config's (see GenerationParams.with_overrides())
+        """
+        config = config or get_config()
+        generation = GenerationParams.from_config(config).with_overrides(**overrides)
+        return cls(generation=generation, languages=config.languages)
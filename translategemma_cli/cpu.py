@@ -0,0 +1,189 @@
+"""CPU tuning of the PyTorch backend: physical cores, NUMA pinning, threads and int8 weights.
+
+By default PyTorch runs one intra-op thread per logical CPU and the model
+is loaded in float32, 4 bytes per parameter. Hyper-threads share a core's
+vector units, so decoding is usually fastest with one thread per physical
+core; on multi-socket machines it also helps to keep the threads and the
+weights on one NUMA node. Loading in bfloat16 halves the weights, and int8
+dynamic quantization of the linear layers brings most of the model down to
+one byte per parameter (activations stay float32 and are quantized on the
+fly), which is what lets 27B fit in memory on CPU.
+
+Topology is read from sysfs on Linux; elsewhere every allowed CPU counts as
+a core and NUMA pinning is unavailable.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable
+
+# Where Linux describes CPU and NUMA topology
+_SYSFS = Path("/sys/devices/system")
+
+# Inter-op threads unless configured: generation runs one op graph at a time
+DEFAULT_INTEROP_THREADS = 1
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """
+    CPU numbers of a sysfs CPU list such as "0-3,8,10-11".
+
+    Raises:
+        ValueError: If the list is malformed
+    """
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def allowed_cpus() -> list[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def numa_nodes() -> dict[int, list[int]]:
+    """CPUs of each NUMA node, or {} where the topology is not available."""
+    nodes = {}
+    for path in sorted((_SYSFS / "node").glob("node[0-9]*/cpulist")):
+        try:
+            cpus = parse_cpu_list(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if cpus:
+            nodes[int(path.parent.name[len("node"):])] = cpus
+    return nodes
+
+
+def physical_cores(cpus: Iterable[int] | None = None) -> int:
+    """
+    Physical cores among cpus (default: the allowed CPUs).
+
+    Hyper-threads of one core share its (package, core) ID; CPUs without
+    topology information count as one core each.
+    """
+    cpus = list(cpus) if cpus is not None else allowed_cpus()
+    cores = set()
+    for cpu in cpus:
+        topology = _SYSFS / "cpu" / f"cpu{cpu}" / "topology"
+        try:
+            cores.add(((topology / "physical_package_id").read_text().strip(), (topology / "core_id").read_text().strip()))
+        except OSError:
+            cores.add(("cpu", str(cpu)))
+    return max(len(cores), 1)
+
+
+def pin_to_node(node: int) -> list[int]:
+    """
+    Pin every thread of this process to the CPUs of a NUMA node.
+
+    Memory is placed on the node of the thread that first touches it, so
+    weights loaded after pinning stay local to the threads using them.
+
+    Returns:
+        The node's CPUs
+
+    Raises:
+        ValueError: If the node does not exist or pinning is not supported here
+    """
+    nodes = numa_nodes()
+    if node not in nodes:
+        available = ", ".join(str(n) for n in nodes) or "none found"
+        raise ValueError(f"Unknown NUMA node {node} (available: {available})")
+    if not hasattr(os, "sched_setaffinity"):
+        raise ValueError("NUMA pinning is only supported on Linux")
+    cpus = nodes[node]
+    try:
+        threads = [int(tid) for tid in os.listdir("/proc/self/task")]
+    except OSError:
+        threads = [0]
+    for tid in threads:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except OSError:
+            # The thread exited meanwhile
+            pass
+    return cpus
+
+
+def tune_cpu(threads: int | None = None, interop_threads: int | None = None, numa_node: int | None = None) -> dict:
+    """
+    Apply the CPU settings of the PyTorch backend before a model is loaded.
+
+    Args:
+        threads: Intra-op threads (default: physical cores of the allowed,
+            or pinned, CPUs)
+        interop_threads: Inter-op threads (default: DEFAULT_INTEROP_THREADS);
+            torch accepts this once per process, before any parallel work,
+            so later loads keep the first value
+        numa_node: NUMA node to pin the process to (default: no pinning)
+
+    Returns:
+        The settings in effect (see thread_settings())
+
+    Raises:
+        ValueError: If a thread count is not positive or the NUMA node is unknown
+    """
+    import torch
+
+    if (threads is not None and threads < 1) or (interop_threads is not None and interop_threads < 1):
+        raise ValueError("Thread counts must be positive")
+    cpus = pin_to_node(numa_node) if numa_node is not None else allowed_cpus()
+    torch.set_num_threads(threads or physical_cores(cpus))
+    try:
+        torch.set_interop_threads(interop_threads or DEFAULT_INTEROP_THREADS)
+    except RuntimeError:
+        pass
+    return {**thread_settings(), "numa_node": numa_node}
+
+
+def thread_settings() -> dict:
+    """CPUs, physical cores and torch thread counts of this process; torch is never imported just to read them."""
+    cpus = allowed_cpus()
+    settings = {"cpus": len(cpus), "physical_cores": physical_cores(cpus), "threads": None, "interop_threads": None}
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        settings["threads"] = torch.get_num_threads()
+        settings["interop_threads"] = torch.get_num_interop_threads()
+    return settings
+
+
+def quantize_int8(model: Any) -> int:
+    """
+    Replace the linear layers of a model with int8 dynamic-quantized ones, in place.
+
+    Layers are converted one at a time (to float32, then int8), so memory
+    peaks at the loaded model plus one float32 layer. The output projection
+    is skipped when it shares its weights with the input embeddings. The
+    remaining modules (embeddings, norms) are converted to float32, the
+    input dtype of the quantized layers.
+
+    Returns:
+        Number of quantized layers
+    """
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    output = model.get_output_embeddings() if hasattr(model, "get_output_embeddings") else None
+    input_embeddings = model.get_input_embeddings() if hasattr(model, "get_input_embeddings") else None
+    tied = output is not None and input_embeddings is not None and output.weight is input_embeddings.weight
+
+    quantized = 0
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if not isinstance(child, torch.nn.Linear) or (tied and child is output):
+                continue
+            # quantize_dynamic swaps children, so the layer is wrapped to be swapped itself
+            wrapper = quantize_dynamic(torch.nn.Sequential(child.float()), {torch.nn.Linear}, dtype=torch.qint8)
+            setattr(parent, name, wrapper[0])
+            quantized += 1
+    model.float()
+    return quantized
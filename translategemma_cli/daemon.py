@@ -0,0 +1,502 @@
+"""Warm-model daemon: a resident Translator served over a Unix domain socket.
+
+`translate daemon start` loads the model once and keeps it in memory;
+single-shot `translate` calls find the socket and forward their text
+instead of loading the model themselves, so scripts that call `translate`
+in a loop pay for the load only once. The daemon exits after idle_timeout
+seconds without requests.
+
+Protocol: the client connects, sends one JSON request on one line and
+reads JSON lines until the connection closes.
+
+    {"op": "translate", "text": ..., "target_lang": ..., "model_size": ...,
+     "explain": false, "stream": false, "chunk_size": null, "overlap": null,
+     "no_chunk": false}
+        -> {"event": "token", "text": ...}   (stream only, repeated)
+        -> {"event": "done", "translation": ..., "stats": {...}}
+    {"op": "status"}    -> {"event": "status", "pid": ..., "model_size": ..., ...}
+    {"op": "shutdown"}  -> {"event": "stopping"}
+
+Any request can instead be answered with {"event": "error", "error": ...}.
+Translations are serialized: the daemon holds one model. Closing the
+connection cancels the translation in progress.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .cancellation import CancellationToken, TranslationCancelled
+from .stats import GenerationStats
+
+# Longest request line accepted, in bytes
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+# Errors raised when the client hangs up mid-response
+_DISCONNECTED = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+# How often the hang-up watcher checks whether the request has finished
+_WATCH_INTERVAL = 0.1
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error."""
+
+
+def daemon_supported() -> bool:
+    """Whether this platform has Unix domain socket servers."""
+    return hasattr(socket, "AF_UNIX") and hasattr(socketserver, "ThreadingUnixStreamServer")
+
+
+def default_socket_path() -> Path:
+    """Socket path from the config (daemon.socket), by default in the cache directory."""
+    from .config import get_config
+
+    return get_config().daemon_socket
+
+
+def _stats_to_wire(stats: GenerationStats | None) -> dict | None:
+    if stats is None:
+        return None
+    return {
+        "prompt_tokens": stats.prompt_tokens,
+        "completion_tokens": stats.completion_tokens,
+        "ttft": stats.ttft,
+        "total_time": stats.total_time,
+        "stop_reason": stats.stop_reason,
+    }
+
+
+def _stats_from_wire(data: dict | None) -> GenerationStats | None:
+    if not data:
+        return None
+    return GenerationStats(
+        prompt_tokens=data.get("prompt_tokens"),
+        completion_tokens=data.get("completion_tokens"),
+        ttft=data.get("ttft"),
+        total_time=data.get("total_time") or 0.0,
+        stop_reason=data.get("stop_reason"),
+    )
+
+
+class TranslationDaemon:
+    """
+    Serves a Translator on a Unix domain socket.
+
+    The model is loaded by the caller (or on the first request); the daemon
+    only keeps it resident. Each connection is handled on its own thread so
+    status and shutdown requests are answered during long translations,
+    while translations themselves run one at a time.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path | str | None = None,
+        idle_timeout: float | None = None,
+        translator=None,
+        model_size: str | None = None,
+    ):
+        """
+        Initialize daemon.
+
+        Args:
+            socket_path: Socket to listen on (default: default_socket_path())
+            idle_timeout: Seconds without requests before exiting; 0 or None
+                never exits (default: config daemon.idle_timeout)
+            translator: Translator to serve (default: the shared translator)
+            model_size: Model served to requests that name none (default:
+                the translator's loaded model, else the first one loaded)
+        """
+        from .config import get_config
+        from .translator import get_translator
+
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.idle_timeout = get_config().daemon_idle_timeout if idle_timeout is None else idle_timeout
+        self.translator = translator or get_translator()
+        # Forwarded CLI calls without --model send no size: they get this model,
+        # not the config default the daemon may not have been started with
+        self.model_size = model_size or self.translator.current_model_size
+        self.requests = 0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._last_activity = time.monotonic()
+        self._stopped = threading.Event()
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def bind(self) -> None:
+        """
+        Create the socket, replacing a stale one left by a crashed daemon.
+
+        Raises:
+            RuntimeError: If Unix sockets are unsupported or a daemon is
+                already listening on socket_path
+        """
+        if not daemon_supported():
+            raise RuntimeError("The daemon needs Unix domain sockets, which this platform lacks")
+        if self.socket_path.exists():
+            if is_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _make_handler(self))
+        self._server.daemon_threads = True
+        # Only the owner may talk to the daemon
+        os.chmod(self.socket_path, 0o600)
+
+    def serve_forever(self) -> None:
+        """Serve until shutdown is requested or the daemon has been idle for idle_timeout."""
+        if self._server is None:
+            self.bind()
+        watcher = threading.Thread(target=self._watch_idle, name="daemon-idle", daemon=True)
+        watcher.start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            self._server = None
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def start(self) -> TranslationDaemon:
+        """Bind and serve on a background thread."""
+        self.bind()
+        self._thread = threading.Thread(target=self.serve_forever, name="translate-daemon", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and remove the socket."""
+        server = self._server
+        if server is not None:
+            server.shutdown()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> TranslationDaemon:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def status(self) -> dict:
+        """What the daemon is serving, for `translate daemon status`."""
+        return {
+            "pid": os.getpid(),
+            "socket": str(self.socket_path),
+            "model_size": self.translator.current_model_size,
+            "backend": self.translator.backend,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "idle_s": round(time.monotonic() - self._last_activity, 1),
+            "idle_timeout": self.idle_timeout,
+            "requests": self.requests,
+            "busy": self._active > 0,
+        }
+
+    def translate(self, request: dict, emit: Callable[[dict], None], cancel_token: CancellationToken) -> dict:
+        """
+        Translate one request the way a single-shot CLI call would.
+
+        Returns:
+            The "done" event
+        """
+        from .translator import should_chunk
+
+        text = request.get("text")
+        if not isinstance(text, str) or not text:
+            raise ValueError("text is required")
+        force_target = request.get("target_lang")
+        mode = "explain" if request.get("explain") else "direct"
+        chunk_size = request.get("chunk_size")
+        overlap = request.get("overlap")
+
+        with self._lock:
+            translator = self.translator
+            translator.ensure_model_loaded(request.get("model_size") or self.model_size)
+            self.model_size = self.model_size or translator.current_model_size
+            if should_chunk(text, chunk_size, overlap, bool(request.get("no_chunk"))):
+                if request.get("stream"):
+                    parts = []
+                    for item in translator.translate_long(
+                        text,
+                        force_target=force_target,
+                        mode=mode,
+                        chunk_size=chunk_size,
+                        overlap=overlap,
+                        stream=True,
+                        cancel_token=cancel_token,
+                    ):
+                        token = item[0] if isinstance(item, tuple) else item
+                        emit({"event": "token", "text": token})
+                        parts.append(token)
+                    translation = "".join(parts)
+                else:
+                    translation = translator.translate_long(
+                        text,
+                        force_target=force_target,
+                        mode=mode,
+                        chunk_size=chunk_size,
+                        overlap=overlap,
+                        stream=False,
+                        cancel_token=cancel_token,
+                    )
+            else:
+                translation, _, _ = translator.translate(text, force_target, mode, cancel_token=cancel_token)
+            stats = translator.last_stats
+        return {"event": "done", "translation": translation, "stats": _stats_to_wire(stats)}
+
+    def handle(
+        self,
+        request: dict,
+        emit: Callable[[dict], None],
+        connection: socket.socket | None = None,
+    ) -> None:
+        """
+        Answer one request, emitting its events.
+
+        Args:
+            request: Decoded request object
+            emit: Writes one event to the client
+            connection: Client socket; translations are cancelled when it
+                reaches EOF, so a hang-up stops generation instead of being
+                noticed only when the result is written
+        """
+        op = request.get("op")
+        if op == "status":
+            emit({"event": "status", **self.status()})
+        elif op == "shutdown":
+            emit({"event": "stopping"})
+            # Stop from another thread so this answer is written and the connection closed first
+            threading.Thread(target=self.stop, daemon=True).start()
+        elif op == "translate":
+            self._begin()
+            token = CancellationToken()
+            finished = threading.Event()
+            watcher = None
+            if connection is not None:
+                watcher = threading.Thread(
+                    target=_watch_hangup, args=(connection, token, finished), name="daemon-hangup", daemon=True
+                )
+                watcher.start()
+            try:
+                def send(event: dict) -> None:
+                    try:
+                        emit(event)
+                    except _DISCONNECTED:
+                        token.cancel("client disconnected")
+                        raise
+
+                send(self.translate(request, send, token))
+            except _DISCONNECTED:
+                pass
+            except TranslationCancelled:
+                pass
+            finally:
+                finished.set()
+                if watcher is not None:
+                    # The socket is closed after this returns: stop polling it first
+                    watcher.join()
+                self._end()
+        else:
+            emit({"event": "error", "error": f"Unknown op: {op}"})
+
+    def _begin(self) -> None:
+        with self._active_lock:
+            self._active += 1
+            self.requests += 1
+            self._last_activity = time.monotonic()
+
+    def _end(self) -> None:
+        with self._active_lock:
+            self._active -= 1
+            self._last_activity = time.monotonic()
+
+    def _watch_idle(self) -> None:
+        while not self._stopped.wait(1.0):
+            if not self.idle_timeout or self._active:
+                continue
+            if time.monotonic() - self._last_activity >= self.idle_timeout:
+                self.stop()
+                return
+
+
+def _watch_hangup(connection: socket.socket, token: CancellationToken, finished: threading.Event) -> None:
+    """Cancel token when the client closes its end before the request has finished."""
+    while not finished.is_set():
+        try:
+            readable, _, _ = select.select([connection], [], [], _WATCH_INTERVAL)
+            if not readable:
+                continue
+            # Clients send nothing after the request line; anything else is ignored
+            if connection.recv(4096):
+                continue
+        except (OSError, ValueError):
+            pass
+        token.cancel("client disconnected")
+        return
+
+
+def _make_handler(daemon: TranslationDaemon) -> type[socketserver.StreamRequestHandler]:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            def emit(event: dict) -> None:
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line.strip():
+                return  # is_running() probes connect and hang up
+            try:
+                try:
+                    if len(line) > MAX_REQUEST_BYTES:
+                        raise ValueError("request too large")
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    emit({"event": "error", "error": f"Bad request: {e}"})
+                    return
+                try:
+                    daemon.handle(request, emit, self.connection)
+                except _DISCONNECTED:
+                    raise
+                except Exception as e:
+                    emit({"event": "error", "error": str(e) or type(e).__name__})
+            except _DISCONNECTED:
+                pass
+
+    return Handler
+
+
+def _connect(socket_path: Path, timeout: float | None) -> socket.socket:
+    if not daemon_supported():
+        raise DaemonUnavailable("Unix domain sockets are not supported on this platform")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+    except OSError as e:
+        sock.close()
+        raise DaemonUnavailable(f"No daemon on {socket_path}: {e}") from None
+    return sock
+
+
+def request(payload: dict, socket_path: Path | str | None = None, timeout: float | None = None) -> Iterator[dict]:
+    """
+    Send one request and yield the daemon's events.
+
+    Args:
+        payload: Request object (see the module docstring)
+        socket_path: Daemon socket (default: default_socket_path())
+        timeout: Socket timeout in seconds (default: none; translations can be long)
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+        DaemonError: If the daemon answers with an error event
+    """
+    path = Path(socket_path) if socket_path else default_socket_path()
+    sock = _connect(path, timeout)
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        stream.flush()
+        for line in stream:
+            event = json.loads(line)
+            if event.get("event") == "error":
+                raise DaemonError(event.get("error", "unknown error"))
+            yield event
+
+
+def is_running(socket_path: Path | str | None = None) -> bool:
+    """Whether a daemon accepts connections on the socket."""
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return False
+    try:
+        _connect(path, timeout=1.0).close()
+    except DaemonUnavailable:
+        return False
+    return True
+
+
+def status(socket_path: Path | str | None = None) -> dict:
+    """
+    Status of the running daemon.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+    """
+    for event in request({"op": "status"}, socket_path, timeout=5.0):
+        return event
+    raise DaemonError("No status received")
+
+
+def shutdown(socket_path: Path | str | None = None) -> None:
+    """
+    Ask the running daemon to exit.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+    """
+    for _ in request({"op": "shutdown"}, socket_path, timeout=5.0):
+        pass
+
+
+def translate(
+    text: str,
+    target_lang: str | None = None,
+    model_size: str | None = None,
+    explain: bool = False,
+    stream: bool = False,
+    chunk_size: int | None = None,
+    overlap: int | None = None,
+    no_chunk: bool = False,
+    on_token: Callable[[str], None] | None = None,
+    socket_path: Path | str | None = None,
+) -> tuple[str, GenerationStats | None]:
+    """
+    Translate through the running daemon.
+
+    Arguments mirror the single-shot CLI; on_token receives streamed tokens.
+
+    Returns:
+        Tuple of (translation, stats of the generation)
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+        DaemonError: If the translation failed in the daemon
+    """
+    payload = {
+        "op": "translate",
+        "text": text,
+        "target_lang": target_lang,
+        "model_size": model_size,
+        "explain": explain,
+        "stream": stream,
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "no_chunk": no_chunk,
+    }
+    for event in request(payload, socket_path):
+        if event.get("event") == "token" and on_token:
+            on_token(event["text"])
+        elif event.get("event") == "done":
+            return event["translation"], _stats_from_wire(event.get("stats"))
+    raise DaemonError("The daemon closed the connection before finishing")
@@ -0,0 +1,320 @@
+"""Parallel, resumable, checksum-verified file downloads.
+
+A file is split into parts that are fetched over several connections with
+HTTP range requests and written in place into `<name>.part`. Finished parts
+are recorded in a `<name>.part.json` sidecar, so an interrupted download
+resumes with the missing parts only. The complete file is checked against
+the SHA-256 the hub publishes for it (the LFS object id) before it replaces
+the destination; on a mismatch the partial file is deleted.
+
+Servers without range support get a single stream that restarts from zero.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from http.client import HTTPException
+from pathlib import Path
+from typing import Callable
+from urllib.error import URLError
+from urllib.parse import urlparse
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+from .config import DEFAULT_DOWNLOAD_CONNECTIONS
+
+# Bytes fetched per range request; also the unit of resume
+PART_SIZE = 64 * 1024 * 1024
+
+# Bytes read from a response and written at a time
+BLOCK_SIZE = 1024 * 1024
+
+# Attempts per part before the download fails; each retry continues where the last stopped
+RETRIES = 3
+
+# Seconds without data before a connection is retried
+TIMEOUT = 30.0
+
+
+class DownloadError(RuntimeError):
+    """A download failed or its checksum did not match."""
+
+
+@dataclass
+class RemoteFile:
+    """
+    A file to download.
+
+    size and sha256 come from the hub metadata when known; the server's
+    reported size is checked against size, and the finished file against
+    sha256. headers are sent to the first host only, not across redirects.
+    """
+
+    url: str
+    size: int | None = None
+    sha256: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def hub_file(repo_id: str, filename: str, revision: str | None = None) -> RemoteFile:
+    """
+    Download URL, size and SHA-256 of a file in a Hugging Face repo.
+
+    Honours HF_ENDPOINT and the saved token like huggingface_hub does.
+
+    Raises:
+        DownloadError: If the file is not in the repo
+    """
+    from huggingface_hub import HfApi, hf_hub_url
+    from huggingface_hub.utils import build_hf_headers
+
+    infos = HfApi().get_paths_info(repo_id, [filename], revision=revision)
+    info = next((item for item in infos if getattr(item, "path", None) == filename), None)
+    if info is None:
+        raise DownloadError(f"{filename} not found in {repo_id}")
+    lfs = getattr(info, "lfs", None)
+    return RemoteFile(
+        url=hf_hub_url(repo_id, filename, revision=revision),
+        size=getattr(info, "size", None),
+        sha256=lfs.sha256 if lfs is not None else None,
+        headers=build_hf_headers(),
+    )
+
+
+def sha256_file(path: Path | str, block_size: int = 8 * 1024 * 1024) -> str:
+    """Hex SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _RedirectHandler(HTTPRedirectHandler):
+    # The hub redirects to a CDN with signed URLs that reject the hub token
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        new = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if new is not None and urlparse(newurl).netloc != urlparse(req.full_url).netloc:
+            new.remove_header("Authorization")
+        return new
+
+
+_opener = build_opener(_RedirectHandler)
+
+
+def _open(remote: RemoteFile, start: int | None = None, end: int | None = None):
+    headers = dict(remote.headers)
+    if start is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+    return _opener.open(Request(remote.url, headers=headers), timeout=TIMEOUT)
+
+
+def _probe(remote: RemoteFile) -> tuple[int | None, bool]:
+    """Size of the remote file and whether the server serves ranges."""
+    with _open(remote, 0, 1) as response:
+        content_range = response.headers.get("Content-Range", "")
+        if response.status == 206 and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            return (int(total) if total.isdigit() else None), total.isdigit()
+        length = response.headers.get("Content-Length")
+        return (int(length) if length and length.isdigit() else None), False
+
+
+class _Parts:
+    """Finished parts of a download, persisted next to the partial file."""
+
+    def __init__(self, path: Path, identity: dict):
+        self.path = path
+        self.identity = identity
+        self.done: set[int] = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if all(state.get(key) == value for key, value in self.identity.items()):
+            self.done = set(state.get("done", []))
+
+    def finish(self, start: int) -> None:
+        with self._lock:
+            self.done.add(start)
+            state = {**self.identity, "done": sorted(self.done)}
+            temp = self.path.with_name(self.path.name + ".tmp")
+            temp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(temp, self.path)
+
+    def clear(self) -> None:
+        self.done.clear()
+        self.path.unlink(missing_ok=True)
+
+
+def download_file(
+    remote: RemoteFile,
+    dest: Path | str,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    part_size: int = PART_SIZE,
+    on_progress: Callable[[int], None] | None = None,
+    on_verify: Callable[[], None] | None = None,
+    stop: threading.Event | None = None,
+) -> Path:
+    """
+    Download remote to dest, resuming a previous partial download.
+
+    Args:
+        remote: What to download
+        dest: Destination path; replaced only once the file is complete and verified
+        connections: Parallel range requests
+        part_size: Bytes per range request
+        on_progress: Called with each number of bytes written (including
+            bytes already present when resuming); may be called from worker threads
+        on_verify: Called before the checksum is computed
+        stop: Set to abandon the download, keeping finished parts for resume
+
+    Returns:
+        dest
+
+    Raises:
+        DownloadError: If the download fails, the server's size disagrees
+            with the metadata, or the checksum does not match
+    """
+    dest = Path(dest)
+    partial = dest.with_name(dest.name + ".part")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        size, ranged = _probe(remote)
+    except (URLError, OSError, HTTPException) as e:
+        raise DownloadError(f"Cannot reach {remote.url}: {e}") from e
+    if remote.size is not None and size is not None and size != remote.size:
+        raise DownloadError(f"Server reports {size} bytes, metadata says {remote.size}")
+    size = size if size is not None else remote.size
+
+    parts = _Parts(
+        dest.with_name(dest.name + ".part.json"),
+        {"url": remote.url if remote.sha256 is None else None, "sha256": remote.sha256, "size": size, "part_size": part_size},
+    )
+    if ranged and size:
+        parts.load()
+        if not partial.exists() or partial.stat().st_size != size:
+            parts.clear()
+            with open(partial, "wb") as f:
+                f.truncate(size)
+        _fetch_parts(remote, partial, size, part_size, connections, parts, on_progress, stop or threading.Event())
+    else:
+        parts.clear()
+        _fetch_stream(remote, partial, on_progress, stop or threading.Event())
+
+    actual = partial.stat().st_size
+    if size is not None and actual != size:
+        raise DownloadError(f"Downloaded {actual} bytes, expected {size}")
+    if remote.sha256:
+        if on_verify is not None:
+            on_verify()
+        digest = sha256_file(partial)
+        if digest != remote.sha256.lower():
+            partial.unlink(missing_ok=True)
+            parts.clear()
+            raise DownloadError(f"Checksum mismatch for {dest.name}: got {digest}, expected {remote.sha256}")
+    os.replace(partial, dest)
+    parts.clear()
+    return dest
+
+
+def _fetch_parts(
+    remote: RemoteFile,
+    partial: Path,
+    size: int,
+    part_size: int,
+    connections: int,
+    parts: _Parts,
+    on_progress: Callable[[int], None] | None,
+    stop: threading.Event,
+) -> None:
+    ranges = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+    pending = [(start, end) for start, end in ranges if start not in parts.done]
+    if on_progress is not None and len(pending) < len(ranges):
+        on_progress(sum(end - start for start, end in ranges if start in parts.done))
+
+    # Set when this download ends, so a failed part stops its siblings
+    # without touching the caller's stop event
+    halt = threading.Event()
+
+    def stopped() -> bool:
+        return halt.is_set() or stop.is_set()
+
+    def fetch(start: int, end: int) -> int:
+        try:
+            _fetch_range(remote, partial, start, end, stopped, on_progress)
+        except BaseException:
+            # Halt here rather than in the caller, which may wake up only
+            # after a free worker has already picked up the next part
+            halt.set()
+            raise
+        parts.finish(start)
+        return start
+
+    pool = ThreadPoolExecutor(max(1, min(connections, len(pending))), thread_name_prefix="download")
+    futures = [pool.submit(fetch, start, end) for start, end in pending]
+    try:
+        for future in as_completed(futures):
+            future.result()
+    finally:
+        # On failure or Ctrl-C running parts stop and queued ones never
+        # connect; finished ones are kept for resume
+        halt.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _fetch_range(
+    remote: RemoteFile,
+    partial: Path,
+    start: int,
+    end: int,
+    stopped: Callable[[], bool],
+    on_progress: Callable[[int], None] | None,
+) -> None:
+    position = start
+    error: Exception | None = None
+    with open(partial, "r+b") as f:
+        for _ in range(RETRIES):
+            if stopped():
+                raise DownloadError("Download stopped")
+            try:
+                with _open(remote, position, end) as response:
+                    if response.status != 206:
+                        raise DownloadError(f"Server ignored the range request (HTTP {response.status})")
+                    f.seek(position)
+                    while position < end:
+                        if stopped():
+                            raise DownloadError("Download stopped")
+                        block = response.read(min(BLOCK_SIZE, end - position))
+                        if not block:
+                            break
+                        f.write(block)
+                        position += len(block)
+                        if on_progress is not None:
+                            on_progress(len(block))
+                if position >= end:
+                    return
+                error = DownloadError(f"Connection closed at byte {position}")
+            except (URLError, OSError, HTTPException) as e:
+                error = e
+    raise DownloadError(f"Bytes {start}-{end - 1} failed after {RETRIES} attempts: {error}")
+
+
+def _fetch_stream(remote: RemoteFile, partial: Path, on_progress: Callable[[int], None] | None, stop: threading.Event) -> None:
+    try:
+        with _open(remote) as response, open(partial, "wb") as f:
+            while block := response.read(BLOCK_SIZE):
+                if stop.is_set():
+                    raise DownloadError("Download stopped")
+                f.write(block)
+                if on_progress is not None:
+                    on_progress(len(block))
+    except (URLError, OSError, HTTPException) as e:
+        raise DownloadError(f"Download of {remote.url} failed: {e}") from e
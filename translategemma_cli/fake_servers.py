@@ -0,0 +1,311 @@
+"""Local fake OpenAI-compatible (vLLM) and Ollama-compatible HTTP servers, and a static file server.
+
+The inference servers serve FakeBackend generations over the same wire
+formats as the real servers, so VLLMBackend and OllamaBackend (and the
+whole app on top of them) can be exercised without a GPU or network
+access. FakeFileServer stands in for the hub's file downloads.
+
+Usage:
+    with FakeOpenAIServer(FakeBackend(token_latency=0.01)) as server:
+        backend = VLLMBackend(server_url=server.url)
+        backend.generate([{"role": "user", "content": "Hello"}])
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+from .backends import FakeBackend
+from .stats import GenerationStats
+
+# Errors raised when the client hangs up mid-response
+_DISCONNECTED = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class FakeServer:
+    """
+    Runs a fake inference server on a background thread.
+
+    Subclasses implement handle_get() and handle_post(). Every request
+    body is kept in requests for assertions.
+    """
+
+    def __init__(self, backend: FakeBackend | None = None, model: str = "translategemma", host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize server.
+
+        Args:
+            backend: Generates the responses (default: zero-latency FakeBackend)
+            model: Model name the server reports
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        self.backend = backend or FakeBackend()
+        self.model = model
+        self.requests: list[dict] = []
+        self.disconnects = 0
+        self._address = (host, port)
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._httpd is None:
+            raise RuntimeError("Server is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeServer:
+        """Start serving in a daemon thread."""
+        self._httpd = ThreadingHTTPServer(self._address, _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._httpd = None
+
+    def __enter__(self) -> FakeServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle_get(self, request: BaseHTTPRequestHandler) -> None:
+        """Serve a GET request."""
+        _send_json(request, {"error": "not found"}, status=404)
+
+    def handle_post(self, request: BaseHTTPRequestHandler, payload: dict) -> None:
+        """Serve a POST request with a parsed JSON body."""
+        _send_json(request, {"error": "not found"}, status=404)
+
+    def _stream(self, request: BaseHTTPRequestHandler, content_type: str, lines: Iterator[bytes]) -> None:
+        """Write lines as they are produced; stop generating if the client hangs up."""
+        request.send_response(200)
+        request.send_header("Content-Type", content_type)
+        request.end_headers()
+        try:
+            for line in lines:
+                request.wfile.write(line)
+                request.wfile.flush()
+        except _DISCONNECTED:
+            self.disconnects += 1
+        finally:
+            lines.close()
+
+
+class FakeOpenAIServer(FakeServer):
+    """Serves /v1/models and /v1/chat/completions like vLLM."""
+
+    def handle_get(self, request: BaseHTTPRequestHandler) -> None:
+        if request.path == "/v1/models":
+            _send_json(request, {"object": "list", "data": [{"id": self.model, "object": "model"}]})
+        else:
+            super().handle_get(request)
+
+    def handle_post(self, request: BaseHTTPRequestHandler, payload: dict) -> None:
+        if request.path != "/v1/chat/completions":
+            super().handle_post(request, payload)
+            return
+        messages = payload.get("messages", [])
+        max_tokens = payload.get("max_tokens", 512)
+        if payload.get("stream"):
+            usage = (payload.get("stream_options") or {}).get("include_usage", False)
+            self._stream(request, "text/event-stream", self._events(messages, max_tokens, usage))
+            return
+        stats = GenerationStats()
+        text = self.backend.generate(messages, max_tokens, stats=stats)
+        _send_json(request, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": stats.stop_reason}],
+            "usage": _usage(stats),
+        })
+
+    def _events(self, messages: list[dict], max_tokens: int, usage: bool) -> Iterator[bytes]:
+        stats = GenerationStats()
+        tokens = self.backend.generate_stream(messages, max_tokens, stats=stats)
+        try:
+            for token in tokens:
+                yield self._chunk({"delta": {"content": token}, "finish_reason": None})
+            yield self._chunk({"delta": {}, "finish_reason": stats.stop_reason})
+            if usage:
+                yield _sse({"id": "chatcmpl-fake", "object": "chat.completion.chunk", "model": self.model, "choices": [], "usage": _usage(stats)})
+            yield b"data: [DONE]\n\n"
+        finally:
+            tokens.close()
+
+    def _chunk(self, choice: dict) -> bytes:
+        return _sse({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "model": self.model,
+            "choices": [{"index": 0, **choice}],
+        })
+
+
+class FakeOllamaServer(FakeServer):
+    """Serves /api/tags, /api/chat and /api/pull like Ollama."""
+
+    def __init__(self, backend: FakeBackend | None = None, model: str = "translategemma:27b", host: str = "127.0.0.1", port: int = 0):
+        super().__init__(backend, model, host, port)
+
+    def handle_get(self, request: BaseHTTPRequestHandler) -> None:
+        if request.path == "/api/tags":
+            _send_json(request, {"models": [{"name": self.model, "model": self.model}]})
+        else:
+            super().handle_get(request)
+
+    def handle_post(self, request: BaseHTTPRequestHandler, payload: dict) -> None:
+        if request.path == "/api/pull":
+            self._stream(request, "application/x-ndjson", self._pull())
+            return
+        if request.path != "/api/chat":
+            super().handle_post(request, payload)
+            return
+        messages = payload.get("messages", [])
+        max_tokens = (payload.get("options") or {}).get("num_predict", 512)
+        if payload.get("stream", True):
+            self._stream(request, "application/x-ndjson", self._lines(messages, max_tokens))
+            return
+        stats = GenerationStats()
+        text = self.backend.generate(messages, max_tokens, stats=stats)
+        _send_json(request, {
+            "model": self.model,
+            "message": {"role": "assistant", "content": text},
+            **self._final(stats),
+        })
+
+    def _lines(self, messages: list[dict], max_tokens: int) -> Iterator[bytes]:
+        stats = GenerationStats()
+        tokens = self.backend.generate_stream(messages, max_tokens, stats=stats)
+        try:
+            for token in tokens:
+                yield _ndjson({"model": self.model, "message": {"role": "assistant", "content": token}, "done": False})
+            yield _ndjson({"model": self.model, "message": {"role": "assistant", "content": ""}, **self._final(stats)})
+        finally:
+            tokens.close()
+
+    @staticmethod
+    def _pull() -> Iterator[bytes]:
+        yield _ndjson({"status": "pulling manifest"})
+        yield _ndjson({"status": "pulling model", "completed": 1, "total": 1})
+        yield _ndjson({"status": "success"})
+
+    @staticmethod
+    def _final(stats: GenerationStats) -> dict:
+        return {
+            "done": True,
+            "done_reason": stats.stop_reason,
+            "prompt_eval_count": stats.prompt_tokens,
+            "eval_count": stats.completion_tokens or 0,
+        }
+
+
+class FakeFileServer(FakeServer):
+    """
+    Serves static files with HTTP range requests, like the hub's file CDN.
+
+    Each GET is recorded in requests with its Range header. With ranges=False
+    the Range header is ignored; cut_after makes the next failures responses
+    hang up after that many bytes, to exercise retries and resume.
+    """
+
+    def __init__(self, files: dict[str, bytes], ranges: bool = True, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host=host, port=port)
+        self.files = files
+        self.ranges = ranges
+        self.cut_after: int | None = None
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def handle_get(self, request: BaseHTTPRequestHandler) -> None:
+        data = self.files.get(request.path)
+        if data is None:
+            super().handle_get(request)
+            return
+        header = request.headers.get("Range")
+        self.requests.append({"path": request.path, "range": header})
+        start, end = 0, len(data)
+        partial = self.ranges and header is not None and header.startswith("bytes=")
+        if partial:
+            first, _, last = header[len("bytes="):].partition("-")
+            start = int(first)
+            end = min(int(last) + 1, len(data)) if last else len(data)
+        body = data[start:end]
+        request.send_response(206 if partial else 200)
+        request.send_header("Content-Length", str(len(body)))
+        if self.ranges:
+            request.send_header("Accept-Ranges", "bytes")
+        if partial:
+            request.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(data)}")
+        request.end_headers()
+        with self._lock:
+            cut = self.cut_after if self.failures > 0 and len(body) > 1 else None
+            if cut is not None:
+                self.failures -= 1
+        try:
+            request.wfile.write(body[:cut] if cut is not None else body)
+        except _DISCONNECTED:
+            self.disconnects += 1
+        if cut is not None:
+            request.close_connection = True
+
+
+def _make_handler(server: FakeServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            server.handle_get(self)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                _send_json(self, {"error": "invalid JSON"}, status=400)
+                return
+            server.requests.append({"path": self.path, **payload})
+            server.handle_post(self, payload)
+
+        def log_message(self, format: str, *args) -> None:
+            # Keep test output quiet
+            pass
+
+    return Handler
+
+
+def _send_json(request: BaseHTTPRequestHandler, data: dict, status: int = 200) -> None:
+    body = json.dumps(data).encode("utf-8")
+    request.send_response(status)
+    request.send_header("Content-Type", "application/json")
+    request.send_header("Content-Length", str(len(body)))
+    request.end_headers()
+    request.wfile.write(body)
+
+
+def _usage(stats: GenerationStats) -> dict:
+    prompt = stats.prompt_tokens or 0
+    completion = stats.completion_tokens or 0
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def _sse(data: dict) -> bytes:
+    return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _ndjson(data: dict) -> bytes:
+    return (json.dumps(data) + "\n").encode("utf-8")
@@ -0,0 +1,124 @@
+"""When to unload an idle model, learned from how often requests arrive."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+# Gaps between requests kept to estimate the arrival pattern
+ARRIVAL_SAMPLES = 64
+
+# Gaps needed before the policy trusts its estimate
+MIN_SAMPLES = 4
+
+# Share of recent gaps the model should stay loaded across
+GAP_QUANTILE = 0.9
+
+# Slack on top of the quantile gap, so the next request finds the model warm
+GAP_MARGIN = 1.5
+
+# Assumed load time until a load has been measured (seconds)
+DEFAULT_LOAD_SECONDS = 30.0
+
+
+def quantile(values: list[float], q: float) -> float:
+    """The q-quantile of values by linear interpolation (0.0 for none)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class AdaptiveIdlePolicy:
+    """
+    Idle timeout for a resident model, derived from request inter-arrival gaps.
+
+    Unloading frees memory but the next request pays a full load, so the
+    model stays loaded across the gaps requests usually leave: the
+    GAP_QUANTILE of recent gaps plus GAP_MARGIN. When traffic is too sparse
+    for that to fit under max_idle, most requests would find the model cold
+    anyway; the policy then keeps it only as long as a reload takes (the
+    break-even point of renting versus reloading), at least min_idle.
+    Until MIN_SAMPLES gaps are seen the timeout is initial.
+    """
+
+    def __init__(
+        self,
+        min_idle: float = 30.0,
+        max_idle: float = 1800.0,
+        initial: float | None = None,
+        samples: int = ARRIVAL_SAMPLES,
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            min_idle: Shortest timeout in seconds
+            max_idle: Longest timeout in seconds
+            initial: Timeout before enough gaps are seen (default: max_idle)
+            samples: Number of recent gaps to learn from
+
+        Raises:
+            ValueError: If the bounds are negative or min_idle exceeds max_idle
+        """
+        if min_idle < 0 or max_idle < min_idle:
+            raise ValueError("Idle bounds must satisfy 0 <= min_idle <= max_idle")
+        self.min_idle = min_idle
+        self.max_idle = max_idle
+        self.initial = max_idle if initial is None else initial
+        self._gaps: deque[float] = deque(maxlen=samples)
+        self._last_arrival: float | None = None
+        self._load_seconds: float | None = None
+        self._lock = threading.Lock()
+
+    def record_arrival(self, now: float | None = None) -> None:
+        """Note a request; the gap since the previous one is learned."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._last_arrival is not None:
+                self._gaps.append(max(0.0, now - self._last_arrival))
+            self._last_arrival = now
+
+    def record_load(self, seconds: float) -> None:
+        """Note how long a model load took (smoothed over loads)."""
+        with self._lock:
+            if self._load_seconds is None:
+                self._load_seconds = seconds
+            else:
+                self._load_seconds = 0.7 * self._load_seconds + 0.3 * seconds
+
+    @property
+    def load_seconds(self) -> float:
+        """Measured load time, or DEFAULT_LOAD_SECONDS before the first load."""
+        return DEFAULT_LOAD_SECONDS if self._load_seconds is None else self._load_seconds
+
+    def timeout(self) -> float:
+        """Seconds an idle model should stay loaded."""
+        with self._lock:
+            gaps = list(self._gaps)
+        if len(gaps) < MIN_SAMPLES:
+            return self._clamp(self.initial)
+        keep = quantile(gaps, GAP_QUANTILE) * GAP_MARGIN
+        if keep > self.max_idle:
+            keep = self.load_seconds
+        return self._clamp(keep)
+
+    def stats(self) -> dict:
+        """Current timeout and what it was learned from."""
+        with self._lock:
+            gaps = list(self._gaps)
+        return {
+            "policy": "adaptive",
+            "timeout_s": round(self.timeout(), 1),
+            "samples": len(gaps),
+            "median_gap_s": round(quantile(gaps, 0.5), 1) if gaps else None,
+            "p90_gap_s": round(quantile(gaps, GAP_QUANTILE), 1) if gaps else None,
+            "load_s": round(self.load_seconds, 1),
+        }
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_idle, max(self.min_idle, seconds))
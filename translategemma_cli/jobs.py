@@ -0,0 +1,397 @@
+"""Persistent job queue for long-running translations."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .cancellation import CancellationToken, TranslationCancelled
+from .config import DEFAULT_CACHE_DIR
+from .scheduler import priority_rank, PRIORITIES
+
+DEFAULT_JOBS_DB = DEFAULT_CACHE_DIR / "jobs.db"
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Seconds a running job stays claimed without a heartbeat from its worker;
+# after that another process sharing the database may resume it
+DEFAULT_LEASE_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    total_chunks INTEGER NOT NULL,
+    done_chunks INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE TABLE IF NOT EXISTS job_chunks (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at);
+"""
+
+
+class JobStore:
+    """
+    SQLite-backed store of translation jobs and their chunks.
+    
+    Every translated chunk is written as soon as it is done, so a job that was
+    interrupted by a restart resumes from the first untranslated chunk.
+    
+    Several processes may share one database. A claimed job is leased to the
+    store that claimed it: its worker renews the lease while it runs, and
+    only a job whose lease ran out (its process died) is put back in the
+    queue by another store.
+    """
+
+    def __init__(self, path: Path | str | None = None, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Open (and create if needed) the job database.
+        
+        Args:
+            path: Database file, defaults to ~/.cache/translate/jobs.db
+            lease_seconds: How long a claimed job stays this store's without renew_leases()
+        """
+        self.path = Path(path) if path is not None else DEFAULT_JOBS_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        # Identifies this store's claims among the processes sharing the database
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(_SCHEMA)
+            # Databases created before leases: their running jobs have no owner
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def create(self, params: dict, chunks: list[str], priority: str = "batch") -> str:
+        """
+        Queue a new job.
+        
+        Args:
+            params: JSON-serializable translation parameters
+            chunks: Source chunks, translated in order
+            priority: Priority class, one of PRIORITIES
+        
+        Returns:
+            The new job id
+        """
+        rank = priority_rank(priority)
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, params, total_chunks, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, rank, json.dumps(params, ensure_ascii=False), len(chunks), now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_chunks (job_id, idx, text) VALUES (?, ?, ?)",
+                [(job_id, i, text) for i, text in enumerate(chunks)],
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        """Return a job with its progress, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_dict(row) if row else None
+
+    def list_jobs(self, status: str | None = None, limit: int = 50) -> list[dict]:
+        """Return the most recent jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        args: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            args = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, args + (limit,)).fetchall()
+        return [_job_dict(row) for row in rows]
+
+    def claim_next(self) -> dict | None:
+        """Mark the most urgent queued job as running, leased to this store, and return it."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, self.owner, now + self.lease_seconds, now, row["id"]),
+            )
+        job = _job_dict(row)
+        job["status"] = RUNNING
+        return job
+
+    def pending_chunks(self, job_id: str) -> list[tuple[int, str]]:
+        """Return (index, text) of the chunks that still need translating."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, text FROM job_chunks WHERE job_id = ? AND result IS NULL ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        return [(row["idx"], row["text"]) for row in rows]
+
+    def chunk_results(self, job_id: str) -> list[str | None]:
+        """Return the translated chunks of a job in order (None where missing)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM job_chunks WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [row["result"] for row in rows]
+
+    def save_chunk(self, job_id: str, index: int, result: str) -> None:
+        """Store one translated chunk and advance the job's progress."""
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                "UPDATE job_chunks SET result = ? WHERE job_id = ? AND idx = ? AND result IS NULL",
+                (result, job_id, index),
+            ).rowcount
+            self._conn.execute(
+                "UPDATE jobs SET done_chunks = done_chunks + ?, updated_at = ? WHERE id = ?",
+                (updated, time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, result: str) -> None:
+        """Mark a job completed with its merged result."""
+        self._set_status(job_id, COMPLETED, result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed."""
+        self._set_status(job_id, FAILED, error=error)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not finished yet.
+        
+        Returns:
+            True if the job was queued or running and is now cancelled
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING),
+            ).rowcount > 0
+
+    def renew_leases(self) -> int:
+        """Extend the lease of every job this store is running. Returns how many."""
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE status = ? AND owner = ?",
+                (now + self.lease_seconds, RUNNING, self.owner),
+            ).rowcount
+
+    def requeue(self, job_id: str) -> bool:
+        """Put a job this store is running back in the queue (e.g. interrupted by shutdown)."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (QUEUED, time.time(), job_id, RUNNING, self.owner),
+            ).rowcount > 0
+
+    def requeue_interrupted(self) -> int:
+        """
+        Put jobs whose process died while running them back in the queue.
+        
+        Only expired leases count (and jobs from before leases, which have no
+        owner): a job another live process is running keeps renewing its lease.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = ? AND (owner IS NULL OR lease_until IS NULL OR lease_until < ?)",
+                (QUEUED, now, RUNNING, now),
+            ).rowcount
+
+    def _set_status(self, job_id: str, status: str, result: str | None = None, error: str | None = None) -> None:
+        # A cancelled job stays cancelled even if its worker finishes afterwards
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status != ?",
+                (status, result, error, time.time(), job_id, CANCELLED),
+            )
+
+
+def _job_dict(row: sqlite3.Row) -> dict:
+    """Convert a jobs row to the public job representation."""
+    total = row["total_chunks"]
+    done = row["done_chunks"]
+    return {
+        "id": row["id"],
+        "status": row["status"],
+        "priority": PRIORITIES[row["priority"]],
+        "params": json.loads(row["params"]),
+        "total_chunks": total,
+        "done_chunks": done,
+        "progress": round(done / total, 4) if total else 1.0,
+        "result": row["result"],
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+# translate_job(job, pending, cancel_token) yields (chunk index, translation)
+JobHandler = Callable[[dict, list[tuple[int, str]], CancellationToken], Iterator[tuple[int, str]]]
+# merge_job(job, chunk_results) returns the final text
+JobMerger = Callable[[dict, list[str]], str]
+
+
+class JobRunner:
+    """
+    Worker threads that drain a JobStore.
+    
+    The most urgent queued job is claimed first. Each translated chunk is
+    saved immediately, and cancelling a running job stops its generation
+    through the job's cancellation token. A heartbeat thread renews the
+    leases of the running jobs and resumes jobs whose process died.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        translate_job: JobHandler,
+        merge_job: JobMerger | None = None,
+        workers: int = 1,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Initialize runner.
+        
+        Args:
+            store: Job store to drain
+            translate_job: Translates a job's pending chunks, yielding (index, result)
+            merge_job: Builds the final result from all chunk results (default: concatenate)
+            workers: Number of worker threads
+            poll_interval: Seconds between queue checks when idle
+        """
+        self.store = store
+        self.translate_job = translate_job
+        self.merge_job = merge_job or (lambda job, results: "".join(results))
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tokens: dict[str, CancellationToken] = {}
+        self._tokens_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Resume interrupted jobs and start the worker and heartbeat threads."""
+        if self._threads:
+            return
+        self._stopping.clear()
+        self.store.requeue_interrupted()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"translate-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="translate-job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the workers; running jobs are interrupted and resume on next start."""
+        self._stopping.set()
+        self._wakeup.set()
+        with self._tokens_lock:
+            for token in self._tokens.values():
+                token.cancel("Server shutting down")
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, params: dict, chunks: list[str], priority: str = "batch") -> str:
+        """Queue a job and wake a worker. Returns the job id."""
+        job_id = self.store.create(params, chunks, priority)
+        self._wakeup.set()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job."""
+        cancelled = self.store.cancel(job_id)
+        with self._tokens_lock:
+            token = self._tokens.get(job_id)
+        if token is not None:
+            token.cancel("Job cancelled")
+        return cancelled
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            job = self.store.claim_next()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _heartbeat(self) -> None:
+        # Renewing well within the lease keeps a slow chunk from losing its job
+        while not self._stopping.wait(self.store.lease_seconds / 3):
+            self.store.renew_leases()
+            if self.store.requeue_interrupted():
+                self._wakeup.set()
+
+    def _run(self, job: dict) -> None:
+        job_id = job["id"]
+        token = CancellationToken()
+        with self._tokens_lock:
+            self._tokens[job_id] = token
+        try:
+            for index, result in self.translate_job(job, self.store.pending_chunks(job_id), token):
+                self.store.save_chunk(job_id, index, result)
+            token.raise_if_cancelled()
+            self.store.finish(job_id, self.merge_job(job, self.store.chunk_results(job_id)))
+        except TranslationCancelled:
+            if self._stopping.is_set():
+                # Interrupted by shutdown, not by the user: pick it up again next start
+                self.store.requeue(job_id)
+        except Exception as e:
+            # One job fails, the worker lives on; KeyboardInterrupt and
+            # SystemExit still stop the process (the job's lease then expires)
+            self.store.fail(job_id, str(e))
+        finally:
+            with self._tokens_lock:
+                self._tokens.pop(job_id, None)
@@ -0,0 +1,285 @@
+"""Weight-file residency for model loading: page-cache prewarming and mlock.
+
+Model loaders memory-map their weights (llama.cpp maps the GGUF file,
+safetensors maps each shard), so after a reboot the first load pays for
+the page faults as random reads scattered across the file. A Prewarmer
+walks the weight files front to back on a background thread instead,
+advising the kernel of sequential access and touching one byte per page,
+so the page cache fills at sequential disk speed while the loader
+initializes. Touching pages through a mapping reads nothing into Python
+buffers; the loader's own mapping then finds the pages already cached.
+
+With pin=True the prewarm pass maps each file with mlock() instead, which
+faults every page in and keeps it resident until release(); this needs a
+large enough RLIMIT_MEMLOCK (`ulimit -l`), and falls back to a plain
+prewarm with a warning when the kernel refuses.
+
+Strategies (config model.load_strategy):
+    auto     library defaults
+    mmap     map weights, read pages on first use
+    prewarm  mmap plus a sequential prewarm thread
+    mlock    prewarm and pin the pages in memory (GGUF; loaders that copy
+             the weights out, PyTorch and MLX, prewarm instead)
+    read     no mmap: read weights into process memory (GGUF only)
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Bytes advised and touched per step of the prewarm pass
+PREWARM_WINDOW = 64 * 1024 * 1024
+
+# Weight file patterns of a Hugging Face model directory
+WEIGHT_PATTERNS = ("*.safetensors", "*.bin", "*.gguf", "*.npz")
+
+_PAGE = mmap.PAGESIZE
+
+
+def weight_files(path: Path | str) -> list[Path]:
+    """The weight files of a model: the file itself, or the weight shards in a directory."""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    if not path.is_dir():
+        return []
+    files = {file for pattern in WEIGHT_PATTERNS for file in path.rglob(pattern) if file.is_file()}
+    return sorted(files)
+
+
+def _advise_sequential(fd: int) -> None:
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+
+class _Libc:
+    """mmap/mlock through libc, since Python's mmap objects cannot be locked."""
+
+    def __init__(self):
+        import ctypes
+
+        self.ctypes = ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+        libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        libc.mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        libc.munlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        self.libc = libc
+
+    def lock(self, fd: int, size: int) -> int:
+        """Map size bytes of fd read-only and lock them; returns the address."""
+        address = self.libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+        if address in (None, self.ctypes.c_void_p(-1).value):
+            raise OSError(self.ctypes.get_errno(), "mmap failed")
+        if self.libc.mlock(address, size) != 0:
+            errno = self.ctypes.get_errno()
+            self.libc.munmap(address, size)
+            raise OSError(errno, os.strerror(errno))
+        return address
+
+    def unlock(self, address: int, size: int) -> None:
+        self.libc.munlock(address, size)
+        self.libc.munmap(address, size)
+
+
+def pinning_supported() -> bool:
+    """Whether mlock() is available (POSIX with a loadable libc)."""
+    return sys.platform != "win32" and hasattr(mmap, "MAP_SHARED")
+
+
+class Prewarmer:
+    """
+    Reads weight files into the page cache on a background thread.
+
+    Attributes:
+        bytes_read: Bytes touched so far
+        seconds: Duration of the pass, once done
+        pinned_bytes: Bytes locked in memory (pin=True)
+        errors: Problems that did not stop the pass (e.g. mlock refused)
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        pin: bool = False,
+        on_done: Callable[[Prewarmer], None] | None = None,
+        window: int = PREWARM_WINDOW,
+    ):
+        """
+        Initialize prewarmer.
+
+        Args:
+            paths: Weight files, read in order
+            pin: Lock the pages in memory until release()
+            on_done: Called on the prewarm thread when the pass finishes
+            window: Bytes advised and touched per step
+        """
+        self.paths = list(paths)
+        self.pin = pin
+        self.on_done = on_done
+        self.window = max(_PAGE, window // _PAGE * _PAGE)
+        self.bytes_read = 0
+        self.seconds: float | None = None
+        self.pinned_bytes = 0
+        self.errors: list[str] = []
+        self._locked: list[tuple[int, int]] = []
+        self._libc: _Libc | None = None
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of all weight files."""
+        return sum(path.stat().st_size for path in self.paths if path.exists())
+
+    @property
+    def done(self) -> bool:
+        """Whether the pass finished (or was cancelled)."""
+        return self.seconds is not None
+
+    def start(self) -> Prewarmer:
+        """Start the pass on a daemon thread."""
+        self._thread = threading.Thread(target=self.run, name="weight-prewarm", daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait for the pass; returns whether it finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def run(self) -> None:
+        """Prewarm (and pin) every file; runs on the calling thread."""
+        start = time.perf_counter()
+        try:
+            for path in self.paths:
+                if self._cancelled.is_set():
+                    break
+                try:
+                    self._prewarm_file(path)
+                except OSError as e:
+                    self.errors.append(f"{path.name}: {e}")
+        finally:
+            self.seconds = time.perf_counter() - start
+            if self.on_done is not None:
+                self.on_done(self)
+
+    def release(self) -> None:
+        """Stop the pass and unlock pinned pages."""
+        self._cancelled.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        while self._locked:
+            address, size = self._locked.pop()
+            self._libc.unlock(address, size)
+        self.pinned_bytes = 0
+
+    def _prewarm_file(self, path: Path) -> None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return
+            _advise_sequential(fd)
+            if self.pin and self._lock(fd, size, path):
+                self.bytes_read += size
+                return
+            with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, self.window):
+                        if self._cancelled.is_set():
+                            return
+                        end = min(offset + self.window, size)
+                        if hasattr(mapped, "madvise"):
+                            mapped.madvise(mmap.MADV_WILLNEED, offset, end - offset)
+                        # One byte per page faults the window in without copying it
+                        bytes(view[offset:end:_PAGE])
+                        self.bytes_read += end - offset
+                finally:
+                    view.release()
+        finally:
+            os.close(fd)
+
+    def _lock(self, fd: int, size: int, path: Path) -> bool:
+        if not pinning_supported():
+            self.errors.append("mlock is not supported on this platform")
+            self.pin = False
+            return False
+        try:
+            self._libc = self._libc or _Libc()
+            address = self._libc.lock(fd, size)
+        except OSError as e:
+            self.errors.append(f"mlock {path.name} refused ({e}); raise `ulimit -l` to pin weights")
+            self.pin = False
+            return False
+        self._locked.append((address, size))
+        self.pinned_bytes += size
+        return True
+
+
+# Prewarmers of the loaded model, released when it is unloaded
+_active: list[Prewarmer] = []
+_active_lock = threading.Lock()
+
+
+def prepare_weights(
+    paths: list[Path],
+    strategy: str,
+    on_phase: Callable[[str, float], None] | None = None,
+    loader_pins: bool = False,
+) -> Prewarmer | None:
+    """
+    Start the disk side of a load strategy before the loader runs.
+
+    For "prewarm" and "mlock" a Prewarmer starts on a background thread and
+    reports its duration as the "read" phase when it finishes; other
+    strategies leave reading to the loader and return None. With "mlock" the
+    Prewarmer pins the pages itself unless loader_pins says the loader
+    locks its own mapping (llama.cpp's use_mlock), in which case it only
+    prewarms so the pages are not locked twice.
+    """
+    if strategy not in ("prewarm", "mlock") or not paths:
+        return None
+
+    def done(prewarmer: Prewarmer) -> None:
+        if on_phase is not None:
+            on_phase("read", prewarmer.seconds)
+
+    prewarmer = Prewarmer(paths, pin=strategy == "mlock" and not loader_pins, on_done=done)
+    with _active_lock:
+        _active.append(prewarmer)
+    return prewarmer.start()
+
+
+def release_weights() -> None:
+    """Stop prewarming and unlock the pinned weights of the unloaded model."""
+    with _active_lock:
+        prewarmers = list(_active)
+        _active.clear()
+    for prewarmer in prewarmers:
+        prewarmer.release()
+
+
+@contextmanager
+def timed_phase(on_phase: Callable[[str, float], None] | None, phase: str) -> Iterator[None]:
+    """Report how long the block took to on_phase as phase."""
+    start = time.perf_counter()
+    yield
+    if on_phase is not None:
+        on_phase(phase, time.perf_counter() - start)
@@ -0,0 +1,367 @@
+"""Process memory readings and a memory budget planner per model, quantization and backend.
+
+Readings work on CPU-only machines: resident set size (current and peak)
+and the file-backed (mmap-resident) part come from /proc on Linux, with a
+getrusage() fallback elsewhere. Device memory is added when torch with CUDA
+or MLX is already loaded in the process; they are never imported just to
+read memory.
+
+Profiles measured by `translate bench memory` are stored in the cache
+directory and preferred over the built-in estimates by the planner.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from .config import MODEL_INFO, MODEL_SIZES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Where measured profiles are kept
+PROFILES_FILE = "memory_profiles.json"
+
+# Estimated KV cache per 1k context tokens (fp16): 2 (K and V) x layers x
+# KV heads x head dim x 2 bytes x 1024. Gemma 3 keeps most layers on a
+# sliding window, so these are upper bounds for long contexts.
+ESTIMATED_KV_MB_PER_1K = {
+    "4b": 136.0,   # 34 layers, 4 KV heads, head dim 256
+    "12b": 384.0,  # 48 layers, 8 KV heads, head dim 256
+    "27b": 496.0,  # 62 layers, 16 KV heads, head dim 128
+}
+
+# Estimated runtime overhead on top of weights and KV cache (compute buffers, CUDA context)
+ESTIMATED_OVERHEAD_MB = 512.0
+
+# Bits per weight of the GGUF quantizations (Q4_K_M, Q8_0); MODEL_INFO sizes are Q4
+_BITS_PER_WEIGHT = {4: 4.85, 8: 8.5}
+
+# Memory kept free when planning against the memory available right now
+DEFAULT_HEADROOM = 0.10
+
+# Largest context the planner recommends; contexts are multiples of CONTEXT_STEP
+MAX_PLANNED_CONTEXT = 8192
+CONTEXT_STEP = 512
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class MemorySnapshot:
+    """
+    Memory of this process at one moment, in MB.
+
+    file_rss_mb is the resident file-backed part (mmap'ed weights, shared
+    libraries); None where the platform does not report it. device_mb and
+    device_peak_mb are None without a loaded CUDA or MLX runtime.
+    """
+
+    rss_mb: float
+    peak_rss_mb: float
+    file_rss_mb: float | None = None
+    device_mb: float | None = None
+    device_peak_mb: float | None = None
+
+    def to_dict(self) -> dict:
+        """Rounded values for JSON."""
+        return {key: round(value, 1) if value is not None else None for key, value in asdict(self).items()}
+
+
+def _proc_status() -> dict[str, float]:
+    values = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if len(parts) == 2 and parts[1] == "kB":
+                    values[key] = int(parts[0]) / 1024
+    except OSError:
+        pass
+    return values
+
+
+def _peak_from_rusage() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / _MB if sys.platform == "darwin" else peak / 1024
+
+
+def _device_memory() -> tuple[float | None, float | None]:
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                return torch.cuda.memory_allocated() / _MB, torch.cuda.max_memory_allocated() / _MB
+        except Exception:
+            pass
+    mx = sys.modules.get("mlx.core")
+    if mx is not None:
+        try:
+            metal = getattr(mx, "metal", mx)
+            return metal.get_active_memory() / _MB, metal.get_peak_memory() / _MB
+        except Exception:
+            pass
+    return None, None
+
+
+def snapshot() -> MemorySnapshot:
+    """Read the current memory of this process."""
+    status = _proc_status()
+    device, device_peak = _device_memory()
+    if "VmRSS" in status:
+        return MemorySnapshot(
+            rss_mb=status["VmRSS"],
+            peak_rss_mb=status.get("VmHWM", status["VmRSS"]),
+            file_rss_mb=status.get("RssFile"),
+            device_mb=device,
+            device_peak_mb=device_peak,
+        )
+    # Without /proc only the peak is known; it is the best available upper bound
+    peak = _peak_from_rusage()
+    return MemorySnapshot(rss_mb=peak, peak_rss_mb=peak, device_mb=device, device_peak_mb=device_peak)
+
+
+def reset_peak() -> bool:
+    """
+    Reset the peak counters so the next snapshot reports the peak since now.
+
+    Returns:
+        Whether the RSS peak could be reset (Linux only; elsewhere the peak
+        is the process maximum, so measure in increasing order of size)
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.reset_peak_memory_stats()
+        except Exception:
+            pass
+    mx = sys.modules.get("mlx.core")
+    if mx is not None:
+        try:
+            getattr(mx, "metal", mx).reset_peak_memory()
+        except Exception:
+            pass
+    try:
+        # "5" resets VmHWM to the current RSS
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def available_memory_mb() -> float | None:
+    """
+    Memory a model could still use: free CUDA memory when torch with CUDA is
+    loaded, else available system RAM (Linux), else None.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                free, _ = torch.cuda.mem_get_info()
+                return free / _MB
+        except Exception:
+            pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+@dataclass
+class MemoryProfile:
+    """
+    Memory needed by one model, quantization and backend, in MB.
+
+    weights_mb covers everything resident after loading (weights plus fixed
+    runtime buffers), kv_mb_per_1k the growth per 1k context tokens.
+    """
+
+    model_size: str
+    quantization: int
+    backend: str
+    weights_mb: float
+    kv_mb_per_1k: float
+    overhead_mb: float = 0.0
+    mmap_mb: float | None = None
+    device_mb: float | None = None
+    measured: bool = False
+
+    @property
+    def key(self) -> str:
+        """Identifier used in the profiles file, e.g. "27b-q4-gguf"."""
+        return profile_key(self.model_size, self.quantization, self.backend)
+
+    def required_mb(self, context_tokens: int) -> float:
+        """Memory needed for a context of context_tokens."""
+        return self.weights_mb + self.overhead_mb + self.kv_mb_per_1k * context_tokens / 1024
+
+    def max_context(self, budget_mb: float, limit: int = MAX_PLANNED_CONTEXT) -> int:
+        """
+        Largest context (a multiple of CONTEXT_STEP, at most limit) that fits in budget_mb.
+
+        Returns:
+            0 if not even the weights fit
+        """
+        spare = budget_mb - self.weights_mb - self.overhead_mb
+        if spare < 0:
+            return 0
+        if self.kv_mb_per_1k <= 0:
+            return limit
+        tokens = int(spare / self.kv_mb_per_1k * 1024) // CONTEXT_STEP * CONTEXT_STEP
+        return min(tokens, limit)
+
+
+def profile_key(model_size: str, quantization: int, backend: str) -> str:
+    """Profiles file key for a model, quantization and backend."""
+    return f"{model_size}-q{quantization}-{backend}"
+
+
+def estimate_profile(model_size: str, quantization: int = 4, backend: str = "gguf") -> MemoryProfile:
+    """
+    Profile estimated from the model's published quantized size.
+
+    Raises:
+        ValueError: If the model size is unknown
+    """
+    if model_size not in MODEL_INFO:
+        raise ValueError(f"Unknown model size: {model_size} (expected one of {', '.join(MODEL_SIZES)})")
+    weights_mb = MODEL_INFO[model_size]["quantized_size_gb"] * 1024
+    weights_mb *= _BITS_PER_WEIGHT.get(quantization, _BITS_PER_WEIGHT[4]) / _BITS_PER_WEIGHT[4]
+    return MemoryProfile(
+        model_size=model_size,
+        quantization=quantization,
+        backend=backend,
+        weights_mb=round(weights_mb, 1),
+        kv_mb_per_1k=ESTIMATED_KV_MB_PER_1K[model_size],
+        overhead_mb=ESTIMATED_OVERHEAD_MB,
+    )
+
+
+def profiles_path() -> Path:
+    """File measured profiles are stored in."""
+    from .config import DEFAULT_CACHE_DIR
+
+    return DEFAULT_CACHE_DIR / PROFILES_FILE
+
+
+def load_profiles(path: Path | str | None = None) -> dict[str, MemoryProfile]:
+    """Measured profiles by key; empty if none were saved or the file is unreadable."""
+    path = Path(path) if path else profiles_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    names = {field.name for field in fields(MemoryProfile)}
+    profiles = {}
+    for key, values in data.items():
+        try:
+            profiles[key] = MemoryProfile(**{name: value for name, value in values.items() if name in names})
+        except TypeError:
+            continue
+    return profiles
+
+
+def save_profile(profile: MemoryProfile, path: Path | str | None = None) -> Path:
+    """Add or replace a measured profile in the profiles file."""
+    path = Path(path) if path else profiles_path()
+    profiles = load_profiles(path)
+    profiles[profile.key] = profile
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {key: asdict(value) for key, value in sorted(profiles.items())}
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def get_profile(model_size: str, quantization: int = 4, backend: str = "gguf", path: Path | str | None = None) -> MemoryProfile:
+    """The measured profile if there is one, else the estimate."""
+    measured = load_profiles(path).get(profile_key(model_size, quantization, backend))
+    return measured or estimate_profile(model_size, quantization, backend)
+
+
+def plan_budget(
+    budget_mb: float | None = None,
+    context_tokens: int = 4096,
+    backend: str = "gguf",
+    quantizations: tuple[int, ...] = (4, 8),
+    headroom: float = DEFAULT_HEADROOM,
+    path: Path | str | None = None,
+) -> list[dict]:
+    """
+    Which models fit in a memory budget, and with how much context.
+
+    Args:
+        budget_mb: Memory to plan for (default: available memory minus headroom)
+        context_tokens: Context the caller wants
+        backend: Backend the profiles are looked up for
+        quantizations: Quantizations to consider
+        headroom: Share of the available memory kept free when budget_mb is not given
+        path: Profiles file (default: profiles_path())
+
+    Returns:
+        One row per model and quantization, smallest first: the profile,
+        required_mb for context_tokens, whether it fits and the largest
+        context that fits
+
+    Raises:
+        ValueError: If no budget is given and available memory is unknown
+    """
+    if budget_mb is None:
+        available = available_memory_mb()
+        if available is None:
+            raise ValueError("Available memory is unknown on this platform; pass a budget")
+        budget_mb = available * (1 - headroom)
+    rows = []
+    for model_size in MODEL_SIZES:
+        for quantization in quantizations:
+            profile = get_profile(model_size, quantization, backend, path)
+            required = profile.required_mb(context_tokens)
+            rows.append({
+                "model_size": model_size,
+                "quantization": quantization,
+                "backend": backend,
+                "measured": profile.measured,
+                "required_mb": round(required, 1),
+                "budget_mb": round(budget_mb, 1),
+                "fits": required <= budget_mb,
+                "max_context": profile.max_context(budget_mb),
+            })
+    return rows
+
+
+def recommended_n_ctx(model_size: str, quantization: int = 4, budget_mb: float | None = None, default: int = 4096) -> int:
+    """
+    Context window for a GGUF model that fits the memory budget.
+
+    Uses the measured or estimated profile against budget_mb (default:
+    available memory minus headroom). Falls back to default when memory
+    cannot be read, and never goes below CONTEXT_STEP.
+    """
+    if budget_mb is None:
+        available = available_memory_mb()
+        if available is None:
+            return default
+        budget_mb = available * (1 - DEFAULT_HEADROOM)
+    context = get_profile(model_size, quantization, "gguf").max_context(budget_mb)
+    return max(context, CONTEXT_STEP)
+
+
+def format_size(mb: float) -> str:
+    """Human-readable size for model listings, e.g. "~15GB"."""
+    gb = mb / 1024
+    return f"~{gb:.0f}GB" if gb >= 10 else f"~{gb:.1f}GB"
@@ -0,0 +1,320 @@
+"""Translation metrics in the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable
+
+from .stats import GenerationStats
+
+# Content type of render() output, for HTTP responses
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds: sub-millisecond cleaning up to multi-minute model loads
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_RATE_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 35.0, 50.0, 75.0, 100.0, 150.0, 250.0, 500.0)
+
+# Labels attached to every translation metric
+TRANSLATION_LABELS = ("model", "quant", "backend", "lang_pair")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for a labelled metric family."""
+    
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        missing = set(self.labelnames) - set(labels)
+        extra = set(labels) - set(self.labelnames)
+        if missing or extra:
+            raise ValueError(
+                f"{self.name}: expected labels {self.labelnames}, got {tuple(sorted(labels))}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple[str, ...], value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increase the counter for the given labels."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value for the given labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        """Current value for the given labels."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+    
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation for the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        """Number of observations for the given labels."""
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels), ([0], 0.0))
+        return counts[-1]
+
+    def sum(self, **labels) -> float:
+        """Sum of observations for the given labels."""
+        with self._lock:
+            _, total = self._values.get(self._key(labels), ([0], 0.0))
+        return total
+
+    def _render_sample(self, key: tuple[str, ...], value) -> list[str]:
+        counts, total = value
+        lines = []
+        for bound, count in zip(self.buckets, counts):
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class TranslatorObserver:
+    """
+    Receives instrumentation events from a Translator.
+    
+    Subclass and override the hooks you need; every hook is a no-op by
+    default. Labels always carry model, quant, backend and lang_pair.
+    """
+
+    def on_stage(self, stage: str, seconds: float, labels: dict) -> None:
+        """A pipeline stage (model_load, chunking, prompt_format, ...) finished."""
+
+    def on_generation(self, stats: GenerationStats, labels: dict) -> None:
+        """A backend generation finished with the given token counts and timing."""
+
+    def on_chunk(self, labels: dict) -> None:
+        """A chunk was translated."""
+
+    def on_cache(self, hit: bool, labels: dict) -> None:
+        """A translation cache was consulted."""
+
+    def on_model_load(self, labels: dict) -> None:
+        """A model was loaded."""
+
+    def on_model_unload(self, labels: dict) -> None:
+        """A model was unloaded."""
+
+
+class TranslationMetrics(TranslatorObserver):
+    """Translator observer that aggregates events into Prometheus metrics."""
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.stage_seconds = r.histogram(
+            "translategemma_stage_seconds",
+            "Time spent per translation pipeline stage.",
+            ("stage",) + TRANSLATION_LABELS,
+        )
+        self.tokens = r.counter(
+            "translategemma_tokens_total",
+            "Tokens processed, by direction (in = prompt, out = completion).",
+            ("direction",) + TRANSLATION_LABELS,
+        )
+        self.tokens_per_second = r.histogram(
+            "translategemma_decode_tokens_per_second",
+            "Decode throughput per generation.",
+            TRANSLATION_LABELS,
+            TOKEN_RATE_BUCKETS,
+        )
+        self.chunks = r.counter(
+            "translategemma_chunks_total",
+            "Chunks translated.",
+            TRANSLATION_LABELS,
+        )
+        self.cache_requests = r.counter(
+            "translategemma_cache_requests_total",
+            "Translation cache lookups, by result (hit or miss).",
+            ("result",) + TRANSLATION_LABELS,
+        )
+        self.model_loads = r.counter(
+            "translategemma_model_loads_total",
+            "Models loaded.",
+            TRANSLATION_LABELS,
+        )
+        self.model_unloads = r.counter(
+            "translategemma_model_unloads_total",
+            "Models unloaded.",
+            TRANSLATION_LABELS,
+        )
+
+    def on_stage(self, stage: str, seconds: float, labels: dict) -> None:
+        self.stage_seconds.observe(seconds, stage=stage, **labels)
+
+    def on_generation(self, stats: GenerationStats, labels: dict) -> None:
+        if stats.prompt_tokens:
+            self.tokens.inc(stats.prompt_tokens, direction="in", **labels)
+        if stats.completion_tokens:
+            self.tokens.inc(stats.completion_tokens, direction="out", **labels)
+        if stats.ttft is not None:
+            self.stage_seconds.observe(stats.ttft, stage="prefill", **labels)
+            self.stage_seconds.observe(stats.decode_time, stage="decode", **labels)
+            rate = stats.decode_tokens_per_second
+            if rate is not None:
+                self.tokens_per_second.observe(rate, **labels)
+        else:
+            self.stage_seconds.observe(stats.total_time, stage="generate", **labels)
+
+    def on_chunk(self, labels: dict) -> None:
+        self.chunks.inc(**labels)
+
+    def on_cache(self, hit: bool, labels: dict) -> None:
+        self.cache_requests.inc(result="hit" if hit else "miss", **labels)
+
+    def on_model_load(self, labels: dict) -> None:
+        self.model_loads.inc(**labels)
+
+    def on_model_unload(self, labels: dict) -> None:
+        self.model_unloads.inc(**labels)
+
+    def render(self) -> str:
+        """Render all translation metrics."""
+        return self.registry.render()
+
+
+# Global metrics instance
+_metrics: TranslationMetrics | None = None
+
+
+def get_metrics() -> TranslationMetrics:
+    """Get the global translation metrics."""
+    global _metrics
+    if _metrics is None:
+        _metrics = TranslationMetrics()
+    return _metrics
+
+
+def reset_metrics() -> None:
+    """Reset the global translation metrics."""
+    global _metrics
+    _metrics = None
@@ -5,9 +5,11 @@
 import os
 import sys
 import platform
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
 # Suppress tokenizer warnings before any transformers imports
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -22,7 +24,6 @@
 logging.getLogger("transformers.tokenization_utils_base").setLevel(logging.ERROR)
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 from .config import (
     get_config,
@@ -32,7 +33,11 @@
     MODEL_SIZES,
     MODEL_INFO,
     DEFAULT_MODEL_SIZE,
+    DEFAULT_DOWNLOAD_CONNECTIONS,
 )
+from .compiled import compile_model, prompt_buckets
+from .cpu import quantize_int8, tune_cpu
+from .loading import prepare_weights, timed_phase, weight_files
 
 console = Console()
 
@@ -40,6 +45,39 @@
 Backend = Literal["mlx", "pytorch", "gguf"]
 
 
+def _progress(bar: bool = True):
+    """
+    Spinner for downloads and loads, with a progress bar if bar is set.
+    
+    rich.progress is imported here rather than at module level so that
+    starting the CLI does not pay for it.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    
+    columns = [SpinnerColumn(), TextColumn("[progress.description]{task.description}")]
+    if bar:
+        columns += [BarColumn(), TaskProgressColumn()]
+    return Progress(*columns, console=console)
+
+
+class _LoadTimer:
+    """Collects load phase durations, forwarding each to on_phase."""
+    
+    def __init__(self, on_phase: Callable[[str, float], None] | None = None):
+        self.on_phase = on_phase
+        self.phases: dict[str, float] = {}
+    
+    def __call__(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+        if self.on_phase is not None:
+            self.on_phase(phase, seconds)
+    
+    def summary(self) -> str:
+        """e.g. "init 3.1s · warm-up 0.8s"; a prewarm still running is not listed."""
+        names = {"read": "disk read", "init": "init", "warmup": "warm-up"}
+        return " · ".join(f"{names.get(phase, phase)} {seconds:.1f}s" for phase, seconds in self.phases.items())
+
+
 def get_backend(model_format: str = "auto") -> Backend:
     """
     Detect platform and return appropriate backend.
@@ -78,35 +116,41 @@ def get_backend(model_format: str = "auto") -> Backend:
     return "pytorch"
 
 
-def is_model_ready(model_size: str | None = None, model_format: str | None = None) -> bool:
+def is_model_ready(
+    model_size: str | None = None,
+    model_format: str | None = None,
+    quantization_bits: int | None = None,
+) -> bool:
     """
     Check if the model exists.
     
     Args:
         model_size: Model size to check. If None, uses config default.
         model_format: Model format (gguf, hf). If None, uses config default.
+        quantization_bits: Quantization to check. If None, uses config default.
     """
     config = get_config()
     size = model_size or config.model_size
     fmt = model_format or config.model_format
+    bits = quantization_bits or config.quantization_bits
     
     if fmt == "gguf" or (fmt == "auto" and get_backend("gguf") == "gguf"):
         # Check for GGUF file
-        gguf_path = get_model_path(size, config.quantization_bits, "gguf")
+        gguf_path = get_model_path(size, bits, "gguf")
         return gguf_path.exists()
     else:
         # Check for HF model directory
-        model_path = get_model_path(size, config.quantization_bits, "hf")
+        model_path = get_model_path(size, bits, "hf")
         if not model_path.exists():
             return False
         return (model_path / "config.json").exists()
 
 
-def is_gguf_model_ready(model_size: str | None = None) -> bool:
+def is_gguf_model_ready(model_size: str | None = None, quantization_bits: int | None = None) -> bool:
     """Check if GGUF model exists."""
     config = get_config()
     size = model_size or config.model_size
-    gguf_path = get_model_path(size, config.quantization_bits, "gguf")
+    gguf_path = get_model_path(size, quantization_bits or config.quantization_bits, "gguf")
     return gguf_path.exists()
 
 
@@ -195,56 +239,118 @@ def download_and_convert_model(
 
 def _download_gguf(model_size: str, quantization_bits: int, force: bool = False) -> Path:
     """Download GGUF model from HuggingFace."""
-    from huggingface_hub import hf_hub_download
-    
-    config = get_config()
-    gguf_path = get_model_path(model_size, quantization_bits, "gguf")
+    return download_gguf_models([(model_size, quantization_bits)], force)[0]
+
+
+def download_gguf_models(
+    models: list[tuple[str, int]],
+    force: bool = False,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    parallel: int = 2,
+) -> list[Path]:
+    """
+    Download several GGUF models concurrently.
     
-    if gguf_path.exists() and not force:
-        console.print(f"[green]GGUF model already available at {gguf_path}[/green]")
-        return gguf_path
+    Each file is fetched over several connections, resumes from a previous
+    partial download and is verified against the hub's SHA-256 before it
+    is moved into place.
     
-    repo, filename = get_gguf_model_info(model_size, quantization_bits)
+    Args:
+        models: (model size, quantization bits) pairs
+        force: Re-download models that already exist
+        connections: Range requests per file
+        parallel: Files downloaded at the same time
     
-    console.print(f"[cyan]Downloading GGUF model from {repo}...[/cyan]")
-    console.print(f"[dim]File: {filename}[/dim]\n")
+    Returns:
+        Paths of the models, in the order given
+    """
+    from .download import download_file, hub_file
     
-    # Ensure parent directory exists
-    gguf_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Downloading...", total=None)
+    paths = [get_model_path(size, bits, "gguf") for size, bits in models]
+    pending = []
+    for (size, bits), gguf_path in zip(models, paths):
+        if gguf_path.exists() and not force:
+            console.print(f"[green]GGUF model already available at {gguf_path}[/green]")
+        else:
+            pending.append((size, bits, gguf_path))
+    if not pending:
+        return paths
+    
+    for size, bits, _ in pending:
+        repo, filename = get_gguf_model_info(size, bits)
+        console.print(f"[cyan]Downloading GGUF model from {repo}...[/cyan]")
+        console.print(f"[dim]File: {filename}[/dim]")
+    console.print()
+    
+    errors = {}
+    stop = threading.Event()
+    with _progress() as progress:
+        def fetch(size: str, bits: int, gguf_path: Path) -> None:
+            repo, filename = get_gguf_model_info(size, bits)
+            task = progress.add_task(f"{size} Q{bits}", total=None)
+            try:
+                remote = hub_file(repo, filename)
+                progress.update(task, total=remote.size)
+                download_file(
+                    remote,
+                    gguf_path,
+                    connections=connections,
+                    on_progress=lambda n: progress.advance(task, n),
+                    on_verify=lambda: progress.update(task, description=f"{size} Q{bits} verifying"),
+                    stop=stop,
+                )
+                progress.update(task, description=f"{size} Q{bits} ✓")
+            except Exception as e:
+                errors[(size, bits)] = (repo, e)
+                progress.update(task, description=f"{size} Q{bits} failed")
         
-        try:
-            downloaded_path = hf_hub_download(
-                repo_id=repo,
-                filename=filename,
-                local_dir=gguf_path.parent,
-                local_dir_use_symlinks=False,
-            )
-            
-            # Rename to standard name if needed
-            downloaded = Path(downloaded_path)
-            if downloaded != gguf_path:
-                downloaded.rename(gguf_path)
-            
-            progress.update(task, completed=True)
-            
-        except Exception as e:
-            console.print(f"\n[red]Error downloading GGUF model: {e}[/red]")
-            console.print("\n[yellow]Troubleshooting:[/yellow]")
+        with ThreadPoolExecutor(max(1, min(parallel, len(pending)))) as pool:
+            try:
+                for future in [pool.submit(fetch, *item) for item in pending]:
+                    future.result()
+            except BaseException:
+                # Ctrl-C: stop every download; finished parts resume next time
+                stop.set()
+                raise
+    
+    if errors:
+        for (size, bits), (repo, e) in errors.items():
+            console.print(f"\n[red]Error downloading GGUF model {size} Q{bits}: {e}[/red]")
+        console.print("\n[yellow]Troubleshooting:[/yellow]")
+        for repo in sorted({repo for repo, _ in errors.values()}):
             console.print(f"1. Check if the model exists: https://huggingface.co/{repo}")
-            console.print("2. Ensure you have internet connection")
-            raise SystemExit(1)
+        console.print("2. Ensure you have internet connection")
+        console.print("3. Run the download again to resume where it stopped")
+        raise SystemExit(1)
     
-    console.print(f"\n[green]✓ GGUF model ready at {gguf_path}[/green]\n")
-    return gguf_path
+    for _, _, gguf_path in pending:
+        console.print(f"[green]✓ GGUF model ready at {gguf_path}[/green]")
+    console.print()
+    return paths
+
+
+def download_models(
+    model_sizes: list[str],
+    quantization_bits: int = 4,
+    model_format: str | None = None,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    parallel: int = 2,
+) -> list[Path]:
+    """
+    Download several model sizes.
+    
+    GGUF files download concurrently; HF models are downloaded and
+    converted one at a time, since conversion needs the model in memory.
+    
+    Returns:
+        Paths of the models, in the order given
+    """
+    fmt = model_format or get_config().model_format
+    if fmt == "auto":
+        fmt = "gguf" if get_backend("auto") == "gguf" else "hf"
+    if fmt == "gguf":
+        return download_gguf_models([(size, quantization_bits) for size in model_sizes], connections=connections, parallel=parallel)
+    return [download_and_convert_model(size, quantization_bits, "hf") for size in model_sizes]
 
 
 def _download_mlx(hf_model_id: str, model_path: Path, quantization_bits: int) -> Path:
@@ -273,13 +379,7 @@ def _download_mlx(hf_model_id: str, model_path: Path, quantization_bits: int) ->
     console.print(f"[cyan]Converting to MLX format with {quantization_bits}-bit quantization...[/cyan]")
     console.print("[dim]This may take 10-20 minutes on first run.[/dim]\n")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console,
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task("Converting model...", total=None)
         
         try:
@@ -408,13 +508,7 @@ def _download_pytorch(hf_model_id: str, model_path: Path, quantization_bits: int
     console.print(f"[cyan]Downloading {hf_model_id} from HuggingFace...[/cyan]")
     console.print("[dim]This may take a while depending on your connection.[/dim]\n")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console,
-    ) as progress:
+    with _progress() as progress:
         task = progress.add_task("Downloading model...", total=None)
         
         try:
@@ -495,19 +589,29 @@ def _download_pytorch(hf_model_id: str, model_path: Path, quantization_bits: int
     return model_path
 
 
-def load_model(model_size: str | None = None, model_format: str | None = None) -> tuple[Any, Any, Backend]:
+def load_model(
+    model_size: str | None = None,
+    model_format: str | None = None,
+    on_phase: Callable[[str, float], None] | None = None,
+    quantization_bits: int | None = None,
+) -> tuple[Any, Any, Backend]:
     """
     Load the TranslateGemma model and tokenizer.
     
     Args:
         model_size: Model size to load. If None, uses config default.
         model_format: Model format (gguf, hf, auto). If None, uses config default.
+        on_phase: Called with each load phase and its duration in seconds:
+            "read" (the prewarm pass of the prewarm and mlock strategies,
+            reported from its thread when it finishes), "init" and "warmup"
+        quantization_bits: Quantization to load. If None, uses config default.
     
     Returns:
         Tuple of (model, tokenizer, backend)
     """
     config = get_config()
     size = model_size or config.model_size
+    bits = quantization_bits or config.quantization_bits
     fmt = model_format or config.model_format
     
     # Determine actual format and backend
@@ -519,23 +623,27 @@ def load_model(model_size: str | None = None, model_format: str | None = None) -
     
     # Download if needed
     if fmt == "gguf":
-        if not is_gguf_model_ready(size):
-            download_and_convert_model(size, config.quantization_bits, "gguf")
-        return _load_gguf(size, config.quantization_bits)
+        if not is_gguf_model_ready(size, bits):
+            download_and_convert_model(size, bits, "gguf")
+        return _load_gguf(size, bits, on_phase)
     
     # HF format
-    model_path = get_model_path(size, config.quantization_bits, "hf")
+    model_path = get_model_path(size, bits, "hf")
     
-    if not is_model_ready(size, "hf"):
-        download_and_convert_model(size, config.quantization_bits, "hf")
+    if not is_model_ready(size, "hf", bits):
+        download_and_convert_model(size, bits, "hf")
     
     if backend == "mlx":
-        return _load_mlx(model_path)
+        return _load_mlx(model_path, on_phase)
     else:
-        return _load_pytorch(model_path)
+        return _load_pytorch(model_path, on_phase, size)
 
 
-def _load_gguf(model_size: str, quantization_bits: int) -> tuple[Any, Any, Backend]:
+def _load_gguf(
+    model_size: str,
+    quantization_bits: int,
+    on_phase: Callable[[str, float], None] | None = None,
+) -> tuple[Any, Any, Backend]:
     """Load model using llama-cpp-python backend."""
     try:
         from llama_cpp import Llama
@@ -555,30 +663,44 @@ def _load_gguf(model_size: str, quantization_bits: int) -> tuple[Any, Any, Backe
         console.print("[yellow]Run: translate model download --format gguf[/yellow]")
         raise SystemExit(1)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    # llama.cpp maps the file by default; explicit strategies set mmap/mlock
+    strategy = config.load_strategy
+    options = {}
+    if strategy != "auto":
+        options["use_mmap"] = strategy != "read"
+        options["use_mlock"] = strategy == "mlock"
+    timer = _LoadTimer(on_phase)
+    # llama.cpp locks its own mapping under use_mlock, so the prewarm only reads
+    prepare_weights([gguf_path], strategy, timer, loader_pins=options.get("use_mlock", False))
+    
+    with _progress(bar=False) as progress:
         task = progress.add_task("Loading GGUF model...", total=None)
         
         # Load model with llama-cpp
-        model = Llama(
-            model_path=str(gguf_path),
-            n_gpu_layers=config.gguf_n_gpu_layers,
-            n_ctx=config.gguf_n_ctx,
-            verbose=False,
-        )
+        with timed_phase(timer, "init"):
+            model = Llama(
+                model_path=str(gguf_path),
+                n_gpu_layers=config.gguf_n_gpu_layers,
+                n_ctx=config.gguf_n_ctx_for(model_size, quantization_bits),
+                verbose=False,
+                **options,
+            )
+        
+        # Warmup: one token touches every layer, so mapped weights are read
+        # now rather than during the first translation
+        progress.update(task, description="Warming up...")
+        with timed_phase(timer, "warmup"):
+            model.create_completion("Hello", max_tokens=1)
         
         progress.update(task, description="Model ready")
     
-    console.print("[dim]GGUF model loaded and ready.[/dim]\n")
+    console.print(f"[dim]GGUF model loaded and ready ({timer.summary()}).[/dim]\n")
     
     # For GGUF, we return model as both model and tokenizer (it handles both)
     return model, model, "gguf"
 
 
-def _load_mlx(model_path: Path) -> tuple[Any, Any, Backend]:
+def _load_mlx(model_path: Path, on_phase: Callable[[str, float], None] | None = None) -> tuple[Any, Any, Backend]:
     """Load model using MLX backend."""
     try:
         from mlx_lm import load, generate
@@ -589,44 +711,83 @@ def _load_mlx(model_path: Path) -> tuple[Any, Any, Backend]:
         console.print("  pip install --upgrade mlx mlx-lm torch")
         raise SystemExit(1)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    timer = _LoadTimer(on_phase)
+    prepare_weights(weight_files(model_path), _copying_load_strategy(get_config().load_strategy), timer)
+    
+    with _progress(bar=False) as progress:
         task = progress.add_task("Loading model...", total=None)
         
-        # Use lazy=False to fully load model into memory at startup
-        # This ensures consistent inference speed throughout the session
-        model, tokenizer = load(
-            str(model_path),
-            lazy=False,
-        )
-        
-        # Force model evaluation to ensure weights are fully loaded
-        progress.update(task, description="Loading weights into memory...")
-        mx.eval(model.parameters())
+        with timed_phase(timer, "init"):
+            # Use lazy=False to fully load model into memory at startup
+            # This ensures consistent inference speed throughout the session
+            model, tokenizer = load(
+                str(model_path),
+                lazy=False,
+            )
+            
+            # Force model evaluation to ensure weights are fully loaded
+            progress.update(task, description="Loading weights into memory...")
+            mx.eval(model.parameters())
         
         # Warmup: Run a small inference to compile Metal shaders
         # This eliminates the cold start delay on first actual query
         progress.update(task, description="Warming up (compiling shaders)...")
-        _ = generate(
-            model,
-            tokenizer,
-            prompt="Hello",
-            max_tokens=1,
-            verbose=False,
-        )
+        with timed_phase(timer, "warmup"):
+            _ = generate(
+                model,
+                tokenizer,
+                prompt="Hello",
+                max_tokens=1,
+                verbose=False,
+            )
         
         progress.update(task, description="Model ready")
     
-    console.print("[dim]Model loaded and ready.[/dim]\n")
+    console.print(f"[dim]Model loaded and ready ({timer.summary()}).[/dim]\n")
     
     return model, tokenizer, "mlx"
 
 
-def _load_pytorch(model_path: Path) -> tuple[Any, Any, Backend]:
-    """Load model using PyTorch backend."""
+def _copying_load_strategy(strategy: str) -> str:
+    """
+    The load strategy for loaders that copy the weights out of their files (PyTorch, MLX).
+    
+    mlock pins the page-cache copy of the weight files, which only llama.cpp
+    serves from; these loaders convert or move the weights into memory of
+    their own, so pinning the files would keep a second, unused copy of the
+    model in RAM. They prewarm instead.
+    """
+    if strategy == "mlock":
+        console.print("[dim]load_strategy mlock only pins GGUF models; prewarming instead.[/dim]")
+        return "prewarm"
+    return strategy
+
+
+def _hub_weight_files(hf_model_id: str) -> list[Path]:
+    """Weight shards of a model already in the Hugging Face cache (none if not cached)."""
+    try:
+        from huggingface_hub import snapshot_download
+        
+        snapshot = snapshot_download(hf_model_id, local_files_only=True, allow_patterns=["*.safetensors"])
+    except Exception:
+        return []
+    return weight_files(snapshot)
+
+
+def _load_pytorch(
+    model_path: Path,
+    on_phase: Callable[[str, float], None] | None = None,
+    model_size: str | None = None,
+) -> tuple[Any, Any, Backend]:
+    """
+    Load model using PyTorch backend.
+    
+    In compiled mode (config backend.pytorch.mode) the warm-up switches the
+    model to a static KV cache and compiles it for every prompt bucket of
+    model_size's largest chunk (see compiled.py). On CPU, threads and NUMA
+    pinning are set up before loading and the weights are loaded as
+    backend.pytorch.cpu_dtype (see cpu.py).
+    """
     try:
         from transformers import AutoModelForCausalLM, AutoTokenizer
         import torch
@@ -636,56 +797,88 @@ def _load_pytorch(model_path: Path) -> tuple[Any, Any, Backend]:
         console.print("  pip install transformers torch accelerate")
         raise SystemExit(1)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    
+    # Get HuggingFace model ID from model_path
+    # model_path is like: ~/.cache/translate/models/translategemma-27b-it-4bit
+    model_name = model_path.name  # translategemma-27b-it-4bit
+    # Extract base name without quantization suffix
+    base_name = model_name.rsplit('-', 1)[0] if model_name.endswith('bit') else model_name
+    hf_model_id = f"google/{base_name}"
+    
+    # Memory-mapped strategies insist on safetensors shards, which are read
+    # through mmap (pickled .bin checkpoints are read into buffers first)
+    config = get_config()
+    strategy = _copying_load_strategy(config.load_strategy)
+    options = {"use_safetensors": True} if strategy in ("mmap", "prewarm") else {}
+    timer = _LoadTimer(on_phase)
+    if strategy == "prewarm":
+        prepare_weights(_hub_weight_files(hf_model_id), strategy, timer)
+    
+    if device == "cpu":
+        try:
+            cpu = tune_cpu(config.pytorch_threads, config.pytorch_interop_threads, config.pytorch_numa_node)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise SystemExit(1)
+        node = f", NUMA node {cpu['numa_node']}" if cpu["numa_node"] is not None else ""
+        console.print(
+            f"[dim]CPU: {cpu['threads']} threads on {cpu['physical_cores']} physical cores{node}, "
+            f"{config.pytorch_cpu_dtype} weights[/dim]"
+        )
+    
+    with _progress(bar=False) as progress:
         task = progress.add_task("Loading model...", total=None)
-        
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        
-        # Get HuggingFace model ID from model_path
-        # model_path is like: ~/.cache/translate/models/translategemma-27b-it-4bit
-        model_name = model_path.name  # translategemma-27b-it-4bit
-        # Extract base name without quantization suffix
-        base_name = model_name.rsplit('-', 1)[0] if model_name.endswith('bit') else model_name
-        hf_model_id = f"google/{base_name}"
-        
         progress.update(task, description=f"Loading from {hf_model_id}...")
         
-        # Load tokenizer from HuggingFace
-        tokenizer = AutoTokenizer.from_pretrained(hf_model_id)
-        
-        # Load model with bfloat16 (no quantization - more stable for TranslateGemma)
-        # Note: 27B model requires ~54GB VRAM, may need multiple GPUs
-        if device == "cuda":
-            model = AutoModelForCausalLM.from_pretrained(
-                hf_model_id,
-                dtype=torch.bfloat16,
-                device_map="auto",
-                trust_remote_code=True,
-            )
-        else:
-            model = AutoModelForCausalLM.from_pretrained(
-                hf_model_id,
-                torch_dtype=torch.float32,
-                trust_remote_code=True,
-                low_cpu_mem_usage=True,
-            )
-            model = model.to(device)
+        with timed_phase(timer, "init"):
+            # Load tokenizer from HuggingFace
+            tokenizer = AutoTokenizer.from_pretrained(hf_model_id)
+            
+            # Load model with bfloat16 (no quantization - more stable for TranslateGemma)
+            # Note: 27B model requires ~54GB VRAM, may need multiple GPUs
+            if device == "cuda":
+                model = AutoModelForCausalLM.from_pretrained(
+                    hf_model_id,
+                    dtype=torch.bfloat16,
+                    device_map="auto",
+                    trust_remote_code=True,
+                    **options,
+                )
+            else:
+                # int8 starts from bfloat16 so the load never holds float32 weights
+                model = AutoModelForCausalLM.from_pretrained(
+                    hf_model_id,
+                    torch_dtype=torch.float32 if config.pytorch_cpu_dtype == "float32" else torch.bfloat16,
+                    trust_remote_code=True,
+                    low_cpu_mem_usage=True,
+                    **options,
+                )
+                model = model.to(device)
+                if config.pytorch_cpu_dtype == "int8":
+                    progress.update(task, description="Quantizing linear layers to int8...")
+                    quantize_int8(model)
         
         # Warmup: Run a small inference to initialize CUDA kernels
         progress.update(task, description="Warming up...")
-        inputs = tokenizer("Hello", return_tensors="pt")
-        if device == "cuda":
-            inputs = {k: v.to("cuda:0") for k, v in inputs.items()}
-        with torch.no_grad():
-            _ = model.generate(**inputs, max_new_tokens=1, do_sample=False)
+        with timed_phase(timer, "warmup"):
+            compiled = False
+            if config.pytorch_mode == "compiled":
+                progress.update(task, description="Compiling for static prompt shapes...")
+                buckets = prompt_buckets(config.max_chunk_size(model_size or config.model_size))
+                compiled = compile_model(model, tokenizer, buckets, config.max_tokens)
+                if not compiled:
+                    console.print("[yellow]torch.compile is not available (needs torch 2); running in eager mode.[/yellow]")
+            if not compiled:
+                inputs = tokenizer("Hello", return_tensors="pt")
+                if device == "cuda":
+                    inputs = {k: v.to("cuda:0") for k, v in inputs.items()}
+                with torch.no_grad():
+                    _ = model.generate(**inputs, max_new_tokens=1, do_sample=False)
         
         progress.update(task, description="Model ready")
     
-    console.print("[dim]Model loaded and ready.[/dim]\n")
+    console.print(f"[dim]Model loaded and ready ({timer.summary()}).[/dim]\n")
     
     return model, tokenizer, "pytorch"
 
@@ -0,0 +1,300 @@
+"""Profiling of the Python-side overhead around model generation."""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+# Output suffixes written by the sampling profiler; anything else gets pstats
+SAMPLED_SUFFIXES = (".folded", ".collapsed")
+
+# Seconds between samples of the sampling profiler
+DEFAULT_INTERVAL = 0.005
+
+# Where time goes, as (category, path fragment, function names or None for
+# any function in a matching file). When a stack hits several categories the
+# earliest one wins: tokenizer calls made by transformers' generate() are
+# model time, while a chat template applied by the tokenizer is template time.
+CATEGORIES = (
+    ("model", "transformers/generation/", {"generate"}),
+    ("model", "llama_cpp/", {"create_completion", "_create_completion"}),
+    ("model", "mlx_lm/", {"generate", "stream_generate", "generate_step"}),
+    ("model", "translategemma_cli/backends.py", {"generate", "generate_stream"}),
+    ("model_load", "translategemma_cli/translator.py", {"ensure_model_loaded"}),
+    ("template", "translategemma_cli/translator.py", {"_format_local_prompt", "_format_messages_for_server"}),
+    ("tokenizer", "tokenization_utils", None),
+    ("tokenizer", "tokenizers/", None),
+    ("tokenizer", "mlx_lm/tokenizer_utils", None),
+    ("tokenizer", "llama_cpp/", {"tokenize", "detokenize"}),
+    ("detection", "translategemma_cli/detector.py", {"detect_language", "get_target_language"}),
+    ("chunking", "translategemma_cli/chunker.py", {"chunk"}),
+    ("chunking", "app_fastapi.py", {"split_text"}),
+    ("cleaning", "translategemma_cli/translator.py", {"_clean_output"}),
+    ("merge", "translategemma_cli/chunker.py", {"merge"}),
+    ("merge", "app_fastapi.py", {"_merge_translations"}),
+)
+CATEGORY_NAMES = tuple(dict.fromkeys(name for name, _, _ in CATEGORIES))
+
+# Called once per backend generation (or batch); used to count generations
+_GENERATION_MARKER = ("translategemma_cli/translator.py", "_record_generation")
+
+
+def categorize(filename: str, function: str) -> str | None:
+    """Category of a function, or None if it is not a tracked pipeline step."""
+    filename = filename.replace(os.sep, "/")
+    for category, fragment, names in CATEGORIES:
+        if fragment in filename and (names is None or function in names):
+            return category
+    return None
+
+
+def _rank(filename: str, function: str) -> int:
+    category = categorize(filename, function)
+    return CATEGORY_NAMES.index(category) if category else len(CATEGORY_NAMES)
+
+
+@dataclass
+class ProfileSummary:
+    """
+    Where the profiled wall time went.
+
+    categories holds seconds per pipeline step outside the model (plus
+    model_load); generations is the number of backend generations seen,
+    or None when the profiler cannot count calls.
+    """
+
+    total: float
+    model: float
+    categories: dict[str, float] = field(default_factory=dict)
+    generations: int | None = None
+    path: Path | None = None
+
+    @property
+    def outside_model(self) -> float:
+        """Seconds of Python work outside the model, excluding model loading."""
+        return max(0.0, self.total - self.model - self.categories.get("model_load", 0.0))
+
+    @property
+    def overhead_per_generation(self) -> float | None:
+        """Seconds of outside-model work per generation."""
+        if not self.generations:
+            return None
+        return self.outside_model / self.generations
+
+    def to_dict(self) -> dict:
+        """JSON-friendly summary with times in milliseconds."""
+        per_generation = self.overhead_per_generation
+        return {
+            "file": str(self.path) if self.path else None,
+            "total_ms": round(self.total * 1000, 1),
+            "model_ms": round(self.model * 1000, 1),
+            "outside_model_ms": round(self.outside_model * 1000, 1),
+            "generations": self.generations,
+            "overhead_per_generation_ms": round(per_generation * 1000, 2) if per_generation is not None else None,
+            "categories_ms": {name: round(seconds * 1000, 1) for name, seconds in self.categories.items()},
+        }
+
+    def format(self) -> str:
+        """Two-line human readable summary."""
+        def share(seconds: float) -> str:
+            return f"{seconds * 1000:.1f} ms ({seconds / self.total:.0%})" if self.total else f"{seconds * 1000:.1f} ms"
+
+        head = f"profile: total {self.total * 1000:.1f} ms · model {share(self.model)} · outside model {share(self.outside_model)}"
+        if self.overhead_per_generation is not None:
+            head += f" · {self.overhead_per_generation * 1000:.2f} ms/generation over {self.generations}"
+        tracked = sum(seconds for name, seconds in self.categories.items() if name != "model_load")
+        parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.categories.items()]
+        parts.append(f"other {max(0.0, self.outside_model - tracked) * 1000:.1f} ms")
+        lines = [head, "  " + " · ".join(parts)]
+        if self.path:
+            lines.append(f"  written to {self.path}")
+        return "\n".join(lines)
+
+
+class _Sampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="translategemma-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[tuple[tuple[str, str, int], ...]] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """
+    Profile a block of translation work in the current thread.
+
+    Two modes, picked from the output file suffix: cProfile (deterministic,
+    written as a pstats file, e.g. ``.prof``) or a py-spy style sampler with
+    lower overhead (collapsed stacks for flamegraph tools, ``.folded``).
+
+    Usage:
+        with Profiler("translate.prof") as profiler:
+            translator.translate_long(text)
+        print(profiler.summary.format())
+    """
+
+    def __init__(self, path: Path | str, interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize profiler.
+
+        Args:
+            path: Output file; .folded/.collapsed selects the sampling profiler
+            interval: Seconds between samples (sampling mode only)
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.sampling = self.path.suffix in SAMPLED_SUFFIXES
+        self.summary: ProfileSummary | None = None
+        self._profile: cProfile.Profile | None = None
+        self._sampler: _Sampler | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """Start profiling the calling thread."""
+        self._started = time.perf_counter()
+        if self.sampling:
+            self._sampler = _Sampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> ProfileSummary:
+        """Stop profiling, write the output file and summarize it."""
+        elapsed = time.perf_counter() - self._started
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.sampling:
+            self._sampler.stop()
+            self.summary = self._summarize_samples(self._sampler.stacks, elapsed)
+            self._write_collapsed(self._sampler.stacks)
+        else:
+            self._profile.disable()
+            self._profile.dump_stats(self.path)
+            self.summary = self._summarize_stats(pstats.Stats(self._profile), elapsed)
+        self.summary.path = self.path
+        return self.summary
+
+    def __enter__(self) -> Profiler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _write_collapsed(self, stacks: Counter) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                frames = ";".join(f"{name} ({os.path.basename(file)}:{line})" for file, name, line in stack)
+                f.write(f"{frames} {count}\n")
+
+    @staticmethod
+    def _summarize_samples(stacks: Counter, elapsed: float) -> ProfileSummary:
+        samples = sum(stacks.values())
+        weight = elapsed / samples if samples else 0.0
+        seconds = Counter()
+        for stack, count in stacks.items():
+            # A sample belongs to the highest-priority category on its stack
+            rank = min((_rank(file, name) for file, name, _ in stack), default=len(CATEGORY_NAMES))
+            if rank < len(CATEGORY_NAMES):
+                seconds[CATEGORY_NAMES[rank]] += count * weight
+        model = seconds.pop("model", 0.0)
+        categories = {name: seconds[name] for name in CATEGORY_NAMES if name in seconds}
+        return ProfileSummary(total=elapsed, model=model, categories=categories)
+
+    @staticmethod
+    def _summarize_stats(stats: pstats.Stats, elapsed: float) -> ProfileSummary:
+        seconds = Counter()
+        generations = 0
+        for (file, _, name), (_, calls, _, cumulative, callers) in stats.stats.items():
+            if file.replace(os.sep, "/").endswith(_GENERATION_MARKER[0]) and name == _GENERATION_MARKER[1]:
+                generations += calls
+            rank = _rank(file, name)
+            if rank == len(CATEGORY_NAMES):
+                continue
+            if not callers:
+                seconds[CATEGORY_NAMES[rank]] += cumulative
+                continue
+            # cProfile only records direct callers: count the time reached from
+            # callers that are not already part of the same or a higher category
+            for (caller_file, _, caller_name), edge in callers.items():
+                if _rank(caller_file, caller_name) > rank:
+                    seconds[CATEGORY_NAMES[rank]] += edge[3]
+        model = seconds.pop("model", 0.0)
+        categories = {name: seconds[name] for name in CATEGORY_NAMES if name in seconds}
+        return ProfileSummary(total=elapsed, model=model, categories=categories, generations=generations)
+
+
+# Only one cProfile profiler can be active per process on newer Pythons,
+# so concurrent server requests are profiled one at a time
+_profile_lock = threading.Lock()
+
+
+class RequestProfiler:
+    """
+    Per-request profiling for the server, enabled with PROFILE=1 (cProfile)
+    or PROFILE=sample (sampling).
+
+    Each profiled request writes one file to the output directory. Requests
+    arriving while another one is being profiled run unprofiled.
+    """
+
+    def __init__(self, mode: str | None, directory: Path | str | None = None):
+        """
+        Initialize request profiler.
+
+        Args:
+            mode: "1"/"cprofile", "sample", or a false value to disable
+            directory: Directory for the profile files (default: ~/.cache/translate/profiles)
+        """
+        from .config import DEFAULT_CACHE_DIR
+
+        mode = (mode or "").lower()
+        self.enabled = mode not in ("", "0", "false", "no", "off")
+        self.suffix = ".folded" if mode == "sample" else ".prof"
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR / "profiles"
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[Profiler | None]:
+        """
+        Profile the block in the calling thread.
+
+        Yields:
+            The profiler (its summary is set once the block exits), or None
+            if profiling is disabled or another request holds the profiler
+        """
+        if not self.enabled or not _profile_lock.acquire(blocking=False):
+            yield None
+            return
+        try:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            with Profiler(self.directory / f"{stamp}-{name}-{threading.get_ident()}{self.suffix}") as profiler:
+                yield profiler
+        finally:
+            _profile_lock.release()
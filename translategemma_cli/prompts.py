@@ -0,0 +1,136 @@
+"""Precompiled chat prompts for the Hugging Face tokenizers (PyTorch, MLX).
+
+Rendering the chat template runs Jinja and the rendered string is then
+tokenized whole, although only the user text differs between chunks of a
+language pair. PromptBuilder renders the template once per (source, target)
+pair around a sentinel, tokenizes the parts before and after it, and builds
+each prompt as prefix IDs + text IDs + suffix IDs.
+
+Token IDs of concatenated strings are not always the concatenation of their
+IDs (a tokenizer may merge across the seam), so a pair's split is checked
+against the full render for a set of probe texts first; a pair that does not
+split cleanly keeps using the template.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Stands in for the user text when the template is rendered (private-use
+# code points, so it cannot occur in the template itself)
+SENTINEL = "\ue000translategemma\ue001"
+
+# Texts whose full render must tokenize exactly like the precompiled split:
+# letters, digits, punctuation, CJK and newlines at both ends of the text
+PROBES = (
+    "Hello, world.",
+    "42 apples",
+    "«Bonjour» — 3 €",
+    "你好，世界。",
+    "line one\nline two",
+    "(see above)!",
+)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Token IDs around the user text for one language pair."""
+
+    prefix: tuple[int, ...]
+    suffix: tuple[int, ...]
+    # Whether the template trims the text (so the builder must too)
+    strip: bool
+
+
+class PromptBuilder:
+    """
+    Build prompt token IDs without rendering the chat template per chunk.
+
+    Args:
+        tokenizer: Hugging Face tokenizer (or mlx_lm wrapper) with
+            apply_chat_template() and encode()
+        format_messages: Builds the chat messages for (text, source, target)
+        encode: Tokenizes a whole rendered prompt the way the backend does
+            (defaults to tokenizer.encode with special tokens)
+    """
+
+    def __init__(
+        self,
+        tokenizer: Any,
+        format_messages: Callable[[str, str, str], list[dict]],
+        encode: Callable[[str], list[int]] | None = None,
+    ):
+        self.tokenizer = tokenizer
+        self.format_messages = format_messages
+        self.encode = encode or (lambda prompt: list(tokenizer.encode(prompt)))
+        self._templates: dict[tuple[str, str], PromptTemplate | None] = {}
+        self._lock = threading.Lock()
+
+    def render(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Render the chat template for text (the uncached path)."""
+        return self.tokenizer.apply_chat_template(
+            self.format_messages(text, source_lang, target_lang),
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+
+    def template(self, source_lang: str, target_lang: str) -> PromptTemplate | None:
+        """The precompiled template of a language pair, or None if it does not split cleanly."""
+        key = (source_lang, target_lang)
+        try:
+            return self._templates[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._templates:
+                self._templates[key] = self._compile(source_lang, target_lang)
+            return self._templates[key]
+
+    def build(self, text: str, source_lang: str, target_lang: str) -> list[int]:
+        """
+        Token IDs of the prompt for text, identical to encoding render(text).
+
+        Falls back to rendering the template when the pair has no
+        precompiled template, or when the text has surrounding whitespace
+        the template keeps (it could merge with the template's own).
+        """
+        template = self.template(source_lang, target_lang)
+        if template is not None:
+            if template.strip:
+                text = text.strip()
+            if template.strip or text == text.strip():
+                return [*template.prefix, *self._encode_text(text), *template.suffix]
+        return self.encode(self.render(text, source_lang, target_lang))
+
+    def clear(self) -> None:
+        """Forget compiled templates (e.g. after the tokenizer changed)."""
+        with self._lock:
+            self._templates.clear()
+
+    def _encode_text(self, text: str) -> list[int]:
+        return list(self.tokenizer.encode(text, add_special_tokens=False)) if text else []
+
+    def _compile(self, source_lang: str, target_lang: str) -> PromptTemplate | None:
+        rendered = self.render(SENTINEL, source_lang, target_lang)
+        if not isinstance(rendered, str) or rendered.count(SENTINEL) != 1:
+            return None
+        prefix, suffix = rendered.split(SENTINEL)
+        padded = self.render(f" {SENTINEL} ", source_lang, target_lang)
+        if padded == rendered:
+            strip = True
+        elif padded == f"{prefix} {SENTINEL} {suffix}":
+            strip = False
+        else:
+            return None
+        template = PromptTemplate(
+            prefix=tuple(self.encode(prefix)),
+            suffix=tuple(self.tokenizer.encode(suffix, add_special_tokens=False)),
+            strip=strip,
+        )
+        for probe in PROBES:
+            split = [*template.prefix, *self._encode_text(probe), *template.suffix]
+            if split != list(self.encode(self.render(probe, source_lang, target_lang))):
+                return None
+        return template
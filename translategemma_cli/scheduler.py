@@ -0,0 +1,222 @@
+"""Request scheduling for shared translation models."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from .cancellation import CancellationToken, TranslationCancelled
+
+# Priority classes, most urgent first
+PRIORITIES = ("interactive", "batch", "background")
+
+# Share of generation slots each class receives under contention
+DEFAULT_WEIGHTS = {"interactive": 8.0, "batch": 2.0, "background": 1.0}
+
+# Queue waits kept per class for percentile stats
+WAIT_SAMPLES = 1000
+
+
+def priority_rank(priority: str) -> int:
+    """
+    Return the rank of a priority class (0 is the most urgent).
+
+    Raises:
+        ValueError: If priority is not one of PRIORITIES
+    """
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})") from None
+
+
+@dataclass(order=True)
+class _Ticket:
+    """A waiter's place in the queue, ordered by virtual finish time."""
+
+    finish: float
+    seq: int
+    priority: str = field(compare=False)
+    flow: str = field(compare=False)
+    start: float = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class GenerationScheduler:
+    """
+    Hands out generation slots on a shared model one chunk at a time.
+
+    A single loaded model cannot run several generations concurrently, so
+    callers wrap each chunk in ``with scheduler.slot(token, priority, flow):``.
+
+    Slots are shared by weighted fair queuing at chunk granularity: every
+    flow (an API key or client address) receives a share of generation
+    slots proportional to the weight of its priority class. One client's
+    500-chunk upload cannot starve other users, and an interactive request
+    only waits a few chunks even when bulk work is queued. Within a flow,
+    chunks are served first-come, first-served.
+
+    A waiter whose token is cancelled leaves the queue without ever touching
+    the model, and a running chunk that is cancelled releases its slot as
+    soon as the backend stops, so capacity goes straight to the next waiter.
+    """
+
+    # How often waiters re-check their cancellation token (seconds)
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, capacity: int = 1, weights: dict[str, float] | None = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            capacity: Number of chunks allowed to generate concurrently
+            weights: Relative slot share per priority class (default: DEFAULT_WEIGHTS)
+
+        Raises:
+            ValueError: If capacity or a weight is not positive, or a weight
+                names a class that is not one of PRIORITIES
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        unknown = sorted(set(weights or {}) - set(PRIORITIES))
+        if unknown:
+            raise ValueError(f"Unknown priority in weights: {', '.join(unknown)} (expected one of {', '.join(PRIORITIES)})")
+        self._weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if any(self._weights[name] <= 0 for name in PRIORITIES):
+            raise ValueError("weights must be positive")
+        self._capacity = capacity
+        self._active = 0
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        # Fair queuing state: system virtual time and each flow's last finish tag
+        self._virtual_time = 0.0
+        self._flow_finish: dict[str, float] = {}
+        self._waits = {name: deque(maxlen=WAIT_SAMPLES) for name in PRIORITIES}
+        self._served = {name: 0 for name in PRIORITIES}
+        self._wait_total = {name: 0.0 for name in PRIORITIES}
+
+    @property
+    def active(self) -> int:
+        """Number of slots currently in use."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for a slot."""
+        return len(self._queue)
+
+    @contextmanager
+    def slot(
+        self,
+        cancel_token: CancellationToken | None = None,
+        priority: str = "interactive",
+        flow: str | None = None,
+    ) -> Iterator[None]:
+        """
+        Wait for a generation slot and hold it for the duration of the block.
+
+        Args:
+            cancel_token: Token that abandons the wait when cancelled (optional)
+            priority: Priority class of the caller, one of PRIORITIES
+            flow: Fairness key such as an API key or client IP (optional)
+
+        Raises:
+            TranslationCancelled: If the token is cancelled while waiting
+            ValueError: If priority is unknown
+        """
+        priority_rank(priority)
+        with self._cond:
+            ticket = self._enqueue(priority, f"{priority}:{flow or '-'}")
+            try:
+                while min(self._queue) is not ticket or self._active >= self._capacity:
+                    if cancel_token is not None and cancel_token.is_cancelled:
+                        raise TranslationCancelled(cancel_token.reason or "Translation cancelled")
+                    self._cond.wait(self.POLL_INTERVAL)
+            except BaseException:
+                self._queue.remove(ticket)
+                self._release_tag(ticket)
+                self._cond.notify_all()
+                raise
+            self._queue.remove(ticket)
+            self._active += 1
+            self._record_start(ticket)
+            self._cond.notify_all()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def _enqueue(self, priority: str, flow: str) -> _Ticket:
+        # Start-time fair queuing: a chunk costs 1/weight of virtual time, and a
+        # flow that was idle restarts at the current virtual time (no saved credit)
+        start = max(self._virtual_time, self._flow_finish.get(flow, 0.0))
+        finish = start + 1.0 / self._weights[priority]
+        self._flow_finish[flow] = finish
+        ticket = _Ticket(finish, next(self._seq), priority, flow, start, time.monotonic())
+        self._queue.append(ticket)
+        return ticket
+
+    def _release_tag(self, ticket: _Ticket) -> None:
+        # A waiter that gave up should not push its flow's next chunk back
+        if self._flow_finish.get(ticket.flow) == ticket.finish:
+            self._flow_finish[ticket.flow] = ticket.start
+
+    def _record_start(self, ticket: _Ticket) -> None:
+        self._virtual_time = max(self._virtual_time, ticket.start)
+        # Flows whose last chunk finished in the virtual past carry no state
+        self._flow_finish = {
+            flow: finish for flow, finish in self._flow_finish.items() if finish > self._virtual_time
+        }
+        wait = time.monotonic() - ticket.enqueued_at
+        self._waits[ticket.priority].append(wait)
+        self._served[ticket.priority] += 1
+        self._wait_total[ticket.priority] += wait
+
+    def wait_stats(self) -> dict:
+        """Return queue wait statistics per priority class, in milliseconds."""
+        with self._cond:
+            stats = {}
+            for name in PRIORITIES:
+                samples = sorted(self._waits[name])
+                served = self._served[name]
+                stats[name] = {
+                    "served": served,
+                    "total_ms": round(self._wait_total[name] * 1000, 1),
+                    "avg_ms": round(self._wait_total[name] / served * 1000, 1) if served else 0.0,
+                    "p50_ms": _percentile_ms(samples, 0.50),
+                    "p95_ms": _percentile_ms(samples, 0.95),
+                    "max_ms": round(samples[-1] * 1000, 1) if samples else 0.0,
+                }
+            return stats
+
+    def stats(self) -> dict:
+        """Return current queue depth, slot usage and queue wait times."""
+        with self._cond:
+            queued = [ticket.priority for ticket in self._queue]
+            flows = {ticket.flow for ticket in self._queue}
+        return {
+            "capacity": self._capacity,
+            "active": self._active,
+            "queued": len(queued),
+            "queued_by_priority": {name: queued.count(name) for name in PRIORITIES},
+            "queued_flows": len(flows),
+            "weights": {name: self._weights[name] for name in PRIORITIES},
+            "queue_wait": self.wait_stats(),
+        }
+
+
+def _percentile_ms(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples, in milliseconds."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(q * len(samples)))
+    return round(samples[index] * 1000, 1)
@@ -0,0 +1,150 @@
+"""Import-time breakdown of the CLI's startup path.
+
+Startup is measured in a fresh interpreter with `python -X importtime`, so
+the numbers do not depend on what the current process already imported.
+The same measurement backs `translate --startup-stats` and the startup
+budget test.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+# Module whose import is the CLI's startup cost
+CLI_MODULE = "translategemma_cli.cli"
+
+# Modules that must not be imported until a command needs them
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "llama_cpp",
+    "huggingface_hub",
+    "prompt_toolkit",
+    "mlx",
+    "mlx_lm",
+)
+
+# Budget for importing CLI_MODULE, in milliseconds as reported by -X importtime
+# (which itself adds overhead); about twice what a laptop measures
+STARTUP_BUDGET_MS = 400.0
+
+_PREFIX = "import time:"
+
+
+@dataclass
+class ImportTiming:
+    """One line of -X importtime output; times in milliseconds."""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    """Imports made by importing a module in a fresh interpreter."""
+
+    module: str
+    import_ms: float
+    process_ms: float
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def heavy(self) -> list[str]:
+        """HEAVY_MODULES (or their submodules) that were imported."""
+        return sorted({
+            timing.module.split(".")[0]
+            for timing in self.timings
+            if timing.module.split(".")[0] in HEAVY_MODULES
+        })
+
+    def by_package(self, limit: int | None = None) -> list[tuple[str, float]]:
+        """
+        Self time summed per top-level package, largest first.
+
+        Modules of this package are reported individually
+        (e.g. "translategemma_cli.model") since that is where time can be cut.
+        Imports made by the interpreter before the module (site, .pth
+        files) are excluded.
+        """
+        totals: dict[str, float] = {}
+        for timing in self._module_timings():
+            parts = timing.module.split(".")
+            key = ".".join(parts[:2]) if parts[0] == __package__ else parts[0]
+            totals[key] = totals.get(key, 0.0) + timing.self_ms
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def _module_timings(self) -> list[ImportTiming]:
+        # Lines are printed as imports finish, so the module's own line comes
+        # after everything it imported; earlier top-level lines were site's
+        end = next((i for i, timing in enumerate(self.timings) if timing.module == self.module and timing.depth == 0), None)
+        if end is None:
+            return []
+        start = end
+        while start > 0 and self.timings[start - 1].depth > 0:
+            start -= 1
+        return self.timings[start:end + 1]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Lines look like "import time:   1234 |   5678 |   package.module",
+    with microseconds and two spaces of indentation per nesting level.
+    Other lines, and the header, are ignored.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith(_PREFIX):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len(_PREFIX):].split("|", 2)
+            self_ms = int(self_us) / 1000
+            cumulative_ms = int(cumulative_us) / 1000
+        except ValueError:
+            continue  # header
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        timings.append(ImportTiming(module, self_ms, cumulative_ms, depth))
+    return timings
+
+
+def measure_startup(module: str = CLI_MODULE, python: str | None = None) -> StartupReport:
+    """
+    Import module in a fresh interpreter and report what it cost.
+
+    Args:
+        module: Module to import
+        python: Interpreter to use (default: the current one)
+
+    Returns:
+        The report; import_ms is the module's cumulative import time,
+        process_ms the wall time of the whole interpreter run
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    process_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError(f"Importing {module} failed: {error[-1] if error else result.returncode}")
+    timings = parse_importtime(result.stderr)
+    own = next((timing for timing in timings if timing.module == module and timing.depth == 0), None)
+    return StartupReport(
+        module=module,
+        import_ms=own.cumulative_ms if own else 0.0,
+        process_ms=process_ms,
+        timings=timings,
+    )
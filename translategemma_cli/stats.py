@@ -0,0 +1,117 @@
+"""Token counts and timing of individual generations."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+# Why a generation ended
+STOP = "stop"            # End-of-turn / EOS token or a stop sequence
+LENGTH = "length"        # Hit max_tokens
+CANCELLED = "cancelled"  # Cancellation token fired or the consumer stopped reading
+
+STOP_REASONS = (STOP, LENGTH, CANCELLED)
+
+
+@dataclass
+class GenerationStats:
+    """
+    Token counts and timing of one backend generation.
+    
+    Times are in seconds. TTFT (time to first token) covers prompt processing
+    (prefill) plus the first sampled token; everything after it is decode.
+    Counts and times a backend does not report are None.
+    """
+    
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    ttft: float | None = None
+    total_time: float = 0.0
+    stop_reason: str | None = None
+    started_at: float = field(default_factory=time.perf_counter, repr=False, compare=False)
+
+    def first_token(self) -> None:
+        """Record the arrival of a token; only the first call sets TTFT."""
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.started_at
+
+    def add_token(self) -> None:
+        """Record one generated token; the first one also sets TTFT."""
+        self.first_token()
+        self.completion_tokens = (self.completion_tokens or 0) + 1
+
+    def finish(self, stop_reason: str | None = None) -> GenerationStats:
+        """Record the total time (and stop reason if given) and return self."""
+        self.total_time = time.perf_counter() - self.started_at
+        if stop_reason is not None:
+            self.stop_reason = stop_reason
+        return self
+
+    @property
+    def decode_time(self) -> float | None:
+        """Seconds spent after the first token, or None without TTFT."""
+        if self.ttft is None:
+            return None
+        return max(0.0, self.total_time - self.ttft)
+
+    @property
+    def inter_token_latency(self) -> float | None:
+        """Average seconds between consecutive decoded tokens."""
+        decode_time = self.decode_time
+        if decode_time is None or not self.completion_tokens or self.completion_tokens < 2:
+            return None
+        return decode_time / (self.completion_tokens - 1)
+
+    @property
+    def decode_tokens_per_second(self) -> float | None:
+        """Decode throughput; the first token is counted as part of prefill."""
+        latency = self.inter_token_latency
+        if not latency:
+            return None
+        return 1.0 / latency
+
+    def to_dict(self) -> dict:
+        """JSON-friendly summary with times in milliseconds."""
+        def ms(seconds: float | None) -> float | None:
+            return round(seconds * 1000, 1) if seconds is not None else None
+        
+        rate = self.decode_tokens_per_second
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "ttft_ms": ms(self.ttft),
+            "inter_token_ms": ms(self.inter_token_latency),
+            "decode_tokens_per_second": round(rate, 1) if rate is not None else None,
+            "total_ms": ms(self.total_time),
+            "stop_reason": self.stop_reason,
+        }
+
+    @classmethod
+    def combine(cls, stats: Iterable[GenerationStats]) -> GenerationStats | None:
+        """
+        Aggregate the generations of a multi-chunk or batched request.
+        
+        Token counts and times are summed, TTFT is the first generation's
+        (what the caller waited for) and the stop reason is the last one's.
+        Decode rates of the result therefore include later chunks' prefill.
+        
+        Returns:
+            Combined stats, or None if stats is empty
+        """
+        stats = [s for s in stats if s is not None]
+        if not stats:
+            return None
+
+        def total(values: list[int | None]) -> int | None:
+            known = [v for v in values if v is not None]
+            return sum(known) if known else None
+        
+        return cls(
+            prompt_tokens=total([s.prompt_tokens for s in stats]),
+            completion_tokens=total([s.completion_tokens for s in stats]),
+            ttft=stats[0].ttft,
+            total_time=sum(s.total_time for s in stats),
+            stop_reason=stats[-1].stop_reason,
+            started_at=stats[0].started_at,
+        )
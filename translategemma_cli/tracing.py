@@ -0,0 +1,359 @@
+"""Tracing spans across the translation pipeline, exportable to OpenTelemetry."""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
+
+# Exporters accepted by configure() (and the TRACE_EXPORTER environment variable)
+EXPORTERS = ("none", "json", "otel")
+
+# Spans kept in memory by JSONExporter
+DEFAULT_MAX_SPANS = 10000
+
+
+@dataclass
+class Span:
+    """
+    One timed operation in a trace.
+
+    Times are nanoseconds since the epoch, as OpenTelemetry expects. A span
+    whose block raised has status "error" and the exception in error.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "ok"
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float | None:
+        """Span duration in milliseconds, or None while it is running."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute; None values are skipped."""
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        """Attach several attributes; None values are skipped."""
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span failed with the given exception."""
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter (only the first call counts)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        _exporter.export(self)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly representation."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoOpSpan:
+    """Span handed out while tracing is disabled; every method does nothing."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoOpSpan()
+
+
+class SpanExporter:
+    """
+    Receives spans as they start and finish.
+
+    Subclass and override export() (and on_start() if the backend needs to
+    know about open spans). An exporter with enabled = False turns tracing
+    off entirely: no spans are created and span() costs a single check.
+    """
+
+    enabled = True
+
+    def on_start(self, span: Span) -> None:
+        """A span started."""
+
+    def export(self, span: Span) -> None:
+        """A span finished."""
+
+    def shutdown(self) -> None:
+        """Flush and release resources."""
+
+
+class NoOpExporter(SpanExporter):
+    """Default exporter: tracing disabled."""
+
+    enabled = False
+
+
+class JSONExporter(SpanExporter):
+    """
+    Keeps finished spans in process and optionally appends them to a file.
+
+    Useful in tests (no collector needed) and for ad-hoc profiling: every
+    finished span is written as one JSON line.
+    """
+
+    def __init__(self, path: Path | str | None = None, max_spans: int = DEFAULT_MAX_SPANS):
+        """
+        Initialize exporter.
+
+        Args:
+            path: JSON lines file to append spans to (optional)
+            max_spans: Number of recent spans kept in memory
+        """
+        self.path = Path(path) if path is not None else None
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._file: TextIO | None = None
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if self.path is not None:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+                self._file.flush()
+
+    @property
+    def spans(self) -> list[Span]:
+        """Finished spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def find(self, name: str) -> list[Span]:
+        """Finished spans with the given name."""
+        return [span for span in self.spans if span.name == name]
+
+    def to_json(self) -> str:
+        """All kept spans as a JSON array."""
+        return json.dumps([span.to_dict() for span in self.spans], ensure_ascii=False, default=str)
+
+    def clear(self) -> None:
+        """Forget the kept spans."""
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Re-emits spans through the OpenTelemetry API.
+
+    Requires opentelemetry-api; configure the SDK and its exporter (OTLP,
+    Jaeger, console, ...) as usual, e.g. with opentelemetry-instrument.
+    """
+
+    def __init__(self, tracer: Any = None):
+        """
+        Initialize exporter.
+
+        Args:
+            tracer: OpenTelemetry tracer (default: the global "translategemma" tracer)
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetry tracing requires opentelemetry-api. "
+                "Install with: pip install opentelemetry-api opentelemetry-sdk"
+            ) from None
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("translategemma")
+        self._open: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._open.get(span.parent_id) if span.parent_id else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(
+            span.name, context=context, attributes=span.attributes, start_time=span.start_ns
+        )
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(span.attributes)
+        if span.status == "error":
+            from opentelemetry.trace import Status, StatusCode
+
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.end_ns)
+
+
+_exporter: SpanExporter = NoOpExporter()
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("translategemma_span", default=None)
+
+
+def set_exporter(exporter: SpanExporter | None) -> SpanExporter:
+    """
+    Install the span exporter; None disables tracing.
+
+    Returns:
+        The previously installed exporter
+    """
+    global _exporter
+    previous = _exporter
+    _exporter = exporter or NoOpExporter()
+    return previous
+
+
+def get_exporter() -> SpanExporter:
+    """Get the installed span exporter."""
+    return _exporter
+
+
+def configure(name: str = "none", path: Path | str | None = None) -> SpanExporter:
+    """
+    Install an exporter by name.
+
+    Args:
+        name: One of EXPORTERS ("none", "json" or "otel")
+        path: JSON lines file for the json exporter (optional)
+
+    Returns:
+        The installed exporter
+
+    Raises:
+        ValueError: If name is unknown
+    """
+    name = (name or "none").lower()
+    if name == "none":
+        exporter = NoOpExporter()
+    elif name == "json":
+        exporter = JSONExporter(path)
+    elif name == "otel":
+        exporter = OpenTelemetryExporter()
+    else:
+        raise ValueError(f"Unknown trace exporter: {name} (expected one of {', '.join(EXPORTERS)})")
+    set_exporter(exporter)
+    return exporter
+
+
+def current_span() -> Span | None:
+    """The span active in this context, if any."""
+    return _current.get()
+
+
+def start_span(name: str, **attributes) -> Span | _NoOpSpan:
+    """
+    Start a span under the current one without making it current.
+
+    Use this where a span outlives a single block of code, such as across
+    the yields of a generator, and call end() on it when done.
+    """
+    if not _exporter.enabled:
+        return NOOP_SPAN
+    parent = _current.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent is not None else None,
+    )
+    span.set_attributes(attributes)
+    _exporter.on_start(span)
+    return span
+
+
+@contextmanager
+def use_span(span: Span | _NoOpSpan) -> Iterator[None]:
+    """Make span current for the block, so spans started inside become its children."""
+    if not isinstance(span, Span):
+        yield
+        return
+    token = _current.set(span)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | _NoOpSpan]:
+    """
+    Trace the block as a child of the current span.
+
+    Exceptions mark the span failed and are re-raised (task cancellation
+    and generator exits are not failures). With tracing disabled this
+    yields a no-op span and records nothing.
+    """
+    if not _exporter.enabled:
+        yield NOOP_SPAN
+        return
+    current = start_span(name, **attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.record_exception(e)
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+
+
+def bind_context(func: Callable) -> Callable:
+    """
+    Carry the current span into another thread.
+
+    Executors do not copy context variables, so wrap callables before
+    handing them to run_in_executor() or a thread pool.
+    """
+    return functools.partial(contextvars.copy_context().run, func)
@@ -3,13 +3,23 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Generator, Literal, Callable
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Generator, Iterator, Literal, Callable
 
-from .config import get_config, OutputMode, SUPPORTED_LANGUAGES, BackendType
+from .config import get_config, OutputMode, SUPPORTED_LANGUAGES, BackendType, GenerationParams, RequestContext
 from .detector import detect_language, get_target_language
 from .model import load_model, Backend, get_backend as get_local_backend
-from .backends import VLLMBackend, OllamaBackend
+from .backends import VLLMBackend, OllamaBackend, FakeBackend
 from .chunker import TextChunker, Chunk
+from .prompts import PromptBuilder
+from .compiled import bucket_length, compiled_shapes, completion_budget, pad_prompt
+from .loading import release_weights
+from .cancellation import CancellationToken, raise_if_cancelled
+from .metrics import TranslatorObserver
+from . import tracing
+from .stats import GenerationStats, STOP, LENGTH
 
 
 # Language code mapping to TranslateGemma's supported codes
@@ -20,7 +30,7 @@
 }
 
 # Extended backend type including server backends
-ExtendedBackend = Literal["mlx", "pytorch", "gguf", "vllm", "ollama"]
+ExtendedBackend = Literal["mlx", "pytorch", "gguf", "vllm", "ollama", "fake"]
 
 
 class Translator:
@@ -33,10 +43,25 @@ def __init__(self):
         self._force_target: str | None = None
         self._output_mode: OutputMode = "direct"
         self._current_model_size: str | None = None
+        self._current_quantization: int | None = None
+        # Chat template precompiled per language pair (mlx, pytorch)
+        self._prompt_builder: PromptBuilder | None = None
+        # Padded prompt lengths and static KV cache length of a compiled PyTorch model (see compiled.py)
+        self._prompt_buckets: tuple[int, ...] | None = None
+        self._static_cache_length: int | None = None
+        # Set by unload(): translating then raises instead of loading the config defaults
+        self._unloaded = False
         
         # Server backends
         self._vllm_backend: VLLMBackend | None = None
         self._ollama_backend: OllamaBackend | None = None
+        # Deterministic fake model for performance tests
+        self._fake_backend: FakeBackend | None = None
+        
+        # Instrumentation hooks (metrics, logging)
+        self._observers: list[TranslatorObserver] = []
+        # Per-thread stats of the last translation (server backends translate concurrently)
+        self._local = threading.local()
 
     def _resolve_backend(self, backend_type: BackendType) -> ExtendedBackend:
         """
@@ -46,7 +71,7 @@ def _resolve_backend(self, backend_type: BackendType) -> ExtendedBackend:
             backend_type: Configured backend type (may be "auto")
             
         Returns:
-            Resolved backend: mlx, pytorch, gguf, vllm, or ollama
+            Resolved backend: mlx, pytorch, gguf, vllm, ollama, or fake
         """
         if backend_type == "auto":
             config = get_config()
@@ -59,6 +84,7 @@ def ensure_model_loaded(
         self,
         model_size: str | None = None,
         backend_type: BackendType | None = None,
+        quantization_bits: int | None = None,
     ) -> None:
         """
         Ensure the model is loaded.
@@ -66,23 +92,40 @@ def ensure_model_loaded(
         Args:
             model_size: Model size to load. If None, uses config default.
             backend_type: Backend to use. If None, uses config default.
+            quantization_bits: Quantization of local models. If None, uses config default.
         """
+        unloaded = self._unloaded
+        try:
+            self._load(model_size, backend_type, quantization_bits)
+        except BaseException:
+            # A switch unloads the old model first; that is not an unload by
+            # the caller, so a failed load leaves later calls free to retry
+            self._unloaded = unloaded
+            raise
+        self._unloaded = False
+
+    def _load(
+        self,
+        model_size: str | None,
+        backend_type: BackendType | None,
+        quantization_bits: int | None,
+    ) -> None:
+        """Load (or switch to) the model and backend; see ensure_model_loaded()."""
         config = get_config()
         size = model_size or config.model_size
+        bits = quantization_bits or config.quantization_bits
         backend_cfg = backend_type or config.backend_type
         resolved_backend = self._resolve_backend(backend_cfg)
         
         # Check if we need to switch backends
         if self._backend != resolved_backend:
-            self._model = None
-            self._tokenizer = None
-            self._vllm_backend = None
-            self._ollama_backend = None
+            self.unload()
             self._current_model_size = None
         
         # For server backends, initialize the client
         if resolved_backend == "vllm":
             if self._vllm_backend is None:
+                start = time.perf_counter()
                 self._vllm_backend = VLLMBackend(
                     server_url=config.vllm_url,
                     model=None,  # Use server default
@@ -90,6 +133,9 @@ def ensure_model_loaded(
                 available, error = self._vllm_backend.is_available()
                 if not available:
                     raise RuntimeError(f"vLLM server not available: {error}")
+                self._backend = "vllm"
+                self._current_model_size = size
+                self._record_load(time.perf_counter() - start)
             self._backend = "vllm"
             self._current_model_size = size
             self._output_mode = config.output_mode
@@ -97,6 +143,7 @@ def ensure_model_loaded(
         
         if resolved_backend == "ollama":
             if self._ollama_backend is None:
+                start = time.perf_counter()
                 ollama_model = OllamaBackend.MODEL_MAP.get(size, f"translategemma:{size}")
                 self._ollama_backend = OllamaBackend(
                     server_url=config.ollama_url,
@@ -113,21 +160,34 @@ def ensure_model_loaded(
                     console.print(f"[yellow]Model {ollama_model} not found in Ollama.[/yellow]")
                     console.print("[dim]Pulling model...[/dim]")
                     self._ollama_backend.pull_model()
+                
+                self._backend = "ollama"
+                self._current_model_size = size
+                self._record_load(time.perf_counter() - start)
             
             self._backend = "ollama"
             self._current_model_size = size
             self._output_mode = config.output_mode
             return
         
+        if resolved_backend == "fake":
+            if self._fake_backend is None:
+                start = time.perf_counter()
+                self._fake_backend = FakeBackend.from_config(config.fake_backend)
+                self._record_load(time.perf_counter() - start)
+            self._backend = "fake"
+            self._current_model_size = size
+            self._output_mode = config.output_mode
+            return
+        
         # Local backends (mlx, pytorch, gguf)
         # Check if we need to switch models
-        if self._model is not None and self._current_model_size == size:
+        if self._model is not None and self._current_model_size == size and self._current_quantization in (None, bits):
             return
         
         # Unload current model if switching
         if self._model is not None and self._current_model_size != size:
-            self._model = None
-            self._tokenizer = None
+            self.unload()
         
         # Determine model format based on backend
         if resolved_backend == "gguf":
@@ -136,14 +196,74 @@ def ensure_model_loaded(
             model_format = "hf"  # MLX and PyTorch use HuggingFace format
         else:
             model_format = None  # Let load_model decide
-        self._model, self._tokenizer, self._backend = load_model(size, model_format)
+        start = time.perf_counter()
+        self._model, self._tokenizer, self._backend = load_model(
+            size, model_format, on_phase=self._record_load_phase, quantization_bits=bits
+        )
         self._current_model_size = size
+        self._current_quantization = bits
         self._output_mode = config.output_mode
+        # Only a model that actually compiled gains anything from padded prompts
+        shapes = compiled_shapes(self._model) if self._backend == "pytorch" else None
+        self._prompt_buckets, self._static_cache_length = shapes or (None, None)
+        self._record_load(time.perf_counter() - start)
+
+    def _require_model(self) -> None:
+        """
+        Load the configured model on first use.
+        
+        Raises:
+            RuntimeError: If the model was unloaded; whoever unloaded it (e.g.
+                the server's idle unload) must load the intended model again,
+                rather than the config defaults being loaded behind its back
+        """
+        if self.is_loaded:
+            return
+        if self._unloaded:
+            raise RuntimeError("The model was unloaded; call ensure_model_loaded() before translating")
+        self.ensure_model_loaded()
+
+    def unload(self) -> None:
+        """Release the model (or server client) so its memory can be reclaimed."""
+        if not self.is_loaded:
+            return
+        labels = self.metric_labels()
+        if self._model is not None:
+            # Unpin and stop prewarming the local model's weight files
+            release_weights()
+        self._model = None
+        self._tokenizer = None
+        self._prompt_builder = None
+        self._prompt_buckets = None
+        self._static_cache_length = None
+        self._vllm_backend = None
+        self._ollama_backend = None
+        self._fake_backend = None
+        self._current_model_size = None
+        self._current_quantization = None
+        self._unloaded = True
+        self._notify("on_model_unload", labels)
+
+    @property
+    def last_stats(self) -> GenerationStats | None:
+        """
+        Token counts and timing of the last translation made by this thread.
+        
+        Set by translate(), translate_long(), translate_stream() (once the
+        stream is exhausted) and translate_batch(); multi-chunk and batched
+        calls report the combined stats of all their generations.
+        """
+        return getattr(self._local, "stats", None)
 
     @property
     def is_loaded(self) -> bool:
-        """Check if model is loaded."""
-        return self._model is not None
+        """Check if a model (or server client) is loaded."""
+        return (
+            self._model is not None
+            or self._vllm_backend is not None
+            or self._ollama_backend is not None
+            or self._fake_backend is not None
+        )
 
     @property
     def current_model_size(self) -> str | None:
@@ -190,6 +310,85 @@ def get_output_mode(self) -> OutputMode:
         """Get the current output mode."""
         return self._output_mode
 
+    def add_observer(self, observer: TranslatorObserver) -> None:
+        """
+        Register an instrumentation observer (e.g. TranslationMetrics).
+        
+        Args:
+            observer: Receives stage timings, generation and model lifecycle events
+        """
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def remove_observer(self, observer: TranslatorObserver) -> None:
+        """Unregister an instrumentation observer."""
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def metric_labels(self, source_lang: str | None = None, target_lang: str | None = None) -> dict:
+        """Labels identifying the current model, backend and language pair."""
+        return {
+            "model": self._current_model_size or "",
+            "quant": str(self._current_quantization or get_config().quantization_bits),
+            "backend": self._backend or "",
+            "lang_pair": f"{source_lang}-{target_lang}" if source_lang and target_lang else "",
+        }
+
+    @contextmanager
+    def stage(
+        self, name: str, source_lang: str | None = None, target_lang: str | None = None
+    ) -> Iterator[None]:
+        """Time a pipeline stage, report it to the observers and trace it as a span."""
+        with tracing.span(name):
+            if not self._observers:
+                yield
+                return
+            start = time.perf_counter()
+            yield
+            self.record_stage(name, time.perf_counter() - start, source_lang, target_lang)
+
+    def record_stage(
+        self,
+        name: str,
+        seconds: float,
+        source_lang: str | None = None,
+        target_lang: str | None = None,
+    ) -> None:
+        """Report a stage timed outside the translator (e.g. queue_wait, merge)."""
+        self._notify("on_stage", name, seconds, self.metric_labels(source_lang, target_lang))
+
+    def record_cache(
+        self, hit: bool, source_lang: str | None = None, target_lang: str | None = None
+    ) -> None:
+        """Report a translation cache lookup made on behalf of this translator."""
+        self._notify("on_cache", hit, self.metric_labels(source_lang, target_lang))
+
+    def _record_load(self, seconds: float) -> None:
+        self.record_stage("model_load", seconds)
+        self._notify("on_model_load", self.metric_labels())
+
+    def _record_load_phase(self, phase: str, seconds: float) -> None:
+        # load_read, load_init and load_warmup break model_load down
+        self.record_stage(f"load_{phase}", seconds)
+
+    def _record_generation(
+        self,
+        stats: GenerationStats,
+        source_lang: str,
+        target_lang: str,
+        chunks: int = 1,
+    ) -> None:
+        if not self._observers:
+            return
+        labels = self.metric_labels(source_lang, target_lang)
+        self._notify("on_generation", stats, labels)
+        for _ in range(chunks):
+            self._notify("on_chunk", labels)
+
+    def _notify(self, hook: str, *args) -> None:
+        for observer in self._observers:
+            getattr(observer, hook)(*args)
+
     def _map_lang_code(self, code: str) -> str:
         """Map internal language code to TranslateGemma's format."""
         return LANG_CODE_MAP.get(code, code)
@@ -287,6 +486,8 @@ def translate(
         text: str,
         force_target: str | None = None,
         mode: OutputMode | None = None,
+        cancel_token: CancellationToken | None = None,
+        context: RequestContext | None = None,
     ) -> tuple[str, str, str]:
         """
         Translate text with automatic language detection.
@@ -295,58 +496,38 @@ def translate(
             text: Text to translate
             force_target: Override target language (optional)
             mode: Override output mode (optional)
+            cancel_token: Token that aborts generation when cancelled (optional)
+            context: Settings of the request (default: a snapshot of the config)
             
         Returns:
-            Tuple of (translation, source_lang, target_lang)
+            Tuple of (translation, source_lang, target_lang); token counts
+            and timing are available from last_stats afterwards
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-generation
             
         Note:
             The model must be loaded before calling this method.
             Call ensure_model_loaded() once at session start.
         """
-        if not self.is_loaded:
-            self.ensure_model_loaded()
-        config = get_config()
+        raise_if_cancelled(cancel_token)
+        self._require_model()
+        context = context or RequestContext.from_config()
         output_mode = mode or self._output_mode
         
         # Detect source language
-        source_lang = detect_language(text, config.languages)
+        source_lang = detect_language(text, context.languages)
         
         # Determine target language
-        target_lang = force_target or self._force_target or get_target_language(source_lang, config.languages)
+        target_lang = force_target or self._force_target or get_target_language(source_lang, context.languages)
         
         # Generate based on backend
-        if self._backend == "vllm":
-            response = self._generate_vllm(text, source_lang, target_lang, config.max_tokens)
-        elif self._backend == "ollama":
-            response = self._generate_ollama(text, source_lang, target_lang, config.max_tokens)
-        else:
-            # Local backends (mlx, pytorch, gguf)
-            # Format messages
-            messages = self._format_messages(text, source_lang, target_lang)
-            
-            # For GGUF, we need to format the prompt manually
-            if self._backend == "gguf":
-                prompt = self._format_gguf_prompt(text, source_lang, target_lang)
-                response = self._generate_gguf(prompt, config.max_tokens)
-            else:
-                # Apply chat template for MLX/PyTorch
-                prompt = self._tokenizer.apply_chat_template(
-                    messages,
-                    tokenize=False,
-                    add_generation_prompt=True,
-                )
-                
-                if self._backend == "mlx":
-                    response = self._generate_mlx(prompt, config.max_tokens)
-                else:
-                    response = self._generate_pytorch(prompt, config.max_tokens)
+        params = context.generation
+        response, stats = self._generate_chunk(text, source_lang, target_lang, params.max_tokens, cancel_token, params)
+        self._local.stats = stats
         
         # Clean response based on mode
-        if output_mode == "direct":
-            response = self._clean_response(response)
-        else:
-            # Explain mode - just clean special tokens
-            response = self._clean_special_tokens(response)
+        response = self._clean_output(response, output_mode, source_lang, target_lang)
         
         return response, source_lang, target_lang
 
@@ -355,11 +536,13 @@ def translate_long(
         text: str,
         force_target: str | None = None,
         mode: OutputMode | None = None,
-        chunk_size: int = 200,
-        overlap: int = 50,
-        split_by: Literal["sentence", "paragraph", "char"] = "sentence",
+        chunk_size: int | None = None,
+        overlap: int | None = None,
+        split_by: Literal["sentence", "paragraph", "char"] | None = None,
         stream: bool = False,
         progress_callback: Callable[[int, int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+        context: RequestContext | None = None,
     ) -> str | Generator[str, None, None]:
         """
         Translate long text using chunking with sliding window.
@@ -371,21 +554,34 @@ def translate_long(
             chunk_size: Target size for each chunk (in characters)
             overlap: Overlap size between chunks (in characters)
             split_by: How to split text - "sentence", "paragraph", or "char"
+                (chunking settings left as None come from the config: the
+                values tuned for this model and language pair if any, else
+                the defaults)
             stream: Whether to stream output
             progress_callback: Callback function(current, total, chunk_text)
+            cancel_token: Token checked between chunks and tokens (optional)
+            context: Settings of the request (default: a snapshot of the config)
             
         Returns:
             Translated text (string) or generator if stream=True
         """
-        if not self.is_loaded:
-            self.ensure_model_loaded()
+        raise_if_cancelled(cancel_token)
+        self._require_model()
         
-        config = get_config()
+        context = context or RequestContext.from_config()
         output_mode = mode or self._output_mode
         
         # Detect source and target languages
-        source_lang = detect_language(text, config.languages)
-        target_lang = force_target or self._force_target or get_target_language(source_lang, config.languages)
+        source_lang = detect_language(text, context.languages)
+        target_lang = force_target or self._force_target or get_target_language(source_lang, context.languages)
+        
+        # Fill in unset chunking settings from the config
+        tuned_size, tuned_overlap, tuned_split_by = get_config().chunking_for(
+            self._current_model_size, source_lang, target_lang
+        )
+        chunk_size = chunk_size if chunk_size is not None else tuned_size
+        overlap = overlap if overlap is not None else tuned_overlap
+        split_by = split_by or tuned_split_by
         
         # Create chunker
         chunker = TextChunker(
@@ -395,7 +591,8 @@ def translate_long(
         )
         
         # Split into chunks
-        chunks = chunker.chunk(text)
+        with self.stage("chunking", source_lang, target_lang):
+            chunks = chunker.chunk(text)
         
         if not chunks:
             return "" if not stream else iter([])
@@ -403,19 +600,19 @@ def translate_long(
         # If only one chunk, use regular translate
         if len(chunks) == 1:
             if stream:
-                return self.translate_stream(text, force_target)
+                return self.translate_stream(text, force_target, cancel_token=cancel_token, context=context)
             else:
-                result, _, _ = self.translate(text, force_target, mode)
+                result, _, _ = self.translate(text, force_target, mode, cancel_token=cancel_token, context=context)
                 return result
         
         # Translate each chunk
         if stream:
             return self._translate_long_stream(
-                chunks, source_lang, target_lang, output_mode, progress_callback
+                chunks, source_lang, target_lang, output_mode, progress_callback, cancel_token, context.generation
             )
         else:
             return self._translate_long_batch(
-                chunks, source_lang, target_lang, output_mode, progress_callback
+                chunks, source_lang, target_lang, output_mode, progress_callback, cancel_token, context.generation
             )
     
     def _translate_long_batch(
@@ -425,50 +622,37 @@ def _translate_long_batch(
         target_lang: str,
         output_mode: OutputMode,
         progress_callback: Callable[[int, int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
     ) -> str:
         """Translate chunks in batch mode."""
-        config = get_config()
+        params = params or GenerationParams.from_config()
         translations = []
+        chunk_stats = []
         
         for i, chunk in enumerate(chunks):
+            raise_if_cancelled(cancel_token)
             if progress_callback:
                 progress_callback(i + 1, len(chunks), chunk.text[:50])
             
             # Adaptive max_tokens based on chunk length
             # Rule: Chinese to English typically expands 1.5-2x
             # Use 3x for safety buffer, cap at 2048
-            adaptive_max_tokens = min(2048, max(config.max_tokens, int(len(chunk.text) * 3)))
+            adaptive_max_tokens = min(2048, max(params.max_tokens, int(len(chunk.text) * 3)))
             
-            # Generate based on backend
-            if self._backend == "vllm":
-                response = self._generate_vllm(chunk.text, source_lang, target_lang, adaptive_max_tokens)
-            elif self._backend == "ollama":
-                response = self._generate_ollama(chunk.text, source_lang, target_lang, adaptive_max_tokens)
-            else:
-                # Local backends
-                messages = self._format_messages(chunk.text, source_lang, target_lang)
-                prompt = self._tokenizer.apply_chat_template(
-                    messages,
-                    tokenize=False,
-                    add_generation_prompt=True,
+            with tracing.span("chunk", index=i, chars=len(chunk.text)):
+                response, stats = self._generate_chunk(
+                    chunk.text, source_lang, target_lang, adaptive_max_tokens, cancel_token, params
                 )
-                
-                if self._backend == "mlx":
-                    response = self._generate_mlx(prompt, adaptive_max_tokens)
-                else:
-                    response = self._generate_pytorch(prompt, adaptive_max_tokens)
-            
-            # Clean response
-            if output_mode == "direct":
-                response = self._clean_response(response)
-            else:
-                response = self._clean_special_tokens(response)
-            
-            translations.append(response)
+                chunk_stats.append(stats)
+                translations.append(self._clean_output(response, output_mode, source_lang, target_lang))
+        
+        self._local.stats = GenerationStats.combine(chunk_stats)
         
         # Merge translations
         chunker = TextChunker()  # Create instance for merge method
-        return chunker.merge(chunks, translations)
+        with self.stage("merge", source_lang, target_lang):
+            return chunker.merge(chunks, translations)
     
     def _translate_long_stream(
         self,
@@ -477,87 +661,377 @@ def _translate_long_stream(
         target_lang: str,
         output_mode: OutputMode,
         progress_callback: Callable[[int, int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
     ) -> Generator[str, None, None]:
         """Translate chunks in streaming mode."""
-        config = get_config()
+        params = params or GenerationParams.from_config()
         translations = []
+        chunk_stats = []
         
         for i, chunk in enumerate(chunks):
+            raise_if_cancelled(cancel_token)
             if progress_callback:
                 progress_callback(i + 1, len(chunks), chunk.text[:50])
             
             # Adaptive max_tokens
-            adaptive_max_tokens = min(2048, max(config.max_tokens, int(len(chunk.text) * 3)))
+            adaptive_max_tokens = min(2048, max(params.max_tokens, int(len(chunk.text) * 3)))
             
-            # Collect streamed tokens for this chunk
+            # Collect streamed tokens for this chunk (the span outlives the yields,
+            # so it is ended explicitly rather than made current)
             chunk_translation = ""
-            
-            if self._backend == "vllm":
-                for token, _, _ in self._stream_vllm(chunk.text, source_lang, target_lang, adaptive_max_tokens):
+            chunk_span = tracing.start_span("chunk", index=i, chars=len(chunk.text))
+            try:
+                for token, _, _ in self._stream_chunk(
+                    chunk.text, source_lang, target_lang, adaptive_max_tokens, cancel_token, params
+                ):
                     chunk_translation += token
                     yield token
+                chunk_stats.append(self.last_stats)
+                
+                # Clean and store translation
+                with tracing.use_span(chunk_span):
+                    translations.append(
+                        self._clean_output(chunk_translation, output_mode, source_lang, target_lang)
+                    )
+            finally:
+                chunk_span.end()
+        
+        self._local.stats = GenerationStats.combine(chunk_stats)
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        force_target: str | None = None,
+        mode: OutputMode | None = None,
+        batch_size: int = 8,
+        cancel_token: CancellationToken | None = None,
+        context: RequestContext | None = None,
+    ) -> list[tuple[str, str, str]]:
+        """
+        Translate several independent texts together.
+        
+        PyTorch pads the prompts into a single generate() call per batch
+        (the fake backend simulates the same), vLLM and Ollama receive the
+        requests concurrently so the server can batch them, and GGUF/MLX
+        (single-sequence runtimes) fall back to translating one text after
+        another without reloading anything.
+        
+        Args:
+            texts: Texts to translate
+            force_target: Override target language (optional)
+            mode: Override output mode (optional)
+            batch_size: Maximum number of texts generated together
+            cancel_token: Token that aborts generation when cancelled (optional)
+            context: Settings of the request (default: a snapshot of the config)
+            
+        Returns:
+            List of (translation, source_lang, target_lang), in input order;
+            combined token counts and timing are available from last_stats
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-generation
+        """
+        raise_if_cancelled(cancel_token)
+        if not texts:
+            return []
+        self._require_model()
+        context = context or RequestContext.from_config()
+        params = context.generation
+        output_mode = mode or self._output_mode
+        
+        langs = []
+        for text in texts:
+            source_lang = detect_language(text, context.languages)
+            target_lang = force_target or self._force_target or get_target_language(source_lang, context.languages)
+            langs.append((source_lang, target_lang))
+        
+        if self._backend == "pytorch":
+            responses = []
+            all_stats = []
+            for start in range(0, len(texts), batch_size):
+                batch_langs = langs[start:start + batch_size]
+                prompts = [
+                    self._format_local_prompt(text, *lang)
+                    for text, lang in zip(texts[start:start + batch_size], batch_langs)
+                ]
+                with tracing.span("generate", backend="pytorch", batch_size=len(prompts)) as span:
+                    batch_responses, stats = self._generate_pytorch_batch(prompts, params.max_tokens, cancel_token, params)
+                    span.set_attributes(stats.to_dict())
+                responses.extend(batch_responses)
+                all_stats.append(stats)
+                self._record_generation(stats, *batch_langs[0], chunks=len(prompts))
+        elif self._backend == "fake":
+            responses = []
+            all_stats = []
+            for start in range(0, len(texts), batch_size):
+                batch_langs = langs[start:start + batch_size]
+                batch = [
+                    self._format_messages_for_server(text, *lang)
+                    for text, lang in zip(texts[start:start + batch_size], batch_langs)
+                ]
+                with tracing.span("generate", backend="fake", batch_size=len(batch)) as span:
+                    batch_responses, stats = self._fake_backend.generate_batch(batch, params.max_tokens, cancel_token)
+                    span.set_attributes(stats.to_dict())
+                responses.extend(batch_responses)
+                all_stats.append(stats)
+                self._record_generation(stats, *batch_langs[0], chunks=len(batch))
+        else:
+            if self.is_server_backend:
+                from concurrent.futures import ThreadPoolExecutor
+                
+                # Each task gets its own copy of the context so generate spans
+                # nest under the caller's span
+                with ThreadPoolExecutor(max_workers=min(batch_size, len(texts))) as pool:
+                    futures = [
+                        pool.submit(
+                            tracing.bind_context(self._generate_chunk),
+                            text, *lang, params.max_tokens, cancel_token, params,
+                        )
+                        for text, lang in zip(texts, langs)
+                    ]
+                    generations = [future.result() for future in futures]
+            else:
+                generations = [
+                    self._generate_chunk(text, source_lang, target_lang, params.max_tokens, cancel_token, params)
+                    for text, (source_lang, target_lang) in zip(texts, langs)
+                ]
+            responses = [response for response, _ in generations]
+            all_stats = [stats for _, stats in generations]
+        
+        self._local.stats = GenerationStats.combine(all_stats)
+        
+        return [
+            (self._clean_output(response, output_mode, source_lang, target_lang), source_lang, target_lang)
+            for response, (source_lang, target_lang) in zip(responses, langs)
+        ]
+
+    def _generate_chunk(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
+        """Dispatch a single generation to the active backend."""
+        with tracing.span("generate", backend=self._backend) as span:
+            if self._backend == "vllm":
+                response, stats = self._generate_vllm(text, source_lang, target_lang, max_tokens, cancel_token, params)
             elif self._backend == "ollama":
-                for token, _, _ in self._stream_ollama(chunk.text, source_lang, target_lang, adaptive_max_tokens):
-                    chunk_translation += token
-                    yield token
+                response, stats = self._generate_ollama(text, source_lang, target_lang, max_tokens, cancel_token, params)
+            elif self._backend == "fake":
+                response, stats = self._generate_fake(text, source_lang, target_lang, max_tokens, cancel_token, params)
             else:
-                # Local backends
-                messages = self._format_messages(chunk.text, source_lang, target_lang)
-                prompt = self._tokenizer.apply_chat_template(
-                    messages,
-                    tokenize=False,
-                    add_generation_prompt=True,
-                )
-                
-                if self._backend == "mlx":
-                    for token, _, _ in self._stream_mlx(prompt, adaptive_max_tokens, source_lang, target_lang):
-                        chunk_translation += token
-                        yield token
+                # Local backends (mlx, pytorch, gguf)
+                with self.stage("prompt_format", source_lang, target_lang):
+                    prompt = self._format_local_prompt(text, source_lang, target_lang)
+                if self._backend == "gguf":
+                    response, stats = self._generate_gguf(prompt, max_tokens, cancel_token, params)
+                elif self._backend == "mlx":
+                    response, stats = self._generate_mlx(prompt, max_tokens, cancel_token)
                 else:
-                    for token, _, _ in self._stream_pytorch(prompt, adaptive_max_tokens, source_lang, target_lang):
-                        chunk_translation += token
-                        yield token
-            
-            # Clean and store translation
+                    response, stats = self._generate_pytorch(prompt, max_tokens, cancel_token, params)
+            span.set_attributes(stats.to_dict())
+        self._record_generation(stats, source_lang, target_lang)
+        return response, stats
+
+    def _clean_output(
+        self,
+        response: str,
+        output_mode: OutputMode,
+        source_lang: str | None = None,
+        target_lang: str | None = None,
+    ) -> str:
+        """Clean a raw response according to the output mode."""
+        with self.stage("clean", source_lang, target_lang):
             if output_mode == "direct":
-                chunk_translation = self._clean_response(chunk_translation)
-            else:
-                chunk_translation = self._clean_special_tokens(chunk_translation)
-            
-            translations.append(chunk_translation)
+                return self._clean_response(response)
+            # Explain mode - just clean special tokens
+            return self._clean_special_tokens(response)
+
+    def _format_local_prompt(self, text: str, source_lang: str, target_lang: str) -> str | list[int]:
+        """
+        Build the prompt for a local backend (mlx, pytorch, gguf).
+        
+        GGUF gets a prompt string. MLX and PyTorch get token IDs built from
+        the chat template precompiled for the language pair, so only the
+        text itself is tokenized (see prompts.PromptBuilder).
+        """
+        if self._backend == "gguf":
+            return self._format_gguf_prompt(text, source_lang, target_lang)
+        builder = self._prompt_builder
+        if builder is None or builder.tokenizer is not self._tokenizer:
+            builder = self._prompt_builder = PromptBuilder(self._tokenizer, self._format_messages, self._encode_prompt)
+        return builder.build(text, source_lang, target_lang)
 
+    def _encode_prompt(self, prompt: str) -> list[int]:
+        """Token IDs of a rendered prompt, tokenized as the active backend would."""
+        if self._backend == "mlx":
+            # mlx_lm adds BOS only when the rendered prompt does not start with it
+            bos_token = getattr(self._tokenizer, "bos_token", None)
+            add_special_tokens = bos_token is None or not prompt.startswith(bos_token)
+            return list(self._tokenizer.encode(prompt, add_special_tokens=add_special_tokens))
+        return list(self._tokenizer.encode(prompt))
 
-    def _generate_mlx(self, prompt: str, max_tokens: int) -> str:
+    def _pytorch_inputs(self, prompt: list[int]) -> dict:
+        """Model inputs for prompt token IDs, on the model's device (left-padded to a bucket when compiled)."""
+        import torch
+        
+        device = next(self._model.parameters()).device
+        if self._prompt_buckets:
+            input_ids, attention_mask = pad_prompt(prompt, self._prompt_buckets, self._pad_token_id())
+        else:
+            input_ids, attention_mask = prompt, [1] * len(prompt)
+        return {
+            "input_ids": torch.tensor([input_ids], device=device),
+            "attention_mask": torch.tensor([attention_mask], device=device),
+        }
+
+    def _pad_token_id(self) -> int:
+        """Token the PyTorch backend pads prompts with."""
+        if self._tokenizer.pad_token_id is not None:
+            return self._tokenizer.pad_token_id
+        return self._tokenizer.eos_token_id
+
+    def _generate_mlx(
+        self, prompt: list[int], max_tokens: int, cancel_token: CancellationToken | None = None
+    ) -> tuple[str, GenerationStats]:
         """Generate response using MLX backend."""
-        from mlx_lm import generate
+        from mlx_lm import stream_generate
         
+        # Step through tokens so generation can be cancelled and the first
+        # token timed; generate() is a thin loop over stream_generate anyway.
         # Note: Current MLX version doesn't support sampling parameters
         # They are only used for PyTorch/vLLM/Ollama backends
-        response = generate(
+        stats = GenerationStats()
+        pieces = []
+        response = None
+        for response in stream_generate(
             self._model,
             self._tokenizer,
             prompt=prompt,
             max_tokens=max_tokens,
-            verbose=False,
-        )
+        ):
+            if cancel_token is not None and cancel_token.is_cancelled:
+                break
+            stats.first_token()
+            pieces.append(response.text if hasattr(response, 'text') else str(response))
+        
+        raise_if_cancelled(cancel_token)
+        
+        # GenerationResponse (newer mlx_lm versions) carries token counts
+        stats.prompt_tokens = getattr(response, "prompt_tokens", None)
+        stats.completion_tokens = getattr(response, "generation_tokens", None) or len(pieces)
+        stop_reason = getattr(response, "finish_reason", None)
+        if stop_reason is None:
+            stop_reason = LENGTH if len(pieces) >= max_tokens else STOP
+        return "".join(pieces), stats.finish(stop_reason)
+
+    def _generate_pytorch(
+        self,
+        prompt: list[int],
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
+        """Generate response using PyTorch backend."""
+        import torch
         
-        # Handle GenerationResponse object (newer mlx_lm versions)
-        if hasattr(response, 'text'):
-            response = response.text
+        stats = GenerationStats()
+        inputs = self._pytorch_inputs(prompt)
         
-        return response
+        gen_kwargs = self._pytorch_kwargs(max_tokens, cancel_token, stats, params, inputs["input_ids"].shape[1])
+        max_tokens = gen_kwargs["max_new_tokens"]
+        
+        with torch.no_grad():
+            outputs = self._model.generate(**inputs, **gen_kwargs)
+        
+        raise_if_cancelled(cancel_token)
+        
+        # Decode only the new tokens
+        prompt_length = inputs["input_ids"].shape[1]
+        new_tokens = outputs[0][prompt_length:]
+        response = self._tokenizer.decode(
+            new_tokens,
+            skip_special_tokens=True,
+        )
+        
+        stats.prompt_tokens = int(inputs["attention_mask"].sum())
+        stats.completion_tokens = len(new_tokens)
+        stop_reason = LENGTH if len(new_tokens) >= max_tokens else STOP
+        return response, stats.finish(stop_reason)
 
-    def _generate_pytorch(self, prompt: str, max_tokens: int) -> str:
-        """Generate response using PyTorch backend."""
+    def _generate_pytorch_batch(
+        self,
+        prompts: list[list[int]],
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[list[str], GenerationStats]:
+        """Generate responses for several prompts (token IDs) in one padded PyTorch batch."""
         import torch
         
-        config = get_config()
-        inputs = self._tokenizer(prompt, return_tensors="pt")
+        stats = GenerationStats()
+        
+        # Decoder-only models must be padded on the left so every row ends at the
+        # prompt; a compiled model pads to the bucket of the longest prompt
+        bucket = bucket_length(max(map(len, prompts)), self._prompt_buckets) if self._prompt_buckets else None
+        padding = {"padding": "max_length", "max_length": bucket} if bucket else {"padding": True}
+        padding_side = self._tokenizer.padding_side
+        self._tokenizer.padding_side = "left"
+        try:
+            inputs = self._tokenizer.pad({"input_ids": prompts}, return_tensors="pt", **padding)
+        finally:
+            self._tokenizer.padding_side = padding_side
         
-        # Move to same device as model
         device = next(self._model.parameters()).device
         inputs = {k: v.to(device) for k, v in inputs.items()}
         
+        gen_kwargs = self._pytorch_kwargs(max_tokens, cancel_token, stats, params, inputs["input_ids"].shape[1])
+        max_tokens = gen_kwargs["max_new_tokens"]
+        pad_token_id = gen_kwargs["pad_token_id"]
+        if self._tokenizer.pad_token_id is not None:
+            pad_token_id = gen_kwargs["pad_token_id"] = self._tokenizer.pad_token_id
+        
+        with torch.no_grad():
+            outputs = self._model.generate(**inputs, **gen_kwargs)
+        
+        raise_if_cancelled(cancel_token)
+        
+        prompt_length = inputs["input_ids"].shape[1]
+        new_tokens = outputs[:, prompt_length:]
+        
+        # Padding is not part of the prompts or the completions
+        stats.prompt_tokens = int(inputs["attention_mask"].sum())
+        stats.completion_tokens = int((new_tokens != pad_token_id).sum())
+        stop_reason = LENGTH if new_tokens.shape[1] >= max_tokens else STOP
+        
+        responses = self._tokenizer.batch_decode(
+            new_tokens,
+            skip_special_tokens=True,
+        )
+        return responses, stats.finish(stop_reason)
+
+    def _pytorch_kwargs(
+        self,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
+        prompt_length: int | None = None,
+    ) -> dict:
+        """
+        Build transformers generate() kwargs from the request's generation params.
+        
+        On a compiled model max_new_tokens stops at the static KV cache
+        (see compiled.completion_budget), which needs the padded prompt_length.
+        """
+        params = params or GenerationParams.from_config()
+        if self._static_cache_length and prompt_length is not None:
+            max_tokens = completion_budget(max_tokens, prompt_length, self._static_cache_length)
+        
         # Prepare generation kwargs
         gen_kwargs = {
             "max_new_tokens": max_tokens,
@@ -565,33 +1039,48 @@ def _generate_pytorch(self, prompt: str, max_tokens: int) -> str:
         }
         
         # Add sampling parameters
-        if config.temperature > 0.0:
+        if params.temperature > 0.0:
             gen_kwargs["do_sample"] = True
-            gen_kwargs["temperature"] = config.temperature
-            if config.top_p < 1.0:
-                gen_kwargs["top_p"] = config.top_p
-            if config.top_k > 0:
-                gen_kwargs["top_k"] = config.top_k
+            gen_kwargs["temperature"] = params.temperature
+            if params.top_p < 1.0:
+                gen_kwargs["top_p"] = params.top_p
+            if params.top_k > 0:
+                gen_kwargs["top_k"] = params.top_k
+            if params.min_p > 0.0:
+                gen_kwargs["min_p"] = params.min_p
         else:
             gen_kwargs["do_sample"] = False
         
-        if config.repetition_penalty != 1.0:
-            gen_kwargs["repetition_penalty"] = config.repetition_penalty
-        
-        with torch.no_grad():
-            outputs = self._model.generate(**inputs, **gen_kwargs)
+        if params.repetition_penalty != 1.0:
+            gen_kwargs["repetition_penalty"] = params.repetition_penalty
         
-        # Decode only the new tokens
-        response = self._tokenizer.decode(
-            outputs[0][inputs["input_ids"].shape[1]:],
-            skip_special_tokens=True,
-        )
+        if cancel_token is not None or stats is not None:
+            # Stopping criteria run after every sampled token, which also
+            # makes them the place to time the first one
+            gen_kwargs["stopping_criteria"] = _cancel_stopping_criteria(
+                cancel_token, on_token=stats.first_token if stats is not None else None
+            )
         
-        return response
+        return gen_kwargs
 
-    def _generate_gguf(self, prompt: str, max_tokens: int) -> str:
+    def _generate_gguf(
+        self,
+        prompt: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
         """Generate response using llama-cpp-python backend."""
-        config = get_config()
+        # Iterate token by token so the llama-cpp loop can be aborted and
+        # the first token timed; streaming costs llama-cpp nothing extra
+        stats = GenerationStats()
+        pieces = [token for token in self._iter_gguf(prompt, max_tokens, cancel_token, stats, params)]
+        raise_if_cancelled(cancel_token)
+        return "".join(pieces), stats.finish()
+
+    def _gguf_kwargs(self, max_tokens: int, params: GenerationParams | None = None) -> dict:
+        """Build llama-cpp generation kwargs from the request's generation params."""
+        params = params or GenerationParams.from_config()
         
         # Prepare generation kwargs
         gen_kwargs = {
@@ -600,39 +1089,111 @@ def _generate_gguf(self, prompt: str, max_tokens: int) -> str:
         }
         
         # Add sampling parameters
-        if config.temperature > 0.0:
-            gen_kwargs["temperature"] = config.temperature
-            if config.top_p < 1.0:
-                gen_kwargs["top_p"] = config.top_p
-            if config.top_k > 0:
-                gen_kwargs["top_k"] = config.top_k
+        if params.temperature > 0.0:
+            gen_kwargs["temperature"] = params.temperature
+            if params.top_p < 1.0:
+                gen_kwargs["top_p"] = params.top_p
+            if params.top_k > 0:
+                gen_kwargs["top_k"] = params.top_k
+            # Always passed: llama-cpp filters at min_p=0.05 unless told otherwise
+            gen_kwargs["min_p"] = params.min_p
         else:
             gen_kwargs["temperature"] = 0.0
         
-        if config.repetition_penalty != 1.0:
-            gen_kwargs["repeat_penalty"] = config.repetition_penalty
-        
-        # Generate using llama-cpp
-        output = self._model(prompt, **gen_kwargs)
-        
-        # Extract text from response
-        response = output["choices"][0]["text"]
+        if params.repetition_penalty != 1.0:
+            gen_kwargs["repeat_penalty"] = params.repetition_penalty
         
-        return response
+        return gen_kwargs
+
+    def _iter_gguf(
+        self,
+        prompt: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
+    ) -> Generator[str, None, None]:
+        """Yield tokens from llama-cpp, closing its iterator as soon as cancelled."""
+        if stats is not None:
+            stats.prompt_tokens = len(self._model.tokenize(prompt.encode("utf-8"), special=True))
+        completion = self._model(prompt, stream=True, **self._gguf_kwargs(max_tokens, params))
+        generated = []
+        usage = None
+        try:
+            for part in completion:
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    break
+                choice = part["choices"][0]
+                usage = part.get("usage") or usage
+                if stats is not None:
+                    stats.first_token()
+                    if choice.get("finish_reason"):
+                        stats.stop_reason = choice["finish_reason"]
+                generated.append(choice["text"])
+                yield choice["text"]
+        finally:
+            # Closing the generator stops llama-cpp from sampling further tokens
+            completion.close()
+            if stats is not None:
+                # A part holds as many tokens as llama-cpp could detokenize
+                # (none mid-character, several while matching a stop
+                # sequence), so the count comes from usage or the text
+                if usage and usage.get("completion_tokens") is not None:
+                    stats.completion_tokens = usage["completion_tokens"]
+                else:
+                    text = "".join(generated).encode("utf-8")
+                    stats.completion_tokens = len(self._model.tokenize(text, add_bos=False, special=True)) if text else 0
 
     def _generate_vllm(
-        self, text: str, source_lang: str, target_lang: str, max_tokens: int
-    ) -> str:
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
         """Generate response using vLLM server backend."""
         messages = self._format_messages_for_server(text, source_lang, target_lang)
-        return self._vllm_backend.generate(messages, max_tokens=max_tokens)
+        stats = GenerationStats()
+        response = self._vllm_backend.generate(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        return response, stats.finish()
 
     def _generate_ollama(
-        self, text: str, source_lang: str, target_lang: str, max_tokens: int
-    ) -> str:
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
         """Generate response using Ollama server backend."""
         messages = self._format_messages_for_server(text, source_lang, target_lang)
-        return self._ollama_backend.generate(messages, max_tokens=max_tokens)
+        stats = GenerationStats()
+        response = self._ollama_backend.generate(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        return response, stats.finish()
+
+    def _generate_fake(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> tuple[str, GenerationStats]:
+        """Generate response using the fake backend."""
+        messages = self._format_messages_for_server(text, source_lang, target_lang)
+        stats = GenerationStats()
+        response = self._fake_backend.generate(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        return response, stats.finish()
 
     def _clean_special_tokens(self, text: str) -> str:
         """Remove special tokens from response."""
@@ -774,6 +1335,8 @@ def translate_stream(
         self,
         text: str,
         force_target: str | None = None,
+        cancel_token: CancellationToken | None = None,
+        context: RequestContext | None = None,
     ) -> Generator[tuple[str, str, str], None, None]:
         """
         Translate text with streaming output (explain mode only).
@@ -787,44 +1350,119 @@ def translate_stream(
         Args:
             text: Text to translate
             force_target: Override target language (optional)
+            cancel_token: Token that stops generation when cancelled (optional)
+            context: Settings of the request (default: a snapshot of the config)
             
         Yields:
             Tuples of (token, source_lang, target_lang)
+            
+        Raises:
+            TranslationCancelled: If cancel_token is cancelled mid-stream
         """
-        if not self.is_loaded:
-            self.ensure_model_loaded()
-        config = get_config()
+        raise_if_cancelled(cancel_token)
+        self._require_model()
+        context = context or RequestContext.from_config()
         
         # Detect source language
-        source_lang = detect_language(text, config.languages)
+        source_lang = detect_language(text, context.languages)
         
         # Determine target language
-        target_lang = force_target or self._force_target or get_target_language(source_lang, config.languages)
+        target_lang = force_target or self._force_target or get_target_language(source_lang, context.languages)
         
-        # Stream based on backend
+        params = context.generation
+        yield from self._stream_chunk(text, source_lang, target_lang, params.max_tokens, cancel_token, params)
+
+    def _stream_chunk(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        params: GenerationParams | None = None,
+    ) -> Generator[tuple[str, str, str], None, None]:
+        """Dispatch a streaming generation to the active backend, timing prefill and decode."""
+        stats = GenerationStats()
+        pieces = 0
+        span = tracing.start_span("generate", backend=self._backend, stream=True)
+        try:
+            for item in self._stream_backend(text, source_lang, target_lang, max_tokens, cancel_token, stats, params):
+                stats.first_token()
+                pieces += 1
+                yield item
+            # Backends that cannot count tokens stream one token per piece
+            if stats.completion_tokens is None:
+                stats.completion_tokens = pieces
+            stats.finish()
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.set_attributes(stats.to_dict())
+            span.end()
+        self._local.stats = stats
+        self._record_generation(stats, source_lang, target_lang)
+
+    def _stream_backend(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
+    ) -> Generator[tuple[str, str, str], None, None]:
+        """Stream tokens from the active backend, filling stats where it reports them."""
         if self._backend == "vllm":
-            yield from self._stream_vllm(text, source_lang, target_lang, config.max_tokens)
+            yield from self._stream_vllm(text, source_lang, target_lang, max_tokens, cancel_token, stats, params)
         elif self._backend == "ollama":
-            yield from self._stream_ollama(text, source_lang, target_lang, config.max_tokens)
+            yield from self._stream_ollama(text, source_lang, target_lang, max_tokens, cancel_token, stats, params)
+        elif self._backend == "fake":
+            yield from self._stream_fake(text, source_lang, target_lang, max_tokens, cancel_token, stats, params)
         else:
-            # Local backends (mlx, pytorch)
-            # Format messages
-            messages = self._format_messages(text, source_lang, target_lang)
-            
-            # Apply chat template
-            prompt = self._tokenizer.apply_chat_template(
-                messages,
-                tokenize=False,
-                add_generation_prompt=True,
-            )
+            # Local backends (mlx, pytorch, gguf)
+            with self.stage("prompt_format", source_lang, target_lang):
+                prompt = self._format_local_prompt(text, source_lang, target_lang)
             
-            if self._backend == "mlx":
-                yield from self._stream_mlx(prompt, config.max_tokens, source_lang, target_lang)
+            if self._backend == "gguf":
+                yield from self._stream_gguf(prompt, max_tokens, source_lang, target_lang, cancel_token, stats, params)
+            elif self._backend == "mlx":
+                yield from self._stream_mlx(prompt, max_tokens, source_lang, target_lang, cancel_token, stats)
             else:
-                yield from self._stream_pytorch(prompt, config.max_tokens, source_lang, target_lang)
+                yield from self._stream_pytorch(prompt, max_tokens, source_lang, target_lang, cancel_token, stats, params)
+
+    def _stream_gguf(
+        self,
+        prompt: str,
+        max_tokens: int,
+        source_lang: str,
+        target_lang: str,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
+    ) -> Generator[tuple[str, str, str], None, None]:
+        """Stream generation using llama-cpp-python backend."""
+        tokens = self._iter_gguf(prompt, max_tokens, cancel_token, stats, params)
+        try:
+            for token in tokens:
+                if "<end_of_turn>" in token or "<eos>" in token:
+                    if stats is not None:
+                        stats.stop_reason = STOP
+                    break
+                yield token, source_lang, target_lang
+        finally:
+            tokens.close()
+        raise_if_cancelled(cancel_token)
 
     def _stream_mlx(
-        self, prompt: str, max_tokens: int, source_lang: str, target_lang: str
+        self,
+        prompt: list[int],
+        max_tokens: int,
+        source_lang: str,
+        target_lang: str,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
     ) -> Generator[tuple[str, str, str], None, None]:
         """Stream generation using MLX backend."""
         from mlx_lm import stream_generate
@@ -837,25 +1475,39 @@ def _stream_mlx(
             prompt=prompt,
             max_tokens=max_tokens,
         ):
+            if cancel_token is not None and cancel_token.is_cancelled:
+                break
             token = response.text if hasattr(response, 'text') else str(response)
+            if stats is not None:
+                stats.add_token()
+                stats.prompt_tokens = getattr(response, "prompt_tokens", None)
+                stats.stop_reason = getattr(response, "finish_reason", None)
             
             # Stop on special tokens
             if "<end_of_turn>" in token or "<eos>" in token:
+                if stats is not None:
+                    stats.stop_reason = STOP
                 break
             yield token, source_lang, target_lang
+        
+        raise_if_cancelled(cancel_token)
 
     def _stream_pytorch(
-        self, prompt: str, max_tokens: int, source_lang: str, target_lang: str
+        self,
+        prompt: list[int],
+        max_tokens: int,
+        source_lang: str,
+        target_lang: str,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
     ) -> Generator[tuple[str, str, str], None, None]:
         """Stream generation using PyTorch backend."""
-        import torch
         from transformers import TextIteratorStreamer
         from threading import Thread
         
-        config = get_config()
-        inputs = self._tokenizer(prompt, return_tensors="pt")
-        device = next(self._model.parameters()).device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+        params = params or GenerationParams.from_config()
+        inputs = self._pytorch_inputs(prompt)
         
         streamer = TextIteratorStreamer(
             self._tokenizer,
@@ -863,58 +1515,171 @@ def _stream_pytorch(
             skip_special_tokens=True,
         )
         
+        # Same sampling settings as _generate_pytorch, plus the streamer
         generation_kwargs = {
             **inputs,
+            **self._pytorch_kwargs(max_tokens, params=params, prompt_length=inputs["input_ids"].shape[1]),
             "streamer": streamer,
-            "max_new_tokens": max_tokens,
-            "pad_token_id": self._tokenizer.eos_token_id,
         }
+        max_tokens = generation_kwargs["max_new_tokens"]
         
-        # Add sampling parameters
-        if config.temperature > 0.0:
-            generation_kwargs["do_sample"] = True
-            generation_kwargs["temperature"] = config.temperature
-            if config.top_p < 1.0:
-                generation_kwargs["top_p"] = config.top_p
-            if config.top_k > 0:
-                generation_kwargs["top_k"] = config.top_k
-        else:
-            generation_kwargs["do_sample"] = False
-        
-        if config.repetition_penalty != 1.0:
-            generation_kwargs["repetition_penalty"] = config.repetition_penalty
+        # Stops the generation thread when the caller cancels, stops reading
+        # early (special token) or closes this generator
+        stop_token = cancel_token.child() if cancel_token is not None else CancellationToken()
+        generation_kwargs["stopping_criteria"] = _cancel_stopping_criteria(
+            stop_token, on_token=stats.add_token if stats is not None else None
+        )
+        if stats is not None:
+            stats.prompt_tokens = int(inputs["attention_mask"].sum())
         
         thread = Thread(target=self._model.generate, kwargs=generation_kwargs)
         thread.start()
         
-        for token in streamer:
-            if "<end_of_turn>" in token or "<eos>" in token:
-                break
-            yield token, source_lang, target_lang
-        
-        thread.join()
+        try:
+            for token in streamer:
+                if stop_token.is_cancelled:
+                    break
+                if "<end_of_turn>" in token or "<eos>" in token:
+                    break
+                yield token, source_lang, target_lang
+        finally:
+            stop_token.cancel()
+            thread.join()
+        
+        raise_if_cancelled(cancel_token)
+        if stats is not None:
+            stats.stop_reason = LENGTH if (stats.completion_tokens or 0) >= max_tokens else STOP
 
     def _stream_vllm(
-        self, text: str, source_lang: str, target_lang: str, max_tokens: int
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
     ) -> Generator[tuple[str, str, str], None, None]:
         """Stream generation using vLLM server backend."""
         messages = self._format_messages_for_server(text, source_lang, target_lang)
         
-        for token in self._vllm_backend.generate_stream(messages, max_tokens=max_tokens):
-            if "<end_of_turn>" in token or "<eos>" in token:
-                break
-            yield token, source_lang, target_lang
+        tokens = self._vllm_backend.generate_stream(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        try:
+            for token in tokens:
+                if "<end_of_turn>" in token or "<eos>" in token:
+                    break
+                yield token, source_lang, target_lang
+        finally:
+            # Closes the HTTP stream so the server stops generating
+            tokens.close()
 
     def _stream_ollama(
-        self, text: str, source_lang: str, target_lang: str, max_tokens: int
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
     ) -> Generator[tuple[str, str, str], None, None]:
         """Stream generation using Ollama server backend."""
         messages = self._format_messages_for_server(text, source_lang, target_lang)
         
-        for token in self._ollama_backend.generate_stream(messages, max_tokens=max_tokens):
-            if "<end_of_turn>" in token or "<eos>" in token:
-                break
-            yield token, source_lang, target_lang
+        tokens = self._ollama_backend.generate_stream(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        try:
+            for token in tokens:
+                if "<end_of_turn>" in token or "<eos>" in token:
+                    break
+                yield token, source_lang, target_lang
+        finally:
+            # Closes the HTTP stream so the server stops generating
+            tokens.close()
+
+    def _stream_fake(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        max_tokens: int,
+        cancel_token: CancellationToken | None = None,
+        stats: GenerationStats | None = None,
+        params: GenerationParams | None = None,
+    ) -> Generator[tuple[str, str, str], None, None]:
+        """Stream generation using the fake backend."""
+        messages = self._format_messages_for_server(text, source_lang, target_lang)
+        
+        tokens = self._fake_backend.generate_stream(
+            messages, max_tokens=max_tokens, cancel_token=cancel_token, stats=stats, **_sampling_kwargs(params)
+        )
+        try:
+            for token in tokens:
+                yield token, source_lang, target_lang
+        finally:
+            tokens.close()
+
+
+def _sampling_kwargs(params: GenerationParams | None) -> dict:
+    """Sampling settings of params as keyword arguments of the server backends' generate()."""
+    params = params or GenerationParams.from_config()
+    return {
+        "temperature": params.temperature,
+        "top_p": params.top_p,
+        "top_k": params.top_k,
+        "min_p": params.min_p,
+        "repetition_penalty": params.repetition_penalty,
+    }
+
+
+def _cancel_stopping_criteria(
+    token: CancellationToken | None, on_token: Callable[[], None] | None = None
+) -> Any:
+    """
+    Build a transformers StoppingCriteriaList that fires when token is cancelled.
+    
+    transformers checks stopping criteria after every sampled token, so
+    on_token (if given) is called once per generation step.
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+    
+    class _CancelCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            if on_token is not None:
+                on_token()
+            return torch.full(
+                (input_ids.shape[0],),
+                token is not None and token.is_cancelled,
+                dtype=torch.bool,
+                device=input_ids.device,
+            )
+    
+    return StoppingCriteriaList([_CancelCriteria()])
+
+
+def should_chunk(
+    text: str,
+    chunk_size: int | None = None,
+    overlap: int | None = None,
+    no_chunk: bool = False,
+) -> bool:
+    """
+    Whether a single-shot request should go through translate_long().
+    
+    Chunking is forced by an explicit chunk_size or overlap, disabled by
+    no_chunk, and otherwise used for text longer than the configured
+    auto-chunk threshold.
+    """
+    if no_chunk:
+        return False
+    if chunk_size is not None or overlap is not None:
+        return True
+    config = get_config()
+    return config.chunking_enabled and len(text) > config.auto_chunk_threshold
 
 
 # Global translator instance